@@ -29,6 +29,8 @@ from __future__ import annotations
 
 import base64
 import functools
+import gzip
+import hashlib
 import html
 import json
 import os
@@ -36,6 +38,9 @@ import pathlib
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -475,8 +480,11 @@ CONFIG_MANDATORY_FILE = "config.yml"
 # environment without code changes. Env-var creds are kept as a thin
 # fallback so dev boxes / CI without vault access still light up.
 JENKINS_VAULT_PATH = os.environ.get("JENKINS_VAULT_PATH", "jenkins").strip()
-JENKINS_TIMEOUT = 10  # seconds — the panel calls 4 endpoints per refresh
-JENKINS_TTL = 30      # seconds — how long status results are cached
+JENKINS_TIMEOUT = 10  # seconds — the poller calls 2 endpoints per refresh
+JENKINS_TTL = 30      # seconds — background poll cadence for the shared snapshot
+JENKINS_VERSION_TTL = 6 * 3600  # seconds — update-center "latest core" check
+JENKINS_POLL_IDLE = 300  # seconds without a reader before the poller parks
+JENKINS_BUILDS_WINDOW = 25  # newest builds per job scanned for in-flight runs
 
 # =============================================================================
 # PRISMA SCAN VIEWER — S3-backed full-report HTML
@@ -485,8 +493,9 @@ JENKINS_TTL = 30      # seconds — how long status results are cached
 # stored in an S3-compatible bucket (custom host + port — likely MinIO or a
 # similar on-prem S3 service rather than AWS). We never list the bucket and
 # never bulk-download — fetches are explicitly user-initiated through the
-# Scan Viewer tab. Cached in-process for PRISMA_SCAN_TTL so a user flipping
-# tabs doesn't re-pay the round trip.
+# Scan Viewer tab. Cached on local disk (see PRISMA_SCAN_CACHE_DIR below) so
+# neither a user flipping tabs nor a second viewer of the same report re-pays
+# the round trip.
 #
 # Connection details (host / port / access_key / secret_key) come from vault:
 #
@@ -510,7 +519,21 @@ PRISMA_S3_KEY_PATTERN = os.environ.get(
 # boto3 won't sign requests without one. Default to us-east-1 unless an env
 # var explicitly overrides — purely a boto3 plumbing concern.
 PRISMA_S3_REGION = os.environ.get("PRISMA_S3_REGION", "us-east-1").strip()
-PRISMA_SCAN_TTL = 600  # seconds — scans are immutable per version, longer TTL OK
+# On-disk report cache. Reports are immutable per (project, application,
+# version), so once an object has been streamed down it's kept gzip'd on local
+# disk and every later view (any session, any rerun, across restarts) is served
+# from there without touching S3. Blobs are content-addressed (sha256 of the
+# decoded bytes) and pointed at by a tiny per-(bucket, key) index entry that
+# also records the S3 ETag, so a forced re-fetch can HEAD the object and skip
+# the download when nothing changed. Least-recently-viewed blobs are evicted
+# once the directory grows past PRISMA_SCAN_CACHE_MAX_MB.
+PRISMA_SCAN_CACHE_DIR = os.environ.get(
+    "PRISMA_SCAN_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "cicd-prisma-scans"),
+).strip()
+PRISMA_SCAN_CACHE_MAX_MB = int(os.environ.get("PRISMA_SCAN_CACHE_MAX_MB", "512") or 512)
+PRISMA_SCAN_STREAM_CHUNK = 256 * 1024  # bytes per S3 body read while streaming to disk
+PRISMA_SCAN_PAGE_BYTES = 512 * 1024    # decoded bytes rendered per viewer page
 
 # =============================================================================
 # POSTGRES — authoritative devops_projects table (per-project teams)
@@ -12561,59 +12584,203 @@ def _resolve_inventory_by_teams_git(_bare_fields, _teams_ci, _bare_agg,
     return sorted(_out)
 
 
+# ── Team → scope inverted index ──────────────────────────────────────────
+# Every scope helper used to re-scan the whole inventory (git rows, else the
+# ES projection) with ``_team_match_set`` normalisation, once per (role,
+# team) combination — several full scans per non-admin session start. The
+# index below is built ONCE per inventory snapshot and shared by every
+# session in the process:
+#
+#   by_team[team_match_key][team_field] = {
+#       "rows": (row_idx, ...), "apps": {...}, "projects": {...},
+#       "companies": {...},
+#   }
+#
+# plus ``row_teams`` (each row's team fields in blob order) so the scope
+# diagnostic can still name the field that matched. A snapshot is the git
+# HEAD + vault-password fingerprint, or a CACHE_TTL bucket when the ES
+# projection is the source. Resolving a session's scope is then a few dict
+# lookups and set unions, independent of inventory size.
+#
+# The scope block near the top of the script runs BEFORE the inventory
+# loaders are defined, so there the last index this process built is served
+# as-is; the refresh happens once the loaders exist (see
+# ``_team_scope_index()`` call after ``_fetch_full_inventory``).
+#
+# A git snapshot that parsed to zero rows is remembered in ``empty_git``
+# (key → monotonic time) so every rerun doesn't re-parse it just to fall
+# back to ES again. The memo expires after CACHE_TTL — the same HEAD can
+# start yielding rows once a clone or vault decrypt recovers — and holds at
+# most _TEAM_SCOPE_EMPTY_GIT_MAX keys.
+
+_TEAM_SCOPE_EMPTY_GIT_MAX = 32
+
+
+@st.cache_resource(show_spinner=False)
+def _team_scope_store() -> dict:
+    """Process-wide slot holding the current index and its snapshot key."""
+    return {"key": "", "index": None, "empty_git": {},
+            "lock": threading.Lock()}
+
+
+def _team_scope_empty_git(store: dict, git_key: str, now: float,
+                          mark: bool = False) -> bool:
+    """Whether *git_key* is a recently-seen empty git snapshot; with
+    *mark*, record it as one (dropping expired keys, then the oldest past
+    _TEAM_SCOPE_EMPTY_GIT_MAX)."""
+    _memo = store["empty_git"]
+    if not mark:
+        _seen = _memo.get(git_key)
+        return _seen is not None and now - _seen < CACHE_TTL
+    for _k in [k for k, t in _memo.items() if now - t >= CACHE_TTL]:
+        del _memo[_k]
+    _memo.pop(git_key, None)
+    _memo[git_key] = now
+    while len(_memo) > _TEAM_SCOPE_EMPTY_GIT_MAX:
+        del _memo[next(iter(_memo))]
+    return True
+
+
+def _team_scope_index_build(rows: list[dict], source: str) -> dict:
+    """Invert inventory rows into the team → scope index described above."""
+    row_vals: list[tuple[str, str, str]] = []
+    row_teams: list[tuple] = []
+    by_rows: dict[str, dict[str, list[int]]] = {}
+    for _r in rows or []:
+        _i = len(row_vals)
+        row_vals.append((
+            (_r.get("application") or "").strip(),
+            (_r.get("project") or "").strip(),
+            (_r.get("company") or "").strip(),
+        ))
+        _fields: list[tuple[str, frozenset]] = []
+        for _k, _v in (_r.get("teams") or {}).items():
+            if not isinstance(_k, str):
+                continue
+            _vals = _v if isinstance(_v, (list, tuple, set)) else [_v]
+            _keys = frozenset(_team_match_key(_x) for _x in _vals if _x) - {""}
+            if not _keys:
+                continue
+            _fields.append((_k, _keys))
+            for _tk in _keys:
+                by_rows.setdefault(_tk, {}).setdefault(_k, []).append(_i)
+        row_teams.append(tuple(_fields))
+    by_team: dict[str, dict[str, dict]] = {}
+    for _tk, _per_field in by_rows.items():
+        for _k, _idx in _per_field.items():
+            by_team.setdefault(_tk, {})[_k] = {
+                "rows":      tuple(_idx),
+                "apps":      frozenset(row_vals[i][0] for i in _idx) - {""},
+                "projects":  frozenset(row_vals[i][1] for i in _idx) - {""},
+                "companies": frozenset(row_vals[i][2] for i in _idx) - {""},
+            }
+    return {"source": source, "rows": row_vals, "row_teams": row_teams,
+            "by_team": by_team}
+
+
+def _team_scope_index() -> dict | None:
+    """Current team-scope index, rebuilt only when the inventory snapshot
+    moved. Falls back to the last-built index when the snapshot can't be
+    resolved (loaders not yet defined in this run, git/ES unreachable);
+    ``None`` only before the first successful build in this process."""
+    store = _team_scope_store()
+    try:
+        _head, _status = _inventory_git_head([])
+        _fp = _vault_pw_fingerprint()
+    except NameError:
+        return store["index"]
+    except Exception:
+        _head, _fp = "", ""
+    _es_key = f"es:{int(time.time() // CACHE_TTL)}"
+    _git_key = f"git:{_head}:{_fp}" if (_head and _YAML_AVAILABLE) else ""
+    _now = time.monotonic()
+    if _git_key and _team_scope_empty_git(store, _git_key, _now):
+        _git_key = ""
+    _key = _git_key or _es_key
+    if store["index"] is not None and store["key"] == _key:
+        return store["index"]
+    with store["lock"]:
+        if store["index"] is not None and store["key"] == _key:
+            return store["index"]
+        try:
+            _rows, _source = [], "es"
+            if _git_key:
+                _rows, _warn = _load_inventory_from_git(_head, _fp)
+                _source = "git"
+                if not _rows:
+                    _team_scope_empty_git(store, _git_key, _now, mark=True)
+                    _key = _es_key
+                else:
+                    store["empty_git"].pop(_git_key, None)
+            if not _rows:
+                # direct_es: bypass the PG read-router so resolution sees the
+                # same authoritative ES inventory the admin scope-check sees.
+                _rows = _fetch_full_inventory("[]", direct_es=True)
+                _source = "es"
+        except Exception:
+            return store["index"]
+        store["index"] = _team_scope_index_build(_rows, _source)
+        store["key"] = _key
+        return store["index"]
+
+
+def _team_scope_lookup(index: dict, teams, fields=None) -> dict:
+    """Union the index entries for *teams* across *fields* (bare or
+    ``.keyword`` names). ``fields`` empty / containing ``"*"`` matches ANY
+    ``*_team`` field. Returns sorted ``apps`` / ``projects`` /
+    ``companies`` plus the matched ``rows`` indices."""
+    _want = _team_match_set(teams)
+    _bare = (None if (not fields or "*" in fields)
+             else {str(f).replace(".keyword", "") for f in fields if f})
+    _rows: set[int] = set()
+    _apps: set[str] = set()
+    _projects: set[str] = set()
+    _companies: set[str] = set()
+    for _tk in _want:
+        for _k, _ent in (index["by_team"].get(_tk) or {}).items():
+            if (_k not in _bare) if _bare is not None else (not _k.endswith("_team")):
+                continue
+            _rows.update(_ent["rows"])
+            _apps |= _ent["apps"]
+            _projects |= _ent["projects"]
+            _companies |= _ent["companies"]
+    return {"rows": sorted(_rows), "apps": sorted(_apps),
+            "projects": sorted(_projects), "companies": sorted(_companies)}
+
+
+_TEAM_SCOPE_AGG_KEYS = {"application": "apps", "project": "projects",
+                        "company": "companies"}
+
+
 def _resolve_inventory_by_teams(fields, teams, agg_field: str) -> list[str]:
     """Resolve inventory apps / projects owned by ANY of *teams* across ANY
     of *fields*, matching team names CASE-INSENSITIVELY (My-Team == my-team).
 
     Resolution order:
-      1. the GIT inventory rows directly — the AUTHORITATIVE source. Matching
-         is case- AND separator-tolerant (``_team_match_key``), so a session
-         team "My Team" resolves apps owned by inventory "my_team" / "My-Team".
-         ES ``term`` queries can only match exact tokens (case-insensitively at
-         best), so a separator drift between the auth layer's team names and the
-         YAML's team names would collapse a non-admin's whole scope to zero —
-         the recurring "non-admins see 0 apps" bug. Git resolution fixes that.
-      2. ES (``case_insensitive`` then exact) — used ONLY when git is
-         unavailable (clone/parse failed → zero rows), so the panel still
-         resolves *something* rather than nothing."""
+      1. the team-scope index over the GIT inventory rows — the AUTHORITATIVE
+         source. Matching is case- AND separator-tolerant
+         (``_team_match_key``), so a session team "My Team" resolves apps
+         owned by inventory "my_team" / "My-Team". ES ``term`` queries can
+         only match exact tokens (case-insensitively at best), so a separator
+         drift between the auth layer's team names and the YAML's team names
+         would collapse a non-admin's whole scope to zero — the recurring
+         "non-admins see 0 apps" bug.
+      2. the same index over the ES full projection — used ONLY when git is
+         unavailable (clone/parse failed → zero rows), with the SAME
+         separator/case-tolerant matching, so the panel still resolves
+         *something* rather than nothing.
+      3. ES exact-token term match (``case_insensitive`` then exact) — only
+         when neither source produced a match."""
     _fields = [f for f in (fields or []) if f]
     _teams = [t for t in (teams or []) if str(t or "").strip()]
     if not _fields or not _teams:
         return []
 
-    # 1) Authoritative git inventory — separator/case tolerant.
-    try:
-        _git_rows, _src, _status, _warn = _load_inventory_from_git_scoped("[]")
-    except Exception:
-        _git_rows = None
-    if _git_rows:
-        return _resolve_inventory_by_teams_git(
-            [f.replace(".keyword", "") for f in _fields],
-            _team_match_set(_teams),
-            agg_field.replace(".keyword", ""),
-            _rows=_git_rows,
-        )
-
-    # 2) Git unavailable — fall back to the ES projection, but do the SAME
-    #    separator/case-tolerant matching in Python (NOT via ES term queries).
-    #    ES `term` can only match exact tokens, so a separator drift between the
-    #    auth layer's team names ("My Team") and the index's stored values
-    #    ("my_team") collapses a non-admin's whole scope to zero — the recurring
-    #    "non-admins see 0 apps" bug. `_fetch_full_inventory` returns rows with a
-    #    `teams` blob, so we can reuse the exact git-path matcher and stay robust
-    #    to drift even when the git clone is unreachable in the deployment.
-    try:
-        _es_rows = _fetch_full_inventory("[]", direct_es=True)
-    except Exception:
-        _es_rows = []
-    if _es_rows:
-        _matched = _resolve_inventory_by_teams_git(
-            [f.replace(".keyword", "") for f in _fields],
-            _team_match_set(_teams),
-            agg_field.replace(".keyword", ""),
-            _rows=_es_rows,
-        )
-        if _matched:
+    _agg = _TEAM_SCOPE_AGG_KEYS.get(agg_field.replace(".keyword", ""))
+    _index = _team_scope_index()
+    if _index is not None and _index["rows"] and _agg:
+        _matched = _team_scope_lookup(_index, _teams, _fields)[_agg]
+        if _matched or _index["source"] == "git":
             return _matched
 
     # 3) Last resort — ES exact-token term match (only reached when even the
@@ -12634,71 +12801,39 @@ def _resolve_inventory_by_teams(fields, teams, agg_field: str) -> list[str]:
 
 
 def _resolve_inventory_scope_for_teams(teams) -> dict:
-    """Resolve a non-admin's apps AND projects in ONE matched-row pass over the
-    best-available inventory rows (git → ES full projection). Matching is field-
-    agnostic (any ``*_team`` field) and separator/case-tolerant.
+    """Resolve a non-admin's apps AND projects in ONE lookup against the
+    team-scope index (git → ES full projection). Matching is field-agnostic
+    (any ``*_team`` field) and separator/case-tolerant.
 
-    Returning both from the SAME pass guarantees they're consistent: a row that
-    matches the team contributes its app AND its project together, so apps can't
-    resolve while projects come back empty (the two old independent passes could
-    diverge when a row carried an app but an empty project, or vice-versa).
+    Returning both from the SAME matched-row set guarantees they're
+    consistent: a row that matches the team contributes its app AND its
+    project together, so apps can't resolve while projects come back empty.
 
     Returns ``{"apps": [...], "projects": [...], "sample": [(app, project,
     matched_field), ...]}`` — the sample (first few matches) is for the scope
     diagnostic so a real data issue is visible without guessing."""
     _teams = [t for t in (teams or []) if str(t or "").strip()]
-    if not _teams:
+    _index = _team_scope_index() if _teams else None
+    if _index is None:
         return {"apps": [], "projects": [], "sample": []}
     _want = _team_match_set(_teams)
-
-    # Best-available rows: git first (authoritative), then the ES full
-    # projection. Both carry a `teams` blob keyed by `*_team` field.
-    _rows = None
-    try:
-        _git_rows, _src, _status, _warn = _load_inventory_from_git_scoped("[]")
-    except Exception:
-        _git_rows = None
-    if _git_rows:
-        _rows = _git_rows
-    else:
-        try:
-            # direct_es: bypass the PG read-router so resolution sees the same
-            # authoritative ES inventory the admin scope-check tool sees.
-            _rows = _fetch_full_inventory("[]", direct_es=True)
-        except Exception:
-            _rows = []
-
-    _apps: set[str] = set()
-    _projects: set[str] = set()
+    _hit = _team_scope_lookup(_index, _teams)
     _sample: list[tuple] = []
-    for _r in _rows or []:
-        _blob = _r.get("teams") or {}
-        _matched_field = ""
-        for _k, _v in _blob.items():
-            if not (isinstance(_k, str) and _k.endswith("_team")):
-                continue
-            _vals = _v if isinstance(_v, (list, tuple, set)) else [_v]
-            if any(_team_match_key(_x) in _want for _x in _vals if _x):
-                _matched_field = _k
-                break
-        if not _matched_field:
-            continue
-        _app = (_r.get("application") or "").strip()
-        _proj = (_r.get("project") or "").strip()
-        if _app:
-            _apps.add(_app)
-        if _proj:
-            _projects.add(_proj)
-        if len(_sample) < 8:
-            _sample.append((_app, _proj, _matched_field))
+    for _i in _hit["rows"][:8]:
+        _app, _proj, _co = _index["rows"][_i]
+        _matched_field = next(
+            (_k for _k, _keys in _index["row_teams"][_i]
+             if _k.endswith("_team") and _keys & _want),
+            "",
+        )
+        _sample.append((_app, _proj, _matched_field))
     return {
-        "apps": sorted(_apps),
-        "projects": sorted(_projects),
+        "apps": _hit["apps"],
+        "projects": _hit["projects"],
         "sample": _sample,
     }
 
 
-@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def _load_team_applications(role: str, team: str) -> list[str]:
     """Return list of application names assigned to this team for this role."""
     return _resolve_inventory_by_teams(
@@ -13953,7 +14088,6 @@ def _fetch_devops_projects(apps_json: str) -> dict[str, dict]:
     return out
 
 
-@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def _load_projects_for_role_teams(role: str, teams: tuple[str, ...]) -> list[str]:
     """Return inventory projects where the role's team field(s) match any of ``teams``.
 
@@ -14156,7 +14290,6 @@ _user_shows_builds = (
 )
 
 
-@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def _load_apps_for_user_teams(team: str, fields_json: str) -> list[str]:
     """Apps where ANY of the user's role-team fields contains ``team``.
     ``fields_json`` is a JSON-encoded list because Streamlit's cache key
@@ -14166,7 +14299,6 @@ def _load_apps_for_user_teams(team: str, fields_json: str) -> list[str]:
         json.loads(fields_json), [team], "application.keyword")
 
 
-@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def _load_projects_for_user_teams(teams_json: str, fields_json: str) -> list[str]:
     """Projects where ANY of the user's role-team fields contains
     ANY team in ``teams_json``. Same JSON-encoded args pattern as
@@ -14195,6 +14327,9 @@ _user_fields_json = json.dumps(_user_team_fields)
 # agnostic) and reused for both `_team_apps` and `_scoped_projects` below, so
 # the two can't diverge. `_nonadmin_scope` is also surfaced in the diagnostic.
 _nonadmin_scope: dict = {"apps": [], "projects": [], "sample": []}
+# No team-scope index in this process yet (first run after a restart) —
+# checked again once the inventory loaders are defined.
+_team_scope_cold = _team_scope_store()["index"] is None
 if (not _is_admin) and _active_teams:
     _nonadmin_scope = _resolve_inventory_scope_for_teams(_active_teams)
 if team_filter:
@@ -15166,7 +15301,7 @@ def _integrations_health() -> list[dict]:
         })
     else:
         try:
-            status = _fetch_jenkins_status_raw()
+            status = _jenkins_status_shared()
             if status.get("ok"):
                 out.append({
                     "key": "jenkins", "label": "Jenkins", "glyph": "⚙",
@@ -19113,9 +19248,13 @@ def _render_sync_check_panel(scope_json: str) -> None:
             st.rerun()
     with _cc3:
         _ts = (diff.get("checked_at") or "").replace("T", " ")[:19]
+        _roots = diff.get("roots") or {}
         st.caption(
             f"comparison run at {_ts} UTC · result kept in session until "
-            f"cleared or re-run · scope mirrors every active filter"
+            f"cleared or re-run · scope mirrors every active filter · "
+            + (f"roots match ({(_roots.get('git') or '')[:10]})"
+               if _roots and _roots.get("git") == _roots.get("es")
+               else f"{diff.get('leaves_checked', 0):,} project leaves re-checked")
         )
 
     # ── Error-state shortcuts ──────────────────────────────────────────────
@@ -19372,7 +19511,8 @@ def _render_postgres_compare_panel(scope_json: str) -> None:
             '          <code>preprod_team</code> disagree, that\'s flagged '
             '          regardless of what Postgres says.</li>'
             '    </ul>'
-            '    One Postgres SELECT + one inventory aggregation per run. '
+            '    One Postgres digest query (full rows only for projects whose '
+            '    digests differ) + one inventory aggregation per run. '
             '    Gated so the rest of the page never pays this cost.'
             '  </div>'
             '</div>',
@@ -19438,7 +19578,8 @@ def _render_postgres_compare_panel(scope_json: str) -> None:
         _src = diff.get("inv_source") or "?"
         st.caption(
             f"comparison run at {_ts} UTC · inventory source: {_src} · "
-            f"Postgres table: {POSTGRES_TABLE}"
+            f"Postgres table: {POSTGRES_TABLE} · "
+            f"{diff.get('leaves_checked', 0):,} project leaves re-checked"
         )
 
     errors = diff.get("errors") or {}
@@ -19910,7 +20051,7 @@ def _render_jenkins_panel_active() -> None:
     with _ctrl1:
         if st.button("↻ Refresh now", key="_jk_refresh_now",
                      use_container_width=True):
-            _fetch_jenkins_status_raw.clear()
+            _jenkins_status_shared(force=True)
             st.rerun(scope="fragment")
     with _ctrl2:
         if st.button("⏸ Pause panel", key="_jk_pause",
@@ -19920,11 +20061,11 @@ def _render_jenkins_panel_active() -> None:
             st.rerun()
     with _ctrl3:
         st.caption(
-            f"auto-refresh every {JENKINS_TTL}s · cached server-side · "
+            f"auto-refresh every {JENKINS_TTL}s · one shared server-side poller · "
             f"all values via Jenkins REST API"
         )
 
-    status = _fetch_jenkins_status_raw()
+    status = _jenkins_status_shared()
 
     # ── Header row: connection state + queue ───────────────────────────────
     if status["ok"]:
@@ -20122,7 +20263,7 @@ def _render_jenkins_panel_active() -> None:
 #   - We persist the loaded scan in session state keyed on (app, version),
 #     so flipping tabs / scrolling doesn't redownload it.
 
-_PSV_LOADED_KEY = "_psv_loaded_v1"  # holds {"app": …, "ver": …, "html": …, "size": …, "key": …, "bucket": …, "region": …}
+_PSV_LOADED_KEY = "_psv_loaded_v1"  # holds {"app": …, "ver": …, "path": …, "size": …, "key": …, "bucket": …, "endpoint": …}
 
 
 def _psv_inventory_options() -> tuple[list[str], dict, dict]:
@@ -21115,6 +21256,47 @@ def _render_actions_tab() -> None:
                     st.rerun()
 
 
+def _render_prisma_scan_body(path: str, key: str, size: int,
+                             pager_key: str, height: int) -> None:
+    """Render a cached scan report from its on-disk blob.
+
+    The platform's PrismaCloudLog files are plain text — they're paged
+    (``PRISMA_SCAN_PAGE_BYTES`` of decoded text per page, snapped to line
+    boundaries) and each page is wrapped in a ``<pre>`` block inside a
+    sandboxed iframe so the parent page styles don't leak in. Only the page
+    on screen is decoded, so a multi-MB report costs one page of memory per
+    rerun instead of the whole blob. HTML reports (legacy) can't be split
+    without breaking their markup, so they still render whole via
+    components.v1.html."""
+    import streamlit.components.v1 as _components
+    _ext_lower = (key or "").lower()
+    if not (_ext_lower.endswith(".txt") or _ext_lower.endswith(".log")):
+        _components.html(_prisma_scan_read_all(path), height=height, scrolling=True)
+        return
+    _pages = _prisma_scan_page_count({"size": size})
+    _page = 0
+    if _pages > 1:
+        _page = int(st.number_input(
+            f"Page (of {_pages})", min_value=1, max_value=_pages, value=1,
+            step=1, key=pager_key,
+            help=f"Reports are shown {PRISMA_SCAN_PAGE_BYTES // 1024} KiB at a time",
+        )) - 1
+    _text = _prisma_scan_read_page(path, _page)
+    _wrapped = (
+        '<html><head><style>'
+        'html,body{margin:0;padding:0;background:#0d1117;'
+        'color:#c9d1d9;font-family:ui-monospace,SFMono-Regular,'
+        'Menlo,Monaco,Consolas,monospace;font-size:12.5px;'
+        'line-height:1.55}'
+        'pre{margin:0;padding:18px 22px;white-space:pre-wrap;'
+        'word-break:break-word;tab-size:4}'
+        '</style></head><body><pre>'
+        f'{html.escape(_text)}'
+        '</pre></body></html>'
+    )
+    _components.html(_wrapped, height=height, scrolling=True)
+
+
 def _render_prisma_inline_viewer() -> None:
     """Inline Prisma report panel rendered above the action toolbar.
 
@@ -21178,7 +21360,7 @@ def _render_prisma_inline_viewer() -> None:
         return
     _key = _prisma_scan_s3_key(_project, _app, _ver)
     with st.spinner(f"Downloading PrismaCloud report for {_app} @ {_ver}..."):
-        _html_doc, _size, _err = _fetch_prisma_scan_html(PRISMA_S3_BUCKET, _key)
+        _entry, _err = _fetch_prisma_scan(PRISMA_S3_BUCKET, _key)
     if _err:
         st.warning(
             f"Couldn't load `{_key}`: {_err}. The report may not exist for "
@@ -21190,7 +21372,7 @@ def _render_prisma_inline_viewer() -> None:
     )
     st.markdown(
         '<div class="iv-prisma-inline-meta">'
-        f'  <span><b>Size:</b> {(_size or 0)/1024:,.1f} KB</span>'
+        f'  <span><b>Size:</b> {(_entry.get("size") or 0)/1024:,.1f} KB</span>'
         f'  <span><b>Key:</b> <code>{html.escape(_key)}</code></span>'
         + (
             f'  <a class="ap-url" href="{html.escape(_viewer_url, quote=True)}" '
@@ -21201,7 +21383,8 @@ def _render_prisma_inline_viewer() -> None:
         unsafe_allow_html=True,
     )
     # Cap iframe height so the rest of the page stays reachable.
-    st.components.v1.html(_html_doc or "", height=600, scrolling=True)
+    _render_prisma_scan_body(_entry["path"], _key, _entry.get("size") or 0,
+                             "_psv_inline_page_v1", 600)
 
 
 def _render_jenkins_trigger_panel() -> None:
@@ -21522,13 +21705,14 @@ def _render_prisma_scan_viewer() -> None:
     s3_key = _prisma_scan_s3_key(project, app, version) if (app and version) else ""
 
     # Optional cache-bust + reset row
+    refresh = False
     if st.session_state.get(_PSV_LOADED_KEY):
         _r1, _r2, _r3 = st.columns([1, 1, 6])
         with _r1:
             if st.button("↻ Re-fetch", key="_psv_refetch_btn",
                          use_container_width=True,
-                         help="Bypasses the local cache for this scan"):
-                _fetch_prisma_scan_html.clear()
+                         help="Re-checks S3 and re-downloads this scan if it changed"):
+                refresh = True
                 load = True  # fall through into the fetch block below
         with _r2:
             if st.button("✕ Clear", key="_psv_clear_btn",
@@ -21539,8 +21723,8 @@ def _render_prisma_scan_viewer() -> None:
 
     # ── Fetch on demand ────────────────────────────────────────────────────
     if load and app and version:
-        html_doc, size, err = _fetch_prisma_scan_html(
-            PRISMA_S3_BUCKET, s3_key,
+        entry, err = _fetch_prisma_scan(
+            PRISMA_S3_BUCKET, s3_key, refresh=refresh,
         )
         if err:
             inline_note(
@@ -21553,8 +21737,8 @@ def _render_prisma_scan_viewer() -> None:
                 "app":      app,
                 "ver":      version,
                 "project":  project,
-                "html":     html_doc,
-                "size":     size,
+                "path":     entry["path"],
+                "size":     entry.get("size") or 0,
                 "key":      s3_key,
                 "bucket":   PRISMA_S3_BUCKET,
                 "endpoint": s3_endpoint,
@@ -21620,32 +21804,17 @@ def _render_prisma_scan_viewer() -> None:
         unsafe_allow_html=True,
     )
 
-    # Render branch depends on the source object's extension. The
-    # platform's PrismaCloudLog files are plain text — we wrap them in a
-    # <pre> block inside a sandboxed iframe so the parent page styles
-    # don't leak in, and the text gets the same monospace + scrolling
-    # treatment regardless of length. HTML reports (legacy) still render
-    # as-is via components.v1.html.
-    _content = loaded.get("html") or ""
-    _ext_lower = (loaded.get("key") or "").lower()
+    # The blob may have been LRU-evicted since this session loaded it —
+    # resolve it again (a no-op cache hit in the common case).
+    if not os.path.isfile(loaded.get("path") or ""):
+        _entry, _err = _fetch_prisma_scan(loaded["bucket"], loaded["key"])
+        if _err:
+            inline_note(f"Couldn't reload `{loaded['key']}`: {_err}", "warning")
+            return
+        loaded["path"] = _entry["path"]
     try:
-        import streamlit.components.v1 as _components
-        if _ext_lower.endswith(".txt") or _ext_lower.endswith(".log"):
-            _wrapped = (
-                '<html><head><style>'
-                'html,body{margin:0;padding:0;background:#0d1117;'
-                'color:#c9d1d9;font-family:ui-monospace,SFMono-Regular,'
-                'Menlo,Monaco,Consolas,monospace;font-size:12.5px;'
-                'line-height:1.55}'
-                'pre{margin:0;padding:18px 22px;white-space:pre-wrap;'
-                'word-break:break-word;tab-size:4}'
-                '</style></head><body><pre>'
-                f'{html.escape(_content)}'
-                '</pre></body></html>'
-            )
-            _components.html(_wrapped, height=900, scrolling=True)
-        else:
-            _components.html(_content, height=900, scrolling=True)
+        _render_prisma_scan_body(loaded["path"], loaded.get("key") or "",
+                                 loaded.get("size") or 0, "_psv_page_v1", 900)
     except Exception as e:
         inline_note(
             f"Failed to render the scan iframe: {type(e).__name__}: {e}",
@@ -26739,13 +26908,10 @@ def _inv_source_pref() -> str:
     return pref if pref in ("auto", "git", "es") else "auto"
 
 
-def _load_inventory_from_git_scoped(scope_json: str) -> tuple[list[dict], str, str, list[str]]:
-    """Run the git inventory pipeline end-to-end (clone + parse + scope
-    filter + author sync). Returns ``(rows, status_msg, head_sha, warnings)``
-    where an empty ``head_sha`` indicates a hard failure (vault / clone /
-    yaml). Centralised so :func:`_inventory_load` and
-    :func:`_inventory_compare` share the same code path."""
-    warnings: list[str] = []
+def _inventory_git_head(warnings: list[str]) -> tuple[str, str]:
+    """Resolve the vault host and sync the inventories clone. Returns
+    ``(head_sha, status_msg)``; an empty ``head_sha`` is a hard failure
+    (vault / clone) and *warnings* gains the admin-facing reason."""
     creds = _git_creds()
     host = creds["hostname"]
     if not host:
@@ -26754,10 +26920,23 @@ def _load_inventory_from_git_scoped(scope_json: str) -> tuple[list[dict], str, s
             f"Git host not resolved from vault `{GIT_VAULT_PATH}`"
             + (f": {v_err}" if v_err else "")
         )
-        return [], "host unresolved", "", warnings
+        return "", "host unresolved"
     ok, head, status_msg = _ensure_inventory_repo(host)
     if not ok:
-        return [], status_msg or "git unavailable", "", warnings
+        return "", status_msg or "git unavailable"
+    return head, status_msg
+
+
+def _load_inventory_from_git_scoped(scope_json: str) -> tuple[list[dict], str, str, list[str]]:
+    """Run the git inventory pipeline end-to-end (clone + parse + scope
+    filter + author sync). Returns ``(rows, status_msg, head_sha, warnings)``
+    where an empty ``head_sha`` indicates a hard failure (vault / clone /
+    yaml). Centralised so :func:`_inventory_load` and
+    :func:`_inventory_compare` share the same code path."""
+    warnings: list[str] = []
+    head, status_msg = _inventory_git_head(warnings)
+    if not head:
+        return [], status_msg, "", warnings
     # Sync git author identity on every successful sync.
     _git_set_author(
         INVENTORY_REPO_PATH,
@@ -26878,32 +27057,180 @@ def _inv_teams_norm(t: Any) -> dict[str, tuple[str, ...]]:
     return out
 
 
+# ── Merkle digests ─────────────────────────────────────────────────────────
+# Each side of a sync check is summarised as a two-level hash tree:
+# leaves are (company, project) digests, their parents are per-company
+# digests, and the root covers the whole scoped source. A comparison swaps
+# roots first — equal roots mean "in sync" without touching a single row —
+# and otherwise walks down only the companies whose digests differ,
+# handing just the mismatched leaves to the row-level diff. Leaf digests are
+# built from the SAME normalised values the field diff compares, so equal
+# digests can never hide a reported discrepancy; an unequal digest that
+# turns out to be cosmetic simply costs one leaf's worth of row diffing.
+#
+# The git tree is a pure function of (HEAD, vault fingerprint, scope), so
+# it's persisted as JSON next to the clone and survives restarts; the ES
+# tree is memoised for CACHE_TTL like the rows it's built from.
+_INV_MERKLE_DIR = os.path.join(CICD_REPO_BASE, ".inventory-merkle")
+
+
+def _merkle_digest(parts: Any) -> str:
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(str(p).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _merkle_tree(leaves: dict[tuple[str, str], tuple[str, int]]) -> dict:
+    """Fold ``{(company, project): (leaf_digest, n_items)}`` into the
+    JSON-friendly tree the comparators exchange::
+
+        {"root": h, "n": total,
+         "companies": {co: {"hash": h, "projects": {pj: [h, n]}}}}
+    """
+    companies: dict[str, dict] = {}
+    for (co, pj), (h, n) in leaves.items():
+        companies.setdefault(co, {"projects": {}})["projects"][pj] = [h, n]
+    for co, node in companies.items():
+        node["hash"] = _merkle_digest(
+            f"{pj}={node['projects'][pj][0]}" for pj in sorted(node["projects"]))
+    return {
+        "root": _merkle_digest(f"{co}={companies[co]['hash']}" for co in sorted(companies)),
+        "n": sum(n for _h, n in leaves.values()),
+        "companies": companies,
+    }
+
+
+def _merkle_mismatches(a: dict, b: dict) -> set[tuple[str, str]]:
+    """Leaves whose digests differ between two trees (present on only one
+    side counts as differing). Equal roots short-circuit to ``set()``;
+    equal company digests skip that company's leaves entirely."""
+    if a.get("root") == b.get("root"):
+        return set()
+    out: set[tuple[str, str]] = set()
+    ca, cb = a.get("companies") or {}, b.get("companies") or {}
+    for co in set(ca) | set(cb):
+        na, nb = ca.get(co) or {}, cb.get(co) or {}
+        if na.get("hash") and na.get("hash") == nb.get("hash"):
+            continue
+        pa, pb = na.get("projects") or {}, nb.get("projects") or {}
+        for pj in set(pa) | set(pb):
+            if (pa.get(pj) or [None])[0] != (pb.get(pj) or [None])[0]:
+                out.add((co, pj))
+    return out
+
+
+def _inv_leaf_key(row: dict) -> tuple[str, str]:
+    return _inv_norm(row.get("company")), _inv_norm(row.get("project"))
+
+
+def _inv_app_digest(app: str, row: dict) -> str:
+    """Digest of exactly what :func:`_inventory_compare` diffs for one app."""
+    teams = _inv_teams_norm(row.get("teams"))
+    return _merkle_digest(
+        [app]
+        + [_inv_norm(row.get(f)) for f in _INV_COMPARE_FIELDS]
+        + [f"{k}={','.join(teams[k])}" for k in sorted(teams)]
+    )
+
+
+def _inv_by_app(rows: list[dict]) -> dict[str, dict]:
+    return {r["application"]: r for r in rows if r.get("application")}
+
+
+def _inv_merkle_from_rows(rows: list[dict]) -> dict:
+    """Git-vs-ES tree for one side: a leaf per (company, project) over the
+    per-app digests of the apps filed under it."""
+    grouped: dict[tuple[str, str], list[str]] = {}
+    for app, r in _inv_by_app(rows).items():
+        grouped.setdefault(_inv_leaf_key(r), []).append(_inv_app_digest(app, r))
+    return _merkle_tree({k: (_merkle_digest(sorted(v)), len(v)) for k, v in grouped.items()})
+
+
+def _inventory_git_merkle(head: str, scope_json: str, rows_fn) -> dict:
+    """Git-side tree for ``scope_json`` at ``head``, read from the on-disk
+    copy when one exists. ``rows_fn`` is only called (to parse the
+    checkout) on a miss."""
+    name = "-".join((
+        head, _vault_pw_fingerprint() or "nopw",
+        hashlib.sha1((scope_json or "").encode("utf-8")).hexdigest()[:16],
+    )) + ".json"
+    path = os.path.join(_INV_MERKLE_DIR, name)
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        pass
+    tree = _inv_merkle_from_rows(rows_fn())
+    try:
+        os.makedirs(_INV_MERKLE_DIR, exist_ok=True)
+        with open(path + ".part", "w", encoding="utf-8") as fh:
+            json.dump(tree, fh)
+        os.replace(path + ".part", path)
+    except OSError:
+        pass  # read-only base dir — tree still serves this call
+    return tree
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _inventory_es_merkle(scope_json: str) -> dict:
+    """ES-side tree, memoised alongside :func:`_fetch_full_inventory`."""
+    return _inv_merkle_from_rows(_fetch_full_inventory(scope_json))
+
+
 def _inventory_compare(scope_json: str) -> dict:
     """Fetch from BOTH git and ES then compute a per-app discrepancy report.
 
-    Pure computation on top of cached fetchers — both sides hit
-    ``@st.cache_data``-memoised results, so calling this is cheap once the
-    individual loaders are warm. Returns ``{"errors": {...}, "git_total":
-    int, "es_total": int, "common": int, "only_in_git": [...],
-    "only_in_es": [...], "field_diffs": [...]}``."""
+    Hash-first: both sides' Merkle trees are compared before any rows are
+    touched. Equal roots return a clean report straight away (the git side
+    doesn't even re-parse the checkout when its tree is on disk); otherwise
+    only the apps under mismatched (company, project) leaves are diffed
+    field by field. Returns ``{"errors": {...}, "git_total": int,
+    "es_total": int, "common": int, "only_in_git": [...], "only_in_es":
+    [...], "field_diffs": [...], "roots": {"git", "es"}, "leaves_checked":
+    int}``."""
     errors: dict[str, str] = {"git": "", "es": ""}
+    git_warnings: list[str] = []
+    _git_loaded: list = []
+
+    def _git_rows() -> list[dict]:
+        if not _git_loaded:
+            rows, status, _head, warns = _load_inventory_from_git_scoped(scope_json)
+            git_warnings[:] = warns
+            if not rows:
+                errors["git"] = status or "no git rows"
+            _git_loaded.append(rows)
+        return _git_loaded[0]
 
     # ── Git side ───────────────────────────────────────────────────────────
-    git_rows, git_status, _head, git_warnings = _load_inventory_from_git_scoped(scope_json)
-    if not git_rows:
-        errors["git"] = git_status or "no git rows"
+    head, git_status = _inventory_git_head(git_warnings)
+    if head and _YAML_AVAILABLE:
+        git_tree = _inventory_git_merkle(head, scope_json, _git_rows)
+        if not git_tree["n"]:
+            _git_rows()  # surface the loader's own status / warnings
+    else:
+        git_tree = _merkle_tree({})
+        errors["git"] = git_status if not head else "PyYAML missing"
 
     # ── ES side ────────────────────────────────────────────────────────────
     try:
-        es_rows = _fetch_full_inventory(scope_json)
+        es_tree = _inventory_es_merkle(scope_json)
     except Exception as e:
-        es_rows = []
+        es_tree = _merkle_tree({})
         errors["es"] = f"{type(e).__name__}: {e}"
-    if not es_rows and not errors["es"]:
+    if not es_tree["n"] and not errors["es"]:
         errors["es"] = "no es rows"
 
-    git_by_app = {r["application"]: r for r in git_rows if r.get("application")}
-    es_by_app  = {r["application"]: r for r in es_rows  if r.get("application")}
+    # ── Row-level diff, restricted to mismatched leaves ───────────────────
+    mismatched = _merkle_mismatches(git_tree, es_tree)
+    git_by_app: dict[str, dict] = {}
+    es_by_app: dict[str, dict] = {}
+    if mismatched:
+        git_by_app = {a: r for a, r in _inv_by_app(_git_rows() if git_tree["n"] else []).items()
+                      if _inv_leaf_key(r) in mismatched}
+        es_by_app = {a: r for a, r in _inv_by_app(_fetch_full_inventory(scope_json)).items()
+                     if _inv_leaf_key(r) in mismatched}
 
     only_in_git = sorted(set(git_by_app) - set(es_by_app), key=str.lower)
     only_in_es  = sorted(set(es_by_app) - set(git_by_app),  key=str.lower)
@@ -26944,13 +27271,16 @@ def _inventory_compare(scope_json: str) -> dict:
 
     return {
         "errors":       errors,
-        "git_total":    len(git_by_app),
-        "es_total":     len(es_by_app),
-        "common":       len(common),
+        "git_total":    git_tree["n"],
+        "es_total":     es_tree["n"],
+        # Apps under matched leaves are in both sides by construction.
+        "common":       git_tree["n"] - len(only_in_git),
         "only_in_git":  only_in_git,
         "only_in_es":   only_in_es,
         "field_diffs":  field_diffs,
         "warnings":     git_warnings,
+        "roots":        {"git": git_tree["root"], "es": es_tree["root"]},
+        "leaves_checked": len(mismatched),
         "checked_at":   datetime.now(timezone.utc).isoformat(),
     }
 
@@ -27056,10 +27386,112 @@ def _team_set_norm(values: list[str] | str | None) -> tuple[str, ...]:
     return ()
 
 
+# Postgres-side leaf digest, computed server-side so the "in sync?" check
+# ships one short hash per (company, project) instead of the whole table.
+# Must stay byte-for-byte in step with :func:`_pg_leaf_digest`.
+_PG_TEAM_NORM_SQL = "lower(btrim(coalesce({c}::text, ''), E' \\t\\r\\n'))"
+_PG_LEAF_DIGEST_SQL = "md5(concat_ws(chr(31), {}, {}, {}))".format(
+    *(_PG_TEAM_NORM_SQL.format(c=c) for c in ("dev_team", "qc_team", "ops_team")))
+
+
+def _pg_leaf_digest(dev: Any, qc: Any, ops: Any, ops_inconsistent: bool = False) -> str:
+    """Python twin of ``_PG_LEAF_DIGEST_SQL`` over :func:`_team_set_norm`
+    values. An inventory-side ops inconsistency is folded in so that leaf
+    never matches Postgres — it's reported even when the teams agree."""
+    digest = hashlib.md5("\x1f".join(
+        "\x1e".join(_team_set_norm(v)) for v in (dev, qc, ops)
+    ).encode("utf-8")).hexdigest()
+    return digest + "!" if ops_inconsistent else digest
+
+
+def _pg_safe_table() -> str:
+    safe_table = POSTGRES_TABLE.strip()
+    if not all(c.isalnum() or c in "_." for c in safe_table):
+        raise RuntimeError(f"refusing unsafe table identifier: {safe_table!r}")
+    return safe_table
+
+
+@st.cache_data(ttl=POSTGRES_DATA_TTL, show_spinner=False)
+def _fetch_devops_projects_merkle() -> tuple[dict, str]:
+    """Merkle tree over ``devops_projects`` built from per-row digests the
+    database computes itself. Returns ``(tree, error)``. Duplicate
+    (company, project) rows that disagree get a sentinel digest so the
+    leaf is always re-checked at row level."""
+    if not _POSTGRES_AVAILABLE:
+        return _merkle_tree({}), "psycopg / psycopg2 not installed"
+    conn = None
+    try:
+        conn = _pg_connect_rw()
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT btrim(coalesce(company::text, '')), "
+            f"       btrim(coalesce(project::text, '')), {_PG_LEAF_DIGEST_SQL} "
+            f"FROM {_pg_safe_table()}"
+        )
+        leaves: dict[tuple[str, str], tuple[str, int]] = {}
+        for co, pj, digest in cur.fetchall():
+            prev = leaves.get((co, pj))
+            leaves[(co, pj)] = (digest if not prev or prev[0] == digest else "dup", 1)
+        cur.close()
+        return _merkle_tree(leaves), ""
+    except Exception as e:
+        return _merkle_tree({}), f"{type(e).__name__}: {e}"
+    finally:
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def _fetch_devops_projects_for(keys: set[tuple[str, str]]) -> tuple[list[dict], str]:
+    """Full ``devops_projects`` rows for just *keys* — the leaves a Merkle
+    comparison flagged. Same row shape as
+    :func:`_fetch_devops_projects_from_postgres`."""
+    if not keys:
+        return [], ""
+    conn = None
+    try:
+        conn = _pg_connect_rw()
+        cur = conn.cursor()
+        cos, pjs = zip(*sorted(keys))
+        cur.execute(
+            f"SELECT company, project, dev_team, qc_team, ops_team "
+            f"FROM {_pg_safe_table()} "
+            f"WHERE (btrim(coalesce(company::text, '')), btrim(coalesce(project::text, ''))) "
+            f"   IN (SELECT * FROM unnest(%s::text[], %s::text[]))",
+            (list(cos), list(pjs)),
+        )
+        rows_raw = cur.fetchall()
+        cur.close()
+        return [
+            {
+                "company":  (str(r[0]) if r[0] is not None else "").strip(),
+                "project":  (str(r[1]) if r[1] is not None else "").strip(),
+                "dev_team": (str(r[2]) if r[2] is not None else "").strip(),
+                "qc_team":  (str(r[3]) if r[3] is not None else "").strip(),
+                "ops_team": (str(r[4]) if r[4] is not None else "").strip(),
+            }
+            for r in rows_raw
+        ], ""
+    except Exception as e:
+        return [], f"{type(e).__name__}: {e}"
+    finally:
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
 def _inventory_vs_postgres_compare(scope_json: str) -> dict:
     """Compare the inventory (in scope) against the Postgres
     ``devops_projects`` table at the (company, project) granularity.
 
+    Hash-first like :func:`_inventory_compare`: the database returns one
+    digest per row, and full rows are fetched only for the (company,
+    project) leaves whose digests disagree with the inventory's.
+
     Returns a structured diff:
 
         {
@@ -27091,12 +27523,25 @@ def _inventory_vs_postgres_compare(scope_json: str) -> dict:
     if not inv_rows:
         errors["inventory"] = inv_status or f"no inventory rows ({inv_source})"
 
-    # ── Postgres side
-    pg_rows, pg_err = _fetch_devops_projects_from_postgres()
+    inv_by_proj = _aggregate_inv_by_project(inv_rows)
+    inv_tree = _merkle_tree({
+        k: (_pg_leaf_digest(v["dev_team"], v["qc_team"], v["ops_union"],
+                            v["ops_inconsistent"]), 1)
+        for k, v in inv_by_proj.items()
+    })
+
+    # ── Postgres side — digests first, full rows only where they disagree
+    pg_tree, pg_err = _fetch_devops_projects_merkle()
+    pg_rows: list[dict] = []
+    if pg_err:
+        mismatched = set(inv_by_proj)
+    else:
+        mismatched = _merkle_mismatches(inv_tree, pg_tree)
+        if mismatched:
+            pg_rows, pg_err = _fetch_devops_projects_for(mismatched)
     if pg_err:
         errors["postgres"] = pg_err
 
-    inv_by_proj = _aggregate_inv_by_project(inv_rows)
     pg_by_proj: dict[tuple[str, str], dict] = {}
     for r in pg_rows:
         key = (r["company"], r["project"])
@@ -27104,7 +27549,9 @@ def _inventory_vs_postgres_compare(scope_json: str) -> dict:
         # be a data quality issue but we tolerate by last-wins.
         pg_by_proj[key] = r
 
-    inv_keys = set(inv_by_proj.keys())
+    # Matched leaves are in both sides and agree, so only the mismatched
+    # ones can land in any of the three buckets below.
+    inv_keys = set(inv_by_proj.keys()) & mismatched
     pg_keys = set(pg_by_proj.keys())
 
     only_in_inv = sorted(inv_keys - pg_keys, key=lambda k: (k[0].lower(), k[1].lower()))
@@ -27166,13 +27613,15 @@ def _inventory_vs_postgres_compare(scope_json: str) -> dict:
 
     return {
         "errors":      errors,
-        "inv_total":   len(inv_keys),
-        "pg_total":    len(pg_keys),
-        "common":      len(common),
+        "inv_total":   len(inv_by_proj),
+        "pg_total":    pg_tree["n"],
+        "common":      len(inv_by_proj) - len(only_in_inv),
         "only_in_inv": only_in_inv_out,
         "only_in_pg":  only_in_pg_out,
         "diffs":       diffs,
         "inv_source":  inv_source,
+        "roots":       {"inventory": inv_tree["root"], "postgres": pg_tree["root"]},
+        "leaves_checked": len(mismatched),
         "checked_at":  datetime.now(timezone.utc).isoformat(),
     }
 
@@ -27567,6 +28016,14 @@ def _ldap_db_load_users() -> dict:
                 pass
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _ldap_db_users_by_email() -> dict:
+    """``{email_lower: row}`` view of :func:`_ldap_db_load_users` for
+    resolving ES identities (keyed on email) without a live lookup."""
+    return {u["email"]: u for u in (_ldap_db_load_users() or {}).values()
+            if u.get("email")}
+
+
 @st.cache_data(ttl=60, show_spinner=False)
 def _ldap_db_load_team_members() -> dict:
     """Cached read of ldap_team_members. Returns
@@ -29026,10 +29483,9 @@ def _prisma_s3_status() -> dict:
 # JENKINS API — read-only status surface
 # =============================================================================
 # Tiny urllib-based client (no extra dependency). All endpoints used:
-#   /api/json                                — root probe + queue size
-#   /job/{folder}/job/{name}/api/json        — pipeline metadata
-#   /job/{folder}/job/{name}/lastBuild/api/json
-#   /job/{folder}/job/{name}/lastCompletedBuild/api/json
+#   /job/<folder>/api/json?tree=...          — health probe + every pipeline
+#   /queue/api/json                          — queue size
+#   /updateCenter/site/default/api/json      — latest core (every few hours)
 # We deliberately DON'T call wfapi or sse endpoints — the cost/value of
 # in-flight stage detail is not worth a second round-trip from the panel.
 
@@ -29041,13 +29497,15 @@ def _jenkins_path_segments(path: str) -> str:
     return "/" + "/".join("job/" + p for p in parts)
 
 
-def _jenkins_request_full(url: str) -> tuple[Any, dict]:
+def _jenkins_request_full(url: str, creds: dict | None = None) -> tuple[Any, dict]:
     """Run a Jenkins GET with optional Basic auth. Returns ``(body, headers)``
     where headers is a plain ``dict`` (case-insensitive lookups handled by
     callers via ``.lower()`` keys). Raises ``RuntimeError`` on any HTTP /
     network / decode failure with a distinguishable phrase so the panel
-    can label them precisely."""
-    creds = _jenkins_creds()
+    can label them precisely. ``creds`` lets the background poller pass
+    credentials resolved on a script thread (vault reads touch
+    ``st.session_state``)."""
+    creds = creds if creds is not None else _jenkins_creds()
     req = urllib.request.Request(url, method="GET")
     req.add_header("Accept", "application/json")
     if creds["username"] and creds["token"]:
@@ -29070,10 +29528,10 @@ def _jenkins_request_full(url: str) -> tuple[Any, dict]:
         raise RuntimeError("non-JSON response from Jenkins")
 
 
-def _jenkins_request(url: str) -> Any:
-    """Body-only variant kept for the per-pipeline calls that don't need
-    headers — keeps those callsites tidy."""
-    body, _ = _jenkins_request_full(url)
+def _jenkins_request(url: str, creds: dict | None = None) -> Any:
+    """Body-only variant kept for the callsites that don't need headers —
+    keeps those callsites tidy."""
+    body, _ = _jenkins_request_full(url, creds)
     return body
 
 
@@ -29195,10 +29653,10 @@ def _jk_compare_versions(running: str, latest: str) -> str:
     return "outdated" if _jk_version_tuple(running) < _jk_version_tuple(latest) else "current"
 
 
-def _jenkins_root_url() -> str:
+def _jenkins_root_url(creds: dict | None = None) -> str:
     """Normalise the resolved host into a fully-qualified URL. The vault
     entry MAY include a scheme; if not, we assume HTTPS."""
-    h = (_jenkins_creds().get("host") or "").strip()
+    h = ((creds if creds is not None else _jenkins_creds()).get("host") or "").strip()
     if not h:
         return ""
     if not h.startswith(("http://", "https://")):
@@ -29228,8 +29686,8 @@ def _jenkins_extract_params(actions: list) -> dict:
 
 
 def _jenkins_extract_running_builds(job_data: dict) -> list[dict]:
-    """``builds`` from /job/.../api/json contains the most-recent N builds;
-    we filter to those still in progress and return their parameter sets."""
+    """``builds`` on a job node contains the most-recent N builds; we
+    filter to those still in progress and return their parameter sets."""
     out: list[dict] = []
     for b in job_data.get("builds") or []:
         if not isinstance(b, dict):
@@ -29246,13 +29704,126 @@ def _jenkins_extract_running_builds(job_data: dict) -> list[dict]:
     return out
 
 
-@st.cache_data(ttl=JENKINS_TTL, show_spinner=False)
-def _fetch_jenkins_status_raw() -> dict:
-    """One-shot status fetch for the Jenkins panel. Returns a plain dict
-    (so ``@st.cache_data`` can pickle it safely):
+# Every pipeline's state comes back from ONE ``tree=``-scoped call on the
+# deepest folder holding all configured pipelines (``/job/CICD/api/json``),
+# so Jenkins only walks that folder rather than every top-level item. The
+# tree nests ``jobs[...]`` down to the deepest pipeline path and only asks
+# for the handful of fields the cards render (plus the newest
+# JENKINS_BUILDS_WINDOW builds). The same response carries the
+# ``X-Jenkins`` version header, so the old root probe is folded in too;
+# only the queue depth needs a second call. The
+# update-center "latest core" lookup changes on a release cadence, so it
+# is re-checked every JENKINS_VERSION_TTL rather than every poll.
+_JK_BUILD_FIELDS = (
+    "number,building,timestamp,duration,estimatedDuration,url,"
+    "actions[parameters[name,value]]"
+)
+_JK_LAST_FIELDS = (
+    "number,result,timestamp,duration,url,displayName,"
+    "actions[parameters[name,value]]"
+)
+_JK_JOB_FIELDS = (
+    f"buildable,color,inQueue,"
+    f"builds[{_JK_BUILD_FIELDS}]{{0,{JENKINS_BUILDS_WINDOW}}},"
+    f"lastCompletedBuild[{_JK_LAST_FIELDS}]"
+)
+
+
+def _jenkins_status_scope(paths: list[str]) -> tuple[str, list[str]]:
+    """Split pipeline paths into the deepest folder containing all of them
+    and each path relative to it: ``["CICD/Build", "CICD/Request_deploy"]``
+    → ``("CICD", ["Build", "Request_deploy"])``. The folder is ``""`` when
+    the pipelines share none (or one sits at the root)."""
+    split = [[seg for seg in p.split("/") if seg] for p in paths]
+    folder: list[str] = []
+    # A pipeline's own name is never part of the folder.
+    for level in zip(*(parts[:-1] for parts in split)):
+        if len(set(level)) != 1:
+            break
+        folder.append(level[0])
+    return "/".join(folder), ["/".join(parts[len(folder):]) for parts in split]
+
+
+def _jenkins_status_tree(paths: list[str], at_root: bool = True) -> str:
+    """Build the ``tree=`` spec reaching every pipeline path (relative to
+    the queried folder). Jenkins can't filter ``jobs`` by name, so each
+    nesting level only carries the job fields when some configured
+    pipeline actually lives that deep. ``mode`` only exists on the root."""
+    split = [[seg for seg in p.split("/") if seg] for p in paths]
+    depths = {len(parts) for parts in split if parts}
+    max_depth = max(depths, default=0)
+
+    def _level(d: int) -> str:
+        spec = "name"
+        if d in depths:
+            spec += "," + _JK_JOB_FIELDS
+        if d < max_depth:
+            spec += f",jobs[{_level(d + 1)}]"
+        return spec
+
+    tree = "mode,nodeName" if at_root else "name"
+    if max_depth:
+        tree += f",jobs[{_level(1)}]"
+    return tree
+
+
+def _jenkins_find_job(root_data: dict, path: str) -> dict | None:
+    """Walk the nested ``jobs`` lists of a tree response down ``path``."""
+    node: dict | None = root_data
+    for seg in (s for s in path.split("/") if s):
+        node = next(
+            (j for j in (node or {}).get("jobs") or []
+             if isinstance(j, dict) and j.get("name") == seg),
+            None,
+        )
+        if node is None:
+            return None
+    return node
+
+
+def _jenkins_latest_core(root: str, creds: dict, cache: dict) -> tuple[str, str]:
+    """Latest core version advertised by the configured update site, as
+    ``(version, error)``. Memoised in ``cache`` (the poller's state) for
+    JENKINS_VERSION_TTL per root URL. This may fail on air-gapped
+    instances or fresh installs that haven't refreshed their update sites
+    yet — failures are remembered for the same window so a dead update
+    site isn't re-probed every poll."""
+    now = time.monotonic()
+    if cache.get("root") == root and now - cache.get("at", -1e9) < JENKINS_VERSION_TTL:
+        return cache.get("latest", ""), cache.get("error", "")
+    latest, err = "", ""
+    try:
+        uc = _jenkins_request(
+            f"{root}/updateCenter/site/default/api/json"
+            f"?tree=data[core[name,version,buildDate]]",
+            creds,
+        )
+        core = (((uc or {}).get("data") or {}).get("core") or {})
+        latest = (core.get("version") or "").strip()
+    except RuntimeError as e:
+        err = str(e)
+    except Exception as e:
+        err = f"{type(e).__name__}: {e}"
+    cache.update({"root": root, "latest": latest, "error": err, "at": now})
+    return latest, err
+
+
+def _jenkins_version_blank() -> dict:
+    """The snapshot's ``version`` block before anything has been probed."""
+    return {
+        "running":     "",   # X-Jenkins header from the status call
+        "latest":      "",   # latest core advertised by /updateCenter
+        "compare":     "unknown",   # current / outdated / unknown
+        "check_error": "",   # populated if the update-center probe failed
+    }
+
+
+def _fetch_jenkins_status_raw(creds: dict | None = None,
+                              version_cache: dict | None = None) -> dict:
+    """One-shot status fetch for the Jenkins panel. Returns a plain dict:
 
         {
-          "ok":            bool,            # root probe succeeded
+          "ok":            bool,            # status call succeeded
           "status_msg":    str,             # human-readable health line
           "url":           str,             # configured hostname
           "queue_size":    int,
@@ -29269,8 +29840,11 @@ def _fetch_jenkins_status_raw() -> dict:
               ...
           },
         }
+
+    Not cached itself — callers go through :func:`_jenkins_status_shared`,
+    which serves one process-wide snapshot kept fresh by the poller.
     """
-    creds = _jenkins_creds()
+    creds = creds if creds is not None else _jenkins_creds()
     out: dict[str, Any] = {
         "ok": False,
         "status_msg": "",
@@ -29281,87 +29855,68 @@ def _fetch_jenkins_status_raw() -> dict:
         "pipelines": {},
         # Version telemetry — admin-only in the UI even when the wider
         # panel eventually opens up to other roles.
-        "version": {
-            "running":     "",   # X-Jenkins header from the root probe
-            "latest":      "",   # latest core advertised by /updateCenter
-            "compare":     "unknown",   # current / outdated / unknown
-            "check_error": "",   # populated if the update-center probe failed
-        },
+        "version": _jenkins_version_blank(),
     }
-    root = _jenkins_root_url()
+    root = _jenkins_root_url(creds)
     if not root:
         out["status_msg"] = (
             "Jenkins host not resolved — check vault path "
             f"`{JENKINS_VAULT_PATH}` or env JENKINS_HOSTNAME"
         )
         return out
-    # Root probe — ALSO yields the queue depth + the running version
-    # (Jenkins always sets X-Jenkins on /api/json regardless of auth state).
+    # Health probe + every pipeline in one round-trip on their common
+    # folder. Jenkins always sets X-Jenkins on /api/json regardless of
+    # auth state.
+    keys = list(JENKINS_PIPELINES)
+    folder, rel_paths = _jenkins_status_scope([JENKINS_PIPELINES[k]["path"] for k in keys])
+    rel_path = dict(zip(keys, rel_paths))
+    tree = _jenkins_status_tree(rel_paths, at_root=not folder)
+    base = root + (_jenkins_path_segments(folder) if folder else "")
     try:
         root_data, root_headers = _jenkins_request_full(
-            f"{root}/api/json?tree=mode,nodeName"
+            f"{base}/api/json?tree={urllib.parse.quote(tree, safe=',[]{}')}",
+            creds,
         )
         out["version"]["running"] = (
             (root_headers.get("x-jenkins") or "").strip()
         )
         # Queue depth: light secondary call; if it fails, we still report ok.
         try:
-            q = _jenkins_request(f"{root}/queue/api/json?tree=items[id]")
+            q = _jenkins_request(f"{root}/queue/api/json?tree=items[id]", creds)
             out["queue_size"] = len(q.get("items") or [])
         except Exception:
             pass
         out["ok"] = True
-        out["status_msg"] = (
-            f"connected · {root_data.get('mode','?')} · queue {out['queue_size']}"
-        )
+        mode = f"{root_data['mode']} · " if root_data.get("mode") else ""
+        out["status_msg"] = f"connected · {mode}queue {out['queue_size']}"
     except RuntimeError as e:
         out["status_msg"] = str(e)
         return out
 
-    # Latest-core probe via the configured update site. This may fail on
-    # air-gapped instances or fresh installs that haven't refreshed their
-    # update sites yet — we record the failure reason but keep the rest of
-    # the panel rendering normally.
-    try:
-        uc = _jenkins_request(
-            f"{root}/updateCenter/site/default/api/json"
-            f"?tree=data[core[name,version,buildDate]]"
-        )
-        core = (((uc or {}).get("data") or {}).get("core") or {})
-        out["version"]["latest"] = (core.get("version") or "").strip()
-    except RuntimeError as e:
-        out["version"]["check_error"] = str(e)
-    except Exception as e:
-        out["version"]["check_error"] = f"{type(e).__name__}: {e}"
+    out["version"]["latest"], out["version"]["check_error"] = _jenkins_latest_core(
+        root, creds, version_cache if version_cache is not None else {}
+    )
     out["version"]["compare"] = _jk_compare_versions(
         out["version"]["running"], out["version"]["latest"]
     )
 
-    # Per-pipeline metadata + last build + in-flight builds. Fetched in
-    # parallel because every call is an independent HTTP round-trip.
-    def _pipeline_status(key: str, cfg: dict) -> tuple[str, dict]:
-        seg = _jenkins_path_segments(cfg["path"])
+    for key, cfg in JENKINS_PIPELINES.items():
         pdata: dict[str, Any] = {
             "exists": False, "buildable": False, "color": "",
             "last_build": None, "running": [], "error": "",
         }
-        try:
-            job = _jenkins_request(
-                f"{root}{seg}/api/json"
-                f"?tree=buildable,color,inQueue,builds[number,building,timestamp,duration,estimatedDuration,url,actions[parameters[name,value]]]"
-            )
-            pdata["exists"] = True
-            pdata["buildable"] = bool(job.get("buildable"))
-            pdata["color"] = job.get("color") or ""
-            pdata["running"] = _jenkins_extract_running_builds(job)
-        except RuntimeError as e:
-            pdata["error"] = str(e)
-            return key, pdata
-        try:
-            last = _jenkins_request(
-                f"{root}{seg}/lastCompletedBuild/api/json"
-                f"?tree=number,result,timestamp,duration,url,displayName,actions[parameters[name,value]]"
-            )
+        job = _jenkins_find_job(root_data, rel_path[key])
+        if job is None:
+            pdata["error"] = f"job not found: {cfg['path']}"
+            out["pipelines"][key] = pdata
+            continue
+        pdata["exists"] = True
+        pdata["buildable"] = bool(job.get("buildable"))
+        pdata["color"] = job.get("color") or ""
+        pdata["running"] = _jenkins_extract_running_builds(job)
+        # No completed build yet — leave last_build as None, not an error.
+        last = job.get("lastCompletedBuild")
+        if isinstance(last, dict):
             pdata["last_build"] = {
                 "number":      last.get("number"),
                 "result":      last.get("result") or "",
@@ -29371,22 +29926,97 @@ def _fetch_jenkins_status_raw() -> dict:
                 "display":     last.get("displayName") or "",
                 "params":      _jenkins_extract_params(last.get("actions") or []),
             }
-        except RuntimeError:
-            # No completed build yet — leave last_build as None, not an error.
-            pass
-        return key, pdata
-
-    with ThreadPoolExecutor(max_workers=len(JENKINS_PIPELINES)) as ex:
-        futures = [
-            ex.submit(_pipeline_status, k, c)
-            for k, c in JENKINS_PIPELINES.items()
-        ]
-        for fut in futures:
-            key, pdata = fut.result()
-            out["pipelines"][key] = pdata
+        out["pipelines"][key] = pdata
     return out
 
 
+# ── Shared snapshot + background poller ───────────────────────────────────
+# The panel used to fetch per viewer every 30s, so Jenkins load scaled
+# with the number of people who had it open. Now one process-wide
+# snapshot is kept fresh by a single daemon thread polling every
+# JENKINS_TTL; every session's 30s fragment just reads memory. The thread
+# parks after JENKINS_POLL_IDLE without a reader and the next read
+# restarts it. Fetches are single-flight under ``lock`` so a manual
+# refresh racing the poller doesn't double the calls. Starting, parking and
+# clearing the thread go through ``poller_lock`` instead, so a read never
+# waits on an in-flight fetch just to check that the poller is alive.
+
+@st.cache_resource(show_spinner=False)
+def _jenkins_poller_state() -> dict:
+    """Process-wide poller state (one per Streamlit server)."""
+    return {
+        "lock":        threading.Lock(),
+        "poller_lock": threading.Lock(),
+        "snapshot":    None,
+        "creds":       {},
+        "version":     {},
+        "last_read":   0.0,
+        "thread":      None,
+    }
+
+
+def _jenkins_refresh_locked(state: dict) -> dict:
+    """Fetch and publish a new snapshot; the caller holds ``state["lock"]``."""
+    try:
+        snap = _fetch_jenkins_status_raw(state["creds"], state["version"])
+    except Exception as e:
+        snap = {
+            "ok": False, "status_msg": f"{type(e).__name__}: {e}",
+            "url": state["creds"].get("host") or "",
+            "public_name": state["creds"].get("public_name") or "",
+            "queue_size": 0,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "pipelines": {}, "version": _jenkins_version_blank(),
+        }
+    state["snapshot"] = snap
+    return snap
+
+
+def _jenkins_poll_once(state: dict) -> dict:
+    with state["lock"]:
+        return _jenkins_refresh_locked(state)
+
+
+def _jenkins_poller_loop(state: dict) -> None:
+    while True:
+        time.sleep(JENKINS_TTL)
+        # Readers bump last_read before taking poller_lock, so one that
+        # arrives after this check sees the cleared slot and starts a new
+        # thread.
+        with state["poller_lock"]:
+            if time.monotonic() - state["last_read"] > JENKINS_POLL_IDLE:
+                state["thread"] = None
+                return
+        _jenkins_poll_once(state)
+
+
+def _jenkins_status_shared(force: bool = False) -> dict:
+    """Current Jenkins status snapshot, shared across sessions. The first
+    read (or ``force=True`` from the panel's refresh button) fetches
+    synchronously; otherwise this never touches Jenkins."""
+    state = _jenkins_poller_state()
+    # Resolve creds here, on the script thread — the poller reuses them.
+    state["creds"] = _jenkins_creds()
+    state["last_read"] = time.monotonic()
+    snap = state["snapshot"]
+    if force or snap is None or snap.get("url") != state["creds"].get("host", ""):
+        seen = snap
+        with state["lock"]:
+            snap = state["snapshot"]
+            # Single-flight: sessions that queued behind another fetch (a
+            # cold start, a refresh click, or the poller) reuse its result.
+            if snap is seen:
+                snap = _jenkins_refresh_locked(state)
+    with state["poller_lock"]:
+        thread = state["thread"]
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=_jenkins_poller_loop, args=(state,),
+                                      name="jenkins-poller", daemon=True)
+            state["thread"] = thread
+            thread.start()
+    return snap
+
+
 # =============================================================================
 # PRISMA SCAN VIEWER — S3 fetch helpers
 # =============================================================================
@@ -29416,52 +30046,221 @@ def _prisma_scan_console_url(endpoint: str, bucket: str, key: str) -> str:
     return f"{endpoint.rstrip('/')}/{urllib.parse.quote(bucket, safe='')}/{safe_key}"
 
 
-@st.cache_data(ttl=PRISMA_SCAN_TTL, show_spinner=False, max_entries=20)
-def _fetch_prisma_scan_html(bucket: str, key: str) -> tuple[str, int, str]:
-    """Fetch the scan file for one ``(bucket, key)`` pair via the
-    platform's :class:`utils.s3.S3Client`. Returns
-    ``(text, content_length, error)``. On success ``error`` is empty;
-    on failure ``text`` is empty and ``error`` carries a short label
-    suitable for the viewer's error banner.
+_PRISMA_CACHE_LOCK = threading.Lock()
+
+
+def _prisma_cache_index_path(bucket: str, key: str) -> str:
+    """Index entry for one ``(bucket, key)`` — a small JSON pointer to the
+    content-addressed blob plus the ETag/size it was downloaded with."""
+    digest = hashlib.sha256(f"{bucket}\0{key}".encode("utf-8")).hexdigest()
+    return os.path.join(PRISMA_SCAN_CACHE_DIR, "index", digest + ".json")
+
+
+def _prisma_cache_blob_path(sha: str) -> str:
+    return os.path.join(PRISMA_SCAN_CACHE_DIR, "blobs", sha[:2], sha + ".gz")
+
 
-    Cache settings:
-      - ``ttl``         : reports are immutable per (app, version), so a
-                          long TTL is safe; 10 minutes lets us absorb retries.
-      - ``max_entries`` : 20 — bounds memory if a user pages through many
-                          scans in a single session. LRU eviction handled
-                          by Streamlit.
+def _prisma_cache_lookup(bucket: str, key: str) -> dict | None:
+    """Return the index entry for a cached report, or ``None`` on a miss.
+    A pointer whose blob has since been evicted counts as a miss. Hits bump
+    the blob's mtime so LRU eviction keeps recently-viewed reports."""
+    try:
+        with open(_prisma_cache_index_path(bucket, key), encoding="utf-8") as fh:
+            entry = json.load(fh)
+        blob = _prisma_cache_blob_path(entry["sha256"])
+        os.utime(blob)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    entry["path"] = blob
+    return entry
+
+
+def _prisma_cache_evict(keep: str = "") -> None:
+    """Size-based LRU eviction over the blob store: drop the oldest-touched
+    blobs until the total is back under ``PRISMA_SCAN_CACHE_MAX_MB``. Index
+    entries pointing at an evicted blob are left behind — they're a few
+    hundred bytes and :func:`_prisma_cache_lookup` treats them as misses.
+
+    ``keep`` (the blob just stored) is never evicted, even when it alone is
+    over the limit — the caller is about to hand its path out. In-flight
+    ``.part`` downloads of other writers are left alone too; removing one
+    would fail that writer's rename."""
+    limit = max(0, PRISMA_SCAN_CACHE_MAX_MB) * 1024 * 1024
+    keep = os.path.normpath(keep) if keep else ""
+    blobs: list[tuple[float, int, str]] = []
+    for root, _dirs, files in os.walk(os.path.join(PRISMA_SCAN_CACHE_DIR, "blobs")):
+        for name in files:
+            if name.endswith(".part"):
+                continue
+            path = os.path.normpath(os.path.join(root, name))
+            try:
+                st_ = os.stat(path)
+            except OSError:
+                continue
+            blobs.append((st_.st_mtime, st_.st_size, path))
+    total = sum(b[1] for b in blobs)
+    for _mtime, size, path in sorted(blobs):
+        if total <= limit:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _prisma_s3_error_label(e: Exception) -> str:
+    """Short banner label for an S3 failure — boto3 ``ClientError`` specifics
+    when available, else the exception type + message."""
+    _resp = getattr(e, "response", None)
+    if isinstance(_resp, dict):
+        _err = _resp.get("Error") or {}
+        _code = _err.get("Code") or type(e).__name__
+        return f"S3 {_code}: {_err.get('Message') or e}"
+    return f"{type(e).__name__}: {e}"
+
+
+def _prisma_cache_store(bucket: str, key: str, obj: dict) -> dict:
+    """Stream a ``get_object`` response body into the cache, gzip'ing and
+    hashing chunk by chunk so a multi-MB report never sits in memory whole.
+    The blob is written to a temp file and renamed into place, so a crashed
+    or concurrent download can't leave a truncated report behind."""
+    body = obj["Body"]
+    blob_dir = os.path.join(PRISMA_SCAN_CACHE_DIR, "blobs")
+    os.makedirs(blob_dir, exist_ok=True)
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(dir=blob_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb",
+                                                        compresslevel=6, mtime=0) as gz:
+            while True:
+                chunk = body.read(PRISMA_SCAN_STREAM_CHUNK)
+                if not chunk:
+                    break
+                sha.update(chunk)
+                gz.write(chunk)
+                size += len(chunk)
+        digest = sha.hexdigest()
+        blob = _prisma_cache_blob_path(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        os.replace(tmp, blob)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    finally:
+        try:
+            body.close()
+        except Exception:
+            pass
+    entry = {
+        "bucket":  bucket,
+        "key":     key,
+        "etag":    str(obj.get("ETag") or "").strip('"'),
+        "sha256":  digest,
+        "size":    size,
+        "fetched": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    index = _prisma_cache_index_path(bucket, key)
+    os.makedirs(os.path.dirname(index), exist_ok=True)
+    # Unique temp name: two sessions storing the same key must not share one.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(index), suffix=".part")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp, index)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    with _PRISMA_CACHE_LOCK:
+        _prisma_cache_evict(keep=blob)
+    entry["path"] = blob
+    return entry
+
+
+def _fetch_prisma_scan(bucket: str, key: str, refresh: bool = False) -> tuple[dict, str]:
+    """Resolve one ``(bucket, key)`` scan to its on-disk cache entry via the
+    platform's :class:`utils.s3.S3Client`. Returns ``(entry, error)``; on
+    success ``entry`` carries ``path`` (gzip'd blob), ``size`` (decoded
+    bytes), ``etag`` and ``sha256`` and ``error`` is empty. On failure
+    ``entry`` is empty and ``error`` carries a short label suitable for the
+    viewer's error banner.
+
+    Cache hits never touch S3 — reports are immutable per (app, version).
+    ``refresh=True`` (the viewer's Re-fetch button) HEADs the object first
+    and only re-downloads when its ETag moved. Callers read the report back
+    a page at a time with :func:`_prisma_scan_read_page`, so nothing here
+    holds the decoded report in memory.
 
     Connection details aren't part of the cache key — the S3Client is a
-    process-level cached resource, so a vault rotation requires
-    refreshing that resource (or restarting the process). Within a single
-    session the credentials are stable, which is the relevant invariant
-    for this cache.
+    process-level cached resource, so a vault rotation requires refreshing
+    that resource (or restarting the process).
     """
-    if not _S3CLIENT_AVAILABLE:
-        return "", 0, "utils.s3 not importable"
     if not bucket or not key:
-        return "", 0, "S3 bucket / key not configured"
+        return {}, "S3 bucket / key not configured"
+    cached = _prisma_cache_lookup(bucket, key)
+    if cached and not refresh:
+        return cached, ""
+    if not _S3CLIENT_AVAILABLE:
+        return {}, "utils.s3 not importable"
     client, err = _prisma_s3_client()
     if not client or err:
-        return "", 0, err or "S3 client not initialised"
+        return {}, err or "S3 client not initialised"
+    # The S3Client exposes a private ``_client`` (boto3) attribute per the
+    # platform's convention. We use ``head_object`` / ``get_object``
+    # directly so we don't depend on any higher-level method that may or
+    # may not exist; this is the lowest-friction path.
+    s3 = getattr(client, "_client", None) or client
+    if cached:
+        try:
+            head = s3.head_object(Bucket=bucket, Key=key)
+            if str(head.get("ETag") or "").strip('"') == cached.get("etag"):
+                return cached, ""
+        except Exception:
+            pass  # no HEAD support / transient — fall through to a full GET
     try:
-        # The S3Client exposes a private ``_client`` (boto3) attribute per
-        # the platform's convention. We use ``get_object`` directly so
-        # we don't depend on any higher-level method that may or may not
-        # exist; this is the lowest-friction path.
-        s3 = getattr(client, "_client", None) or client
         obj = s3.get_object(Bucket=bucket, Key=key)
-        body_bytes = obj["Body"].read()
-        size = int(obj.get("ContentLength") or len(body_bytes))
-        return body_bytes.decode("utf-8", errors="replace"), size, ""
+        return _prisma_cache_store(bucket, key, obj), ""
     except Exception as e:
-        # Surface boto3 ClientError specifics when available.
-        _resp = getattr(e, "response", None)
-        if isinstance(_resp, dict):
-            _err = _resp.get("Error") or {}
-            _code = _err.get("Code") or type(e).__name__
-            return "", 0, f"S3 {_code}: {_err.get('Message') or e}"
-        return "", 0, f"{type(e).__name__}: {e}"
+        return {}, _prisma_s3_error_label(e)
+
+
+def _prisma_scan_page_count(entry: dict) -> int:
+    return max(1, -(-int(entry.get("size") or 0) // PRISMA_SCAN_PAGE_BYTES))
+
+
+def _prisma_scan_read_page(path: str, page: int) -> str:
+    """Decode page ``page`` (0-based) of a cached report straight from the
+    gzip'd blob. Pages are ``PRISMA_SCAN_PAGE_BYTES`` of decoded text snapped
+    to line boundaries: a page starts at the first line beginning at or after
+    ``page * PRISMA_SCAN_PAGE_BYTES`` and runs up to where the next one
+    starts, so adjacent pages never split or repeat a line. Only one page is
+    ever resident in memory."""
+    start = max(0, page) * PRISMA_SCAN_PAGE_BYTES
+    with gzip.open(path, "rb") as fh:
+        if start:
+            fh.seek(start - 1)
+            if fh.read(1) != b"\n":
+                fh.readline()
+        data = fh.read(max(0, start + PRISMA_SCAN_PAGE_BYTES - fh.tell()))
+        if data and not data.endswith(b"\n"):
+            data += fh.readline()
+    return data.decode("utf-8", errors="replace")
+
+
+def _prisma_scan_read_all(path: str) -> str:
+    """Whole-report read, for HTML reports whose markup can't be split into
+    independently renderable pages."""
+    with gzip.open(path, "rb") as fh:
+        return fh.read().decode("utf-8", errors="replace")
 
 
 # =============================================================================
@@ -29533,6 +30332,17 @@ def _fetch_full_inventory(scope_json: str, direct_es: bool = False) -> list[dict
     return rows
 
 
+# Every inventory loader the team-scope index needs is defined from here on:
+# build / refresh it for the current snapshot. When this process had no
+# index yet, the non-admin scope resolved near the top of this run came back
+# empty — rerun once so it resolves against the fresh index.
+if (_team_scope_index() is not None and _team_scope_cold
+        and (not _is_admin) and _active_teams
+        and not st.session_state.get("_team_scope_rerun_v1")):
+    st.session_state["_team_scope_rerun_v1"] = True
+    st.rerun()
+
+
 # =============================================================================
 # PER-USER AGGREGATION — reconciled across commits / jira / requests / approval
 # =============================================================================
@@ -29556,6 +30366,23 @@ def _fetch_full_inventory(scope_json: str, direct_es: bool = False) -> list[dict
 # can pair (identity, related-attribute) without two round-trips per index.
 
 _USERS_AGG_BUCKET_CAP = 5000  # per index — bounds memory even on noisy fleets
+# Daily-rollup walk cap: composite pages per probe when backfilling the
+# per-day table (pages are _USERS_AGG_BUCKET_CAP buckets each).
+_USERS_ROLLUP_MAX_PAGES = 50
+
+# Per-user counters, in the order the People tables render them.
+_USERS_ACT_FIELDS: tuple[str, ...] = (
+    "commits", "jira_authored", "jira_assigned",
+    "requests_made", "approvals", "rejections",
+    # CI events — counters per the index schemas:
+    #   builds_authored:  user is the commit-author of the build.
+    #   deploys_requested/approved: deployments has requester /
+    #     approver fields (keyword) per the schema.
+    #   releases_authored: commitauthor on the release record.
+    "builds_authored",
+    "deploys_requested", "deploys_approved",
+    "releases_authored",
+)
 
 
 def _users_term_size(es_index: str, field: str) -> int:
@@ -29565,80 +30392,57 @@ def _users_term_size(es_index: str, field: str) -> int:
     return _USERS_AGG_BUCKET_CAP
 
 
-@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
-def _fetch_users_aggregate(
-    scope_filters_json: str,
-    commit_scope_json: str,
-    start_iso: str,
-    end_iso: str,
-) -> dict:
-    """Aggregate per-user activity across event indices.
-
-    Returns ``{"users": [...], "errors": {...}, "checked_at": iso}`` where
-    each user dict carries:
-
-        {
-          "key":           canonical key (email_lower or name_lower)
-          "email":         resolved email (may be "")
-          "names":         sorted distinct display names seen
-          "label":         preferred display label (first non-empty name)
-          "teams":         sorted distinct teams (inferred from jira)
-          "commits":       int,
-          "jira_authored": int (creator/reporter)
-          "jira_assigned": int
-          "requests_made": int
-          "approvals":     int
-          "rejections":    int
-          "total":         sum of the above (for ranking)
-        }
+def _users_activity_events(
+    scope_filters_list: list,
+    commit_scope_list: list,
+    start: datetime,
+    end: datetime,
+    by_day: bool = False,
+) -> tuple[list[tuple], dict[str, str], dict[str, str]]:
+    """Fan the per-user identity aggregations out across the event indices.
+
+    Returns ``(events, name_to_email, errors)``. Each event is a raw,
+    un-reconciled ``(counter, email, name, team, day, count)`` tuple —
+    ``counter`` is one of the ``_USERS_ACT_FIELDS``, ``email`` is only set
+    for commit buckets, and ``day`` is an ISO date when ``by_day`` (the
+    composite aggs gain a daily ``date_histogram`` source and page through
+    ``after_key``) and ``""`` otherwise. ``name_to_email`` is the
+    commit-derived display-name → email index used to reconcile identities.
     """
-    start = parse_dt(start_iso)
-    end = parse_dt(end_iso)
-    if start is None or end is None:
-        return {"users": [], "errors": {"window": "invalid time window"},
-                "checked_at": datetime.now(timezone.utc).isoformat()}
-
-    try:
-        scope_filters_list = json.loads(scope_filters_json or "[]")
-    except Exception:
-        scope_filters_list = []
-    try:
-        commit_scope_list = json.loads(commit_scope_json or "[]")
-    except Exception:
-        commit_scope_list = scope_filters_list
-
     errors: dict[str, str] = {}
-    users: dict[str, dict] = {}
+    events: list[tuple] = []
     name_to_email: dict[str, str] = {}
 
-    def _norm(s: Any) -> str:
-        return (str(s).strip().lower()) if s else ""
-
-    def _canonical_key(email: str, name: str) -> str:
-        return _norm(email) or _norm(name)
-
-    def _ensure(email: str, name: str) -> dict:
-        key = _canonical_key(email, name)
-        if not key:
-            return {}
-        u = users.setdefault(key, {
-            "key": key, "email": "", "names": set(), "teams": set(),
-            "commits": 0, "jira_authored": 0, "jira_assigned": 0,
-            "requests_made": 0, "approvals": 0, "rejections": 0,
-            # CI events — counters per the index schemas:
-            #   builds_authored:  user is the commit-author of the build.
-            #   deploys_requested/approved: deployments has requester /
-            #     approver fields (keyword) per the schema.
-            #   releases_authored: commitauthor on the release record.
-            "builds_authored": 0,
-            "deploys_requested": 0, "deploys_approved": 0,
-            "releases_authored": 0,
-        })
-        if email and not u["email"]:
-            u["email"] = _norm(email)
-        if name:
-            u["names"].add(str(name).strip())
-        return u
+    def _day_sources(time_field: str) -> list[dict]:
+        if not by_day:
+            return []
+        return [{"day": {"date_histogram": {"field": time_field,
+                                            "calendar_interval": "1d"}}}]
+
+    def _composite_buckets(index: str, body: dict) -> tuple[list[dict], str]:
+        """Run one composite agg. The live path keeps the single capped
+        page; the rollup path walks ``after_key`` so no day is truncated.
+        A walk cut short — by an ES error or by ``_USERS_ROLLUP_MAX_PAGES``
+        — returns an error, so the probe counts as failed rather than
+        handing the rollup a silently partial count."""
+        comp = body["aggs"]["by_user"]["composite"]
+        out: list[dict] = []
+        for _page in range(_USERS_ROLLUP_MAX_PAGES if by_day else 1):
+            r = es_search(index, body)
+            # _run_search returns {"_error": ...} on ES failure instead
+            # of raising — hand it back so the caller can log + move on.
+            if r.get("_error"):
+                return out, str(r["_error"])
+            agg = r.get("aggregations", {}).get("by_user", {})
+            page = agg.get("buckets", [])
+            out.extend(page)
+            if not agg.get("after_key") or len(page) < comp["size"]:
+                break
+            comp["after"] = agg["after_key"]
+        else:
+            if by_day:
+                return out, f"stopped after {_USERS_ROLLUP_MAX_PAGES} composite pages"
+        return out, ""
 
     # ── 1. COMMITS — primary source of (email, name) pairs ────────────────
     # Index schema variants this org has used:
@@ -29664,7 +30468,7 @@ def _fetch_users_aggregate(
     _commit_any_data = False
     for _email_field, _name_field in _COMMIT_IDENTITY_PAIRS:
         try:
-            r = es_search(
+            _buckets, _err = _composite_buckets(
                 IDX["commits"],
                 {
                     "query": {"bool": {"filter": list(commit_scope_list)
@@ -29679,21 +30483,18 @@ def _fetch_users_aggregate(
                                                          "missing_bucket": True}}},
                                     {"name":  {"terms": {"field": _name_field,
                                                          "missing_bucket": True}}},
-                                ],
+                                ] + _day_sources("commitdate"),
                             }
                         }
                     },
                 },
             )
-            # _run_search returns {"_error": ...} on ES failure instead
-                # of raising — log the failure and move on.
-            if r.get("_error"):
+            if _err:
                 _commit_failures.append(
                     f"({_email_field},{_name_field}): ES error: "
-                    f"{str(r['_error'])[:120]}"
+                    f"{_err[:120]}"
                 )
                 continue
-            _buckets = r.get("aggregations", {}).get("by_user", {}).get("buckets", [])
             if not _buckets:
                 continue
             _commit_any_data = True
@@ -29708,8 +30509,9 @@ def _fetch_users_aggregate(
                 name = _normalize_git_author(name_raw)
                 if not email and not name:
                     continue
-                u = _ensure(email, name)
-                u["commits"] += int(b.get("doc_count", 0))
+                events.append(("commits", email, name, "",
+                               _users_bucket_day(k.get("day")),
+                               int(b.get("doc_count", 0))))
                 if email and name:
                     name_to_email[name.strip().lower()] = email.strip().lower()
         except Exception as e:
@@ -29767,7 +30569,8 @@ def _fetch_users_aggregate(
                 if attach_team and team_field:
                     sources.append({"team": {"terms": {"field": team_field,
                                                        "missing_bucket": True}}})
-                r = es_search(
+                sources += _day_sources(time_field)
+                _buckets, _err = _composite_buckets(
                     IDX[index_key],
                     {
                         "query": {"bool": {"filter": list(filters)
@@ -29782,13 +30585,12 @@ def _fetch_users_aggregate(
                 # _run_search swallows ES errors and returns them as
                 # {"_error": str(exc)}. Surface those so the caller can
                 # log + fall back to the next probe variant.
-                if r.get("_error"):
+                if _err:
                     _failures.append(
                         f"{ident_field}{'(+team)' if attach_team else ''}: "
-                        f"ES error: {str(r['_error'])[:120]}"
+                        f"ES error: {_err[:120]}"
                     )
                     return False
-                _buckets = r.get("aggregations", {}).get("by_user", {}).get("buckets", [])
                 if not _buckets:
                     return False
                 _local_any = False
@@ -29807,12 +30609,9 @@ def _fetch_users_aggregate(
                     )
                     if not ident:
                         continue
-                    # Reconcile name → email when commits saw the same person
-                    email = name_to_email.get(ident.lower(), "")
-                    u = _ensure(email, ident)
-                    u[ctr_attr] += int(b.get("doc_count", 0))
-                    if tm:
-                        u["teams"].add(tm)
+                    events.append((ctr_attr, "", ident, tm,
+                                   _users_bucket_day(k.get("day")),
+                                   int(b.get("doc_count", 0))))
                     _local_any = True
                 return _local_any
             except Exception as e:
@@ -29836,7 +30635,7 @@ def _fetch_users_aggregate(
                     f"def v = params._source['{bare_field}']; "
                     "if (v != null) { emit(v.toString()); }"
                 )
-                r = es_search(
+                _buckets, _err = _composite_buckets(
                     IDX[index_key],
                     {
                         "query": {"bool": {"filter": list(filters)
@@ -29849,29 +30648,30 @@ def _fetch_users_aggregate(
                         "aggs": {"by_user": {"composite": {
                             "size": _users_term_size(IDX[index_key], bare_field),
                             "sources": [{"id": {"terms": {"field": "_rt_ident",
-                                                          "missing_bucket": True}}}],
+                                                          "missing_bucket": True}}}]
+                                       + _day_sources(time_field),
                         }}},
                     },
                 )
-                if r.get("_error"):
+                if _err:
                     _failures.append(
-                        f"{bare_field}(runtime): ES error: {str(r['_error'])[:120]}")
+                        f"{bare_field}(runtime): ES error: {_err[:120]}")
                     return False
-                _buckets = r.get("aggregations", {}).get("by_user", {}).get("buckets", [])
                 if not _buckets:
                     return False
                 _local_any = False
                 for b in _buckets:
-                    ident_raw = ((b.get("key") or {}).get("id") or "").strip()
+                    k = b.get("key") or {}
+                    ident_raw = (k.get("id") or "").strip()
                     if not ident_raw:
                         continue
                     ident = (ident_transform(ident_raw) if ident_transform
                              else ident_raw)
                     if not ident:
                         continue
-                    email = name_to_email.get(ident.lower(), "")
-                    u = _ensure(email, ident)
-                    u[ctr_attr] += int(b.get("doc_count", 0))
+                    events.append((ctr_attr, "", ident, "",
+                                   _users_bucket_day(k.get("day")),
+                                   int(b.get("doc_count", 0))))
                     _local_any = True
                 return _local_any
             except Exception as e:
@@ -29990,6 +30790,58 @@ def _fetch_users_aggregate(
                  commit_scope_list, "releasedate",
                  ident_transform=_normalize_git_author)
 
+    return events, name_to_email, errors
+
+
+def _users_bucket_day(value: Any) -> str:
+    """Normalise a composite ``date_histogram`` key to an ISO date. ES
+    hands back epoch millis; ``""`` when the probe wasn't split by day."""
+    if value in (None, ""):
+        return ""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).date().isoformat()
+    ts = parse_dt(value)
+    return ts.date().isoformat() if ts is not None else str(value)[:10]
+
+
+def _users_canonical_key(email: str, name: str) -> str:
+    """canonical key = lower(email) when present, else lower(name)."""
+    return (str(email or "").strip().lower()
+            or str(name or "").strip().lower())
+
+
+def _users_fold(events: list[tuple], name_to_email: dict[str, str]) -> list[dict]:
+    """Reconcile raw ``(counter, email, name, team, day, count)`` events
+    into the per-user dicts :func:`_fetch_users_aggregate` returns.
+
+    Name-only events (jira / requests / approvals / CI) fold into the
+    email-keyed user when ``name_to_email`` knows the name; a final pass
+    re-keys name-only users whose other display names have a known email.
+    """
+    users: dict[str, dict] = {}
+
+    def _blank(key: str) -> dict:
+        u = {"key": key, "email": "", "names": set(), "teams": set()}
+        u.update((f, 0) for f in _USERS_ACT_FIELDS)
+        return u
+
+    for ctr, email, name, team, _day, n in events:
+        if not email:
+            email = name_to_email.get(str(name or "").strip().lower(), "")
+        key = _users_canonical_key(email, name)
+        if not key:
+            continue
+        u = users.get(key)
+        if u is None:
+            u = users[key] = _blank(key)
+        if email and not u["email"]:
+            u["email"] = str(email).strip().lower()
+        if name:
+            u["names"].add(str(name).strip())
+        if team:
+            u["teams"].add(team)
+        u[ctr] += int(n)
+
     # ── Final reconciliation pass — merge name-only buckets into
     # email-keyed buckets where the name has a known email from commits.
     if name_to_email:
@@ -30007,22 +30859,11 @@ def _fetch_users_aggregate(
             if old_key not in users:
                 continue
             src = users.pop(old_key)
-            dst = users.setdefault(em, {
-                "key": em, "email": em, "names": set(), "teams": set(),
-                "commits": 0, "jira_authored": 0, "jira_assigned": 0,
-                "requests_made": 0, "approvals": 0, "rejections": 0,
-                "builds_authored": 0,
-                "deploys_requested": 0, "deploys_approved": 0,
-                "releases_authored": 0,
-            })
+            dst = users.setdefault(em, _blank(em))
             dst["email"] = em
             dst["names"].update(src["names"])
             dst["teams"].update(src["teams"])
-            for fld in ("commits", "jira_authored", "jira_assigned",
-                        "requests_made", "approvals", "rejections",
-                        "builds_authored",
-                        "deploys_requested", "deploys_approved",
-                        "releases_authored"):
+            for fld in _USERS_ACT_FIELDS:
                 dst[fld] += src.get(fld, 0)
             dst["key"] = em
 
@@ -30030,35 +30871,19 @@ def _fetch_users_aggregate(
     out_users: list[dict] = []
     for u in users.values():
         names_sorted = sorted(u["names"])
-        teams_sorted = sorted(u["teams"])
-        total = (
-            u["commits"]
-            + u["jira_authored"] + u["jira_assigned"]
-            + u["requests_made"]
-            + u["approvals"] + u["rejections"]
-            + u["builds_authored"]
-            + u["deploys_requested"] + u["deploys_approved"]
-            + u["releases_authored"]
-        )
+        total = sum(u[f] for f in _USERS_ACT_FIELDS)
         if total == 0:
             continue
-        out_users.append({
-            "key":              u["key"],
-            "email":            u["email"],
-            "names":            names_sorted,
-            "label":            names_sorted[0] if names_sorted else (u["email"] or u["key"]),
-            "teams":            teams_sorted,
-            "commits":          u["commits"],
-            "jira_authored":    u["jira_authored"],
-            "jira_assigned":    u["jira_assigned"],
-            "requests_made":    u["requests_made"],
-            "approvals":        u["approvals"],
-            "rejections":       u["rejections"],
-            "builds_authored":  u["builds_authored"],
-            "deploys_requested": u["deploys_requested"],
-            "deploys_approved": u["deploys_approved"],
-            "releases_authored": u["releases_authored"],
-            "total":            total,
+        row = {
+            "key":    u["key"],
+            "email":  u["email"],
+            "names":  names_sorted,
+            "label":  names_sorted[0] if names_sorted else (u["email"] or u["key"]),
+            "teams":  sorted(u["teams"]),
+        }
+        row.update((f, u[f]) for f in _USERS_ACT_FIELDS)
+        row.update({
+            "total":           total,
             # LDAP enrichment slots — populated by the un-cached wrapper.
             "ldap_title":      "",
             "ldap_department": "",
@@ -30066,9 +30891,300 @@ def _fetch_users_aggregate(
             "ldap_manager":    "",
             "ldap_username":   "",
         })
+        out_users.append(row)
     out_users.sort(key=lambda u: (-u["total"], u["label"].lower()))
+    return out_users
+
+
+# ── Daily activity rollup (Postgres) ─────────────────────────────────────
+# Re-running the fan-out above for every People window costs ~8s of
+# composite aggs per render, and an "All-time" window re-scans every
+# event since 2000. Instead the same probes are split by day and folded
+# into a per-(scope, day, source, identity) table that only ever
+# re-aggregates from its watermark forward; any window is then ONE
+# indexed GROUP BY over the (scope_key, day) primary-key prefix.
+#
+#   user_activity_daily      — (scope_key, day, source, ident_key, name,
+#                              team) → n. ``source`` is the counter name;
+#                              ``ident_key`` the pre-alias canonical key.
+#   user_identity_aliases    — alias_key → canonical_key. Seeded from the
+#                              commit name→email pairs (source='commits')
+#                              and admin 'alias' resolutions from
+#                              :func:`_ldap_db_load_resolutions`
+#                              (source='resolution', always wins).
+#   user_activity_watermarks — per-scope through_day + refreshed_at, so
+#                              concurrent sessions share one refresh per
+#                              CACHE_TTL instead of each re-aggregating.
+#
+# Buckets are UTC days, so a window's edges round out to whole days.
+# Without Postgres the live fan-out runs exactly as before.
+
+USERS_ROLLUP_TABLE = os.environ.get(
+    "USERS_ROLLUP_TABLE", "user_activity_daily").strip()
+USERS_ALIAS_TABLE = os.environ.get(
+    "USERS_ALIAS_TABLE", "user_identity_aliases").strip()
+USERS_ROLLUP_WM_TABLE = os.environ.get(
+    "USERS_ROLLUP_WM_TABLE", "user_activity_watermarks").strip()
+
+
+def _users_rollup_ensure_schema(conn) -> None:
+    """Idempotent CREATE TABLE IF NOT EXISTS for the rollup tables."""
+    for _name in (USERS_ROLLUP_TABLE, USERS_ALIAS_TABLE, USERS_ROLLUP_WM_TABLE):
+        if not _ldap_db_safe_ident(_name):
+            raise RuntimeError(f"unsafe table identifier: {_name!r}")
+    cur = conn.cursor()
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {USERS_ROLLUP_TABLE} (
+            scope_key  TEXT NOT NULL,
+            day        DATE NOT NULL,
+            source     TEXT NOT NULL,
+            ident_key  TEXT NOT NULL,
+            email      TEXT NOT NULL DEFAULT '',
+            name       TEXT NOT NULL DEFAULT '',
+            team       TEXT NOT NULL DEFAULT '',
+            n          BIGINT NOT NULL,
+            PRIMARY KEY (scope_key, day, source, ident_key, name, team)
+        )
+    """)
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {USERS_ALIAS_TABLE} (
+            alias_key     TEXT PRIMARY KEY,
+            canonical_key TEXT NOT NULL,
+            source        TEXT NOT NULL,
+            updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {USERS_ROLLUP_WM_TABLE} (
+            scope_key    TEXT PRIMARY KEY,
+            through_day  DATE NOT NULL,
+            refreshed_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    cur.close()
+    conn.commit()
+
+
+def _users_rollup_failed_sources(errors: dict[str, str]) -> set[str] | None:
+    """Counters whose probes failed, from the ``_users_activity_events``
+    error keys (``commits`` or ``<index>_<counter>``). ``None`` when a key
+    can't be pinned to a counter — treat that as every source failing."""
+    failed: set[str] = set()
+    for key in errors:
+        ctr = next((c for c in _USERS_ACT_FIELDS
+                    if key == c or key.endswith("_" + c)), None)
+        if ctr is None:
+            return None
+        failed.add(ctr)
+    return failed
+
+
+def _users_rollup_refresh(conn, scope_key: str, scope_filters_list: list,
+                          commit_scope_list: list) -> dict[str, str] | None:
+    """Bring one scope's rollup up to now. Re-aggregates only from the day
+    before the watermark (late-indexed events land there), backfilling
+    from ``_EL_ALLTIME_FLOOR`` on first use. A transaction-scoped advisory
+    lock keeps concurrent sessions from racing; whoever loses reads the
+    rows the winner last committed. Returns per-probe ES errors, or
+    ``None`` when the rollup has nothing to read yet (another session
+    holds the lock on the first backfill) and the caller should go live.
+
+    A probe that failed leaves its counter's rows alone and the watermark
+    where it was, so the next refresh re-reads the same days; the other
+    counters are still rewritten."""
+    cur = conn.cursor()
+    cur.execute("SELECT pg_try_advisory_xact_lock(hashtext(%s))",
+                (f"{USERS_ROLLUP_TABLE}:{scope_key}",))
+    if not cur.fetchone()[0]:
+        cur.execute(f"SELECT 1 FROM {USERS_ROLLUP_WM_TABLE} WHERE scope_key = %s",
+                    (scope_key,))
+        built = cur.fetchone() is not None
+        conn.rollback()
+        return {} if built else None
+    cur.execute(
+        f"SELECT through_day, refreshed_at FROM {USERS_ROLLUP_WM_TABLE} "
+        f"WHERE scope_key = %s", (scope_key,))
+    wm = cur.fetchone()
+    now = datetime.now(timezone.utc)
+    if wm and wm[1] and (now - wm[1]).total_seconds() < CACHE_TTL:
+        conn.rollback()
+        return {}
+    if wm:
+        start = datetime.combine(wm[0] - timedelta(days=1), datetime.min.time(),
+                                 tzinfo=timezone.utc)
+    else:
+        start = _EL_ALLTIME_FLOOR
+    events, name_to_email, errors = _users_activity_events(
+        scope_filters_list, commit_scope_list, start, now, by_day=True)
+    failed = _users_rollup_failed_sources(errors)
+    if failed is None or len(failed) == len(_USERS_ACT_FIELDS):
+        # Nothing usable — keep the old watermark so the next render
+        # retries instead of recording an empty stretch as "done".
+        conn.rollback()
+        return errors
+    rows: dict[tuple, int] = {}
+    for ctr, email, name, team, day, n in events:
+        ident = _users_canonical_key(email, name)
+        if not ident or not day or ctr in failed:
+            continue
+        k = (day, ctr, ident, (email or "").strip().lower(),
+             str(name or "").strip(), team or "")
+        rows[k] = rows.get(k, 0) + int(n)
+    if failed:
+        cur.execute(
+            f"DELETE FROM {USERS_ROLLUP_TABLE} WHERE scope_key = %s AND day >= %s "
+            f"AND source <> ALL(%s)",
+            (scope_key, start.date(), sorted(failed)))
+    else:
+        cur.execute(
+            f"DELETE FROM {USERS_ROLLUP_TABLE} WHERE scope_key = %s AND day >= %s",
+            (scope_key, start.date()))
+    cur.executemany(
+        f"INSERT INTO {USERS_ROLLUP_TABLE} "
+        f"(scope_key, day, source, ident_key, email, name, team, n) "
+        f"VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+        f"ON CONFLICT (scope_key, day, source, ident_key, name, team) "
+        f"DO UPDATE SET n = {USERS_ROLLUP_TABLE}.n + EXCLUDED.n",
+        [(scope_key,) + k + (n,) for k, n in rows.items()])
+    # Commit-derived pairs never override an admin resolution.
+    cur.executemany(
+        f"INSERT INTO {USERS_ALIAS_TABLE} (alias_key, canonical_key, source) "
+        f"VALUES (%s, %s, 'commits') "
+        f"ON CONFLICT (alias_key) DO UPDATE SET "
+        f"canonical_key = EXCLUDED.canonical_key, updated_at = NOW() "
+        f"WHERE {USERS_ALIAS_TABLE}.source = 'commits'",
+        sorted(name_to_email.items()))
+    # Re-seed the resolution aliases wholesale so a deleted resolution
+    # drops out. Targets are LDAP usernames — fold into the member's email,
+    # which is the key the People tab matches LDAP records on.
+    _ldap_users = _ldap_db_load_users() or {}
+    _res_pairs = []
+    for _ak, _res in (_ldap_db_load_resolutions() or {}).items():
+        if _res.get("kind") != "alias":
+            continue
+        _tgt = _ldap_users.get((_res.get("target_username") or "").lower()) or {}
+        if _tgt.get("email") and _tgt["email"] != _ak:
+            _res_pairs.append((_ak, _tgt["email"]))
+    cur.execute(f"DELETE FROM {USERS_ALIAS_TABLE} WHERE source = 'resolution'")
+    cur.executemany(
+        f"INSERT INTO {USERS_ALIAS_TABLE} (alias_key, canonical_key, source) "
+        f"VALUES (%s, %s, 'resolution') "
+        f"ON CONFLICT (alias_key) DO UPDATE SET "
+        f"canonical_key = EXCLUDED.canonical_key, source = 'resolution', "
+        f"updated_at = NOW()",
+        _res_pairs)
+    # After a partial failure the watermark stays put (the next start is
+    # this one again), but refreshed_at still moves so the retry waits a
+    # CACHE_TTL instead of re-running the fan-out on every render.
+    through = start.date() + timedelta(days=1) if failed else now.date()
+    cur.execute(
+        f"INSERT INTO {USERS_ROLLUP_WM_TABLE} (scope_key, through_day, refreshed_at) "
+        f"VALUES (%s, %s, %s) ON CONFLICT (scope_key) DO UPDATE SET "
+        f"through_day = EXCLUDED.through_day, refreshed_at = EXCLUDED.refreshed_at",
+        (scope_key, through, now))
+    cur.close()
+    conn.commit()
+    return errors
+
+
+def _users_rollup_window(conn, scope_key: str, start: datetime,
+                         end: datetime) -> list[tuple]:
+    """The single aggregate read: window rows re-keyed through the alias
+    map, shaped as ``_users_fold`` events (``day`` left blank)."""
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT r.source, COALESCE(a.canonical_key, r.email), r.name, r.team, "
+        f"SUM(r.n) "
+        f"FROM {USERS_ROLLUP_TABLE} r "
+        f"LEFT JOIN {USERS_ALIAS_TABLE} a ON a.alias_key = r.ident_key "
+        f"WHERE r.scope_key = %s AND r.day BETWEEN %s AND %s "
+        f"GROUP BY 1, 2, 3, 4",
+        (scope_key, start.date(), end.date()))
+    rows = cur.fetchall()
+    cur.close()
+    return [(r[0], r[1] or "", r[2] or "", r[3] or "", "", int(r[4] or 0))
+            for r in rows]
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_users_aggregate(
+    scope_filters_json: str,
+    commit_scope_json: str,
+    start_iso: str,
+    end_iso: str,
+) -> dict:
+    """Aggregate per-user activity across event indices.
+
+    Returns ``{"users": [...], "errors": {...}, "checked_at": iso}`` where
+    each user dict carries:
+
+        {
+          "key":           canonical key (email_lower or name_lower)
+          "email":         resolved email (may be "")
+          "names":         sorted distinct display names seen
+          "label":         preferred display label (first non-empty name)
+          "teams":         sorted distinct teams (inferred from jira)
+          "commits":       int,
+          "jira_authored": int (creator/reporter)
+          "jira_assigned": int
+          "requests_made": int
+          "approvals":     int
+          "rejections":    int
+          "total":         sum of the above (for ranking)
+        }
+
+    Served from the daily rollup when Postgres is reachable (refreshed
+    incrementally, then one GROUP BY for the window); otherwise the live
+    ES fan-out. A rollup failure falls back to the live path too.
+    """
+    start = parse_dt(start_iso)
+    end = parse_dt(end_iso)
+    if start is None or end is None:
+        return {"users": [], "errors": {"window": "invalid time window"},
+                "checked_at": datetime.now(timezone.utc).isoformat()}
+
+    try:
+        scope_filters_list = json.loads(scope_filters_json or "[]")
+    except Exception:
+        scope_filters_list = []
+    try:
+        commit_scope_list = json.loads(commit_scope_json or "[]")
+    except Exception:
+        commit_scope_list = scope_filters_list
+
+    if _POSTGRES_AVAILABLE:
+        scope_key = hashlib.sha1(
+            f"{scope_filters_json}\x1f{commit_scope_json}".encode()
+        ).hexdigest()[:16]
+        conn = None
+        try:
+            conn = _pg_connect_rw()
+            _users_rollup_ensure_schema(conn)
+            errors = _users_rollup_refresh(
+                conn, scope_key, scope_filters_list, commit_scope_list)
+            # None: another session is still building this scope's first
+            # backfill — go live rather than cache an empty rollup.
+            if errors is not None:
+                events = _users_rollup_window(conn, scope_key, start, end)
+                return {
+                    "users":       _users_fold(events, {}),
+                    "errors":      errors,
+                    "checked_at":  datetime.now(timezone.utc).isoformat(),
+                    "source":      "rollup",
+                }
+        except Exception:
+            pass
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    events, name_to_email, errors = _users_activity_events(
+        scope_filters_list, commit_scope_list, start, end)
     return {
-        "users":       out_users,
+        "users":       _users_fold(events, name_to_email),
         "errors":      errors,
         "checked_at":  datetime.now(timezone.utc).isoformat(),
     }
@@ -30231,7 +31347,13 @@ def _ldap_backfill_user(user_dict: dict) -> None:
     username = (username or "").strip()
     if not username:
         return
-    info = _ldap_user_info_cached(username)
+    # The synced ldap_users table answers most lookups in-process (one
+    # cached bulk read); the live per-user directory call is the fallback
+    # for people the last sync didn't cover.
+    info = (_ldap_db_load_users().get(username.lower())
+            or _ldap_db_users_by_email().get(
+                str(user_dict.get("email") or "").strip().lower())
+            or _ldap_user_info_cached(username))
     if not info:
         return
     user_dict["ldap_username"]   = str(info.get("username") or username)
@@ -5,10 +5,11 @@ import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.security import decode_token
 from app.models import User
 
@@ -21,20 +22,35 @@ _CRED_EXC = HTTPException(
 )
 
 
-def get_current_user(
-    token: str | None = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+def _access_token_user_id(token: str | None) -> int:
     if not token:
         raise _CRED_EXC
     try:
         payload = decode_token(token)
         if payload.get("type") != "access":
             raise _CRED_EXC
-        user_id = int(payload["sub"])
+        return int(payload["sub"])
     except (jwt.PyJWTError, KeyError, ValueError):
         raise _CRED_EXC
-    user = db.get(User, user_id)
+
+
+def get_current_user(
+    token: str | None = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    user = db.get(User, _access_token_user_id(token))
+    if user is None or not user.is_active:
+        raise _CRED_EXC
+    return user
+
+
+async def get_current_user_async(
+    token: str | None = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """:func:`get_current_user` for ``async def`` routes; the user is loaded
+    into the request's :class:`AsyncSession`, ready for ``db.run_sync``."""
+    user = await db.get(User, _access_token_user_id(token))
     if user is None or not user.is_active:
         raise _CRED_EXC
     return user
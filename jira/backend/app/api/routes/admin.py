@@ -1,5 +1,5 @@
-"""Instance administration: mail, Jira connections, identity providers, and
-global permissions. Every route requires site-administrator privileges.
+"""Instance administration: mail, Jira connections, identity providers, rank
+maintenance, request metrics and global permissions. Every route requires site-administrator privileges.
 
 Mounted at ``/api/admin``. Secret fields are write-only — they are stored
 encrypted and never echoed back; read models expose ``*_set`` booleans instead.
@@ -14,8 +14,10 @@ from sqlalchemy.orm import Session
 
 import logging
 
+from app.core import request_metrics
+from app.core.config import settings
 from app.core.crypto import encrypt, decrypt
-from app.core.database import get_db
+from app.core.database import async_engine, engine, get_db
 from app.core.security import create_access_token, create_refresh_token
 from app.schemas.auth import Token
 from app.models import (
@@ -40,6 +42,9 @@ from app.schemas.admin import (
     JiraProjectSummary,
     MailConfigIn,
     MailConfigOut,
+    PoolStatsOut,
+    RankPressureOut,
+    RequestMetricsOut,
     TestEmailIn,
 )
 from app.schemas.common import Message
@@ -47,6 +52,7 @@ from app.schemas.rbac import GlobalGrantIn, GlobalGrantOut
 from app.services import auth_settings as auth_settings_service
 from app.services import mail as mail_service
 from app.services import permission_keys as P
+from app.services import rank_maintenance
 from app.services.permissions import require_site_admin
 
 router = APIRouter()
@@ -702,3 +708,50 @@ def delete_global_permission(
     db.delete(grant)
     db.commit()
     return Message(detail="Grant deleted")
+
+
+# --- Rank maintenance --------------------------------------------------------
+@router.get("/ranks", response_model=list[RankPressureOut])
+def rank_pressure(
+    db: Session = Depends(get_db),
+    _admin: User = Depends(require_site_admin),
+) -> list[RankPressureOut]:
+    keys = dict(db.execute(select(Project.id, Project.key)).all())
+    return [
+        RankPressureOut(project_key=keys.get(row["project_id"], ""), **row)
+        for row in rank_maintenance.rank_pressure(db)
+    ]
+
+
+@router.post("/ranks/{project_id}/rebalance", response_model=Message, status_code=status.HTTP_202_ACCEPTED)
+def rebalance_ranks(
+    project_id: int,
+    db: Session = Depends(get_db),
+    _admin: User = Depends(require_site_admin),
+) -> Message:
+    if db.get(Project, project_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    rank_maintenance.enqueue_rebalance(db, project_id)
+    db.commit()
+    return Message(detail="Rank rebalance queued")
+
+
+# --- Request metrics ---------------------------------------------------------
+def _pool_stats(pool) -> PoolStatsOut:
+    return PoolStatsOut(size=pool.size(), checked_out=pool.checkedout(), overflow=max(pool.overflow(), 0))
+
+
+@router.get("/request-metrics", response_model=RequestMetricsOut)
+def get_request_metrics(_admin: User = Depends(require_site_admin)) -> RequestMetricsOut:
+    """Per-route SQL statement counts and timings of this process."""
+    return RequestMetricsOut(
+        statement_budget=settings.request_statement_budget,
+        routes=request_metrics.snapshot(),
+        pools={"sync": _pool_stats(engine.pool), "async": _pool_stats(async_engine.pool)},
+    )
+
+
+@router.delete("/request-metrics", response_model=Message)
+def reset_request_metrics(_admin: User = Depends(require_site_admin)) -> Message:
+    request_metrics.reset()
+    return Message(detail="Request metrics reset")
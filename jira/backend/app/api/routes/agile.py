@@ -4,12 +4,13 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_admin, get_current_user
+from app.api.deps import get_current_admin, get_current_user, get_current_user_async
 from app.api.routes.projects import _resolve_project
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.models import Board, Issue, Project, Sprint, Status, User
 from app.services import permission_keys as P
 from app.services.permissions import assert_project_permission
@@ -24,7 +25,7 @@ from app.schemas.agile import (
     SprintUpdate,
 )
 from app.schemas.common import Message
-from app.services.serializers import to_list_item
+from app.services.serializers import list_items
 
 router = APIRouter()
 
@@ -117,19 +118,13 @@ def get_board(
     return board
 
 
-@router.get("/boards/{board_id}/board", response_model=BoardView)
-def board_view(
-    board_id: int,
-    sprint_id: int | None = Query(None),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> BoardView:
+def _board_view(db: Session, user: User, board_id: int, sprint_id: int | None) -> BoardView:
     board = _get_board(db, board_id)
     assert_project_permission(db, user, _board_project(db, board), P.BROWSE_PROJECTS)
     statuses = _project_statuses(db, board.project_id)
 
     active_sprint: Sprint | None = None
-    stmt = select(Issue).where(Issue.project_id == board.project_id)
+    where = [Issue.project_id == board.project_id]
 
     if board.board_type == "scrum":
         if sprint_id is not None:
@@ -142,23 +137,20 @@ def board_view(
             ).first()
         # Only issues in the selected/active sprint populate a scrum board.
         target_sprint_id = active_sprint.id if active_sprint else None
-        stmt = stmt.where(Issue.sprint_id == target_sprint_id)
+        where.append(Issue.sprint_id == target_sprint_id)
     # Kanban: all issues in the project, no sprint filter (done issues live in
     # the done column). No extra filtering required.
 
-    stmt = stmt.order_by(Issue.rank.asc())
-    issues = list(db.scalars(stmt))
-
-    by_status: dict[int, list[Issue]] = {}
-    for issue in issues:
-        by_status.setdefault(issue.status_id, []).append(issue)
+    by_status: dict[int, list] = {}
+    for item in list_items(db, *where):
+        by_status.setdefault(item.status.id if item.status else None, []).append(item)
 
     columns = [
         BoardColumn(
             status_id=s.id,
             status_name=s.name,
             category=s.category,
-            issues=[to_list_item(i) for i in by_status.get(s.id, [])],
+            issues=by_status.get(s.id, []),
         )
         for s in statuses
     ]
@@ -172,12 +164,17 @@ def board_view(
     )
 
 
-@router.get("/boards/{board_id}/backlog", response_model=BacklogView)
-def backlog_view(
+@router.get("/boards/{board_id}/board", response_model=BoardView)
+async def board_view(
     board_id: int,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> BacklogView:
+    sprint_id: int | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async),
+) -> BoardView:
+    return await db.run_sync(_board_view, user, board_id, sprint_id)
+
+
+def _backlog_view(db: Session, user: User, board_id: int) -> BacklogView:
     board = _get_board(db, board_id)
     assert_project_permission(db, user, _board_project(db, board), P.BROWSE_PROJECTS)
 
@@ -190,34 +187,26 @@ def backlog_view(
         )
     )
 
-    sprint_issues: dict[int, list] = {}
-    for sprint in sprints:
-        items = list(
-            db.scalars(
-                select(Issue)
-                .where(Issue.sprint_id == sprint.id)
-                .order_by(Issue.rank.asc())
-            )
-        )
-        sprint_issues[sprint.id] = [to_list_item(i) for i in items]
-
-    # Backlog: issues in the project with no sprint and not in a done status.
-    done_status_ids = [
-        s.id
-        for s in _project_statuses(db, board.project_id)
-        if s.category == "done"
-    ]
-    backlog_stmt = (
-        select(Issue)
-        .where(
-            Issue.project_id == board.project_id,
-            Issue.sprint_id.is_(None),
-        )
-        .order_by(Issue.rank.asc())
+    # Sprint contents and the backlog (no sprint, not in a done status) come
+    # from one query, split in memory.
+    in_backlog = and_(
+        Issue.project_id == board.project_id,
+        Issue.sprint_id.is_(None),
+        ~and_(
+            Status.category == "done",
+            or_(Status.project_id == board.project_id, Status.project_id.is_(None)),
+        ),
     )
-    if done_status_ids:
-        backlog_stmt = backlog_stmt.where(Issue.status_id.notin_(done_status_ids))
-    backlog = [to_list_item(i) for i in db.scalars(backlog_stmt)]
+    sprint_ids = [s.id for s in sprints]
+    where = or_(Issue.sprint_id.in_(sprint_ids), in_backlog) if sprint_ids else in_backlog
+
+    sprint_issues: dict[int, list] = {sid: [] for sid in sprint_ids}
+    backlog = []
+    for item in list_items(db, where):
+        if item.sprint_id is None:
+            backlog.append(item)
+        else:
+            sprint_issues[item.sprint_id].append(item)
 
     return BacklogView(
         board=BoardOut.model_validate(board),
@@ -227,6 +216,15 @@ def backlog_view(
     )
 
 
+@router.get("/boards/{board_id}/backlog", response_model=BacklogView)
+async def backlog_view(
+    board_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async),
+) -> BacklogView:
+    return await db.run_sync(_backlog_view, user, board_id)
+
+
 # --- Sprints ---------------------------------------------------------------
 @router.post(
     "/boards/{board_id}/sprints",
@@ -1,17 +1,16 @@
 """Issue routes: CRUD plus comments, worklogs, history, links, attachments and ranking."""
 from __future__ import annotations
 
-import os
-import uuid
-
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_async
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.models import (
     Attachment,
     Comment,
@@ -35,6 +34,7 @@ from app.schemas.issue import (
     IssueDetail,
     IssueLinkIn,
     IssueLinkOut,
+    IssueBulkRankUpdate,
     IssueListItem,
     IssueRankUpdate,
     IssueUpdate,
@@ -51,14 +51,17 @@ from app.services.issues import (
     record_history,
     resolve_labels,
 )
+from app.services import analytics, attachments
 from app.services import permission_keys as P
+from app.services import rank_maintenance
 from app.services.permissions import (
     assert_own_or_all,
     assert_project_permission,
-    visible_project_ids,
+    visible_project_filter,
 )
-from app.services.serializers import issue_ref, to_detail, to_list_item
-from app.utils.ranking import rank_between
+from app.services.serializers import LIST_ITEM_OPTIONS, issue_ref, to_detail, to_list_item
+from app.services.storage import get_storage
+from app.utils.ranking import rank_between, ranks_after, ranks_between
 from app.utils.timetracking import parse_duration
 
 router = APIRouter()
@@ -141,17 +144,16 @@ def create_issue(
     return to_detail(issue)
 
 
-@router.get("", response_model=Page[IssueListItem])
-def list_issues(
-    project: str | None = Query(None),
-    status_id: int | None = Query(None),
-    assignee_id: int | None = Query(None),
-    type_id: int | None = Query(None),
-    sprint_id: int | None = Query(None),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+def _list_issues(
+    db: Session,
+    user: User,
+    project: str | None,
+    status_id: int | None,
+    assignee_id: int | None,
+    type_id: int | None,
+    sprint_id: int | None,
+    page: int,
+    page_size: int,
 ) -> Page[IssueListItem]:
     stmt = select(Issue)
     if project is not None:
@@ -172,18 +174,40 @@ def list_issues(
     if sprint_id is not None:
         stmt = stmt.where(Issue.sprint_id == sprint_id)
 
-    vis = visible_project_ids(db, user)
+    vis = visible_project_filter(db, user, Issue.project_id)
     if vis is not None:
-        stmt = stmt.where(Issue.project_id.in_(vis or {-1}))
+        stmt = stmt.where(vis)
 
     total = db.scalar(
         select(func.count()).select_from(stmt.subquery())
     ) or 0
-    stmt = stmt.order_by(Issue.updated_at.desc()).offset((page - 1) * page_size).limit(page_size)
+    stmt = (
+        stmt.options(*LIST_ITEM_OPTIONS)
+        .order_by(Issue.updated_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
     items = [to_list_item(i) for i in db.scalars(stmt)]
     return Page[IssueListItem](items=items, total=total, page=page, page_size=page_size)
 
 
+@router.get("", response_model=Page[IssueListItem])
+async def list_issues(
+    project: str | None = Query(None),
+    status_id: int | None = Query(None),
+    assignee_id: int | None = Query(None),
+    type_id: int | None = Query(None),
+    sprint_id: int | None = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async),
+) -> Page[IssueListItem]:
+    return await db.run_sync(
+        _list_issues, user, project, status_id, assignee_id, type_id, sprint_id, page, page_size
+    )
+
+
 @router.get("/{key_or_id}", response_model=IssueDetail)
 def get_issue(
     key_or_id: str,
@@ -218,6 +242,7 @@ def update_issue(
 @router.delete("/{key_or_id}", response_model=Message)
 def delete_issue(
     key_or_id: str,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> Message:
@@ -225,6 +250,7 @@ def delete_issue(
     assert_project_permission(db, user, issue.project, P.DELETE_ISSUES, issue=issue)
     db.delete(issue)
     db.commit()
+    background.add_task(attachments.sweep_unreferenced)
     return Message(detail="Issue deleted")
 
 
@@ -470,44 +496,47 @@ def delete_link(
 
 
 # --- Attachments -----------------------------------------------------------
+_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}},
+        }}},
+    },
+}
+
+
 @router.post(
     "/{key_or_id}/attachments",
     response_model=AttachmentOut,
     status_code=status.HTTP_201_CREATED,
+    openapi_extra=_UPLOAD_BODY,
 )
 async def upload_attachment(
     key_or_id: str,
-    file: UploadFile = File(...),
+    request: Request,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> Attachment:
     issue = _resolve_issue(db, key_or_id)
     assert_project_permission(db, user, issue.project, P.CREATE_ATTACHMENTS, issue=issue)
-    data = await file.read()
-    max_bytes = settings.max_attachment_mb * 1024 * 1024
-    if len(data) > max_bytes:
+    # The body is streamed to a staging file (not read into memory) and cut
+    # off as soon as it passes the limit.
+    try:
+        staged = await attachments.receive_upload(request, settings.max_attachment_mb * 1024 * 1024)
+    except attachments.UploadTooLarge:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File exceeds the {settings.max_attachment_mb} MB limit",
         )
-    os.makedirs(settings.attachments_dir, exist_ok=True)
-    storage_key = uuid.uuid4().hex
-    path = os.path.join(settings.attachments_dir, storage_key)
-    with open(path, "wb") as fh:
-        fh.write(data)
-
-    attachment = Attachment(
-        issue_id=issue.id,
-        author_id=user.id,
-        filename=file.filename or storage_key,
-        content_type=file.content_type or "application/octet-stream",
-        size_bytes=len(data),
-        storage_key=storage_key,
-    )
-    db.add(attachment)
-    db.commit()
-    db.refresh(attachment)
-    return attachment
+    except attachments.UploadError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    try:
+        return await run_in_threadpool(attachments.save_upload, db, issue, user.id, staged)
+    finally:
+        staged.discard()
 
 
 @router.get("/{key_or_id}/attachments", response_model=list[AttachmentOut])
@@ -524,9 +553,10 @@ def list_attachments(
 @router.get("/attachments/{aid}/download")
 def download_attachment(
     aid: int,
+    request: Request,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-) -> FileResponse:
+) -> StreamingResponse:
     attachment = db.get(Attachment, aid)
     if attachment is None:
         raise HTTPException(
@@ -534,21 +564,48 @@ def download_attachment(
         )
     issue = _resolve_issue(db, attachment.issue_id)
     assert_project_permission(db, user, issue.project, P.BROWSE_PROJECTS, issue=issue)
-    path = os.path.join(settings.attachments_dir, attachment.storage_key)
-    if not os.path.exists(path):
+    store = get_storage()
+    size = store.size(attachment.storage_key)
+    if size is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Attachment file missing"
         )
-    return FileResponse(
-        path,
-        filename=attachment.filename,
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": attachments.content_disposition(attachment.filename),
+    }
+    etag = f'"{attachment.sha256}"' if attachment.sha256 else None
+    if etag:
+        headers["ETag"] = etag
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range != etag:
+        range_header = None  # the client's copy is stale: send it all
+    try:
+        span = attachments.parse_range(range_header, size)
+    except attachments.RangeNotSatisfiable:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    start, stop = span or (0, size)
+    if span is not None:
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    headers["Content-Length"] = str(stop - start)
+    return StreamingResponse(
+        store.iter_range(attachment.storage_key, start, stop),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if span is not None else status.HTTP_200_OK,
         media_type=attachment.content_type,
+        headers=headers,
     )
 
 
 @router.delete("/attachments/{aid}", response_model=Message)
 def delete_attachment(
     aid: int,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> Message:
@@ -562,30 +619,16 @@ def delete_attachment(
         db, user, issue.project, attachment.author_id,
         P.DELETE_OWN_ATTACHMENTS, P.DELETE_ALL_ATTACHMENTS, issue=issue,
     )
-    path = os.path.join(settings.attachments_dir, attachment.storage_key)
-    try:
-        if os.path.exists(path):
-            os.remove(path)
-    except OSError:
-        pass
+    attachments.delete_attachment_file(attachment)
     db.delete(attachment)
     db.commit()
+    # The blob goes once no other attachment shares it.
+    background.add_task(attachments.sweep_unreferenced)
     return Message(detail="Attachment deleted")
 
 
 # --- Rank / move -----------------------------------------------------------
-@router.put("/{key_or_id}/rank", response_model=IssueListItem)
-def rank_issue(
-    key_or_id: str,
-    payload: IssueRankUpdate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> IssueListItem:
-    issue = _resolve_issue(db, key_or_id)
-    assert_project_permission(db, user, issue.project, P.EDIT_ISSUES, issue=issue)
-    if payload.sprint_id is not None:
-        assert_project_permission(db, user, issue.project, P.MANAGE_SPRINTS, issue=issue)
-
+def _neighbour_ranks(db: Session, payload: IssueRankUpdate) -> tuple[str | None, str | None]:
     low: str | None = None
     high: str | None = None
     if payload.after_id is not None:
@@ -602,7 +645,85 @@ def rank_issue(
                 status_code=status.HTTP_404_NOT_FOUND, detail="before_id issue not found"
             )
         high = before.rank
+    return low, high
+
+
+def _status_history(db: Session, issues: list[Issue], status_id: int, author_id: int) -> None:
+    names = dict(db.execute(select(Status.id, Status.name)).all())
+    for issue in issues:
+        if issue.status_id != status_id:
+            record_history(db, issue, author_id, "status", names.get(issue.status_id), names.get(status_id))
+
+
+@router.put("/rank", response_model=list[IssueListItem])
+def rank_issues(
+    payload: IssueBulkRankUpdate,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> list[IssueListItem]:
+    """Move several issues at once (multi-select drag) with a single rank UPDATE."""
+    ids = list(dict.fromkeys(payload.issue_ids))
+    if {payload.after_id, payload.before_id} & set(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_id/before_id must not be one of the moved issues",
+        )
+    by_id = {i.id: i for i in db.scalars(select(Issue).where(Issue.id.in_(ids)))}
+    missing = [i for i in ids if i not in by_id]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Issue(s) not found: {missing}"
+        )
+    issues = [by_id[i] for i in ids]
+    for issue in issues:
+        assert_project_permission(db, user, issue.project, P.EDIT_ISSUES, issue=issue)
+        if payload.sprint_id is not None:
+            assert_project_permission(db, user, issue.project, P.MANAGE_SPRINTS, issue=issue)
+    project_ids = {i.project_id for i in issues}
+
+    low, high = _neighbour_ranks(db, payload)
+    if payload.after_id is not None or payload.before_id is not None:
+        ranks = ranks_between(low, high, len(ids))
+    elif payload.sprint_id is not None or payload.status_id is not None:
+        last = db.scalar(select(func.max(Issue.rank)).where(Issue.project_id.in_(project_ids)))
+        ranks = ranks_after(last, len(ids))
+    else:
+        ranks = [i.rank for i in issues]
+
+    extra = {}
+    if payload.sprint_id is not None:
+        extra["sprint_id"] = payload.sprint_id
+    if payload.status_id is not None:
+        _status_history(db, issues, payload.status_id, user.id)
+        extra["status_id"] = payload.status_id
+    rank_maintenance.write_ranks(db, zip(ids, ranks), **extra)
+    if any(rank_maintenance.needs_rebalance(r) for r in ranks):
+        for project_id in project_ids:
+            rank_maintenance.enqueue_rebalance(db, project_id)
+    db.commit()
+    if extra:
+        # write_ranks is a Core UPDATE the flush hook never sees; status and
+        # sprint feed the cached insights.
+        analytics.invalidate_projects(project_ids)
+
+    for issue in issues:
+        db.refresh(issue)
+    return [to_list_item(i) for i in issues]
+
+
+@router.put("/{key_or_id}/rank", response_model=IssueListItem)
+def rank_issue(
+    key_or_id: str,
+    payload: IssueRankUpdate,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> IssueListItem:
+    issue = _resolve_issue(db, key_or_id)
+    assert_project_permission(db, user, issue.project, P.EDIT_ISSUES, issue=issue)
+    if payload.sprint_id is not None:
+        assert_project_permission(db, user, issue.project, P.MANAGE_SPRINTS, issue=issue)
 
+    low, high = _neighbour_ranks(db, payload)
     if payload.after_id is not None or payload.before_id is not None:
         issue.rank = rank_between(low, high)
     elif payload.sprint_id is not None or payload.status_id is not None:
@@ -621,6 +742,8 @@ def rank_issue(
         )
         issue.status_id = payload.status_id
 
+    if rank_maintenance.needs_rebalance(issue.rank):
+        rank_maintenance.enqueue_rebalance(db, issue.project_id)
     db.commit()
     db.refresh(issue)
     return to_list_item(issue)
@@ -1,7 +1,7 @@
 """Project routes: projects, membership, components and versions."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -15,12 +15,13 @@ from app.models import (
     User,
     Version,
 )
+from app.services import attachments
 from app.services import permission_keys as P
 from app.services.permissions import (
     assert_project_permission,
     has_project_permission,
     is_site_admin,
-    visible_project_ids,
+    visible_project_filter,
 )
 from app.schemas.common import Message
 from app.schemas.project import (
@@ -76,9 +77,9 @@ def list_projects(
     stmt = select(Project)
     if not include_archived:
         stmt = stmt.where(Project.is_archived.is_(False))
-    vis = visible_project_ids(db, user)
+    vis = visible_project_filter(db, user, Project.id)
     if vis is not None:
-        stmt = stmt.where(Project.id.in_(vis or {-1}))
+        stmt = stmt.where(vis)
     stmt = stmt.order_by(Project.key.asc())
     return list(db.scalars(stmt))
 
@@ -161,6 +162,7 @@ def update_project(
 @router.delete("/{project_id}", response_model=Message)
 def delete_project(
     project_id: int,
+    background: BackgroundTasks,
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin),
 ) -> Message:
@@ -171,6 +173,8 @@ def delete_project(
         )
     db.delete(project)
     db.commit()
+    # Release the attachment blobs only this project's issues referenced.
+    background.add_task(attachments.sweep_unreferenced)
     return Message(detail="Project deleted")
 
 
@@ -1,13 +1,15 @@
 """Search routes: TQL execution, validation, and saved filters."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func, or_, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_current_user_async
+from app.core.database import get_async_db, get_db
 from app.models import (
     Issue,
     IssueType,
@@ -19,17 +21,20 @@ from app.models import (
     Status,
     User,
 )
-from app.schemas.common import Message, Page
+from app.schemas.common import CursorPage, Message
 from app.schemas.issue import IssueListItem
 from app.services import export as export_svc
-from app.services.permissions import visible_project_ids
-from app.services.serializers import to_list_item
-from app.services.tql import TQLError, build_query, tql_schema
+from app.services import pagination
+from app.services.permissions import visible_project_filter
+from app.services.serializers import LIST_ITEM_OPTIONS, to_list_item
+from app.services.tql import TQLError, build_query, compile_query, tql_schema
 
 router = APIRouter()
 
-# Hard cap on a single export to keep responses bounded.
-_EXPORT_LIMIT = 10000
+# Searches count matches exactly only up to this many; beyond it the total is
+# reported as "10,000+" (see services.pagination) and /search/count gives the
+# exact figure on demand.
+_COUNT_CAP = 10000
 
 
 # --- Search bodies ---------------------------------------------------------
@@ -37,86 +42,131 @@ class SearchRequest(BaseModel):
     tql: str = ""
     page: int = 1
     page_size: int = 50
+    # Opaque token from a previous response's next_cursor; takes precedence
+    # over ``page`` and costs the same at any depth.
+    cursor: str | None = None
 
 
-def _run_search(db: Session, tql: str, page: int, page_size: int, user: User) -> Page[IssueListItem]:
-    page = max(page, 1)
-    page_size = min(max(page_size, 1), 200)
+def _search_stmt(db: Session, tql: str, user: User):
     try:
-        where, order_by = build_query(db, tql, user.id)
+        compiled = compile_query(db, tql, user.id)
     except TQLError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
     stmt = select(Issue)
-    if where is not None:
-        stmt = stmt.where(where)
+    if compiled.where is not None:
+        stmt = stmt.where(compiled.where)
 
-    vis = visible_project_ids(db, user)
+    vis = visible_project_filter(db, user, Issue.project_id)
     if vis is not None:
-        stmt = stmt.where(Issue.project_id.in_(vis or {-1}))
+        stmt = stmt.where(vis)
+    return stmt, compiled
+
+
+def _run_search(
+    db: Session, tql: str, page: int, page_size: int, user: User, cursor: str | None = None
+) -> CursorPage[IssueListItem]:
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), 200)
+    stmt, compiled = _search_stmt(db, tql, user)
+    keys = compiled.sort_keys
+    signature = pagination.query_signature(tql)
+
+    total, exact = pagination.bounded_count(db, stmt, _COUNT_CAP)
+    estimate = None if exact else pagination.estimated_count(db, stmt)
 
-    total = db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
-    stmt = stmt.order_by(*order_by).offset((page - 1) * page_size).limit(page_size)
-    items = [to_list_item(i) for i in db.scalars(stmt)]
-    return Page[IssueListItem](items=items, total=total, page=page, page_size=page_size)
+    rows_stmt = (
+        stmt.add_columns(*(expr for expr, _ in keys))
+        .options(*LIST_ITEM_OPTIONS)
+        .order_by(*compiled.order_by)
+    )
+    if cursor:
+        try:
+            after = pagination.decode_cursor(cursor, signature, len(keys), keys)
+        except pagination.CursorError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        rows_stmt = rows_stmt.where(pagination.keyset_clause(keys, after))
+    else:
+        rows_stmt = rows_stmt.offset((page - 1) * page_size)
+    # One extra row tells us whether a next page exists without counting.
+    rows = db.execute(rows_stmt.limit(page_size + 1)).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = pagination.encode_cursor(rows[-1][1:], signature)
+
+    items = [to_list_item(row[0]) for row in rows]
+    return CursorPage[IssueListItem](
+        items=items, total=total, page=page, page_size=page_size,
+        next_cursor=next_cursor, total_exact=exact, total_estimate=estimate,
+    )
 
 
-@router.get("/search", response_model=Page[IssueListItem])
-def search_get(
+@router.get("/search", response_model=CursorPage[IssueListItem])
+async def search_get(
     tql: str = Query(""),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
-) -> Page[IssueListItem]:
-    return _run_search(db, tql, page, page_size, user)
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async),
+) -> CursorPage[IssueListItem]:
+    return await db.run_sync(_run_search, tql, page, page_size, user, cursor)
 
 
-@router.post("", response_model=Page[IssueListItem])
-def search_post(
+@router.post("", response_model=CursorPage[IssueListItem])
+async def search_post(
     payload: SearchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user: User = Depends(get_current_user_async),
+) -> CursorPage[IssueListItem]:
+    return await db.run_sync(
+        _run_search, payload.tql, payload.page, payload.page_size, user, payload.cursor
+    )
+
+
+class SearchCount(BaseModel):
+    total: int
+
+
+@router.get("/count", response_model=SearchCount)
+def search_count(
+    tql: str = Query(""),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-) -> Page[IssueListItem]:
-    return _run_search(db, payload.tql, payload.page, payload.page_size, user)
+) -> SearchCount:
+    """Exact number of matches — the uncapped count searches skip."""
+    stmt, _ = _search_stmt(db, tql, user)
+    return SearchCount(total=pagination.exact_count(db, stmt))
 
 
 @router.get("/export")
 def export_search(
-    format: str = Query("csv", description="csv | json | xlsx"),
+    format: str = Query("csv", description="csv | json | ndjson | xlsx"),
     tql: str = Query("", description="TQL filter (same as search)"),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
-) -> Response:
-    """Export the issues matching a TQL filter as CSV / JSON / XLSX.
+) -> StreamingResponse:
+    """Stream the issues matching a TQL filter as CSV / JSON / NDJSON / XLSX.
 
     Honors the same RBAC as search — only issues from projects the user can
-    browse are included (site admins see all).
+    browse are included (site admins see all). At most
+    ``settings.export_max_rows`` issues are written.
     """
     fmt = format.lower()
     if fmt not in export_svc.ISSUE_EXPORTERS:
-        raise HTTPException(status_code=400, detail="format must be one of: csv, json, xlsx")
+        raise HTTPException(status_code=400, detail="format must be one of: csv, json, ndjson, xlsx")
     try:
         where, order_by = build_query(db, tql, user.id)
     except TQLError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    stmt = select(Issue)
-    if where is not None:
-        stmt = stmt.where(where)
-    vis = visible_project_ids(db, user)
+    clauses = [where] if where is not None else []
+    vis = visible_project_filter(db, user, Issue.project_id)
     if vis is not None:
-        stmt = stmt.where(Issue.project_id.in_(vis or {-1}))
-    stmt = stmt.options(
-        joinedload(Issue.project), joinedload(Issue.type), joinedload(Issue.status),
-        joinedload(Issue.priority), joinedload(Issue.assignee), joinedload(Issue.reporter),
-        joinedload(Issue.sprint),
-    ).order_by(*order_by).limit(_EXPORT_LIMIT)
-    issues = db.scalars(stmt).unique().all()
-
-    data = export_svc.ISSUE_EXPORTERS[fmt](list(issues))
-    return Response(
-        content=data,
+        clauses.append(vis)
+    return StreamingResponse(
+        export_svc.stream_issues(fmt, clauses, [*order_by, Issue.id]),
         media_type=export_svc.CONTENT_TYPE[fmt],
         headers={"Content-Disposition": f'attachment; filename="trackly-issues.{fmt}"'},
     )
@@ -151,10 +201,10 @@ def tql_values(
         out.append(ValueSuggestion(value=value, label=label, hint=hint))
 
     if field == "project":
-        vis = visible_project_ids(db, user)
+        vis = visible_project_filter(db, user, Project.id)
         stmt = select(Project).order_by(Project.key.asc())
         if vis is not None:
-            stmt = stmt.where(Project.id.in_(vis or {-1}))
+            stmt = stmt.where(vis)
         if q:
             stmt = stmt.where(or_(Project.key.ilike(like), Project.name.ilike(like)))
         for p in db.scalars(stmt.limit(20)):
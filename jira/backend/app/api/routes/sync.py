@@ -2,12 +2,13 @@
 
 Mounted at ``/sync`` under the API prefix. Access is restricted to site
 administrators or users holding ``ADMINISTER_PROJECTS`` on the target project.
-Sync execution is kicked off via FastAPI ``BackgroundTasks`` so the request
-returns immediately while the resumable engine runs in the background.
+Starting or resuming a sync only queues a job (see :mod:`app.services.jobs`);
+the resumable engine runs in the separate job worker process, never in the
+API process.
 """
 from __future__ import annotations
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -27,8 +28,8 @@ from app.schemas.sync import (
 from app.services import permission_keys as P
 from app.services.jira_sync import (
     discover,
+    enqueue_sync,
     get_default_connection,
-    start_sync_background,
 )
 from app.services.permissions import has_project_permission, is_site_admin
 
@@ -181,7 +182,6 @@ def link_project(
 @router.post("/projects/{project_id}/start", response_model=SyncActionResult)
 def start_sync(
     project_id: int,
-    background: BackgroundTasks,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> SyncActionResult:
@@ -198,12 +198,12 @@ def start_sync(
 
     link.status = "running"
     link.last_error = None
+    enqueue_sync(db, link, "manual", user.id)
     db.commit()
 
-    background.add_task(start_sync_background, project.id, "manual", user.id)
     return SyncActionResult(
         status="accepted",
-        message="Sync started",
+        message="Sync queued",
         link=SyncLinkOut.model_validate(link),
     )
 
@@ -233,7 +233,6 @@ def pause_sync(
 @router.post("/projects/{project_id}/resume", response_model=SyncActionResult)
 def resume_sync(
     project_id: int,
-    background: BackgroundTasks,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> SyncActionResult:
@@ -248,12 +247,12 @@ def resume_sync(
     # Resume keeps the persisted watermark + cursor untouched.
     link.status = "running"
     link.last_error = None
+    enqueue_sync(db, link, "resume", user.id)
     db.commit()
 
-    background.add_task(start_sync_background, project.id, "resume", user.id)
     return SyncActionResult(
         status="accepted",
-        message="Sync resumed",
+        message="Sync resume queued",
         link=SyncLinkOut.model_validate(link),
     )
 
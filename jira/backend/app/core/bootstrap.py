@@ -73,12 +73,22 @@ def seed_admin(db: Session) -> None:
 def run_bootstrap() -> None:
     from app.core.bootstrap_rbac import run_rbac_bootstrap
     from app.core.schema_sync import reconcile_schema
+    from app.services.attachments import ensure_blob_refcounts
+    from app.services.permission_index import rebuild_all
+    from app.services.text_search import ensure_search_index
 
     create_all_tables()
     # Additively add any new columns to pre-existing tables so schema changes
     # never require dropping the database (see app.core.schema_sync).
     reconcile_schema(engine)
+    # Full-text / trigram search column, triggers and indexes (PostgreSQL only).
+    ensure_search_index(engine)
+    # Attachment blob reference counting (PostgreSQL only).
+    ensure_blob_refcounts(engine)
     with SessionLocal() as db:
         seed_defaults(db)
         seed_admin(db)
         run_rbac_bootstrap(db)
+    # Flattened project permissions; kept current on write afterwards, rebuilt
+    # here so data changed outside the ORM (restores, manual SQL) is picked up.
+    rebuild_all(engine)
@@ -35,6 +35,15 @@ class Settings(BaseSettings):
     postgres_password: str = Field(default="trackly")
     # If DATABASE_URL is set it takes precedence over the discrete fields above.
     database_url: str | None = Field(default=None)
+    # The hot read endpoints (search, issue list, board, backlog, insights) run
+    # on an async engine with its own pool. By default it uses the same server
+    # through psycopg's async mode; set ASYNC_DATABASE_URL to pick another
+    # driver, e.g. postgresql+asyncpg://... when asyncpg is installed.
+    async_database_url: str | None = Field(default=None)
+    db_pool_size: int = Field(default=10)
+    db_max_overflow: int = Field(default=20)
+    async_db_pool_size: int = Field(default=20)
+    async_db_max_overflow: int = Field(default=20)
 
     # --- Security ----------------------------------------------------------
     secret_key: str = Field(default="change-me-in-production-please-32+chars")
@@ -52,6 +61,77 @@ class Settings(BaseSettings):
     # --- File storage ------------------------------------------------------
     attachments_dir: str = Field(default="/data/attachments")
     max_attachment_mb: int = Field(default=25)
+    # Where attachment files are kept: "local" (attachments_dir) or "s3" for
+    # any S3-compatible object store (needs boto3; credentials come from the
+    # standard AWS environment variables / instance profile). Identical files
+    # are stored once, keyed by their sha256.
+    attachments_backend: str = Field(default="local")
+    attachments_s3_bucket: str = Field(default="")
+    attachments_s3_prefix: str = Field(default="attachments/")
+    attachments_s3_endpoint_url: str | None = Field(default=None)
+    attachments_s3_region: str | None = Field(default=None)
+
+    # --- Caching -----------------------------------------------------------
+    # Upper bound on how stale the in-process reference-data cache (project /
+    # status / type / priority / user / sprint names) may get when another
+    # worker process changes those tables. Local writes invalidate at once.
+    refcache_ttl_seconds: int = Field(default=60)
+    # How long per-project insights aggregates are reused. Writes through this
+    # process invalidate the affected project immediately.
+    analytics_cache_ttl_seconds: int = Field(default=30)
+
+    # --- Notifications -----------------------------------------------------
+    # Notification email is queued in the notification_outbox table and sent by
+    # a background thread that polls every notification_poll_seconds (and wakes
+    # at once when a request queues mail). Failed sends back off from
+    # notification_retry_seconds, doubling up to notification_retry_max_seconds.
+    notification_worker_enabled: bool = Field(default=True)
+    notification_poll_seconds: float = Field(default=5.0)
+    notification_batch_size: int = Field(default=200)
+    notification_max_attempts: int = Field(default=8)
+    notification_retry_seconds: int = Field(default=30)
+    notification_retry_max_seconds: int = Field(default=3600)
+
+    # --- Exports -----------------------------------------------------------
+    # Issue exports stream from a server-side cursor this many rows at a
+    # time; a single export stops after export_max_rows (0 = no cap).
+    export_chunk_rows: int = Field(default=1000)
+    export_max_rows: int = Field(default=200_000)
+
+    # --- Jira sync ---------------------------------------------------------
+    # Concurrent requests to Jira per sync run, and how many search pages may
+    # be fetched ahead of the database writer.
+    jira_sync_workers: int = Field(default=4)
+    jira_sync_prefetch_pages: int = Field(default=4)
+    # Syncs run by the job worker at once against the same Jira connection.
+    jira_sync_per_connection: int = Field(default=2)
+
+    # --- Background jobs ---------------------------------------------------
+    # Run by the separate worker process (python -m app.worker). A lease not
+    # renewed for job_lease_seconds is taken over by another worker; failed
+    # jobs are retried after job_retry_seconds, doubling up to the max.
+    job_worker_concurrency: int = Field(default=4)
+    job_poll_seconds: float = Field(default=2.0)
+    job_lease_seconds: int = Field(default=60)
+    job_claim_scan: int = Field(default=20)
+    job_max_attempts: int = Field(default=3)
+    job_retry_seconds: int = Field(default=30)
+    job_retry_max_seconds: int = Field(default=1800)
+
+    # --- Ranking -----------------------------------------------------------
+    # A project whose longest issue rank reaches rank_rebalance_length is
+    # rebalanced by the job worker, rank_rebalance_batch issues per transaction.
+    rank_rebalance_length: int = Field(default=24)
+    rank_rebalance_batch: int = Field(default=500)
+
+    # --- Request metrics ---------------------------------------------------
+    # Every request's SQL statements and database time are counted; a request
+    # running more than request_statement_budget statements is logged as a
+    # warning (0 = never) and counted in /api/admin/request-metrics.
+    request_statement_budget: int = Field(default=30)
+    # Also report the counts to clients in Server-Timing / X-DB-Statements.
+    # Off by default: they expose query counts and timings to every caller.
+    request_timing_headers: bool = Field(default=False)
 
     # --- First-run bootstrap admin ----------------------------------------
     bootstrap_admin_email: str = Field(default="admin@trackly.local")
@@ -74,6 +154,18 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def sqlalchemy_async_database_uri(self) -> str:
+        if self.async_database_url:
+            return self.async_database_url
+        uri = self.sqlalchemy_database_uri
+        scheme, _, rest = uri.partition("://")
+        if scheme.startswith("postgresql"):
+            return f"postgresql+psycopg://{rest}"
+        if scheme.startswith("sqlite"):
+            return f"sqlite+aiosqlite://{rest}"
+        return uri
+
     @property
     def is_production(self) -> bool:
         return self.app_env.lower() == "production"
@@ -1,24 +1,45 @@
-"""Database engine, session factory, and declarative base."""
+"""Database engines, session factories, and declarative base.
+
+Most routes use the sync :data:`engine` through :func:`get_db` and run in the
+threadpool. The hot read endpoints are ``async def`` and use
+:func:`get_async_db` on :data:`async_engine` instead: the shared sync query
+code runs through ``AsyncSession.run_sync`` on the event loop while the
+driver waits on the network, so a slow query holds neither a threadpool slot
+nor a connection from the sync pool.
+"""
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
 
 from app.core.config import settings
 
+_echo = settings.debug and settings.app_env == "development"
+
 engine = create_engine(
     settings.sqlalchemy_database_uri,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.debug and settings.app_env == "development",
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    echo=_echo,
     future=True,
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+async_engine = create_async_engine(
+    settings.sqlalchemy_async_database_uri,
+    pool_pre_ping=True,
+    pool_size=settings.async_db_pool_size,
+    max_overflow=settings.async_db_max_overflow,
+    echo=_echo,
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     """Declarative base for all ORM models."""
@@ -31,3 +52,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of :func:`get_db` for ``async def`` routes."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,177 @@
+"""Per-request SQL statement counts, database time and latency.
+
+:class:`RequestMetricsMiddleware` gives every HTTP request a
+:class:`RequestStats` in a context variable; cursor-execute listeners on both
+engines (see :func:`instrument`) add each statement and its duration to it.
+Threadpool routes and ``run_sync`` code inherit the context, so statements are
+attributed to the request that ran them, not to whatever else the process is
+doing.
+
+When the response is finished the request is folded into per-route totals
+(``/api/admin/request-metrics``), and one that ran more than
+``settings.request_statement_budget`` statements is logged — N+1 regressions
+show up as a warning naming the route instead of only as latency. The counts
+are also sent to the client in ``Server-Timing`` and ``X-DB-Statements``.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+log = logging.getLogger("trackly.requests")
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    # Set once the response body is sent; background tasks run after that.
+    closed: bool = False
+
+
+@dataclass
+class RouteTotals:
+    requests: int = 0
+    errors: int = 0
+    over_budget: int = 0
+    statements: int = 0
+    max_statements: int = 0
+    db_seconds: float = 0.0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        n = self.requests or 1
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "over_budget": self.over_budget,
+            "avg_statements": round(self.statements / n, 2),
+            "max_statements": self.max_statements,
+            "avg_db_ms": round(self.db_seconds * 1000 / n, 2),
+            "avg_ms": round(self.seconds * 1000 / n, 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("trackly_request_stats", default=None)
+_lock = threading.Lock()
+_routes: dict[str, RouteTotals] = {}
+
+
+def current() -> RequestStats | None:
+    """Stats of the request being handled in this context, if any."""
+    return _current.get()
+
+
+# --- Statement listeners ------------------------------------------------------
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is not None and not stats.closed:
+        conn.info.setdefault("trackly_query_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None or stats.closed:
+        return
+    starts = conn.info.get("trackly_query_start")
+    stats.statements += 1
+    if starts:
+        stats.db_seconds += time.perf_counter() - starts.pop()
+
+
+def instrument(*engines: Engine) -> None:
+    """Count statements run on *engines* (sync engines; pass ``async_engine.sync_engine``)."""
+    for eng in engines:
+        if not event.contains(eng, "before_cursor_execute", _before_execute):
+            event.listen(eng, "before_cursor_execute", _before_execute)
+            event.listen(eng, "after_cursor_execute", _after_execute)
+
+
+# --- Aggregates ---------------------------------------------------------------
+def record(route: str, stats: RequestStats, seconds: float, status_code: int) -> None:
+    budget = settings.request_statement_budget
+    over = bool(budget) and stats.statements > budget
+    with _lock:
+        totals = _routes.setdefault(route, RouteTotals())
+        totals.requests += 1
+        totals.errors += status_code >= 500
+        totals.over_budget += over
+        totals.statements += stats.statements
+        totals.max_statements = max(totals.max_statements, stats.statements)
+        totals.db_seconds += stats.db_seconds
+        totals.seconds += seconds
+        totals.max_seconds = max(totals.max_seconds, seconds)
+    if over:
+        log.warning(
+            "%s ran %d SQL statements (budget %d) in %.1f ms, %.1f ms in the database",
+            route, stats.statements, budget, seconds * 1000, stats.db_seconds * 1000,
+        )
+
+
+def snapshot() -> dict[str, dict]:
+    """Per-route totals since start-up (or the last :func:`reset`)."""
+    with _lock:
+        return {route: totals.as_dict() for route, totals in sorted(_routes.items())}
+
+
+def reset() -> None:
+    with _lock:
+        _routes.clear()
+
+
+# --- Middleware ---------------------------------------------------------------
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses pass through untouched."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        elapsed: float | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, elapsed
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.request_timing_headers:
+                    headers = MutableHeaders(scope=message)
+                    so_far = (time.perf_counter() - started) * 1000
+                    headers.append("X-DB-Statements", str(stats.statements))
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} statements", '
+                        f"app;dur={so_far:.1f}",
+                    )
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                stats.closed = True
+                elapsed = time.perf_counter() - started
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            name = f"{scope['method']} {getattr(route, 'path', None) or 'unmatched'}"
+            if elapsed is None:
+                elapsed = time.perf_counter() - started
+            record(name, stats, elapsed, status_code)
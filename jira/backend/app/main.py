@@ -9,7 +9,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.router import api_router
+from app.core import request_metrics
+from app.core.request_metrics import RequestMetricsMiddleware
 from app.core.config import settings
+from app.core.database import async_engine, engine
 
 logging.basicConfig(level=logging.INFO if not settings.debug else logging.DEBUG)
 log = logging.getLogger("trackly")
@@ -26,7 +29,15 @@ async def lifespan(app: FastAPI):
     except Exception:  # pragma: no cover - surfaced in logs, container retries
         log.exception("Bootstrap failed")
         raise
+    if settings.notification_worker_enabled:
+        from app.services import outbox
+
+        outbox.start_worker()
     yield
+    if settings.notification_worker_enabled:
+        outbox.stop_worker()
+    # Async connections belong to this event loop; never hand them to the next.
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -38,6 +49,8 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
 )
 
+request_metrics.instrument(engine, async_engine.sync_engine)
+app.add_middleware(RequestMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -0,0 +1,174 @@
+"""Page-at-a-time bulk writes shared by the one-shot importer and the sync engine.
+
+Both pull Jira search pages and write each one with a single lookup of the
+rows that already exist plus one multi-row INSERT / executemany UPDATE per
+table. The helpers here take the session and the caller's user resolver, so
+each caller keeps its own caches and bookkeeping.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.migration.jira_client import JiraClient
+from app.migration.mapper import adf_to_text, map_user, parse_jira_datetime
+from app.models import Comment, Label, Worklog
+from app.models.issue import issue_labels
+
+log = logging.getLogger("trackly.migration.bulk")
+
+# Jira issue key -> (comments, worklogs) as returned by the REST API.
+Children = dict[str, tuple[list, list]]
+UserResolver = Callable[[dict | None], int | None]
+
+
+def same_keys(rows: list[dict]) -> list[list[dict]]:
+    """Split executemany parameter sets into groups that share the same keys."""
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return list(groups.values())
+
+
+def fetch_children(
+    client: JiraClient,
+    pool: ThreadPoolExecutor,
+    jira_issues: list[dict],
+    *,
+    comments: bool = True,
+    worklogs: bool = True,
+) -> Children:
+    """Comments and worklogs per issue key for one search page.
+
+    The search embeds the first few of each (``comment`` / ``worklog``
+    fields); only issues with more than that are fetched individually,
+    concurrently on *pool*. A failed fetch keeps what the search embedded.
+    """
+    wanted = (
+        ("comment", "comments", client.iter_comments, comments),
+        ("worklog", "worklogs", client.iter_worklogs, worklogs),
+    )
+    out: dict[str, list[list]] = {}
+    fetches: list[tuple[str, int, Future]] = []
+    for jira_issue in jira_issues:
+        jkey = jira_issue.get("key")
+        if not jkey:
+            continue
+        fields = jira_issue.get("fields") or {}
+        out[jkey] = [[], []]
+        for slot, (field, items_key, fetch, enabled) in enumerate(wanted):
+            if not enabled:
+                continue
+            embedded = fields.get(field)
+            out[jkey][slot] = list((embedded or {}).get(items_key) or [])
+            if embedded is None or (embedded.get("total") or 0) > len(out[jkey][slot]):
+                fetches.append((jkey, slot, pool.submit(lambda f=fetch, k=jkey: list(f(k)))))
+    for jkey, slot, future in fetches:
+        try:
+            out[jkey][slot] = future.result()
+        except Exception as exc:  # noqa: BLE001 - keep what the search embedded
+            log.warning("Could not fetch %ss for %s: %s", wanted[slot][0], jkey, exc)
+    return {jkey: (page_comments, page_worklogs) for jkey, (page_comments, page_worklogs) in out.items()}
+
+
+def write_labels(db: Session, names_by_issue: dict[int, list[str]], label_ids: dict[str, int]) -> None:
+    """Replace the labels of every issue in *names_by_issue*.
+
+    *label_ids* is the caller's name -> ``Label.id`` cache; names missing from
+    it are looked up, created when new, and added to it.
+    """
+    wanted = {n.strip() for names in names_by_issue.values() for n in names if n.strip()}
+    unknown = wanted - label_ids.keys()
+    if unknown:
+        label_ids.update(db.execute(select(Label.name, Label.id).where(Label.name.in_(unknown))).all())
+        new = sorted(unknown - label_ids.keys())
+        if new:
+            # Labels are global; a concurrent import or sync may be creating the same ones.
+            db.execute(pg_insert(Label).on_conflict_do_nothing(index_elements=["name"]), [{"name": n} for n in new])
+            label_ids.update(db.execute(select(Label.name, Label.id).where(Label.name.in_(new))).all())
+    db.execute(delete(issue_labels).where(issue_labels.c.issue_id.in_(names_by_issue)))
+    links = {
+        (issue_id, label_ids[n.strip()])
+        for issue_id, names in names_by_issue.items() for n in names if n.strip()
+    }
+    if links:
+        db.execute(insert(issue_labels), [{"issue_id": i, "label_id": l} for i, l in links])
+
+
+def write_comments(db: Session, children: Children, key_to_id: dict[str, int], user_id: UserResolver) -> int:
+    """Upsert the page's comments by ``external_id``; returns how many were inserted."""
+    rows: dict[str, dict] = {}
+    for jkey, (comments, _) in children.items():
+        if jkey not in key_to_id:
+            continue
+        for jc in comments:
+            ext = str(jc.get("id")) if jc.get("id") else None
+            if not ext:
+                continue
+            row = {
+                "issue_id": key_to_id[jkey],
+                "external_id": ext,
+                "author_id": user_id(map_user(jc.get("author"))),
+                "body": adf_to_text(jc.get("body")) or "(empty comment)",
+            }
+            for ts in ("created", "updated"):
+                parsed = parse_jira_datetime(jc.get(ts))
+                if parsed:
+                    row[f"{ts}_at"] = parsed
+            rows[ext] = row
+    if not rows:
+        return 0
+    existing = dict(db.execute(
+        select(Comment.external_id, Comment.id).where(Comment.external_id.in_(rows))
+    ).all())
+    now = datetime.now(timezone.utc)
+    inserts = [{"created_at": now, "updated_at": now, **r} for ext, r in rows.items() if ext not in existing]
+    updates = [{**r, "id": existing[ext]} for ext, r in rows.items() if ext in existing]
+    if inserts:
+        db.execute(insert(Comment), inserts)
+    for group in same_keys(updates):
+        db.execute(update(Comment), group)
+    return len(inserts)
+
+
+def write_worklogs(db: Session, children: Children, key_to_id: dict[str, int], user_id: UserResolver) -> int:
+    """Insert the page's worklogs not stored yet; returns how many were inserted."""
+    issue_ids = [key_to_id[k] for k in children if k in key_to_id]
+    if not issue_ids:
+        return 0
+    # Worklogs carry no stable id here; (issue, start, duration) identifies one.
+    seen = set(db.execute(
+        select(Worklog.issue_id, Worklog.started_at, Worklog.time_spent_seconds)
+        .where(Worklog.issue_id.in_(issue_ids))
+    ).all())
+    inserts: list[dict] = []
+    for jkey, (_, worklogs) in children.items():
+        if jkey not in key_to_id:
+            continue
+        for wl in worklogs:
+            seconds = wl.get("timeSpentSeconds")
+            if not seconds:
+                continue
+            started = parse_jira_datetime(wl.get("started")) or parse_jira_datetime(wl.get("created"))
+            if started is None:
+                continue
+            ident = (key_to_id[jkey], started, int(seconds))
+            if ident in seen:
+                continue
+            seen.add(ident)
+            inserts.append({
+                "issue_id": key_to_id[jkey],
+                "author_id": user_id(map_user(wl.get("author"))),
+                "time_spent_seconds": int(seconds),
+                "comment": adf_to_text(wl.get("comment")) or None,
+                "started_at": started,
+            })
+    if inserts:
+        db.execute(insert(Worklog), inserts)
+    return len(inserts)
@@ -8,35 +8,35 @@ from __future__ import annotations
 
 import logging
 import secrets
-from dataclasses import dataclass, field
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, String, column, func, insert, or_, select, update, values
+from sqlalchemy.orm import Session, aliased
 
 from app.core.bootstrap import run_bootstrap
 from app.core.security import hash_password
 from app.models import (
     Board,
-    Comment,
     Issue,
     IssueType,
+    Label,
     Priority,
     Project,
     Status,
     User,
-    Worklog,
 )
-from app.services.issues import resolve_labels
-from app.utils.ranking import initial_rank, rank_between
+from app.utils.ranking import initial_rank, ranks_after
 
+from app.migration import bulk
 from app.migration.jira_client import JiraClient
 from app.migration.mapper import (
+    adf_to_text,
     map_issue_fields,
     map_priority_rank,
     map_status_category,
     map_user,
-    parse_jira_datetime,
 )
 
 log = logging.getLogger("trackly.migration.importer")
@@ -51,12 +51,22 @@ DEFAULT_ISSUE_FIELDS = [
     "customfield_10014", "customfield_10008",
 ]
 
+# Users upserted per statement by sync_users, and parent/epic links resolved
+# per UPDATE statement.
+_USER_BATCH = 500
+_LINK_CHUNK = 5000
+
 
 @dataclass
 class ImportOptions:
-    commit_every: int = 50
+    # Commit after at least this many issues (whole search pages at a time).
+    commit_every: int = 500
     import_comments: bool = True
     import_worklogs: bool = True
+    # Concurrent requests to Jira, and search pages fetched ahead of the writer
+    # (None: same as workers).
+    workers: int = 4
+    prefetch: int | None = None
 
 
 @dataclass
@@ -93,6 +103,15 @@ class Importer:
         self.priority_map: dict[str, int] = {}      # Jira priority id -> Priority.id
         self.priority_name_map: dict[str, int] = {}
         self.issue_key_map: dict[str, int] = {}     # Jira issue key   -> Issue.id
+        self.issue_ext_map: dict[str, int] = {}     # Jira issue id    -> Issue.id (current project)
+        self.label_map: dict[str, int] = {}         # label name       -> Label.id
+        # Preloaded once per run (see _preload_users).
+        self.user_ext_map: dict[str, int] = {}      # User.external_id -> User.id
+        self.user_email_map: dict[str, int] = {}    # User.email       -> User.id
+        self.usernames: set[str] = set()
+        self._users_loaded = False
+        self._password_hash: str | None = None
+        self._last_rank: str | None = None
         self.story_point_field_ids: list[str] = []
         self.epic_link_field_ids: list[str] = []
 
@@ -127,54 +146,104 @@ class Importer:
         }
 
     # -- users -------------------------------------------------------------
+    def _preload_users(self) -> None:
+        """Load every user's ids, emails and usernames once per run."""
+        if self._users_loaded:
+            return
+        for uid, ext, email, username in self.db.execute(
+            select(User.id, User.external_id, User.email, User.username)
+        ):
+            if ext:
+                self.user_ext_map[ext] = uid
+            self.user_email_map[email] = uid
+            self.usernames.add(username)
+        self._users_loaded = True
+
+    def _upsert_users(self, mapped_users: list[dict | None]) -> None:
+        """Resolve (creating or refreshing) users not yet seen in this run.
+
+        Matches by ``external_id`` and then by email against the preloaded
+        maps, then writes one executemany UPDATE and one multi-row INSERT.
+        """
+        wanted = {m["external_id"]: m for m in mapped_users if m and m["external_id"] not in self.user_map}
+        if not wanted:
+            return
+        self._preload_users()
+        updates: list[dict] = []
+        inserts: list[dict] = []
+        same_email: list[tuple[str, str]] = []
+        new_emails: set[str] = set()
+        for ext, m in wanted.items():
+            # Fall back to matching by email to avoid clashing with seeded users.
+            uid = self.user_ext_map.get(ext) or self.user_email_map.get(m["email"])
+            if uid is not None:
+                row = {"id": uid, "external_id": ext, "display_name": m["display_name"]}
+                if m.get("avatar_url"):
+                    row["avatar_url"] = m["avatar_url"]
+                updates.append(row)
+                self.user_map[ext] = uid
+            elif m["email"] in new_emails:
+                same_email.append((ext, m["email"]))
+            else:
+                new_emails.add(m["email"])
+                inserts.append({
+                    "external_id": ext,
+                    "username": self._unique_username(m["username"]),
+                    "email": m["email"],
+                    "display_name": m["display_name"],
+                    "avatar_url": m.get("avatar_url"),
+                    "password_hash": self._placeholder_hash(),
+                    "is_active": True,
+                })
+        # Never overwrite an existing password: updates carry no password_hash.
+        for group in bulk.same_keys(updates):
+            self.db.execute(update(User), group)
+        if inserts:
+            for uid, ext, email in self.db.execute(
+                insert(User).returning(User.id, User.external_id, User.email, sort_by_parameter_order=True),
+                inserts,
+            ):
+                self.user_map[ext] = self.user_ext_map[ext] = self.user_email_map[email] = uid
+            self.stats.users += len(inserts)
+        for ext, email in same_email:
+            self.user_map[ext] = self.user_email_map[email]
+
     def _upsert_user(self, mapped: dict | None) -> int | None:
         if not mapped:
             return None
-        ext = mapped["external_id"]
-        if ext in self.user_map:
-            return self.user_map[ext]
+        self._upsert_users([mapped])
+        return self.user_map[mapped["external_id"]]
 
-        user = self.db.scalars(select(User).where(User.external_id == ext)).first()
-        if user is None:
-            # Fall back to matching by email to avoid clashing with seeded users.
-            user = self.db.scalars(select(User).where(User.email == mapped["email"])).first()
+    def _user_id(self, mapped: dict | None) -> int | None:
+        return self.user_map.get(mapped["external_id"]) if mapped else None
 
-        if user is None:
-            user = User(
-                external_id=ext,
-                username=self._unique_username(mapped["username"]),
-                email=mapped["email"],
-                display_name=mapped["display_name"],
-                avatar_url=mapped.get("avatar_url"),
-                password_hash=hash_password(secrets.token_urlsafe(24)),
-                is_active=True,
-            )
-            self.db.add(user)
-            self.stats.users += 1
-        else:
-            # Update mutable attributes; never overwrite the existing password.
-            user.external_id = ext
-            user.display_name = mapped["display_name"]
-            if mapped.get("avatar_url"):
-                user.avatar_url = mapped["avatar_url"]
-        self.db.flush()
-        self.user_map[ext] = user.id
-        return user.id
+    def _placeholder_hash(self) -> str:
+        # Imported accounts get an unusable random password; hashing one per
+        # run instead of one per user keeps bcrypt off the hot path.
+        if self._password_hash is None:
+            self._password_hash = hash_password(secrets.token_urlsafe(24))
+        return self._password_hash
 
     def _unique_username(self, base: str) -> str:
         base = (base or "user").strip()[:100] or "user"
         candidate = base
         suffix = 1
-        while self.db.scalars(select(User.id).where(User.username == candidate)).first():
+        while candidate in self.usernames:
             tail = f"-{suffix}"
             candidate = f"{base[:100 - len(tail)]}{tail}"
             suffix += 1
+        self.usernames.add(candidate)
         return candidate
 
     def sync_users(self) -> None:
         log.info("Syncing users...")
+        batch: list[dict | None] = []
         for jira_user in self.client.iter_users():
-            self._upsert_user(map_user(jira_user))
+            batch.append(map_user(jira_user))
+            if len(batch) >= _USER_BATCH:
+                self._upsert_users(batch)
+                batch = []
+        self._upsert_users(batch)
         self._commit()
         log.info("Users synced (new this run: %s)", self.stats.users)
 
@@ -307,7 +376,6 @@ class Importer:
         name = (jira_project.get("name") or key or "Imported").strip()
         description = jira_project.get("description")
         if isinstance(description, dict):
-            from app.migration.mapper import adf_to_text
             description = adf_to_text(description)
 
         project = None
@@ -350,87 +418,186 @@ class Importer:
         return project
 
     # -- issues ------------------------------------------------------------
+    def _preload_issues(self, project: Project) -> None:
+        """Map the project's existing issues by Jira id and by key, in one query."""
+        self.issue_ext_map.clear()
+        for iid, ext, key in self.db.execute(
+            select(Issue.id, Issue.external_id, Issue.key).where(or_(
+                Issue.project_id == project.id,
+                Issue.key.startswith(f"{project.key}-", autoescape=True),
+            ))
+        ):
+            if ext:
+                self.issue_ext_map[ext] = iid
+            self.issue_key_map[key] = iid
+
+    def _preload_labels(self) -> None:
+        if not self.label_map:
+            self.label_map.update(self.db.execute(select(Label.name, Label.id)).all())
+
     def import_issues(self, project: Project, jql: str) -> None:
+        """Import every issue matching *jql* into *project*, a search page at a time.
+
+        Pages are fetched ahead concurrently while the previous one is written.
+        Existing issues, users and labels are resolved against maps preloaded
+        once per project, so a page costs a handful of set-based statements
+        (one INSERT and one executemany UPDATE per table) regardless of its
+        size. Parent / epic links are resolved at the end in chunked
+        ``UPDATE … FROM (VALUES …)`` statements.
+        """
         log.info("Importing issues for %s (jql: %s)", project.key, jql)
-        last_rank = self.db.scalars(
+        self._preload_issues(project)
+        self._preload_labels()
+        self._last_rank = self.db.scalars(
             select(Issue.rank).where(Issue.project_id == project.id)
             .order_by(Issue.rank.desc()).limit(1)
         ).first()
 
         # (issue_id, parent_key, epic_key) deferred until all issues exist.
         link_pass: list[tuple[int, str | None, str | None]] = []
-        counter = project.issue_counter
         processed = 0
+        uncommitted = 0
 
         fields = list(DEFAULT_ISSUE_FIELDS)
+        if self.options.import_comments:
+            fields.append("comment")
+        if self.options.import_worklogs:
+            fields.append("worklog")
         for fid in self.story_point_field_ids + self.epic_link_field_ids:
             if fid not in fields:
                 fields.append(fid)
 
-        for jira_issue in self.client.iter_issues(jql, fields=fields, expand="renderedFields"):
+        workers = max(1, self.options.workers)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jira-import") as pool:
+            pages = self.client.iter_issue_pages(
+                jql, fields=fields, expand="renderedFields",
+                workers=workers, prefetch=self.options.prefetch or workers,
+            )
+            try:
+                for _, jira_issues in pages:
+                    if not jira_issues:
+                        continue
+                    children = bulk.fetch_children(
+                        self.client, pool, jira_issues,
+                        comments=self.options.import_comments, worklogs=self.options.import_worklogs,
+                    )
+                    self._write_page(project, jira_issues, children, link_pass)
+                    processed += len(jira_issues)
+                    uncommitted += len(jira_issues)
+                    if uncommitted >= self.options.commit_every:
+                        self._commit()
+                        uncommitted = 0
+                        log.info("  ... %s issues processed for %s", processed, project.key)
+            finally:
+                pages.close()
+        self._commit()
+
+        # Second pass: resolve parent / epic links now that all keys are known.
+        self._resolve_links(link_pass)
+        self._commit()
+        log.info("Finished %s: %s issues processed", project.key, processed)
+
+    def _write_page(
+        self,
+        project: Project,
+        jira_issues: list[dict],
+        children: dict[str, tuple[list, list]],
+        link_pass: list[tuple[int, str | None, str | None]],
+    ) -> None:
+        """Upsert one search page of issues with their labels, comments and worklogs."""
+        lookups = self._lookups()
+        rows: dict[str, tuple[str | None, dict]] = {}
+        for jira_issue in jira_issues:
             jkey = jira_issue.get("key")
-            mapped = map_issue_fields(jira_issue, self._lookups())
             ext = str(jira_issue.get("id")) if jira_issue.get("id") else jkey
+            if ext:
+                rows[ext] = (jkey, map_issue_fields(jira_issue, lookups))
+
+        people: list[dict | None] = []
+        for jkey, mapped in rows.values():
+            people += [mapped.get("assignee"), mapped.get("reporter")]
+            comments, worklogs = children.get(jkey, ([], []))
+            people += [map_user(c.get("author")) for c in comments]
+            people += [map_user(w.get("author")) for w in worklogs]
+        self._upsert_users(people)
 
+        counter = project.issue_counter
+        inserts: list[dict] = []
+        updates: list[dict] = []
+        for ext, (jkey, mapped) in rows.items():
             number = self._number_from_key(jkey)
             if number is not None:
                 counter = max(counter, number)
-
-            issue = self.db.scalars(select(Issue).where(Issue.external_id == ext)).first()
-            if issue is None and jkey:
-                issue = self.db.scalars(select(Issue).where(Issue.key == jkey)).first()
-
-            assignee_id = self._upsert_user(mapped.get("assignee"))
-            reporter_id = self._upsert_user(mapped.get("reporter"))
-            type_id = self._resolve_type_id(mapped)
-            status_id = self._resolve_status_id(mapped)
-            priority_id = self._resolve_priority_id(mapped)
-
-            if issue is None:
-                last_rank = rank_between(last_rank, None) if last_rank else initial_rank()
-                issue = Issue(
+            values = {
+                "external_id": ext,
+                "type_id": self._resolve_type_id(mapped),
+                "status_id": self._resolve_status_id(mapped),
+                "summary": mapped["summary"],
+                "description": mapped["description"],
+                "priority_id": self._resolve_priority_id(mapped),
+                "assignee_id": self._user_id(mapped.get("assignee")),
+                "reporter_id": self._user_id(mapped.get("reporter")),
+                "story_points": mapped["story_points"],
+                "due_date": mapped["due_date"],
+                "original_estimate_seconds": mapped["original_estimate_seconds"],
+                "remaining_estimate_seconds": mapped["remaining_estimate_seconds"],
+                "resolution": mapped["resolution"],
+                "resolved_at": mapped["resolved_at"],
+            }
+            for ts in ("created_at", "updated_at"):
+                if mapped.get(ts):
+                    values[ts] = mapped[ts]
+            issue_id = self.issue_ext_map.get(ext) or (self.issue_key_map.get(jkey) if jkey else None)
+            if issue_id is None:
+                now = datetime.now(timezone.utc)
+                values.setdefault("created_at", now)
+                values.setdefault("updated_at", now)
+                values.update(
                     key=jkey,
                     number=number if number is not None else (counter or 1),
                     project_id=project.id,
-                    external_id=ext,
-                    rank=last_rank,
-                    type_id=type_id,
-                    status_id=status_id,
-                    summary=mapped["summary"],
                 )
-                self.db.add(issue)
-                self.stats.issues += 1
+                inserts.append(values)
             else:
-                issue.external_id = ext
+                values["id"] = issue_id
                 if jkey:
-                    issue.key = jkey
+                    values["key"] = jkey
                 if number is not None:
-                    issue.number = number
-                issue.type_id = type_id
-                issue.status_id = status_id
-
-            # Common scalar fields (set on both create + update paths).
-            issue.summary = mapped["summary"]
-            issue.description = mapped["description"]
-            issue.priority_id = priority_id
-            issue.assignee_id = assignee_id
-            issue.reporter_id = reporter_id
-            issue.story_points = mapped["story_points"]
-            issue.due_date = mapped["due_date"]
-            issue.original_estimate_seconds = mapped["original_estimate_seconds"]
-            issue.remaining_estimate_seconds = mapped["remaining_estimate_seconds"]
-            issue.resolution = mapped["resolution"]
-            issue.resolved_at = mapped["resolved_at"]
-            if mapped.get("created_at"):
-                issue.created_at = mapped["created_at"]
-            if mapped.get("updated_at"):
-                issue.updated_at = mapped["updated_at"]
-            issue.labels = resolve_labels(self.db, mapped.get("labels") or [])
-
-            self.db.flush()
+                    values["number"] = number
+                updates.append(values)
+
+        if inserts:
+            ranks = ranks_after(self._last_rank or initial_rank(), len(inserts))
+            for values, rank in zip(inserts, ranks):
+                values["rank"] = rank
+            self._last_rank = ranks[-1]
+            for iid, iext in self.db.execute(
+                insert(Issue).returning(Issue.id, Issue.external_id, sort_by_parameter_order=True),
+                inserts,
+            ):
+                self.issue_ext_map[iext] = iid
+            self.stats.issues += len(inserts)
+        for group in bulk.same_keys(updates):
+            self.db.execute(update(Issue), group)
+        self.issue_ext_map.update({u["external_id"]: u["id"] for u in updates})
+        for ext, (jkey, _) in rows.items():
             if jkey:
-                self.issue_key_map[jkey] = issue.id
-
+                self.issue_key_map[jkey] = self.issue_ext_map[ext]
+        # Persist the highest seen number so future native creates don't collide.
+        if counter > project.issue_counter:
+            project.issue_counter = counter
+
+        ids = {ext: self.issue_ext_map[ext] for ext in rows}
+        key_to_id = {jkey: ids[ext] for ext, (jkey, _) in rows.items() if jkey}
+        bulk.write_labels(
+            self.db, {ids[ext]: mapped.get("labels") or [] for ext, (_, mapped) in rows.items()}, self.label_map,
+        )
+        if self.options.import_comments:
+            self.stats.comments += bulk.write_comments(self.db, children, key_to_id, self._user_id)
+        if self.options.import_worklogs:
+            self.stats.worklogs += bulk.write_worklogs(self.db, children, key_to_id, self._user_id)
+
+        for ext, (_, mapped) in rows.items():
             parent_key = mapped.get("parent_key")
             epic_key = mapped.get("epic_key")
             # If the parent is an epic, treat it as the epic link instead.
@@ -438,45 +605,32 @@ class Importer:
                 epic_key = epic_key or parent_key
                 parent_key = None
             if parent_key or epic_key:
-                link_pass.append((issue.id, parent_key, epic_key))
-
-            if self.options.import_comments:
-                self._import_comments(issue, jkey)
-            if self.options.import_worklogs:
-                self._import_worklogs(issue, jkey)
-
-            processed += 1
-            if processed % self.options.commit_every == 0:
-                self._commit()
-                log.info("  ... %s issues processed for %s", processed, project.key)
-
-        # Persist the highest seen number so future native creates don't collide.
-        project.issue_counter = max(project.issue_counter, counter)
-        self.db.flush()
-        self._commit()
-
-        # Second pass: resolve parent / epic links now that all keys are known.
-        self._resolve_links(link_pass)
-        self._commit()
-        log.info("Finished %s: %s issues processed", project.key, processed)
+                link_pass.append((ids[ext], parent_key, epic_key))
 
     def _resolve_links(self, link_pass: list[tuple[int, str | None, str | None]]) -> None:
-        for issue_id, parent_key, epic_key in link_pass:
-            issue = self.db.get(Issue, issue_id)
-            if issue is None:
-                continue
-            if parent_key:
-                pid = self.issue_key_map.get(parent_key) or self._lookup_issue_id_by_key(parent_key)
-                if pid and pid != issue.id:
-                    issue.parent_id = pid
-            if epic_key:
-                eid = self.issue_key_map.get(epic_key) or self._lookup_issue_id_by_key(epic_key)
-                if eid and eid != issue.id:
-                    issue.epic_id = eid
-        self.db.flush()
-
-    def _lookup_issue_id_by_key(self, key: str) -> int | None:
-        return self.db.scalars(select(Issue.id).where(Issue.key == key)).first()
+        """Set parent / epic ids by key with ``UPDATE … FROM (VALUES …)``.
+
+        Targets are looked up by key across all projects; a missing target
+        (or a self-reference) leaves the current value in place.
+        """
+        parent, epic = aliased(Issue), aliased(Issue)
+        for start in range(0, len(link_pass), _LINK_CHUNK):
+            v = values(
+                column("id", Integer), column("parent_key", String), column("epic_key", String), name="v",
+            ).data(link_pass[start:start + _LINK_CHUNK])
+
+            def target(alias, key):
+                return select(alias.id).where(alias.key == key, alias.id != Issue.id).scalar_subquery()
+
+            self.db.execute(
+                update(Issue)
+                .where(Issue.id == v.c.id)
+                .values(
+                    parent_id=func.coalesce(target(parent, v.c.parent_key), Issue.parent_id),
+                    epic_id=func.coalesce(target(epic, v.c.epic_key), Issue.epic_id),
+                )
+                .execution_options(synchronize_session=False)
+            )
 
     @staticmethod
     def _number_from_key(key: str | None) -> int | None:
@@ -485,71 +639,6 @@ class Importer:
         tail = key.rsplit("-", 1)[-1]
         return int(tail) if tail.isdigit() else None
 
-    # -- comments / worklogs ----------------------------------------------
-    def _import_comments(self, issue: Issue, jkey: str | None) -> None:
-        if not jkey:
-            return
-        from app.migration.mapper import adf_to_text
-        for jc in self.client.iter_comments(jkey):
-            ext = str(jc.get("id")) if jc.get("id") else None
-            if not ext:
-                continue
-            comment = self.db.scalars(
-                select(Comment).where(Comment.external_id == ext)
-            ).first()
-            author_id = self._upsert_user(map_user(jc.get("author")))
-            body = adf_to_text(jc.get("body")) or "(empty comment)"
-            created = parse_jira_datetime(jc.get("created"))
-            updated = parse_jira_datetime(jc.get("updated"))
-            if comment is None:
-                comment = Comment(
-                    issue_id=issue.id, external_id=ext,
-                    author_id=author_id, body=body,
-                )
-                self.db.add(comment)
-                self.stats.comments += 1
-            else:
-                comment.body = body
-                comment.author_id = author_id
-            self.db.flush()
-            if created:
-                comment.created_at = created
-            if updated:
-                comment.updated_at = updated
-
-    def _import_worklogs(self, issue: Issue, jkey: str | None) -> None:
-        if not jkey:
-            return
-        from app.migration.mapper import adf_to_text
-        for wl in self.client.iter_worklogs(jkey):
-            seconds = wl.get("timeSpentSeconds")
-            if not seconds:
-                continue
-            started = parse_jira_datetime(wl.get("started")) or parse_jira_datetime(wl.get("created"))
-            if started is None:
-                continue
-            ext = str(wl.get("id")) if wl.get("id") else None
-            author_id = self._upsert_user(map_user(wl.get("author")))
-            existing = None
-            if ext:
-                # Match an existing worklog for this issue by started+author+secs.
-                existing = self.db.scalars(
-                    select(Worklog).where(
-                        Worklog.issue_id == issue.id,
-                        Worklog.started_at == started,
-                        Worklog.time_spent_seconds == int(seconds),
-                    )
-                ).first()
-            if existing is None:
-                self.db.add(Worklog(
-                    issue_id=issue.id,
-                    author_id=author_id,
-                    time_spent_seconds=int(seconds),
-                    comment=adf_to_text(wl.get("comment")) or None,
-                    started_at=started,
-                ))
-                self.stats.worklogs += 1
-
     # -- top-level pipeline ------------------------------------------------
     def run(self, project_keys: list[str] | None = None, jql_extra: str = "") -> ImportStats:
         log.info("Bootstrapping Trackly schema + defaults...")
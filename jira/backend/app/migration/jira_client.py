@@ -5,12 +5,18 @@ Server/Data Center (Bearer Personal Access Token). Paginated iterators
 transparently handle ``startAt``/``maxResults``/``isLast``/``total`` and the
 newer token-based ``/search/jql`` cursor. Requests retry with backoff on 429
 (honouring ``Retry-After``) and transient 5xx responses.
+
+:meth:`JiraClient.iter_issue_pages` fetches search pages concurrently (the
+underlying ``httpx.Client`` pool is shared across threads) while the caller
+works on the pages already returned.
 """
 from __future__ import annotations
 
 import logging
 import time
+from collections import deque
 from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 import httpx
@@ -236,19 +242,24 @@ class JiraClient:
                      exc.response.status_code)
         yield from self._iter_issues_classic(jql, field_list, expand)
 
+    def _token_page(
+        self, jql: str, fields: list[str] | None, expand: str | None, token: str | None
+    ) -> dict:
+        body: dict[str, Any] = {"jql": jql, "maxResults": PAGE_SIZE}
+        if fields:
+            body["fields"] = fields
+        if expand:
+            body["expand"] = [e.strip() for e in expand.split(",")]
+        if token:
+            body["nextPageToken"] = token
+        return self._post("/rest/api/3/search/jql", json=body)
+
     def _iter_issues_token(
         self, jql: str, fields: list[str] | None, expand: str | None
     ) -> Iterator[dict]:
         next_token: str | None = None
         while True:
-            body: dict[str, Any] = {"jql": jql, "maxResults": PAGE_SIZE}
-            if fields:
-                body["fields"] = fields
-            if expand:
-                body["expand"] = [e.strip() for e in expand.split(",")]
-            if next_token:
-                body["nextPageToken"] = next_token
-            page = self._post("/rest/api/3/search/jql", json=body)
+            page = self._token_page(jql, fields, expand, next_token)
             issues = page.get("issues", [])
             for issue in issues:
                 yield issue
@@ -256,6 +267,92 @@ class JiraClient:
             if page.get("isLast") or not next_token or not issues:
                 break
 
+    def search_page(
+        self,
+        jql: str,
+        fields: list[str] | None = None,
+        expand: str | None = None,
+        start_at: int = 0,
+        max_results: int = PAGE_SIZE,
+    ) -> dict:
+        """One page of the classic offset-paginated ``/search`` (v3, v2 fallback)."""
+        body: dict[str, Any] = {"jql": jql, "startAt": start_at, "maxResults": max_results}
+        if fields:
+            body["fields"] = fields
+        if expand:
+            body["expand"] = [e.strip() for e in expand.split(",")]
+        try:
+            return self._post("/rest/api/3/search", json=body)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:
+                return self._post("/rest/api/2/search", json=body)
+            raise
+
+    def iter_issue_pages(
+        self,
+        jql: str,
+        fields: list[str] | None = None,
+        expand: str | None = None,
+        workers: int = 4,
+        prefetch: int = 4,
+    ) -> Iterator[tuple[int, list[dict]]]:
+        """Yield ``(start_at, issues)`` pages in order, fetching ahead concurrently.
+
+        The first page of the classic ``/search`` reports ``total``, after which
+        up to *prefetch* further pages are requested on *workers* threads. If the
+        classic endpoint is gone (Jira Cloud), the token-paginated
+        ``/search/jql`` is used instead; its pages can only be requested one
+        after another, so just the next page is fetched in the background.
+        """
+        try:
+            first = self.search_page(jql, fields, expand)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code not in (404, 410):
+                raise
+            log.info("Classic /search unavailable (%s); paging /search/jql sequentially",
+                     exc.response.status_code)
+            yield from self._iter_token_pages(jql, fields, expand)
+            return
+
+        issues = first.get("issues", [])
+        yield 0, issues
+        total = first.get("total", 0)
+        step = first.get("maxResults") or PAGE_SIZE
+        offsets = deque(range(len(issues), total, step)) if issues else deque()
+        if not offsets:
+            return
+        pending: deque[tuple[int, Future]] = deque()
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="jira-page") as pool:
+            try:
+                while offsets or pending:
+                    while offsets and len(pending) < max(1, prefetch):
+                        start = offsets.popleft()
+                        pending.append((start, pool.submit(
+                            self.search_page, jql, fields, expand, start, step,
+                        )))
+                    start, future = pending.popleft()
+                    page = future.result()
+                    yield start, page.get("issues", [])
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def _iter_token_pages(
+        self, jql: str, fields: list[str] | None, expand: str | None
+    ) -> Iterator[tuple[int, list[dict]]]:
+        start = 0
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="jira-page") as pool:
+            future = pool.submit(self._token_page, jql, fields, expand, None)
+            while future is not None:
+                page = future.result()
+                issues = page.get("issues", [])
+                token = page.get("nextPageToken")
+                future = None
+                if issues and token and not page.get("isLast"):
+                    future = pool.submit(self._token_page, jql, fields, expand, token)
+                yield start, issues
+                start += len(issues)
+
     def _iter_issues_classic(
         self, jql: str, fields: list[str] | None, expand: str | None
     ) -> Iterator[dict]:
@@ -14,7 +14,7 @@ from app.models.issue import (
     issue_fix_versions,
 )
 from app.models.agile import Board, Sprint
-from app.models.activity import Comment, Attachment, Worklog, IssueHistory, Notification
+from app.models.activity import Comment, Attachment, AttachmentBlob, Worklog, IssueHistory, Notification, NotificationOutbox
 from app.models.customfield import CustomField, CustomFieldValue, SavedFilter
 from app.models.rbac import (
     Group,
@@ -24,9 +24,11 @@ from app.models.rbac import (
     PermissionScheme,
     PermissionGrant,
     GlobalPermissionGrant,
+    EffectiveProjectPermission,
 )
 from app.models.identity import MailConfig, JiraConnection, IdentityProvider, AuthSettings
 from app.models.sync import ProjectSyncLink, SyncRun
+from app.models.job import Job
 from app.models.notify_prefs import UserNotificationPreference, NOTIFICATION_EVENTS, CHANNELS
 
 __all__ = [
@@ -49,9 +51,11 @@ __all__ = [
     "Sprint",
     "Comment",
     "Attachment",
+    "AttachmentBlob",
     "Worklog",
     "IssueHistory",
     "Notification",
+    "NotificationOutbox",
     "CustomField",
     "CustomFieldValue",
     "SavedFilter",
@@ -62,12 +66,14 @@ __all__ = [
     "PermissionScheme",
     "PermissionGrant",
     "GlobalPermissionGrant",
+    "EffectiveProjectPermission",
     "MailConfig",
     "JiraConnection",
     "IdentityProvider",
     "AuthSettings",
     "ProjectSyncLink",
     "SyncRun",
+    "Job",
     "UserNotificationPreference",
     "NOTIFICATION_EVENTS",
     "CHANNELS",
@@ -32,12 +32,32 @@ class Attachment(Base, TimestampMixin):
     filename: Mapped[str] = mapped_column(String(512), nullable=False)
     content_type: Mapped[str] = mapped_column(String(160), default="application/octet-stream", nullable=False)
     size_bytes: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
-    storage_key: Mapped[str] = mapped_column(String(512), nullable=False)  # path under attachments_dir
+    storage_key: Mapped[str] = mapped_column(String(512), nullable=False)  # key in the attachment store
+    # Content hash of the stored blob (see AttachmentBlob); NULL for files
+    # uploaded before content addressing, which own their storage_key alone.
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     issue = relationship("Issue", back_populates="attachments")
     author = relationship("User")
 
 
+class AttachmentBlob(Base):
+    """One stored file, shared by every attachment with the same content.
+
+    ``ref_count`` is maintained by a database trigger on ``attachments``
+    (see :mod:`app.services.attachments`), so cascaded issue and project
+    deletes release their blobs too; unreferenced blobs are swept later.
+    """
+
+    __tablename__ = "attachment_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    storage_key: Mapped[str] = mapped_column(String(512), nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class Worklog(Base, TimestampMixin):
     __tablename__ = "worklogs"
 
@@ -83,3 +103,26 @@ class Notification(Base):
 
     user = relationship("User", foreign_keys=[user_id])
     actor = relationship("User", foreign_keys=[actor_id])
+
+
+class NotificationOutbox(Base):
+    """An email notification waiting for the background mailer.
+
+    Rows are written in the same transaction as the change that caused them and
+    delivered later by :mod:`app.services.outbox`, so a slow or unreachable SMTP
+    relay never holds up the API request.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    to_address: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(500), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)  # pending | sent | failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,49 @@
+"""Durable background jobs, run by the separate worker process (``app.worker``)."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class Job(Base):
+    """One unit of background work, leased by a worker with ``SKIP LOCKED``.
+
+    See :mod:`app.services.jobs` for the lifecycle: ``queued`` → ``running``
+    (leased, heart-beating) → ``done`` | ``failed``, with retries re-queued
+    after a backoff and expired leases picked up again by another worker.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # At most one live job per dedupe key (e.g. one sync per project).
+        Index(
+            "uq_jobs_active_dedupe", "dedupe_key", unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+        Index("ix_jobs_due", "status", "run_after"),
+        Index("ix_jobs_concurrency", "concurrency_key", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(40), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, default="{}", nullable=False)  # JSON-encoded
+    dedupe_key: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    # Jobs sharing a concurrency key run at most concurrency_limit at a time.
+    concurrency_key: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    concurrency_limit: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    # queued | running | done | failed
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    lease_owner: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -7,10 +7,12 @@ The model mirrors Jira's permission architecture so schemes import cleanly:
 - A permission scheme is a reusable set of grants (permission -> holder).
 - A project points at one permission scheme.
 - Global permission grants govern instance-wide rights (e.g. ADMINISTER).
+- Effective project permissions are the schemes/roles above flattened per
+  project (maintained by services.permission_index, never edited directly).
 """
 from __future__ import annotations
 
-from sqlalchemy import Boolean, ForeignKey, String, Table, Column, Text, UniqueConstraint
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Table, Column, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -112,3 +114,22 @@ class GlobalPermissionGrant(Base):
     permission: Mapped[str] = mapped_column(String(60), nullable=False, index=True)
     holder_type: Mapped[str] = mapped_column(String(20), nullable=False)  # group | user
     holder_value: Mapped[str] = mapped_column(String(255), nullable=False)
+
+
+class EffectiveProjectPermission(Base):
+    """One (project, permission) held by one principal, scheme and roles resolved.
+
+    ``holder_type`` is ``user`` / ``group`` (``holder_id`` set), or ``anyone`` /
+    ``reporter`` / ``assignee`` (``holder_id`` 0). Group *membership* is not
+    expanded, so adding a user to a group needs no recomputation.
+    """
+
+    __tablename__ = "effective_project_permissions"
+    __table_args__ = (
+        Index("ix_effective_perm_holder", "permission", "holder_type", "holder_id", "project_id"),
+    )
+
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    permission: Mapped[str] = mapped_column(String(60), primary_key=True)
+    holder_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    holder_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
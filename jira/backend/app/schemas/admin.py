@@ -184,3 +184,37 @@ class IdentityProviderUpdate(IdentityProviderIn):
     enabled: bool | None = None
     auto_provision_users: bool | None = None
     sync_groups: bool | None = None
+
+
+class RankPressureOut(BaseModel):
+    project_id: int
+    project_key: str
+    issues: int
+    max_length: int
+    avg_length: float
+    long_ranks: int
+    needs_rebalance: bool
+
+
+class RouteMetricsOut(BaseModel):
+    requests: int
+    errors: int
+    over_budget: int
+    avg_statements: float
+    max_statements: int
+    avg_db_ms: float
+    avg_ms: float
+    max_ms: float
+
+
+class PoolStatsOut(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+
+
+class RequestMetricsOut(BaseModel):
+    statement_budget: int
+    # "METHOD /path/template" -> totals since start-up or the last reset
+    routes: dict[str, RouteMetricsOut]
+    pools: dict[str, PoolStatsOut]
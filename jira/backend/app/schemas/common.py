@@ -23,5 +23,18 @@ class Page(BaseModel, Generic[T]):
         return (self.total + self.page_size - 1) // self.page_size if self.page_size else 0
 
 
+class CursorPage(Page[T], Generic[T]):
+    """A page that can also be continued by keyset cursor.
+
+    ``next_cursor`` is null on the last page. When ``total_exact`` is false,
+    ``total`` is a lower bound (the count cap) and ``total_estimate`` carries
+    the database's estimate where one is available.
+    """
+
+    next_cursor: str | None = None
+    total_exact: bool = True
+    total_estimate: int | None = None
+
+
 class Message(BaseModel):
     detail: str
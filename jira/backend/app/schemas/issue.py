@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 from app.schemas.common import ORMModel
 from app.schemas.meta import IssueTypeOut, PriorityOut, StatusOut
@@ -174,3 +174,9 @@ class IssueRankUpdate(BaseModel):
     before_id: int | None = None
     sprint_id: int | None = None
     status_id: int | None = None
+
+
+class IssueBulkRankUpdate(IssueRankUpdate):
+    # Multi-select drag: the issues land together, in this order, between
+    # `after_id` and `before_id` (or at the bottom for a bare sprint/status move).
+    issue_ids: list[int] = Field(min_length=1, max_length=1000)
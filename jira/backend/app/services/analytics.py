@@ -3,14 +3,30 @@
 Beyond descriptive stats (counts, breakdowns, velocity) this module computes
 "needs attention" signals — overdue, high-priority, blocked, unassigned and
 stale work, plus active-sprint risk — so the UI can lead with what to act on now.
+
+Everything is computed for a batch of projects at once: category counts,
+attention buckets, sprint health and velocity are each one grouped query with
+``FILTER``-ed aggregates (``count(*) FILTER (WHERE overdue)``, ...), and issue
+rows are only read for the handful of samples a response shows. The overview
+therefore costs a fixed number of queries however many projects it covers.
+
+Per-project results are kept for ``settings.analytics_cache_ttl_seconds`` and
+dropped as soon as a flush touches that project's issues, links or sprints
+(and again on commit); a change to statuses, priorities or issue types drops
+every project.
 """
 from __future__ import annotations
 
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, event, func, inspect, literal, select
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.config import settings
+
 from app.models import Board, Component, Issue, IssueLink, IssueType, Priority, Project, Sprint, Status
 from app.models.issue import issue_components
 from app.schemas.analytics import (
@@ -48,22 +64,137 @@ def _apply_window(q, start: datetime | None, end: datetime | None):
     return q
 
 
-def _category_counts(
-    db: Session, project_ids: list[int] | None,
+# --- Short-lived per-project cache ------------------------------------------
+_cache_lock = threading.Lock()
+# project_id -> {kind: (expires_at, generation, value)}
+_cache: dict[int, dict[str, tuple[float, tuple[int, int], object]]] = {}
+_generations: dict[int, int] = defaultdict(int)
+_global_generation = 0
+
+
+def _generation(pid: int) -> tuple[int, int]:
+    return _global_generation, _generations[pid]
+
+
+def invalidate_projects(project_ids=None) -> None:
+    """Drop cached analytics for *project_ids* (every project when None)."""
+    global _global_generation
+    with _cache_lock:
+        if project_ids is None:
+            _cache.clear()
+            _global_generation += 1
+            return
+        for pid in project_ids:
+            _cache.pop(pid, None)
+            _generations[pid] += 1
+
+
+def _cached(kind: str, project_ids: list[int], compute) -> dict:
+    """Per-project values of *kind*; ``compute(missing_ids)`` fills cache misses in one batch."""
+    if not project_ids:
+        return {}
+    now = time.monotonic()
+    out: dict = {}
+    missing: list[int] = []
+    with _cache_lock:
+        for pid in project_ids:
+            hit = _cache.get(pid, {}).get(kind)
+            if hit is not None and hit[0] > now and hit[1] == _generation(pid):
+                out[pid] = hit[2]
+            else:
+                missing.append(pid)
+        seen = {pid: _generation(pid) for pid in missing}
+    if missing:
+        fresh = compute(missing)
+        expires = time.monotonic() + settings.analytics_cache_ttl_seconds
+        with _cache_lock:
+            for pid in missing:
+                value = fresh.get(pid)
+                # A write that landed while we computed makes this result stale.
+                if _generation(pid) == seen[pid]:
+                    _cache.setdefault(pid, {})[kind] = (expires, seen[pid], value)
+                out[pid] = value
+    return out
+
+
+def _touched_projects(session: Session) -> set[int] | None:
+    """Project ids whose analytics a flush may have changed (None => all)."""
+    pids: set[int] = set()
+    issue_ids: set[int] = set()
+    board_ids: set[int] = set()
+    for obj in list(session.new) + list(session.deleted) + list(session.dirty):
+        if isinstance(obj, Issue):
+            pids.add(obj.project_id)
+            pids.update(p for p in inspect(obj).attrs.project_id.history.deleted if p)
+        elif isinstance(obj, IssueLink):
+            issue_ids.update((obj.source_id, obj.target_id))
+        elif isinstance(obj, Sprint):
+            board_ids.add(obj.board_id)
+        elif isinstance(obj, (Status, Priority, IssueType)) and obj in session.dirty:
+            return None  # categories / ranks / type names feed every project
+    if issue_ids:
+        pids.update(session.connection().scalars(select(Issue.project_id).where(Issue.id.in_(issue_ids))))
+    if board_ids:
+        pids.update(session.connection().scalars(select(Board.project_id).where(Board.id.in_(board_ids))))
+    pids.discard(None)
+    return pids
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session: Session, flush_context) -> None:
+    pids = _touched_projects(session)
+    if pids is None:
+        session.info["analytics_dirty_all"] = True
+        invalidate_projects()
+    elif pids:
+        session.info.setdefault("analytics_dirty", set()).update(pids)
+        invalidate_projects(pids)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session: Session) -> None:
+    # Again on commit: a concurrent read between flush and commit could have
+    # cached pre-commit numbers.
+    if session.info.pop("analytics_dirty_all", False):
+        invalidate_projects()
+    pids = session.info.pop("analytics_dirty", None)
+    if pids:
+        invalidate_projects(pids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    session.info.pop("analytics_dirty_all", None)
+    session.info.pop("analytics_dirty", None)
+
+
+def _category_counts_by_project(
+    db: Session, project_ids: list[int],
     start: datetime | None = None, end: datetime | None = None,
-) -> dict[str, int]:
-    q = (
-        select(Status.category, func.count(Issue.id))
-        .join(Status, Status.id == Issue.status_id)
-        .group_by(Status.category)
-    )
-    if project_ids is not None:
-        q = q.where(Issue.project_id.in_(project_ids or [-1]))
-    q = _apply_window(q, start, end)
-    rows = db.execute(q).all()
+) -> dict[int, dict[str, int]]:
+    def compute(ids: list[int]) -> dict[int, dict[str, int]]:
+        q = (
+            select(Issue.project_id, Status.category, func.count(Issue.id))
+            .join(Status, Status.id == Issue.status_id)
+            .where(Issue.project_id.in_(ids))
+            .group_by(Issue.project_id, Status.category)
+        )
+        q = _apply_window(q, start, end)
+        out = {pid: {"todo": 0, "in_progress": 0, "done": 0} for pid in ids}
+        for pid, category, count in db.execute(q).all():
+            out[pid][category] = out[pid].get(category, 0) + count
+        return out
+
+    if start is None and end is None:
+        return _cached("categories", project_ids, compute)
+    return compute(project_ids) if project_ids else {}
+
+
+def _sum_counts(per_project: dict[int, dict[str, int]]) -> dict[str, int]:
     out = {"todo": 0, "in_progress": 0, "done": 0}
-    for category, count in rows:
-        out[category] = out.get(category, 0) + count
+    for counts in per_project.values():
+        for category, count in counts.items():
+            out[category] = out.get(category, 0) + count
     return out
 
 
@@ -147,48 +278,114 @@ def _by_component(
     return items
 
 
+# --- Sprint aggregates -------------------------------------------------------
+def _sprint_totals(db: Session, sprint_ids: list[int]) -> dict[int, tuple[float, int, float, int]]:
+    """sprint_id -> (points, issues, done points, done issues) in one grouped query."""
+    if not sprint_ids:
+        return {}
+    done = Status.category == "done"
+    rows = db.execute(
+        select(
+            Issue.sprint_id,
+            func.coalesce(func.sum(Issue.story_points), 0.0),
+            func.count(Issue.id),
+            func.coalesce(func.sum(Issue.story_points).filter(done), 0.0),
+            func.count(Issue.id).filter(done),
+        )
+        .join(Status, Status.id == Issue.status_id)
+        .where(Issue.sprint_id.in_(sprint_ids))
+        .group_by(Issue.sprint_id)
+    ).all()
+    return {sid: (float(pts or 0.0), int(n or 0), float(dpts or 0.0), int(dn or 0)) for sid, pts, n, dpts, dn in rows}
+
+
+def _velocity_by_project(
+    db: Session, project_ids: list[int],
+    start: datetime | None = None, end: datetime | None = None,
+) -> dict[int, list[VelocityPoint]]:
+    # The last _VELOCITY_SPRINTS closed sprints per project (within the window,
+    # when one is set), oldest first for charting.
+    def compute(ids: list[int]) -> dict[int, list[VelocityPoint]]:
+        rn = func.row_number().over(
+            partition_by=Board.project_id,
+            order_by=(Sprint.complete_date.desc().nullslast(), Sprint.id.desc()),
+        )
+        q = (
+            select(Board.project_id, Sprint.id, Sprint.name, rn.label("rn"))
+            .join(Board, Board.id == Sprint.board_id)
+            .where(Board.project_id.in_(ids), Sprint.state == "closed")
+        )
+        if start is not None:
+            q = q.where(Sprint.complete_date >= start)
+        if end is not None:
+            q = q.where(Sprint.complete_date < end)
+        sub = q.subquery()
+        sprints = db.execute(
+            select(sub.c.project_id, sub.c.id, sub.c.name)
+            .where(sub.c.rn <= _VELOCITY_SPRINTS)
+            .order_by(sub.c.project_id, sub.c.rn.desc())
+        ).all()
+        totals = _sprint_totals(db, [sid for _, sid, _ in sprints])
+        out: dict[int, list[VelocityPoint]] = {pid: [] for pid in ids}
+        for pid, sid, name in sprints:
+            pts, _n, dpts, dn = totals.get(sid, (0.0, 0, 0.0, 0))
+            out[pid].append(VelocityPoint(
+                sprint_id=sid, sprint_name=name, committed_points=pts,
+                completed_points=dpts, completed_issues=dn,
+            ))
+        return out
+
+    if start is None and end is None:
+        return _cached("velocity", project_ids, compute)
+    return compute(project_ids) if project_ids else {}
+
+
 def _velocity(
     db: Session, project_id: int,
     start: datetime | None = None, end: datetime | None = None,
 ) -> list[VelocityPoint]:
-    # Closed sprints on this project's boards, most-recent first, then reversed
-    # to chronological order for charting. When a window is set, only sprints
-    # completed within it are included.
-    q = (
-        select(Sprint)
-        .join(Board, Board.id == Sprint.board_id)
-        .where(Board.project_id == project_id, Sprint.state == "closed")
+    return _velocity_by_project(db, [project_id], start, end)[project_id]
+
+
+def _health(sprint: Sprint, totals: tuple[float, int, float, int], now: datetime) -> SprintHealth:
+    total_pts, total_cnt, done_pts, done_cnt = totals
+    incomplete = total_cnt - done_cnt
+    pct = (done_pts / total_pts) if total_pts > 0 else ((done_cnt / total_cnt) if total_cnt else 0.0)
+    days_remaining = (sprint.end_date.date() - now.date()).days if sprint.end_date else None
+    at_risk, reason = False, None
+    if days_remaining is not None and incomplete > 0:
+        if days_remaining < 0:
+            at_risk, reason = True, f"Ended {abs(days_remaining)}d ago with {incomplete} unfinished"
+        elif days_remaining <= 3 and pct < 0.7:
+            at_risk, reason = True, f"{days_remaining}d left · {round(pct * 100)}% done · {incomplete} unfinished"
+    return SprintHealth(
+        sprint_id=sprint.id, name=sprint.name, goal=sprint.goal, end_date=sprint.end_date,
+        days_remaining=days_remaining, total_points=float(total_pts), completed_points=done_pts,
+        percent_complete=round(pct, 3), incomplete_issues=incomplete, at_risk=at_risk, risk_reason=reason,
     )
-    if start is not None:
-        q = q.where(Sprint.complete_date >= start)
-    if end is not None:
-        q = q.where(Sprint.complete_date < end)
-    sprints = db.scalars(
-        q.order_by(Sprint.complete_date.desc().nullslast(), Sprint.id.desc()).limit(_VELOCITY_SPRINTS)
-    ).all()
-    points: list[VelocityPoint] = []
-    for sprint in reversed(sprints):
-        committed = db.scalar(
-            select(func.coalesce(func.sum(Issue.story_points), 0.0)).where(Issue.sprint_id == sprint.id)
-        ) or 0.0
-        done = db.execute(
-            select(
-                func.coalesce(func.sum(Issue.story_points), 0.0),
-                func.count(Issue.id),
-            )
-            .join(Status, Status.id == Issue.status_id)
-            .where(Issue.sprint_id == sprint.id, Status.category == "done")
-        ).one()
-        points.append(
-            VelocityPoint(
-                sprint_id=sprint.id,
-                sprint_name=sprint.name,
-                committed_points=float(committed),
-                completed_points=float(done[0] or 0.0),
-                completed_issues=int(done[1] or 0),
-            )
-        )
-    return points
+
+
+def _sprint_health_by_project(db: Session, project_ids: list[int], now: datetime) -> dict[int, SprintHealth | None]:
+    def compute(ids: list[int]) -> dict[int, SprintHealth | None]:
+        # The most recent active sprint per project.
+        active: dict[int, Sprint] = {}
+        for pid, sprint in db.execute(
+            select(Board.project_id, Sprint).join(Board, Board.id == Sprint.board_id)
+            .where(Board.project_id.in_(ids), Sprint.state == "active")
+            .order_by(Sprint.id.desc())
+        ).all():
+            active.setdefault(pid, sprint)
+        totals = _sprint_totals(db, [s.id for s in active.values()])
+        return {
+            pid: (_health(active[pid], totals.get(active[pid].id, (0.0, 0, 0.0, 0)), now) if pid in active else None)
+            for pid in ids
+        }
+
+    return _cached("sprint_health", project_ids, compute)
+
+
+def _sprint_health(db: Session, project_id: int, now: datetime) -> SprintHealth | None:
+    return _sprint_health_by_project(db, [project_id], now)[project_id]
 
 
 # --- "Needs attention" engine ---------------------------------------------
@@ -196,18 +393,80 @@ def _now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _open_issues(db: Session, project_id: int) -> list[Issue]:
-    return list(
-        db.scalars(
-            select(Issue)
-            .join(Status, Status.id == Issue.status_id)
-            .where(Issue.project_id == project_id, Status.category != "done")
-            .options(
-                joinedload(Issue.priority), joinedload(Issue.assignee),
-                joinedload(Issue.status), joinedload(Issue.type),
-            )
+_ATTENTION_KEYS = ["overdue", "high_priority", "blocked", "open_bugs", "unassigned",
+                   "stale", "stale_wip", "low_priority", "low_priority_wip"]
+
+
+def _bucket_conditions(now: datetime) -> dict:
+    """SQL predicate per attention bucket, applied on top of "open" issues.
+
+    Expects Issue joined to Status and outer-joined to Priority and IssueType.
+    """
+    stale_cut = now - timedelta(days=_STALE_DAYS)
+    wip_cut = now - timedelta(days=_STALE_WIP_DAYS)
+    in_progress = Status.category == "in_progress"
+    low = Priority.rank >= _LOW_PRIORITY_RANK
+    return {
+        "overdue": Issue.due_date < now.date(),
+        "high_priority": Priority.rank <= _HIGH_PRIORITY_RANK,
+        "blocked": Issue.id.in_(select(IssueLink.target_id).where(IssueLink.link_type == "blocks")),
+        "open_bugs": func.lower(IssueType.name) == "bug",
+        "unassigned": Issue.assignee_id.is_(None),
+        "stale": Issue.updated_at < stale_cut,
+        # Low-priority work that's actively in progress — effort going to
+        # low-value work while higher-priority items wait.
+        "stale_wip": and_(in_progress, Issue.updated_at < wip_cut),
+        "low_priority": low,
+        "low_priority_wip": and_(low, in_progress),
+    }
+
+
+def _open_issue_select(*cols):
+    return (
+        select(*cols)
+        .join(Status, Status.id == Issue.status_id)
+        .outerjoin(Priority, Priority.id == Issue.priority_id)
+        .outerjoin(IssueType, IssueType.id == Issue.type_id)
+        .where(Status.category != "done")
+    )
+
+
+def _attention_counts(db: Session, project_ids: list[int], now: datetime) -> dict[int, dict[str, int]]:
+    """Per-project open-issue count for every attention bucket, in one query."""
+    def compute(ids: list[int]) -> dict[int, dict[str, int]]:
+        conds = _bucket_conditions(now)
+        q = _open_issue_select(
+            Issue.project_id, *(func.count(Issue.id).filter(conds[k]).label(k) for k in _ATTENTION_KEYS)
+        ).where(Issue.project_id.in_(ids)).group_by(Issue.project_id)
+        out = {pid: dict.fromkeys(_ATTENTION_KEYS, 0) for pid in ids}
+        for row in db.execute(q).all():
+            out[row.project_id] = {k: int(getattr(row, k) or 0) for k in _ATTENTION_KEYS}
+        return out
+
+    return _cached("attention", project_ids, compute)
+
+
+def _sample_order(key: str, now: datetime) -> list:
+    today = literal(now.date())
+    if key == "overdue":
+        return [Issue.due_date.asc(), Issue.id.asc()]
+    if key == "high_priority":
+        return [Priority.rank.asc(), func.coalesce(Issue.due_date, today).asc(), Issue.id.asc()]
+    return [Issue.updated_at.asc(), Issue.id.asc()]
+
+
+def _sample_issues(db: Session, project_ids: list[int], key: str, now: datetime, limit: int) -> list[Issue]:
+    q = (
+        _open_issue_select(Issue)
+        .where(Issue.project_id.in_(project_ids), _bucket_conditions(now)[key])
+        .options(
+            joinedload(Issue.priority), joinedload(Issue.assignee),
+            joinedload(Issue.status), joinedload(Issue.type),
         )
+        .order_by(*_sample_order(key, now))
+        .limit(limit)
     )
+    return list(db.scalars(q).unique())
 
 
 def _attn_issue(i: Issue, now: datetime) -> AttentionIssue:
@@ -225,80 +484,11 @@ def _attn_issue(i: Issue, now: datetime) -> AttentionIssue:
     )
 
 
-def _sprint_health(db: Session, project_id: int, now: datetime) -> SprintHealth | None:
-    sprint = db.scalars(
-        select(Sprint).join(Board, Board.id == Sprint.board_id)
-        .where(Board.project_id == project_id, Sprint.state == "active")
-        .order_by(Sprint.id.desc()).limit(1)
-    ).first()
-    if not sprint:
-        return None
-    total_pts = db.scalar(
-        select(func.coalesce(func.sum(Issue.story_points), 0.0)).where(Issue.sprint_id == sprint.id)
-    ) or 0.0
-    done_pts, done_cnt = db.execute(
-        select(func.coalesce(func.sum(Issue.story_points), 0.0), func.count(Issue.id))
-        .join(Status, Status.id == Issue.status_id)
-        .where(Issue.sprint_id == sprint.id, Status.category == "done")
-    ).one()
-    total_cnt = db.scalar(select(func.count(Issue.id)).where(Issue.sprint_id == sprint.id)) or 0
-    done_pts = float(done_pts or 0.0)
-    done_cnt = int(done_cnt or 0)
-    incomplete = int(total_cnt) - done_cnt
-    pct = (done_pts / total_pts) if total_pts > 0 else ((done_cnt / total_cnt) if total_cnt else 0.0)
-    days_remaining = (sprint.end_date.date() - now.date()).days if sprint.end_date else None
-    at_risk, reason = False, None
-    if days_remaining is not None and incomplete > 0:
-        if days_remaining < 0:
-            at_risk, reason = True, f"Ended {abs(days_remaining)}d ago with {incomplete} unfinished"
-        elif days_remaining <= 3 and pct < 0.7:
-            at_risk, reason = True, f"{days_remaining}d left · {round(pct * 100)}% done · {incomplete} unfinished"
-    return SprintHealth(
-        sprint_id=sprint.id, name=sprint.name, goal=sprint.goal, end_date=sprint.end_date,
-        days_remaining=days_remaining, total_points=float(total_pts), completed_points=done_pts,
-        percent_complete=round(pct, 3), incomplete_issues=incomplete, at_risk=at_risk, risk_reason=reason,
-    )
-
-
-def compute_attention(db: Session, project: Project, with_samples: bool = True) -> dict:
-    """Compute the per-project attention signals, score and active-sprint risk."""
-    now = _now()
-    today = now.date()
-    opens = _open_issues(db, project.id)
-    open_ids = [i.id for i in opens]
-    blocked_ids: set[int] = set()
-    if open_ids:
-        blocked_ids = set(
-            db.scalars(
-                select(IssueLink.target_id).where(
-                    IssueLink.link_type == "blocks", IssueLink.target_id.in_(open_ids)
-                )
-            )
-        )
-    stale_cut = now - timedelta(days=_STALE_DAYS)
-    wip_cut = now - timedelta(days=_STALE_WIP_DAYS)
-
-    groups: dict[str, list[Issue]] = {
-        "overdue": [i for i in opens if i.due_date and i.due_date < today],
-        "high_priority": [i for i in opens if i.priority and i.priority.rank <= _HIGH_PRIORITY_RANK],
-        "blocked": [i for i in opens if i.id in blocked_ids],
-        "open_bugs": [i for i in opens if i.type and i.type.name.lower() == "bug"],
-        "unassigned": [i for i in opens if i.assignee_id is None],
-        "stale": [i for i in opens if i.updated_at and i.updated_at < stale_cut],
-        "stale_wip": [
-            i for i in opens
-            if i.status and i.status.category == "in_progress" and i.updated_at and i.updated_at < wip_cut
-        ],
-        "low_priority": [i for i in opens if i.priority and i.priority.rank >= _LOW_PRIORITY_RANK],
-    }
-    # Low-priority work that's actively in progress — effort going to low-value
-    # work while higher-priority items wait.
-    groups["low_priority_wip"] = [
-        i for i in groups["low_priority"]
-        if i.status and i.status.category == "in_progress"
-    ]
-    sprint = _sprint_health(db, project.id, now)
-    score = sum(_W[k] * len(v) for k, v in groups.items())
+def _attention(
+    db: Session, project: Project, counts: dict[str, int], sprint: SprintHealth | None,
+    now: datetime, with_samples: bool,
+) -> dict:
+    score = sum(_W[k] * n for k, n in counts.items())
     if sprint and sprint.at_risk:
         score += _W["at_risk_sprint"]
 
@@ -325,50 +515,49 @@ def compute_attention(db: Session, project: Project, with_samples: bool = True)
                     f"project = {k} AND priority IN (Low, Lowest) AND statusCategory != done ORDER BY updated ASC"),
     }
 
-    def _samples(key: str, items: list[Issue]) -> list[AttentionIssue]:
-        if not with_samples:
-            return []
-        if key == "overdue":
-            items = sorted(items, key=lambda i: (i.due_date or today))
-        elif key == "high_priority":
-            items = sorted(items, key=lambda i: (i.priority.rank if i.priority else 99, i.due_date or today))
-        else:
-            items = sorted(items, key=lambda i: (i.updated_at or now))
-        return [_attn_issue(i, now) for i in items[:5]]
-
     order = ["overdue", "high_priority", "blocked", "unassigned", "stale_wip",
              "open_bugs", "low_priority_wip", "stale", "low_priority"]
     items: list[AttentionItem] = []
     for key in order:
-        grp = groups[key]
-        if not grp:
+        if not counts[key]:
             continue
         label, desc, sev, tql = meta[key]
-        items.append(AttentionItem(key=key, label=label, description=desc, count=len(grp),
-                                   severity=sev, tql=tql, samples=_samples(key, grp)))
+        samples = []
+        if with_samples:
+            samples = [_attn_issue(i, now) for i in _sample_issues(db, [project.id], key, now, 5)]
+        items.append(AttentionItem(key=key, label=label, description=desc, count=counts[key],
+                                   severity=sev, tql=tql, samples=samples))
 
     reasons: list[str] = []
-    if groups["overdue"]:
-        reasons.append(f"{len(groups['overdue'])} overdue")
-    if groups["high_priority"]:
-        reasons.append(f"{len(groups['high_priority'])} high-priority")
-    if groups["blocked"]:
-        reasons.append(f"{len(groups['blocked'])} blocked")
+    if counts["overdue"]:
+        reasons.append(f"{counts['overdue']} overdue")
+    if counts["high_priority"]:
+        reasons.append(f"{counts['high_priority']} high-priority")
+    if counts["blocked"]:
+        reasons.append(f"{counts['blocked']} blocked")
     if sprint and sprint.at_risk:
         reasons.append("sprint at risk")
-    if groups["unassigned"] and len(reasons) < 3:
-        reasons.append(f"{len(groups['unassigned'])} unassigned")
+    if counts["unassigned"] and len(reasons) < 3:
+        reasons.append(f"{counts['unassigned']} unassigned")
 
-    return {"items": items, "score": score, "sprint": sprint, "groups": groups,
+    return {"items": items, "score": score, "sprint": sprint, "counts": counts,
             "reasons": reasons[:3], "now": now}
 
 
+def compute_attention(db: Session, project: Project, with_samples: bool = True) -> dict:
+    """Compute the per-project attention signals, score and active-sprint risk."""
+    now = _now()
+    counts = _attention_counts(db, [project.id], now)[project.id]
+    sprint = _sprint_health(db, project.id, now)
+    return _attention(db, project, counts, sprint, now, with_samples)
+
+
 def project_stats(
     db: Session, project: Project,
     start: datetime | None = None, end: datetime | None = None, window: Window | None = None,
 ) -> ProjectStats:
     pid = [project.id]
-    cats = _category_counts(db, pid, start, end)
+    cats = _category_counts_by_project(db, pid, start, end)[project.id]
     total = sum(cats.values())
     closed = cats.get("done", 0)
     velocity = _velocity(db, project.id, start, end)
@@ -401,15 +590,12 @@ def project_stats(
 
 
 def _project_summary(
-    db: Session, project: Project, att: dict,
-    start: datetime | None = None, end: datetime | None = None,
+    project: Project, att: dict, cats: dict[str, int], velocity: list[VelocityPoint],
 ) -> ProjectSummary:
-    cats = _category_counts(db, [project.id], start, end)
     total = sum(cats.values())
     closed = cats.get("done", 0)
-    velocity = _velocity(db, project.id, start, end)
     avg_pts = (sum(v.completed_points for v in velocity) / len(velocity)) if velocity else 0.0
-    g = att["groups"]
+    c = att["counts"]
     sprint = att["sprint"]
     return ProjectSummary(
         project_id=project.id,
@@ -422,10 +608,10 @@ def _project_summary(
         resolution_rate=(closed / total) if total else 0.0,
         avg_velocity_points=round(avg_pts, 2),
         attention_score=att["score"],
-        overdue=len(g["overdue"]),
-        high_priority_open=len(g["high_priority"]),
-        unassigned_open=len(g["unassigned"]),
-        blocked=len(g["blocked"]),
+        overdue=c["overdue"],
+        high_priority_open=c["high_priority"],
+        unassigned_open=c["unassigned"],
+        blocked=c["blocked"],
         at_risk_sprint=bool(sprint and sprint.at_risk),
         needs_attention=att["score"] > 0,
         top_reasons=att["reasons"],
@@ -436,7 +622,10 @@ def overview_stats(
     db: Session, project_ids: list[int] | None, scope: str,
     start: datetime | None = None, end: datetime | None = None, window: Window | None = None,
 ) -> OverviewStats:
-    """Aggregate across the given projects (None => every project)."""
+    """Aggregate across the given projects (None => every project).
+
+    Issues a fixed number of queries however many projects are included.
+    """
     if project_ids is None:
         projects = list(db.scalars(select(Project).where(Project.is_archived.is_(False))))
     else:
@@ -444,35 +633,40 @@ def overview_stats(
             db.scalars(select(Project).where(Project.id.in_(project_ids or [-1]), Project.is_archived.is_(False)))
         )
     ids = [p.id for p in projects]
-    cats = _category_counts(db, ids if ids else [-1], start, end)
+    now = _now()
+    cats_by = _category_counts_by_project(db, ids, start, end)
+    counts_by = _attention_counts(db, ids, now)
+    sprint_by = _sprint_health_by_project(db, ids, now)
+    velocity_by = _velocity_by_project(db, ids, start, end)
+    cats = _sum_counts(cats_by)
     total = sum(cats.values())
     closed = cats.get("done", 0)
 
     summaries: list[ProjectSummary] = []
-    top_pool: list[tuple[int, float, AttentionIssue]] = []  # (bucket, sortkey, issue)
     tot_overdue = tot_unassigned = tot_high = tot_blocked = at_risk = needs = 0
     for p in projects:
-        att = compute_attention(db, p, with_samples=True)
-        summaries.append(_project_summary(db, p, att, start, end))
-        g = att["groups"]
-        now = att["now"]
-        tot_overdue += len(g["overdue"])
-        tot_unassigned += len(g["unassigned"])
-        tot_high += len(g["high_priority"])
-        tot_blocked += len(g["blocked"])
+        att = _attention(db, p, counts_by[p.id], sprint_by[p.id], now, with_samples=False)
+        summaries.append(_project_summary(p, att, cats_by[p.id], velocity_by[p.id]))
+        c = att["counts"]
+        tot_overdue += c["overdue"]
+        tot_unassigned += c["unassigned"]
+        tot_high += c["high_priority"]
+        tot_blocked += c["blocked"]
         if att["sprint"] and att["sprint"].at_risk:
             at_risk += 1
         if att["score"] > 0:
             needs += 1
-        # Cross-project most-urgent issues: overdue (by days overdue), then high-priority.
-        for i in g["overdue"]:
-            d = (now.date() - i.due_date).days if i.due_date else 0
-            top_pool.append((0, -d, _attn_issue(i, now)))
-        for i in g["high_priority"]:
-            top_pool.append((1, (i.priority.rank if i.priority else 99), _attn_issue(i, now)))
-
-    top_pool.sort(key=lambda t: (t[0], t[1]))
-    top_attention = [t[2] for t in top_pool[:8]]
+
+    # Cross-project most-urgent issues: overdue (most overdue first), then
+    # high-priority (by rank) — only the rows that can make the top 8 are read.
+    top_attention: list[AttentionIssue] = []
+    if ids:
+        top_attention = [_attn_issue(i, now) for i in _sample_issues(db, ids, "overdue", now, 8)]
+        if len(top_attention) < 8 and tot_high:
+            top_attention += [
+                _attn_issue(i, now)
+                for i in _sample_issues(db, ids, "high_priority", now, 8 - len(top_attention))
+            ]
 
     summaries.sort(key=lambda s: (s.attention_score, s.total_issues), reverse=True)
     return OverviewStats(
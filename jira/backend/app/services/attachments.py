@@ -0,0 +1,367 @@
+"""Streaming, content-addressed attachment storage.
+
+Uploads never sit in memory or block the event loop:
+
+* :func:`receive_upload` parses the ``multipart/form-data`` request body as
+  it arrives, hashing the file part and writing it to a staging file on a
+  worker thread chunk by chunk. The size limit is enforced on the bytes seen so
+  far (and up front from ``Content-Length``), so an oversized upload is cut
+  off at the limit rather than read to the end.
+* :func:`save_upload` stores the staged file under its sha256 in the
+  configured :mod:`app.services.storage` backend — identical files are kept
+  once — and records the attachment. ``attachment_blobs.ref_count`` is kept
+  by a trigger on ``attachments`` (installed by :func:`ensure_blob_refcounts`),
+  so every way an attachment row disappears, cascades included, releases its
+  blob; :func:`sweep_unreferenced` later removes blobs nothing points at.
+
+Downloads are ranged reads from the same backend (:func:`parse_range`).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import BinaryIO
+from urllib.parse import quote
+
+from python_multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.database import SessionLocal
+from app.models import Attachment, AttachmentBlob, Issue
+from app.services.storage import get_storage
+
+log = logging.getLogger("trackly.attachments")
+
+# Slack for the multipart envelope (boundaries, part headers, other fields)
+# when checking Content-Length against the file size limit.
+_FORM_OVERHEAD = 64 * 1024
+
+_SWEEP_BATCH = 500
+
+_DDL = """
+CREATE OR REPLACE FUNCTION trackly_attachment_blob_refs() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.sha256 IS NOT NULL THEN
+        UPDATE attachment_blobs SET ref_count = ref_count - 1 WHERE sha256 = OLD.sha256;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.sha256 IS NOT NULL THEN
+        UPDATE attachment_blobs SET ref_count = ref_count + 1 WHERE sha256 = NEW.sha256;
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trackly_attachment_blob_refs ON attachments;
+CREATE TRIGGER trackly_attachment_blob_refs AFTER INSERT OR UPDATE OF sha256 OR DELETE ON attachments
+    FOR EACH ROW EXECUTE FUNCTION trackly_attachment_blob_refs();
+
+CREATE INDEX IF NOT EXISTS ix_attachment_blobs_unreferenced ON attachment_blobs (sha256) WHERE ref_count <= 0;
+"""
+
+
+class UploadError(ValueError):
+    """The request body is not a usable attachment upload."""
+
+
+class UploadTooLarge(UploadError):
+    """The file part exceeded the size limit."""
+
+
+class RangeNotSatisfiable(ValueError):
+    """A ``Range`` header that selects no bytes of the file."""
+
+
+# --- Schema -----------------------------------------------------------------
+def ensure_blob_refcounts(engine: Engine) -> bool:
+    """Install the blob reference-count trigger. PostgreSQL only; idempotent."""
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.begin() as conn:
+        conn.exec_driver_sql("SELECT pg_advisory_xact_lock(hashtext('trackly.attachment_blobs'))")
+        conn.exec_driver_sql(_DDL)
+    return True
+
+
+def blob_key(sha256: str) -> str:
+    return f"sha256/{sha256[:2]}/{sha256}"
+
+
+# --- Upload -----------------------------------------------------------------
+@dataclass
+class StagedUpload:
+    """A received file part, staged on disk and hashed."""
+
+    path: str
+    filename: str
+    content_type: str
+    size: int = 0
+    sha256: str = ""
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class _FileReceiver:
+    """python-multipart callbacks that stage one file field to disk.
+
+    Parser callbacks run on the event loop and only queue the file's bytes;
+    :meth:`flush` (run in the threadpool) hashes and writes them.
+    """
+
+    field_name: str
+    max_bytes: int
+    staging_dir: str | None
+    staged: StagedUpload | None = None
+    pending: list[bytes] = field(default_factory=list)
+    _in_file: bool = False
+    _header_name: bytes = b""
+    _header_value: bytes = b""
+    _headers: dict[bytes, bytes] = field(default_factory=dict)
+    _hash: "hashlib._Hash" = field(default_factory=hashlib.sha256)
+    _fh: BinaryIO | None = None
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+            "on_header_field": self._header_field,
+            "on_header_value": self._header_value_cb,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+        }
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+        self._in_file = False
+
+    def _header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _header_value_cb(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = self._header_value = b""
+
+    def _headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if name != self.field_name or b"filename" not in options or self.staged is not None:
+            return  # other fields are ignored
+        fd, path = tempfile.mkstemp(prefix="upload-", dir=self.staging_dir)
+        os.close(fd)
+        content_type = self._headers.get(b"content-type", b"").decode("latin-1").strip()
+        self.staged = StagedUpload(
+            path=path,
+            filename=options[b"filename"].decode("utf-8", "replace"),
+            content_type=content_type or "application/octet-stream",
+        )
+        self._in_file = True
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file:
+            return
+        self.staged.size += end - start
+        if self.staged.size > self.max_bytes:
+            raise UploadTooLarge(f"File exceeds {self.max_bytes} bytes")
+        self.pending.append(data[start:end])
+
+    def _part_end(self) -> None:
+        self._in_file = False
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        if self._fh is None:
+            self._fh = open(self.staged.path, "wb")
+        for chunk in self.pending:
+            self._hash.update(chunk)
+            self._fh.write(chunk)
+        self.pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self.staged is not None:
+            self.staged.sha256 = self._hash.hexdigest()
+
+    def abort(self) -> None:
+        self.pending.clear()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self.staged is not None:
+            self.staged.discard()
+
+
+async def receive_upload(request: Request, max_bytes: int, field_name: str = "file") -> StagedUpload:
+    """Stream the *field_name* file of a multipart request to a staging file.
+
+    Raises :class:`UploadTooLarge` as soon as the file passes *max_bytes*, or
+    :class:`UploadError` for a body without that file. The caller owns the
+    returned file and must :meth:`~StagedUpload.discard` it.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadError("Expected a multipart/form-data upload")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes + _FORM_OVERHEAD:
+        raise UploadTooLarge(f"File exceeds {max_bytes} bytes")
+
+    store = get_storage()
+    if store.staging_dir:
+        await run_in_threadpool(os.makedirs, store.staging_dir, exist_ok=True)
+    receiver = _FileReceiver(field_name=field_name, max_bytes=max_bytes, staging_dir=store.staging_dir)
+    parser = MultipartParser(boundary, receiver.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if receiver.pending:
+                await run_in_threadpool(receiver.flush)
+        parser.finalize()
+        await run_in_threadpool(receiver.close)
+    except BaseException:
+        await run_in_threadpool(receiver.abort)
+        raise
+    if receiver.staged is None:
+        raise UploadError(f"Missing file field {field_name!r}")
+    return receiver.staged
+
+
+def save_upload(db: Session, issue: Issue, author_id: int, staged: StagedUpload) -> Attachment:
+    """Store *staged* by content hash and record it on *issue*. Commits."""
+    store = get_storage()
+    # Upserting the blob row first locks it until commit, so a concurrent
+    # sweep cannot remove the file between the existence check and the
+    # attachment (and its reference) being committed.
+    stmt = pg_insert(AttachmentBlob).values(
+        sha256=staged.sha256,
+        size_bytes=staged.size,
+        storage_key=blob_key(staged.sha256),
+        ref_count=0,
+        created_at=datetime.now(timezone.utc),
+    )
+    key = db.scalar(
+        stmt.on_conflict_do_update(index_elements=["sha256"], set_={"size_bytes": stmt.excluded.size_bytes})
+        .returning(AttachmentBlob.storage_key)
+    )
+    stored = False
+    try:
+        if not store.exists(key):
+            store.put_file(key, staged.path)
+            stored = True
+        attachment = Attachment(
+            issue_id=issue.id,
+            author_id=author_id,
+            filename=staged.filename or staged.sha256,
+            content_type=staged.content_type,
+            size_bytes=staged.size,
+            storage_key=key,
+            sha256=staged.sha256,
+        )
+        db.add(attachment)
+        db.commit()
+    except Exception:
+        if stored:
+            store.delete(key)
+        db.rollback()
+        raise
+    db.refresh(attachment)
+    return attachment
+
+
+# --- Release ----------------------------------------------------------------
+def sweep_unreferenced(batch_size: int = _SWEEP_BATCH) -> int:
+    """Delete blobs no attachment references any more; returns how many."""
+    store = get_storage()
+    removed = 0
+    with SessionLocal() as db:
+        while True:
+            doomed = (
+                select(AttachmentBlob.sha256)
+                .where(AttachmentBlob.ref_count <= 0)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            keys = db.scalars(
+                delete(AttachmentBlob)
+                .where(AttachmentBlob.sha256.in_(doomed.scalar_subquery()), AttachmentBlob.ref_count <= 0)
+                .returning(AttachmentBlob.storage_key)
+            ).all()
+            # Files go while the rows are still locked, before the commit.
+            for key in keys:
+                store.delete(key)
+            db.commit()
+            removed += len(keys)
+            if len(keys) < batch_size:
+                break
+    if removed:
+        log.info("Removed %d unreferenced attachment blob(s)", removed)
+    return removed
+
+
+def delete_attachment_file(attachment: Attachment) -> None:
+    """Remove the file of a pre-content-addressing attachment (owned alone)."""
+    if attachment.sha256 is None:
+        try:
+            get_storage().delete(attachment.storage_key)
+        except (OSError, ValueError):
+            pass
+
+
+# --- Download ---------------------------------------------------------------
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Resolve a ``Range`` header to a ``[start, stop)`` span of *size* bytes.
+
+    Returns None when the whole file should be sent: no header, a unit other
+    than bytes, a malformed value, or several ranges (which a server may
+    answer with the full body). Raises :class:`RangeNotSatisfiable` for a
+    well-formed range that selects nothing.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first.isdigit() or last.isdigit()):
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - suffix, 0), size
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    stop = min(int(last) + 1, size) if last else size
+    return start, stop
+
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
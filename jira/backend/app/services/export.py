@@ -1,9 +1,16 @@
 """Export helpers: serialize issues and insights to downloadable formats.
 
-Issues  -> CSV, JSON, XLSX
+Issues  -> CSV, JSON, NDJSON, XLSX (streamed)
 Insights -> JSON, CSV, Markdown
 
-All functions return ``bytes`` ready to stream as a file response. Only the
+Issue exports never hold the result set in memory: :func:`stream_issues`
+reads projected columns through a server-side cursor in chunks of
+``settings.export_chunk_rows`` and the format writers turn each chunk into
+bytes as it arrives, so a large export starts sending at once and runs in
+bounded memory. XLSX goes through a write-only workbook spooled to a temporary
+file (the zip container can only be finished once every row is known).
+
+Insight exporters return ``bytes`` ready to send as a file response. Only the
 caller's already-permission-filtered data should be passed in.
 """
 from __future__ import annotations
@@ -11,8 +18,29 @@ from __future__ import annotations
 import csv
 import io
 import json
-
-from app.models import Issue
+import tempfile
+from collections.abc import Iterable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import (
+    Component,
+    Issue,
+    IssueType,
+    Label,
+    Priority,
+    Project,
+    Sprint,
+    Status,
+    User,
+    Version,
+    issue_components,
+    issue_fix_versions,
+    issue_labels,
+)
 from app.schemas.analytics import OverviewStats, ProjectStats
 
 # --- Issues ----------------------------------------------------------------
@@ -22,66 +50,189 @@ ISSUE_COLUMNS = [
     "Fix Versions", "Sprint", "Due", "Resolution", "Created", "Updated",
 ]
 
+_ISSUE_FIELDS = (
+    Issue.id, Issue.key, Issue.summary, Issue.project_id, Issue.type_id, Issue.status_id,
+    Issue.priority_id, Issue.assignee_id, Issue.reporter_id, Issue.story_points,
+    Issue.sprint_id, Issue.due_date, Issue.resolution, Issue.created_at, Issue.updated_at,
+)
+
+# reference kind -> the columns kept for it (id first)
+_REFS = {
+    "project": (Project.id, Project.key),
+    "type": (IssueType.id, IssueType.name),
+    "status": (Status.id, Status.name, Status.category),
+    "priority": (Priority.id, Priority.name),
+    "user": (User.id, User.display_name),
+    "sprint": (Sprint.id, Sprint.name),
+}
+
+# many-to-many export column -> (named entity, association table, its fk to the entity)
+_MULTI = {
+    "Labels": (Label, issue_labels, issue_labels.c.label_id),
+    "Components": (Component, issue_components, issue_components.c.component_id),
+    "Fix Versions": (Version, issue_fix_versions, issue_fix_versions.c.version_id),
+}
+
+
+def _iso(v) -> str:
+    return v.isoformat() if v else ""
+
+
+class _Refs:
+    """Names behind the foreign keys of exported issues, loaded on first sight.
+
+    Each chunk costs one query per reference table with unseen ids; the
+    tables are small, so the memo stays bounded however many issues stream by.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.rows: dict[str, dict[int, tuple]] = {kind: {} for kind in _REFS}
+
+    def load(self, chunk) -> None:
+        wanted: dict[str, set[int]] = {kind: set() for kind in _REFS}
+        for r in chunk:
+            wanted["project"].add(r.project_id)
+            wanted["type"].add(r.type_id)
+            wanted["status"].add(r.status_id)
+            wanted["priority"].add(r.priority_id)
+            wanted["user"].update((r.assignee_id, r.reporter_id))
+            wanted["sprint"].add(r.sprint_id)
+        for kind, ids in wanted.items():
+            known = self.rows[kind]
+            missing = {i for i in ids if i is not None and i not in known}
+            if missing:
+                cols = _REFS[kind]
+                for row in self.db.execute(select(*cols).where(cols[0].in_(missing))):
+                    known[row[0]] = tuple(row[1:])
+
+    def get(self, kind: str, ref_id: int | None, field: int = 0):
+        row = self.rows[kind].get(ref_id) if ref_id is not None else None
+        return row[field] if row and row[field] is not None else ""
+
+
+def _names(db: Session, ids: list[int]) -> dict[str, dict[int, list[str]]]:
+    out: dict[str, dict[int, list[str]]] = {}
+    for column, (entity, table, fk) in _MULTI.items():
+        by_issue: dict[int, list[str]] = {}
+        stmt = (
+            select(table.c.issue_id, entity.name)
+            .join(entity, entity.id == fk)
+            .where(table.c.issue_id.in_(ids))
+            .order_by(table.c.issue_id, entity.name)
+        )
+        for issue_id, value in db.execute(stmt):
+            by_issue.setdefault(issue_id, []).append(value)
+        out[column] = by_issue
+    return out
+
+
+def _issue_rows(db: Session, chunk, refs: _Refs) -> list[dict]:
+    refs.load(chunk)
+    multi = _names(db, [r.id for r in chunk])
+    return [
+        {
+            "Key": r.key,
+            "Summary": r.summary,
+            "Project": refs.get("project", r.project_id),
+            "Type": refs.get("type", r.type_id),
+            "Status": refs.get("status", r.status_id),
+            "Category": refs.get("status", r.status_id, 1),
+            "Priority": refs.get("priority", r.priority_id),
+            "Assignee": refs.get("user", r.assignee_id),
+            "Reporter": refs.get("user", r.reporter_id),
+            "Story Points": r.story_points if r.story_points is not None else "",
+            **{column: ", ".join(multi[column].get(r.id, ())) for column in _MULTI},
+            "Sprint": refs.get("sprint", r.sprint_id),
+            "Due": _iso(r.due_date),
+            "Resolution": r.resolution or "",
+            "Created": _iso(r.created_at),
+            "Updated": _iso(r.updated_at),
+        }
+        for r in chunk
+    ]
+
 
-def _issue_row(i: Issue) -> dict:
-    def _iso(v):
-        return v.isoformat() if v else ""
-
-    return {
-        "Key": i.key,
-        "Summary": i.summary,
-        "Project": i.project.key if i.project else "",
-        "Type": i.type.name if i.type else "",
-        "Status": i.status.name if i.status else "",
-        "Category": i.status.category if i.status else "",
-        "Priority": i.priority.name if i.priority else "",
-        "Assignee": i.assignee.display_name if i.assignee else "",
-        "Reporter": i.reporter.display_name if i.reporter else "",
-        "Story Points": i.story_points if i.story_points is not None else "",
-        "Labels": ", ".join(l.name for l in i.labels),
-        "Components": ", ".join(c.name for c in i.components),
-        "Fix Versions": ", ".join(v.name for v in i.fix_versions),
-        "Sprint": i.sprint.name if i.sprint else "",
-        "Due": _iso(i.due_date),
-        "Resolution": i.resolution or "",
-        "Created": _iso(i.created_at),
-        "Updated": _iso(i.updated_at),
-    }
-
-
-def issues_csv(issues: list[Issue]) -> bytes:
+def iter_issue_rows(db: Session, where: Iterable, order_by: Iterable, limit: int | None = None) -> Iterator[list[dict]]:
+    """Export rows for issues matching *where*, in chunks, via a server-side cursor.
+
+    *where* must only reference ``issues`` columns (TQL and the visibility
+    filter do); names are resolved per chunk.
+    """
+    stmt = select(*_ISSUE_FIELDS).where(*where).order_by(*order_by)
+    if limit:
+        stmt = stmt.limit(limit)
+    refs = _Refs(db)
+    result = db.execute(stmt.execution_options(yield_per=settings.export_chunk_rows))
+    for chunk in result.partitions():
+        yield _issue_rows(db, chunk, refs)
+
+
+def issues_csv(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
     buf = io.StringIO()
     writer = csv.DictWriter(buf, fieldnames=ISSUE_COLUMNS)
     writer.writeheader()
-    for i in issues:
-        writer.writerow(_issue_row(i))
-    return buf.getvalue().encode("utf-8-sig")  # BOM => opens cleanly in Excel
+    yield buf.getvalue().encode("utf-8-sig")  # BOM => opens cleanly in Excel
+    for rows in chunks:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+
 
+def issues_json(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
+    """A JSON array, written one object per line as chunks arrive."""
+    sep = "[\n"
+    for rows in chunks:
+        if rows:
+            yield (sep + ",\n".join(json.dumps(r, default=str) for r in rows)).encode("utf-8")
+            sep = ",\n"
+    yield b"[]\n" if sep == "[\n" else b"\n]\n"
 
-def issues_json(issues: list[Issue]) -> bytes:
-    return json.dumps([_issue_row(i) for i in issues], indent=2, default=str).encode("utf-8")
 
+def issues_ndjson(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
+    for rows in chunks:
+        if rows:
+            yield "".join(json.dumps(r, default=str) + "\n" for r in rows).encode("utf-8")
 
-def issues_xlsx(issues: list[Issue]) -> bytes:
+
+def issues_xlsx(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Issues"
-    ws.append(ISSUE_COLUMNS)
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-    for i in issues:
-        row = _issue_row(i)
-        ws.append([row[c] for c in ISSUE_COLUMNS])
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Issues")
     ws.freeze_panes = "A2"
-    out = io.BytesIO()
-    wb.save(out)
-    return out.getvalue()
+    bold = Font(bold=True)
+    header = []
+    for name in ISSUE_COLUMNS:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = bold
+        header.append(cell)
+    ws.append(header)
+    for rows in chunks:
+        for row in rows:
+            ws.append([row[c] for c in ISSUE_COLUMNS])
+    with tempfile.SpooledTemporaryFile(max_size=8 << 20) as out:
+        wb.save(out)
+        out.seek(0)
+        while block := out.read(64 << 10):
+            yield block
+
+
+ISSUE_EXPORTERS = {"csv": issues_csv, "json": issues_json, "ndjson": issues_ndjson, "xlsx": issues_xlsx}
+
 
+def stream_issues(fmt: str, where: Iterable, order_by: Iterable) -> Iterator[bytes]:
+    """Encoded *fmt* export of the matching issues, capped at ``export_max_rows``.
 
-ISSUE_EXPORTERS = {"csv": issues_csv, "json": issues_json, "xlsx": issues_xlsx}
+    Runs on its own session because the response body is produced after the
+    request's session has been released.
+    """
+    with SessionLocal() as db:
+        chunks = iter_issue_rows(db, list(where), list(order_by), settings.export_max_rows or None)
+        yield from ISSUE_EXPORTERS[fmt](chunks)
 
 
 # --- Insights --------------------------------------------------------------
@@ -209,6 +360,7 @@ OVERVIEW_EXPORTERS = {"json": insights_json, "csv": overview_csv, "md": overview
 CONTENT_TYPE = {
     "csv": "text/csv; charset=utf-8",
     "json": "application/json",
+    "ndjson": "application/x-ndjson",
     "md": "text/markdown; charset=utf-8",
     "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
 }
@@ -18,7 +18,7 @@ from app.models import (
     Version,
 )
 from app.models.activity import IssueHistory
-from app.utils.ranking import rank_between
+from app.utils.ranking import initial_rank, ranks_after
 from app.utils.timetracking import parse_duration
 
 
@@ -56,7 +56,7 @@ def bottom_rank(db: Session, project_id: int) -> str:
     last = db.scalars(
         select(Issue.rank).where(Issue.project_id == project_id).order_by(Issue.rank.desc()).limit(1)
     ).first()
-    return rank_between(last, None)
+    return ranks_after(last, 1)[0] if last else initial_rank()
 
 
 def resolve_labels(db: Session, names: list[str]) -> list[Label]:
@@ -2,13 +2,27 @@
 
 This builds on the one-shot ``app.migration.importer`` but adds:
 
-* **Resumability** — the sync watermark (``ProjectSyncLink.updated_watermark``)
-  and a coarse page cursor (``cursor_start_at``) are persisted and the DB
-  session is committed every ``COMMIT_EVERY`` issues, so an interrupted or
-  paused run picks up where it left off instead of restarting.
+* **Pipelining** — search pages are fetched ahead on ``jira_sync_workers``
+  threads (at most ``jira_sync_prefetch_pages`` in flight) while the previous
+  page is written. Comments and worklogs come embedded in the search results;
+  only issues with more than Jira embeds are fetched individually, in
+  parallel.
+* **Bulk writes** — each page is written with one lookup of existing rows and
+  one multi-row INSERT / executemany UPDATE per table (issues, labels,
+  comments, worklogs) instead of per-row ORM flushes; the page writers are
+  shared with the importer (:mod:`app.migration.bulk`).
+* **Resumability** — every page is committed together with a checkpoint: the
+  sync watermark (``ProjectSyncLink.updated_watermark``, held back to the
+  oldest issue still waiting for its parent/epic) and the page cursor
+  (``cursor_start_at``), so an interrupted or paused run picks up where it
+  left off instead of restarting.
 * **Idempotency** — every row is upserted by ``external_id`` (Jira id), Jira
   issue keys/numbers are preserved verbatim, and re-running only updates rows
-  in place. The same upsert patterns the importer uses are reused here.
+  in place.
+* **Out-of-process execution** — the API only queues a ``jira_sync`` job
+  (:func:`enqueue_sync`); the separate job worker (``python -m app.worker``)
+  runs it, so syncs never compete with request handling. A run that fails or
+  whose worker dies is retried and resumes from its checkpoint.
 * **Cooperative pause** — between batches the engine re-reads ``link.status``
   from the database; if the UI flipped it to ``paused`` the run stops
   gracefully (no error) and can later be resumed.
@@ -18,23 +32,24 @@ This builds on the one-shot ``app.migration.importer`` but adds:
 The engine is deliberately defensive: metadata / permission failures are logged
 and skipped rather than aborting an otherwise good issue sync, and a fatal error
 records ``link.status='error'`` + ``link.last_error`` without crashing the
-background worker.
+job worker.
 """
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import and_, insert, or_, select, update
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.crypto import decrypt
-from app.core.database import SessionLocal
+from app.migration import bulk
 from app.migration.jira_client import JiraClient
 from app.migration.mapper import (
-    adf_to_text,
     map_issue_fields,
     map_priority_rank,
     map_status_category,
@@ -42,7 +57,6 @@ from app.migration.mapper import (
     parse_jira_datetime,
 )
 from app.models import (
-    Comment,
     Group,
     Issue,
     IssueType,
@@ -55,18 +69,14 @@ from app.models import (
     Status,
     SyncRun,
     User,
-    Worklog,
 )
 from app.models.identity import JiraConnection
+from app.services import analytics, jobs
 from app.services import permission_keys as P
-from app.services.issues import resolve_labels
-from app.utils.ranking import initial_rank, rank_between
+from app.utils.ranking import initial_rank, ranks_after
 
 log = logging.getLogger("trackly.services.jira_sync")
 
-# Commit (and persist the resume cursor) after this many issues.
-COMMIT_EVERY = 25
-
 # Jira's JQL date literal format for the ``updated >=`` watermark clause.
 JQL_DATE_FMT = "%Y/%m/%d %H:%M"
 
@@ -74,7 +84,7 @@ DEFAULT_ISSUE_FIELDS = [
     "summary", "description", "issuetype", "status", "priority",
     "assignee", "reporter", "parent", "labels", "duedate",
     "timeoriginalestimate", "timeestimate", "resolution", "resolutiondate",
-    "created", "updated",
+    "created", "updated", "comment", "worklog",
     "customfield_10016", "customfield_10026", "customfield_10002",
     "customfield_10014", "customfield_10008",
 ]
@@ -178,9 +188,18 @@ def _count_issues(client: JiraClient, key: str) -> int | None:
 class JiraSyncEngine:
     """Run a resumable, idempotent sync for a single :class:`ProjectSyncLink`."""
 
-    def __init__(self, db: Session, link: ProjectSyncLink) -> None:
+    def __init__(
+        self,
+        db: Session,
+        link: ProjectSyncLink,
+        workers: int | None = None,
+        prefetch: int | None = None,
+    ) -> None:
         self.db = db
         self.link = link
+        # Concurrent Jira requests, and search pages fetched ahead of the writer.
+        self.workers = max(1, workers or settings.jira_sync_workers)
+        self.prefetch = max(1, prefetch or settings.jira_sync_prefetch_pages)
         self.project: Project = db.get(Project, link.project_id)
         self.connection: JiraConnection = link.connection or db.get(
             JiraConnection, link.connection_id
@@ -261,6 +280,15 @@ class JiraSyncEngine:
                      self.project.key, run.processed)
             return run
 
+        except jobs.LeaseLost:
+            # The link now belongs to the run that took the job over; only
+            # close out this run's own row.
+            self.db.rollback()
+            run.status = "error"
+            run.message = "Superseded: the job was taken over by another worker"
+            run.finished_at = datetime.now(timezone.utc)
+            self.db.commit()
+            raise
         except Exception as exc:  # noqa: BLE001 - keep the worker alive
             self.db.rollback()
             log.exception("Sync failed for project %s", self.project.key)
@@ -461,7 +489,7 @@ class JiraSyncEngine:
 
     # -- the resumable issue loop ------------------------------------------
     def _sync_issues(self, run: SyncRun) -> bool:
-        """Pull + upsert issues. Returns True if paused mid-run, else False."""
+        """Pull + upsert issues page by page. Returns True if paused mid-run."""
         project = self.project
         key = self.link.jira_project_key or project.key
 
@@ -478,156 +506,247 @@ class JiraSyncEngine:
             if fid not in fields:
                 fields.append(fid)
 
-        # Deferred parent/epic links: resolve after all issues exist.
-        link_pass: list[tuple[int, str | None, str | None]] = []
-        counter = project.issue_counter
+        # Deferred parent/epic links: (issue id, parent key, epic key, updated),
+        # resolved as soon as the target issue has been written.
+        link_pass: list[tuple[int, str | None, str | None, datetime | None]] = []
         processed = 0
         max_updated: datetime | None = self.link.updated_watermark
 
-        for jira_issue in self.client.iter_issues(jql, fields=fields, expand="renderedFields"):
-            self._upsert_issue(jira_issue, project, link_pass, counter_box := [counter])
-            counter = counter_box[0]
-
-            mapped_updated = parse_jira_datetime(
-                (jira_issue.get("fields") or {}).get("updated")
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jira-sync") as pool:
+            pages = self.client.iter_issue_pages(
+                jql, fields=fields, expand="renderedFields",
+                workers=self.workers, prefetch=self.prefetch,
             )
-            if mapped_updated and (max_updated is None or mapped_updated > max_updated):
-                max_updated = mapped_updated
-
-            processed += 1
-
-            if processed % COMMIT_EVERY == 0:
-                # Persist progress so an interruption resumes from here.
-                project.issue_counter = max(project.issue_counter, counter)
-                self.link.cursor_start_at = processed
-                self.link.processed_issues = (self.link.processed_issues or 0)
-                self.link.updated_watermark = max_updated
-                run.processed = self._created + self._updated
-                run.created = self._created
-                run.updated = self._updated
-                self.db.commit()
-                log.info("  ... %s issues processed for %s", processed, key)
-
-                # Cooperative pause: re-read status fresh from the DB.
-                self.db.refresh(self.link, attribute_names=["status"])
-                if self.link.status == "paused":
-                    self.link.processed_issues = (self.link.processed_issues or 0) + 0
+            try:
+                for start_at, jira_issues in pages:
+                    if not jira_issues:
+                        continue
+                    children = bulk.fetch_children(self.client, pool, jira_issues)
+                    self._write_page(jira_issues, children, project, link_pass)
+
+                    for jira_issue in jira_issues:
+                        updated = parse_jira_datetime((jira_issue.get("fields") or {}).get("updated"))
+                        if updated and (max_updated is None or updated > max_updated):
+                            max_updated = updated
+                    processed += len(jira_issues)
                     self._resolve_links(link_pass)
+
+                    # Checkpoint: pages arrive in ``updated`` order, so every
+                    # issue up to max_updated is now committed and a restart
+                    # only needs to re-read from there — or from the oldest
+                    # issue still waiting for its parent/epic to arrive.
+                    self.link.cursor_start_at = start_at + len(jira_issues)
+                    self.link.processed_issues = processed
+                    waiting = [u for *_, u in link_pass if u]
+                    self.link.updated_watermark = min([max_updated, *waiting]) if max_updated else None
+                    run.processed = self._created + self._updated
+                    run.created = self._created
+                    run.updated = self._updated
+                    # A worker that lost its job lease must not commit over
+                    # the checkpoint of the worker that took it over.
+                    jobs.check_lease()
                     self.db.commit()
-                    return True
+                    analytics.invalidate_projects([project.id])
+                    log.info("  ... %s issues processed for %s", processed, key)
 
-        # Final flush of this run's tail.
-        project.issue_counter = max(project.issue_counter, counter)
+                    # Cooperative pause: re-read status fresh from the DB.
+                    self.db.refresh(self.link, attribute_names=["status"])
+                    if self.link.status == "paused":
+                        return True
+            finally:
+                pages.close()
+
+        # Links still pending point outside this project/run; nothing to wait for.
         self.link.processed_issues = processed
         self.link.total_issues = max(self.link.total_issues or 0, processed)
         self.link.updated_watermark = max_updated or datetime.now(timezone.utc)
         self.db.commit()
-
-        # Second pass: resolve parent/epic links now that all keys exist.
-        self._resolve_links(link_pass)
-        self.db.commit()
         return False
 
-    def _upsert_issue(
+    # -- bulk writes -------------------------------------------------------
+    def _prime_users(self, mapped_users: list[dict | None]) -> None:
+        """Resolve a page's users with one query per lookup column."""
+        wanted = {m["external_id"]: m for m in mapped_users if m and m["external_id"] not in self.user_map}
+        if not wanted:
+            return
+        found = {u.external_id: u for u in self.db.scalars(select(User).where(User.external_id.in_(wanted)))}
+        missing = [m for ext, m in wanted.items() if ext not in found]
+        if missing:
+            by_email = {
+                u.email: u for u in self.db.scalars(
+                    select(User).where(User.email.in_({m["email"] for m in missing}))
+                )
+            }
+            for m in missing:
+                user = by_email.get(m["email"])
+                if user is not None and user.external_id in (None, m["external_id"]):
+                    found[m["external_id"]] = user
+        for ext, user in found.items():
+            m = wanted[ext]
+            user.external_id = ext
+            user.display_name = m["display_name"]
+            if m.get("avatar_url"):
+                user.avatar_url = m["avatar_url"]
+            self.user_map[ext] = user.id
+        self.db.flush()
+        # Brand-new users are rare after the first sync; create them one by one.
+        for ext, m in wanted.items():
+            if ext not in self.user_map:
+                self._upsert_user(m)
+
+    def _user_id(self, mapped: dict | None) -> int | None:
+        return self.user_map.get(mapped["external_id"]) if mapped else None
+
+    def _write_page(
         self,
-        jira_issue: dict,
+        jira_issues: list[dict],
+        children: dict[str, tuple[list, list]],
         project: Project,
-        link_pass: list[tuple[int, str | None, str | None]],
-        counter_box: list[int],
+        link_pass: list[tuple[int, str | None, str | None, datetime | None]],
     ) -> None:
-        jkey = jira_issue.get("key")
-        mapped = map_issue_fields(jira_issue, self._lookups())
-        ext = str(jira_issue.get("id")) if jira_issue.get("id") else jkey
-
-        number = self._number_from_key(jkey)
-        if number is not None:
-            counter_box[0] = max(counter_box[0], number)
+        """Upsert one page of issues with their labels, comments and worklogs.
 
-        issue = self.db.scalars(select(Issue).where(Issue.external_id == ext)).first()
-        if issue is None and jkey:
-            issue = self.db.scalars(select(Issue).where(Issue.key == jkey)).first()
-
-        assignee_id = self._upsert_user(mapped.get("assignee"))
-        reporter_id = self._upsert_user(mapped.get("reporter"))
-        type_id = self._resolve_type_id(mapped)
-        status_id = self._resolve_status_id(mapped)
-        priority_id = self._resolve_priority_id(mapped)
+        Each table is written with a single multi-row INSERT and/or
+        executemany UPDATE rather than per-row ORM flushes.
+        """
+        lookups = self._lookups()
+        rows: list[tuple[str, str | None, dict]] = []
+        seen: set[str] = set()
+        for jira_issue in jira_issues:
+            jkey = jira_issue.get("key")
+            ext = str(jira_issue.get("id")) if jira_issue.get("id") else jkey
+            if not ext or ext in seen:
+                continue
+            seen.add(ext)
+            rows.append((ext, jkey, map_issue_fields(jira_issue, lookups)))
+
+        people: list[dict | None] = []
+        for _, jkey, mapped in rows:
+            people += [mapped.get("assignee"), mapped.get("reporter")]
+            comments, worklogs = children.get(jkey, ([], []))
+            people += [map_user(c.get("author")) for c in comments]
+            people += [map_user(w.get("author")) for w in worklogs]
+        self._prime_users(people)
+
+        exts = [ext for ext, _, _ in rows]
+        keys = [jkey for _, jkey, _ in rows if jkey]
+        by_ext: dict[str, int] = {}
+        by_key: dict[str, int] = {}
+        for iid, iext, ikey in self.db.execute(
+            select(Issue.id, Issue.external_id, Issue.key)
+            .where(or_(
+                and_(Issue.project_id == project.id, Issue.external_id.in_(exts)),
+                Issue.key.in_(keys),
+            ))
+        ):
+            if iext:
+                by_ext[iext] = iid
+            by_key[ikey] = iid
 
-        if issue is None:
+        counter = project.issue_counter
+        inserts: list[dict] = []
+        updates: list[dict] = []
+        for ext, jkey, mapped in rows:
+            number = self._number_from_key(jkey)
+            if number is not None:
+                counter = max(counter, number)
+            values = {
+                "external_id": ext,
+                "type_id": self._resolve_type_id(mapped),
+                "status_id": self._resolve_status_id(mapped),
+                "summary": mapped["summary"],
+                "description": mapped["description"],
+                "priority_id": self._resolve_priority_id(mapped),
+                "assignee_id": self._user_id(mapped.get("assignee")),
+                "reporter_id": self._user_id(mapped.get("reporter")),
+                "story_points": mapped["story_points"],
+                "due_date": mapped["due_date"],
+                "original_estimate_seconds": mapped["original_estimate_seconds"],
+                "remaining_estimate_seconds": mapped["remaining_estimate_seconds"],
+                "resolution": mapped["resolution"],
+                "resolved_at": mapped["resolved_at"],
+            }
+            for ts in ("created_at", "updated_at"):
+                if mapped.get(ts):
+                    values[ts] = mapped[ts]
+            issue_id = by_ext.get(ext) or (by_key.get(jkey) if jkey else None)
+            if issue_id is None:
+                now = datetime.now(timezone.utc)
+                values.setdefault("created_at", now)
+                values.setdefault("updated_at", now)
+                values.update(
+                    key=jkey,
+                    number=number if number is not None else (counter or 1),
+                    project_id=project.id,
+                )
+                inserts.append(values)
+            else:
+                values["id"] = issue_id
+                if jkey:
+                    values["key"] = jkey
+                if number is not None:
+                    values["number"] = number
+                updates.append(values)
+
+        ids: dict[str, int] = {}
+        if inserts:
             last_rank = self.db.scalars(
                 select(Issue.rank).where(Issue.project_id == project.id)
                 .order_by(Issue.rank.desc()).limit(1)
             ).first()
-            new_rank = rank_between(last_rank, None) if last_rank else initial_rank()
-            issue = Issue(
-                key=jkey,
-                number=number if number is not None else (counter_box[0] or 1),
-                project_id=project.id,
-                external_id=ext,
-                rank=new_rank,
-                type_id=type_id,
-                status_id=status_id,
-                summary=mapped["summary"],
-            )
-            self.db.add(issue)
-            self._created += 1
-        else:
-            issue.external_id = ext
-            if jkey:
-                issue.key = jkey
-            if number is not None:
-                issue.number = number
-            issue.type_id = type_id
-            issue.status_id = status_id
-            self._updated += 1
-
-        issue.summary = mapped["summary"]
-        issue.description = mapped["description"]
-        issue.priority_id = priority_id
-        issue.assignee_id = assignee_id
-        issue.reporter_id = reporter_id
-        issue.story_points = mapped["story_points"]
-        issue.due_date = mapped["due_date"]
-        issue.original_estimate_seconds = mapped["original_estimate_seconds"]
-        issue.remaining_estimate_seconds = mapped["remaining_estimate_seconds"]
-        issue.resolution = mapped["resolution"]
-        issue.resolved_at = mapped["resolved_at"]
-        if mapped.get("created_at"):
-            issue.created_at = mapped["created_at"]
-        if mapped.get("updated_at"):
-            issue.updated_at = mapped["updated_at"]
-        issue.labels = resolve_labels(self.db, mapped.get("labels") or [])
-
-        self.db.flush()
-
-        parent_key = mapped.get("parent_key")
-        epic_key = mapped.get("epic_key")
-        if parent_key and mapped.get("parent_is_epic"):
-            epic_key = epic_key or parent_key
-            parent_key = None
-        if parent_key or epic_key:
-            link_pass.append((issue.id, parent_key, epic_key))
-
-        self._import_comments(issue, jkey)
-        self._import_worklogs(issue, jkey)
-
-    def _resolve_links(self, link_pass: list[tuple[int, str | None, str | None]]) -> None:
-        for issue_id, parent_key, epic_key in link_pass:
-            issue = self.db.get(Issue, issue_id)
-            if issue is None:
-                continue
-            if parent_key:
-                pid = self._lookup_issue_id_by_key(parent_key)
-                if pid and pid != issue.id:
-                    issue.parent_id = pid
-            if epic_key:
-                eid = self._lookup_issue_id_by_key(epic_key)
-                if eid and eid != issue.id:
-                    issue.epic_id = eid
-        self.db.flush()
+            for values, rank in zip(inserts, ranks_after(last_rank or initial_rank(), len(inserts))):
+                values["rank"] = rank
+            for iid, iext in self.db.execute(
+                insert(Issue).returning(Issue.id, Issue.external_id, sort_by_parameter_order=True),
+                inserts,
+            ):
+                ids[iext] = iid
+            self._created += len(inserts)
+        if updates:
+            for group in bulk.same_keys(updates):
+                self.db.execute(update(Issue), group)
+            ids.update({u["external_id"]: u["id"] for u in updates})
+            self._updated += len(updates)
+        project.issue_counter = max(project.issue_counter, counter)
 
-    def _lookup_issue_id_by_key(self, key: str) -> int | None:
-        return self.db.scalars(select(Issue.id).where(Issue.key == key)).first()
+        key_to_id = {jkey: ids[ext] for ext, jkey, _ in rows if jkey}
+        bulk.write_labels(self.db, {ids[ext]: mapped.get("labels") or [] for ext, _, mapped in rows}, {})
+        bulk.write_comments(self.db, children, key_to_id, self._user_id)
+        bulk.write_worklogs(self.db, children, key_to_id, self._user_id)
+
+        for ext, _, mapped in rows:
+            parent_key = mapped.get("parent_key")
+            epic_key = mapped.get("epic_key")
+            if parent_key and mapped.get("parent_is_epic"):
+                epic_key = epic_key or parent_key
+                parent_key = None
+            if parent_key or epic_key:
+                link_pass.append((ids[ext], parent_key, epic_key, mapped.get("updated_at")))
+
+    def _resolve_links(self, link_pass: list[tuple[int, str | None, str | None, datetime | None]]) -> None:
+        """Set parent/epic ids whose targets now exist; keep the rest pending."""
+        wanted = {k for _, parent_key, epic_key, _ in link_pass for k in (parent_key, epic_key) if k}
+        if not wanted:
+            return
+        ids = dict(self.db.execute(select(Issue.key, Issue.id).where(Issue.key.in_(wanted))).all())
+        updates: list[dict] = []
+        pending = []
+        for entry in link_pass:
+            issue_id, parent_key, epic_key, _ = entry
+            values: dict[str, int] = {}
+            pid = ids.get(parent_key) if parent_key else None
+            if pid and pid != issue_id:
+                values["parent_id"] = pid
+            eid = ids.get(epic_key) if epic_key else None
+            if eid and eid != issue_id:
+                values["epic_id"] = eid
+            if values:
+                updates.append({"id": issue_id, **values})
+            if (parent_key and parent_key not in ids) or (epic_key and epic_key not in ids):
+                pending.append(entry)
+        for group in bulk.same_keys(updates):
+            self.db.execute(update(Issue), group)
+        link_pass[:] = pending
 
     @staticmethod
     def _number_from_key(key: str | None) -> int | None:
@@ -636,68 +755,6 @@ class JiraSyncEngine:
         tail = key.rsplit("-", 1)[-1]
         return int(tail) if tail.isdigit() else None
 
-    # -- comments / worklogs ----------------------------------------------
-    def _import_comments(self, issue: Issue, jkey: str | None) -> None:
-        if not jkey:
-            return
-        try:
-            comments = list(self.client.iter_comments(jkey))
-        except Exception as exc:  # noqa: BLE001
-            log.debug("Could not fetch comments for %s: %s", jkey, exc)
-            return
-        for jc in comments:
-            ext = str(jc.get("id")) if jc.get("id") else None
-            if not ext:
-                continue
-            comment = self.db.scalars(select(Comment).where(Comment.external_id == ext)).first()
-            author_id = self._upsert_user(map_user(jc.get("author")))
-            body = adf_to_text(jc.get("body")) or "(empty comment)"
-            created = parse_jira_datetime(jc.get("created"))
-            updated = parse_jira_datetime(jc.get("updated"))
-            if comment is None:
-                comment = Comment(issue_id=issue.id, external_id=ext, author_id=author_id, body=body)
-                self.db.add(comment)
-            else:
-                comment.body = body
-                comment.author_id = author_id
-            self.db.flush()
-            if created:
-                comment.created_at = created
-            if updated:
-                comment.updated_at = updated
-
-    def _import_worklogs(self, issue: Issue, jkey: str | None) -> None:
-        if not jkey:
-            return
-        try:
-            worklogs = list(self.client.iter_worklogs(jkey))
-        except Exception as exc:  # noqa: BLE001
-            log.debug("Could not fetch worklogs for %s: %s", jkey, exc)
-            return
-        for wl in worklogs:
-            seconds = wl.get("timeSpentSeconds")
-            if not seconds:
-                continue
-            started = parse_jira_datetime(wl.get("started")) or parse_jira_datetime(wl.get("created"))
-            if started is None:
-                continue
-            author_id = self._upsert_user(map_user(wl.get("author")))
-            existing = self.db.scalars(
-                select(Worklog).where(
-                    Worklog.issue_id == issue.id,
-                    Worklog.started_at == started,
-                    Worklog.time_spent_seconds == int(seconds),
-                )
-            ).first()
-            if existing is None:
-                self.db.add(Worklog(
-                    issue_id=issue.id,
-                    author_id=author_id,
-                    time_spent_seconds=int(seconds),
-                    comment=adf_to_text(wl.get("comment")) or None,
-                    started_at=started,
-                ))
-
     # -- permission-scheme import -----------------------------------------
     def import_permission_scheme(self, project: Project, client: JiraClient) -> None:
         """Translate the Jira project's permission scheme into a Trackly one.
@@ -878,34 +935,52 @@ class JiraSyncEngine:
 
 
 # --------------------------------------------------------------------------- #
-# Background runner
+# Job queue integration
 # --------------------------------------------------------------------------- #
-def start_sync_background(project_id: int, trigger: str = "manual", actor_id: int | None = None) -> None:
-    """Run a sync in its own DB session (for BackgroundTasks / threads).
+SYNC_JOB = "jira_sync"
+
+
+class SyncFailed(RuntimeError):
+    """A sync run ended in ``error``; raised so the job queue retries it."""
+
+
+def enqueue_sync(db: Session, link: ProjectSyncLink, trigger: str = "manual", actor_id: int | None = None) -> int | None:
+    """Queue a sync of *link* for the job worker, in *db*'s transaction.
 
-    Guards against a double-run: if the link is already ``running`` it refuses.
-    The route flips the link to ``running`` before scheduling this, so we only
-    bail when something else genuinely owns the run.
+    One sync per project is live at a time (a second request reuses the queued
+    job), and at most ``jira_sync_per_connection`` run against one connection.
     """
-    db = SessionLocal()
-    try:
-        link = db.scalars(
-            select(ProjectSyncLink).where(ProjectSyncLink.project_id == project_id)
-        ).first()
-        if link is None:
-            log.warning("No sync link for project %s; nothing to run", project_id)
-            return
+    return jobs.enqueue(
+        db, SYNC_JOB,
+        {"project_id": link.project_id, "trigger": trigger, "actor_id": actor_id},
+        dedupe_key=f"{SYNC_JOB}:{link.project_id}",
+        concurrency_key=f"jira_connection:{link.connection_id}",
+        concurrency_limit=settings.jira_sync_per_connection,
+    )
 
-        engine = JiraSyncEngine(db, link)
-        run = engine.run(trigger=trigger)
-        if actor_id is not None and run is not None:
-            try:
-                run.actor_id = actor_id
-                db.commit()
-            except Exception:  # noqa: BLE001
-                db.rollback()
-    except Exception:  # noqa: BLE001 - never crash the worker
-        log.exception("Background sync crashed for project %s", project_id)
-        db.rollback()
-    finally:
-        db.close()
+
+@jobs.handler(SYNC_JOB)
+def run_sync_job(db: Session, payload: dict) -> None:
+    """Job handler: run (or resume) a project's sync in the worker process.
+
+    The engine continues from the link's persisted cursor and watermark, so a
+    retried or taken-over job picks up where the previous attempt stopped.
+    """
+    project_id = payload["project_id"]
+    link = db.scalars(
+        select(ProjectSyncLink).where(ProjectSyncLink.project_id == project_id)
+    ).first()
+    if link is None:
+        log.warning("No sync link for project %s; nothing to run", project_id)
+        return
+    if link.status == "paused":
+        log.info("Sync for project %s was paused before it started", project_id)
+        return
+
+    run = JiraSyncEngine(db, link).run(trigger=payload.get("trigger") or "manual")
+    actor_id = payload.get("actor_id")
+    if actor_id is not None and run is not None:
+        run.actor_id = actor_id
+        db.commit()
+    if run is not None and run.status == "error":
+        raise SyncFailed(run.message or "Sync failed")
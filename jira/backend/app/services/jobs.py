@@ -0,0 +1,354 @@
+"""Postgres-backed job queue for work that must not run inside the API process.
+
+The API only ever calls :func:`enqueue`, in the same transaction as the state
+change that asked for the work. A separate worker process (``python -m
+app.worker``) runs :class:`Worker`, which:
+
+* **leases** due jobs with ``FOR UPDATE SKIP LOCKED`` so any number of worker
+  processes share the table without double-running a job;
+* honours a per-``concurrency_key`` limit (e.g. at most N syncs against one
+  Jira connection), checked under a transaction-scoped advisory lock on the
+  key so concurrent claimers cannot overshoot it;
+* **heart-beats** every lease it holds; a job whose lease expires (worker
+  killed, node lost) is claimed again by another worker, until it has used
+  up ``max_attempts`` — a job that keeps killing its worker ends ``failed``.
+  Handlers are written to resume from their own checkpoints — the Jira sync
+  continues from its persisted page cursor and watermark. A worker that
+  finds its lease gone flags the run; long handlers call
+  :func:`check_lease` before committing and stop, so only the new holder
+  writes;
+* retries a job whose handler raised with exponential backoff
+  (``job_retry_seconds`` doubling up to ``job_retry_max_seconds``), and marks
+  it ``failed`` after ``max_attempts``.
+
+Handlers are registered per job kind with :func:`handler` and receive a fresh
+session plus the decoded payload.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Job
+
+log = logging.getLogger("trackly.services.jobs")
+
+# pg_advisory_xact_lock namespace for concurrency-key checks.
+_LOCK_NS = 7302
+
+Handler = Callable[[Session, dict], None]
+_handlers: dict[str, Handler] = {}
+# The running job's "lease lost" flag, per worker thread (see check_lease).
+_current = threading.local()
+
+
+class LeaseLost(RuntimeError):
+    """The running job's lease passed to another worker; stop without writing."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register the function that runs jobs of *kind*."""
+    def register(fn: Handler) -> Handler:
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+# --- Producer ----------------------------------------------------------------
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict | None = None,
+    *,
+    dedupe_key: str | None = None,
+    concurrency_key: str | None = None,
+    concurrency_limit: int = 1,
+    max_attempts: int | None = None,
+) -> int | None:
+    """Queue a job in *db*'s transaction; returns its id.
+
+    With a *dedupe_key*, a job that is already queued or running under the
+    same key is reused (its id is returned) instead of adding another.
+    """
+    stmt = (
+        pg_insert(Job)
+        .values(
+            kind=kind,
+            payload=json.dumps(payload or {}),
+            dedupe_key=dedupe_key,
+            concurrency_key=concurrency_key,
+            concurrency_limit=max(1, concurrency_limit),
+            max_attempts=max_attempts or settings.job_max_attempts,
+            run_after=_now(),
+            created_at=_now(),
+        )
+        .on_conflict_do_nothing(
+            index_elements=["dedupe_key"], index_where=Job.status.in_(("queued", "running")),
+        )
+        .returning(Job.id)
+    )
+    job_id = db.scalar(stmt)
+    if job_id is None and dedupe_key is not None:
+        job_id = db.scalar(
+            select(Job.id).where(Job.dedupe_key == dedupe_key, Job.status.in_(("queued", "running")))
+        )
+    return job_id
+
+
+# --- Leasing -----------------------------------------------------------------
+def _backoff(attempts: int) -> timedelta:
+    seconds = settings.job_retry_seconds * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.job_retry_max_seconds))
+
+
+def claim(db: Session, owner: str, kinds: list[str] | None = None) -> Job | None:
+    """Lease the next runnable job for *owner*, or None. Commits."""
+    now = _now()
+    stmt = (
+        select(Job)
+        .where(or_(
+            (Job.status == "queued") & (Job.run_after <= now),
+            # A running job whose lease lapsed lost its worker: take it over.
+            (Job.status == "running") & (Job.lease_expires_at < now),
+        ))
+        .order_by(Job.run_after, Job.id)
+        .limit(settings.job_claim_scan)
+        .with_for_update(skip_locked=True)
+    )
+    if kinds is not None:
+        stmt = stmt.where(Job.kind.in_(kinds))
+    for job in db.scalars(stmt).all():
+        if job.status == "running" and job.attempts >= job.max_attempts:
+            # The handler never got to record an outcome (it took its worker
+            # down with it, or ran past its lease every time): stop re-leasing.
+            log.error("Job %s (%s) lease expired on its last attempt; failing it", job.id, job.kind)
+            job.status = "failed"
+            job.finished_at = now
+            job.last_error = (
+                f"Lease expired (held by {job.lease_owner}) after {job.attempts} attempt(s)"
+            )[:2000]
+            job.lease_owner = None
+            job.lease_expires_at = None
+            continue
+        if job.concurrency_key and not _has_slot(db, job, now):
+            continue
+        if job.status == "running":
+            log.warning("Job %s (%s) lease held by %s expired; taking over", job.id, job.kind, job.lease_owner)
+        job.status = "running"
+        job.attempts += 1
+        job.lease_owner = owner
+        job.lease_expires_at = now + timedelta(seconds=settings.job_lease_seconds)
+        job.heartbeat_at = now
+        job.started_at = job.started_at or now
+        db.commit()
+        return job
+    db.commit()
+    return None
+
+
+def _has_slot(db: Session, job: Job, now: datetime) -> bool:
+    # Serialise claimers of the same key until commit, then count live leases.
+    # Only try the lock: a claimer holding another key's lock could otherwise
+    # wait on us while we wait on it. A busy key just means another claimer
+    # is deciding on it right now; move on to the next candidate.
+    if not db.scalar(
+        text("SELECT pg_try_advisory_xact_lock(:ns, hashtext(:key))"),
+        {"ns": _LOCK_NS, "key": job.concurrency_key},
+    ):
+        return False
+    running = db.scalar(
+        select(func.count()).select_from(Job).where(
+            Job.concurrency_key == job.concurrency_key,
+            Job.status == "running",
+            Job.lease_expires_at >= now,
+            Job.id != job.id,
+        )
+    )
+    return running < job.concurrency_limit
+
+
+def heartbeat(db: Session, owner: str, job_ids: list[int]) -> list[int]:
+    """Extend *owner*'s leases on *job_ids*; returns the ids still held. Commits."""
+    if not job_ids:
+        return []
+    now = _now()
+    held = db.scalars(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.lease_owner == owner, Job.status == "running")
+        .values(heartbeat_at=now, lease_expires_at=now + timedelta(seconds=settings.job_lease_seconds))
+        .returning(Job.id)
+    ).all()
+    db.commit()
+    return list(held)
+
+
+def check_lease() -> None:
+    """Raise :class:`LeaseLost` when the job running on this thread lost its lease.
+
+    Handlers that commit in steps call this before each commit; outside a job
+    it does nothing.
+    """
+    lost = getattr(_current, "lost", None)
+    if lost is not None and lost.is_set():
+        raise LeaseLost("Job lease lost to another worker")
+
+
+def _finish(job_id: int, owner: str, error: str | None) -> None:
+    with SessionLocal() as db:
+        job = db.get(Job, job_id, with_for_update=True)
+        if job is None or job.lease_owner != owner or job.status != "running":
+            db.commit()
+            return  # lease lost meanwhile; the new owner decides the outcome
+        now = _now()
+        job.lease_owner = None
+        job.lease_expires_at = None
+        if error is None:
+            job.status = "done"
+            job.finished_at = now
+            job.last_error = None
+        else:
+            job.last_error = error[:2000]
+            if job.attempts >= job.max_attempts:
+                job.status = "failed"
+                job.finished_at = now
+            else:
+                job.status = "queued"
+                job.run_after = now + _backoff(job.attempts)
+        db.commit()
+
+
+def run_job(
+    job_id: int, kind: str, payload: str, owner: str, lost: threading.Event | None = None,
+) -> None:
+    """Run one claimed job with its registered handler and record the outcome.
+
+    *lost* is set (by the worker's heartbeat) once the lease has passed to
+    someone else; :func:`check_lease` reads it.
+    """
+    fn = _handlers.get(kind)
+    error = None
+    if fn is None:
+        error = f"No handler registered for job kind {kind!r}"
+        log.error(error)
+    else:
+        db = SessionLocal()
+        _current.lost = lost
+        try:
+            fn(db, json.loads(payload or "{}"))
+        except LeaseLost:
+            log.warning("Job %s (%s) stopped: its lease passed to another worker", job_id, kind)
+            db.rollback()
+            return
+        except Exception as exc:  # noqa: BLE001 - recorded on the job and retried
+            log.exception("Job %s (%s) failed", job_id, kind)
+            db.rollback()
+            error = str(exc) or exc.__class__.__name__
+        finally:
+            _current.lost = None
+            db.close()
+    _finish(job_id, owner, error)
+
+
+# --- Worker ------------------------------------------------------------------
+class Worker:
+    """Runs up to ``concurrency`` jobs at a time on threads, plus a heartbeat."""
+
+    def __init__(self, concurrency: int | None = None, kinds: list[str] | None = None) -> None:
+        self.concurrency = max(1, concurrency or settings.job_worker_concurrency)
+        self.kinds = kinds
+        self.name = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._stop_beat = threading.Event()
+        self._lock = threading.Lock()
+        self._running: dict[int, threading.Event] = {}
+        self._threads: list[threading.Thread] = []
+        self._beat_thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._stop_beat.clear()
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"job-{i}", daemon=True) for i in range(self.concurrency)
+        ]
+        self._beat_thread = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+        for thread in [*self._threads, self._beat_thread]:
+            thread.start()
+        log.info("Job worker %s started (%d slot(s))", self.name, self.concurrency)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop claiming and wait for the jobs in hand to finish.
+
+        Jobs still running after *timeout* keep their lease until it expires,
+        then another worker resumes them from their checkpoint.
+        """
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        # Keep heart-beating until the job threads are done (or given up on).
+        self._stop_beat.set()
+        if self._beat_thread is not None:
+            self._beat_thread.join(timeout)
+
+    def run_once(self) -> bool:
+        """Claim and run a single job in this thread; False when none was due."""
+        with SessionLocal() as db:
+            job = claim(db, self.name, self.kinds)
+            if job is None:
+                return False
+            job_id, kind, payload = job.id, job.kind, job.payload
+        lost = threading.Event()
+        with self._lock:
+            self._running[job_id] = lost
+        try:
+            run_job(job_id, kind, payload, self.name, lost)
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+        return True
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception:  # noqa: BLE001 - never let a worker thread die
+                log.exception("Job worker loop failed")
+            self._wake.wait(settings.job_poll_seconds)
+
+    def _beat(self) -> None:
+        interval = settings.job_lease_seconds / 3
+        while not self._stop_beat.wait(interval):
+            with self._lock:
+                ids = list(self._running)
+            if not ids:
+                continue
+            try:
+                with SessionLocal() as db:
+                    lost = set(ids) - set(heartbeat(db, self.name, ids))
+                for job_id in lost:
+                    log.warning("Lost the lease on job %s", job_id)
+                    with self._lock:
+                        flag = self._running.get(job_id)
+                    if flag is not None:
+                        flag.set()
+            except Exception:  # noqa: BLE001
+                log.exception("Job heartbeat failed")
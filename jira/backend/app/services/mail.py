@@ -45,6 +45,30 @@ def build_message(
     return msg
 
 
+def connect(cfg: MailConfig) -> smtplib.SMTP:
+    """Open an SMTP connection for *cfg*, upgraded to TLS and logged in.
+
+    The caller owns the connection and should ``quit()`` it; keeping it open
+    lets a batch of messages share one handshake. Raises on any SMTP error.
+    """
+    if cfg.use_ssl:
+        server: smtplib.SMTP = smtplib.SMTP_SSL(cfg.host, cfg.port, timeout=_TIMEOUT)
+    else:
+        server = smtplib.SMTP(cfg.host, cfg.port, timeout=_TIMEOUT)
+    try:
+        server.ehlo()
+        if cfg.use_tls and not cfg.use_ssl:
+            server.starttls()
+            server.ehlo()
+        if cfg.username:
+            password = decrypt(cfg.password_enc) or ""
+            server.login(cfg.username, password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
 def send_email(
     db: Session,
     to: str | list[str],
@@ -77,18 +101,8 @@ def send_email(
     )
 
     try:
-        if cfg.use_ssl:
-            server: smtplib.SMTP = smtplib.SMTP_SSL(cfg.host, cfg.port, timeout=_TIMEOUT)
-        else:
-            server = smtplib.SMTP(cfg.host, cfg.port, timeout=_TIMEOUT)
+        server = connect(cfg)
         try:
-            server.ehlo()
-            if cfg.use_tls and not cfg.use_ssl:
-                server.starttls()
-                server.ehlo()
-            if cfg.username:
-                password = decrypt(cfg.password_enc) or ""
-                server.login(cfg.username, password)
             server.sendmail(from_address, recipients, msg.as_string())
         finally:
             try:
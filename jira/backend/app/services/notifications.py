@@ -2,12 +2,13 @@
 
 Every notifiable event funnels through :func:`dispatch`, which consults the
 recipient's per-channel :class:`UserNotificationPreference` rows. When no row
-exists the :data:`DEFAULTS` map decides. In-app delivery writes a
-:class:`Notification`; email delivery (only when instance mail is enabled) goes
-through :mod:`app.services.mail`.
+exists the :data:`DEFAULTS` map decides; both channels are resolved with one
+query per event. In-app delivery writes a :class:`Notification`; email delivery
+(only when instance mail is enabled) queues a row in the transactional outbox
+that :mod:`app.services.outbox` sends in the background.
 
-``mail`` is imported lazily inside :func:`dispatch` to avoid import cycles, and
-every delivery path is wrapped so a notification failure never breaks the
+``outbox`` is imported lazily inside :func:`dispatch` to avoid import cycles,
+and every delivery path is wrapped so a notification failure never breaks the
 request that triggered it.
 """
 from __future__ import annotations
@@ -15,7 +16,7 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
 from app.models import NOTIFICATION_EVENTS, MailConfig, User
@@ -98,6 +99,37 @@ def _mail_enabled(db: Session) -> bool:
     return bool(cfg and cfg.enabled and cfg.host)
 
 
+def _pref_event(event: str) -> str:
+    """Preference key for *event*; callers pass short verbs ("assigned")."""
+    return event if event in NOTIFICATION_EVENTS else f"issue_{event}"
+
+
+def _recipient(db: Session, user_id: int, event: str) -> tuple[str | None, dict[str, bool]] | None:
+    """The recipient's email and effective per-channel prefs for *event*.
+
+    One query: the user row outer-joined to their preference rows for the
+    event. Returns None when the user does not exist.
+    """
+    rows = db.execute(
+        select(User.email, UserNotificationPreference.channel, UserNotificationPreference.enabled)
+        .outerjoin(
+            UserNotificationPreference,
+            and_(
+                UserNotificationPreference.user_id == User.id,
+                UserNotificationPreference.event == event,
+            ),
+        )
+        .where(User.id == user_id)
+    ).all()
+    if not rows:
+        return None
+    prefs = {channel: _default(event, channel) for channel in ("in_app", "email")}
+    for _, channel, enabled in rows:
+        if channel is not None:
+            prefs[channel] = bool(enabled)
+    return rows[0][0], prefs
+
+
 def dispatch(
     db: Session,
     user_id: int | None,
@@ -110,15 +142,25 @@ def dispatch(
 ) -> None:
     """Deliver a notification for *event* to *user_id* honoring their prefs.
 
-    Writes an in-app :class:`Notification` when the in-app pref is on, and sends
-    an email when the email pref is on *and* instance mail is enabled. Self-
-    notifications (``user_id == actor_id``) and missing recipients are skipped.
-    Never raises.
+    Writes an in-app :class:`Notification` when the in-app pref is on, and
+    queues an email in the outbox (:mod:`app.services.outbox`) when the email
+    pref is on *and* instance mail is enabled; both are part of the caller's
+    transaction. Self-notifications (``user_id == actor_id``) and missing
+    recipients are skipped. Never raises.
     """
     if not user_id or user_id == actor_id:
         return
     try:
-        if get_preference(db, user_id, event, "in_app"):
+        found = _recipient(db, user_id, _pref_event(event))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Notification lookup failed for user %s: %s", user_id, exc)
+        return
+    if found is None:
+        return
+    email, prefs = found
+
+    if prefs["in_app"]:
+        try:
             db.add(
                 Notification(
                     user_id=user_id,
@@ -129,29 +171,20 @@ def dispatch(
                     created_at=_now(),
                 )
             )
-            db.flush()
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("In-app notification failed for user %s: %s", user_id, exc)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("In-app notification failed for user %s: %s", user_id, exc)
 
     try:
-        if not get_preference(db, user_id, event, "email"):
-            return
-        if not _mail_enabled(db):
+        if not prefs["email"] or not email or not _mail_enabled(db):
             return
-        recipient = db.get(User, user_id)
-        if recipient is None or not recipient.email:
-            return
-
         issue_key = getattr(issue, "key", None)
         subj = subject or (f"[{issue_key}] {message}" if issue_key else message)
         body = email_body or message
         if issue_key:
             body = f"{body}\n\nIssue: {issue_key}"
 
-        from app.services import mail  # lazy import to avoid cycles
+        from app.services import outbox  # lazy import to avoid cycles
 
-        ok, detail = mail.send_email(db, recipient.email, subj, body)
-        if not ok:
-            logger.info("Email notification not sent to %s: %s", recipient.email, detail)
+        outbox.enqueue(db, user_id, email, subj, body)
     except Exception as exc:  # noqa: BLE001
         logger.warning("Email notification failed for user %s: %s", user_id, exc)
@@ -0,0 +1,195 @@
+"""Transactional email outbox and the background mailer that drains it.
+
+:func:`app.services.notifications.dispatch` never talks to SMTP. It calls
+:func:`enqueue`, which adds a :class:`NotificationOutbox` row to the caller's
+session, so the email commits (or rolls back) together with the change that
+caused it and the request returns without waiting on the relay.
+
+A single daemon thread per process (:func:`start_worker`) delivers due rows:
+
+* rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several worker processes
+  can share one outbox without sending anything twice;
+* everything due for the same address goes out as one message, and a batch
+  shares one SMTP connection;
+* a failed delivery is retried with exponential backoff
+  (``notification_retry_seconds`` doubling up to
+  ``notification_retry_max_seconds``) and marked ``failed`` after
+  ``notification_max_attempts``.
+
+The worker wakes on a timer and right after any commit that enqueued mail.
+While instance mail is disabled rows simply stay pending.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import NotificationOutbox
+from app.services import mail
+
+log = logging.getLogger("trackly.services.outbox")
+
+_WAKE_KEY = "outbox_enqueued"
+_wake = threading.Event()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# --- Producer ----------------------------------------------------------------
+def enqueue(db: Session, user_id: int | None, to_address: str, subject: str, body: str) -> None:
+    """Queue an email in *db*'s transaction; it is sent after commit."""
+    now = _now()
+    db.add(
+        NotificationOutbox(
+            user_id=user_id,
+            to_address=to_address,
+            subject=subject[:500],
+            body=body,
+            next_attempt_at=now,
+            created_at=now,
+        )
+    )
+    db.info[_WAKE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session: Session) -> None:
+    if session.info.pop(_WAKE_KEY, False):
+        _wake.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    session.info.pop(_WAKE_KEY, None)
+
+
+# --- Delivery ----------------------------------------------------------------
+def _backoff(attempts: int) -> timedelta:
+    seconds = settings.notification_retry_seconds * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.notification_retry_max_seconds))
+
+
+def _retry(row: NotificationOutbox, error: str, now: datetime) -> None:
+    row.attempts += 1
+    row.last_error = error[:2000]
+    if row.attempts >= settings.notification_max_attempts:
+        row.status = "failed"
+    else:
+        row.next_attempt_at = now + _backoff(row.attempts)
+
+
+def _compose(rows: list[NotificationOutbox]) -> tuple[str, str]:
+    """One message for everything queued for a recipient."""
+    if len(rows) == 1:
+        return rows[0].subject, rows[0].body
+    parts = [f"{r.subject}\n\n{r.body}" for r in rows]
+    return f"{len(rows)} Trackly notifications", "\n\n---\n\n".join(parts)
+
+
+def deliver_pending(db: Session, limit: int | None = None) -> int:
+    """Send up to *limit* due outbox rows; returns how many rows were sent.
+
+    Commits its own transaction. Never raises for SMTP problems — those are
+    recorded on the rows and retried later.
+    """
+    cfg = mail.get_mail_config(db)
+    if cfg is None or not cfg.enabled or not cfg.host:
+        return 0
+    now = _now()
+    rows = list(
+        db.scalars(
+            select(NotificationOutbox)
+            .where(NotificationOutbox.status == "pending", NotificationOutbox.next_attempt_at <= now)
+            .order_by(NotificationOutbox.id)
+            .limit(limit or settings.notification_batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    if not rows:
+        db.commit()
+        return 0
+
+    by_address: dict[str, list[NotificationOutbox]] = {}
+    for row in rows:
+        by_address.setdefault(row.to_address, []).append(row)
+
+    try:
+        server = mail.connect(cfg)
+    except Exception as exc:  # noqa: BLE001 - relay down: back off every row
+        log.warning("SMTP connect failed, %d notification(s) deferred: %s", len(rows), exc)
+        for row in rows:
+            _retry(row, str(exc), now)
+        db.commit()
+        return 0
+
+    from_address = cfg.from_address or cfg.username or ""
+    sent = 0
+    try:
+        for address, items in by_address.items():
+            subject, body = _compose(items)
+            msg = mail.build_message(cfg.from_name, from_address, [address], subject, body)
+            try:
+                server.sendmail(from_address, [address], msg.as_string())
+            except Exception as exc:  # noqa: BLE001
+                log.info("Notification email to %s failed: %s", address, exc)
+                for row in items:
+                    _retry(row, str(exc), now)
+                continue
+            for row in items:
+                row.status = "sent"
+                row.sent_at = now
+            sent += len(items)
+    finally:
+        try:
+            server.quit()
+        except Exception:  # noqa: BLE001
+            pass
+    db.commit()
+    return sent
+
+
+# --- Background worker -------------------------------------------------------
+_worker: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        sent = 0
+        try:
+            with SessionLocal() as db:
+                sent = deliver_pending(db)
+        except Exception:  # noqa: BLE001 - never let the mailer thread die
+            log.exception("Notification outbox delivery failed")
+        if sent >= settings.notification_batch_size:
+            continue  # more may be due right away
+        _wake.wait(settings.notification_poll_seconds)
+        _wake.clear()
+
+
+def start_worker() -> None:
+    """Start this process's mailer thread (idempotent)."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    _stop.clear()
+    _worker = threading.Thread(target=_run, name="notification-outbox", daemon=True)
+    _worker.start()
+
+
+def stop_worker(timeout: float = 5.0) -> None:
+    """Ask the mailer thread to finish its current batch and exit."""
+    global _worker
+    _stop.set()
+    _wake.set()
+    if _worker is not None:
+        _worker.join(timeout)
+    _worker = None
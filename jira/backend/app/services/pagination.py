@@ -0,0 +1,159 @@
+"""Keyset (cursor) pagination and bounded counts for issue searches.
+
+OFFSET paging makes the database walk and discard every earlier row, so page
+500 costs 500 pages of work; ``count(*)`` over a broad filter scans every match
+on every request. Instead:
+
+* A cursor records the sort-key values of the last row served. The next page
+  is ``WHERE (keys) > (cursor values)`` in the query's own order, so any page
+  costs the same as the first. Cursors are opaque (base64 JSON) and bound to
+  the query they came from.
+* Totals are counted exactly only up to a cap; beyond it the response says
+  "cap+" and, on PostgreSQL, carries the planner's row estimate. Exact counts
+  are a separate, explicit request.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import and_, false, func, or_, select
+from sqlalchemy.orm import Session
+
+log = logging.getLogger("trackly.search")
+
+
+class CursorError(ValueError):
+    """Raised when a cursor token is malformed or belongs to another query."""
+
+
+# --- Cursor tokens ----------------------------------------------------------
+def _dump(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise CursorError("Invalid cursor")
+    return value
+
+
+def query_signature(tql: str) -> str:
+    """Short fingerprint tying a cursor to the query text it was issued for."""
+    return hashlib.sha1(" ".join((tql or "").split()).encode()).hexdigest()[:12]
+
+
+def encode_cursor(values, signature: str) -> str:
+    payload = json.dumps({"q": signature, "k": [_dump(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _key_type(expr) -> type | None:
+    try:
+        return expr.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def _fits(value, expected: type | None) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (list, dict)):
+        return False
+    if expected is None:
+        return not isinstance(value, bool)
+    if expected is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    if expected is date:
+        # datetime subclasses date, but a timestamp is not a valid date key.
+        return type(value) is date
+    return isinstance(value, expected)
+
+
+def decode_cursor(token: str, signature: str, n_keys: int, sort_keys=None) -> list:
+    """Values stored in *token*, checked against the query they must continue.
+
+    With *sort_keys* each value must also match its column's Python type, so a
+    tampered cursor is rejected here instead of failing inside the database.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        values = [_load(v) for v in payload["k"]]
+        sig = payload["q"]
+    except (ValueError, KeyError, TypeError):
+        raise CursorError("Invalid cursor")
+    if sig != signature or len(values) != n_keys:
+        raise CursorError("Cursor does not belong to this query")
+    if sort_keys is not None and not all(
+        _fits(v, _key_type(expr)) for (expr, _), v in zip(sort_keys, values)
+    ):
+        raise CursorError("Invalid cursor")
+    return values
+
+
+# --- Keyset predicate -------------------------------------------------------
+def _equal(expr, value):
+    return expr.is_(None) if value is None else expr == value
+
+
+def _after(expr, descending: bool, value):
+    # Matches ORDER BY ... ASC NULLS LAST / DESC NULLS FIRST.
+    if descending:
+        return expr.isnot(None) if value is None else expr < value
+    return false() if value is None else or_(expr > value, expr.is_(None))
+
+
+def keyset_clause(sort_keys: list[tuple[object, bool]], values: list):
+    """Rows strictly after *values* in the order given by *sort_keys*."""
+    branches = []
+    for i, (expr, descending) in enumerate(sort_keys):
+        prefix = [_equal(e, v) for (e, _), v in zip(sort_keys[:i], values[:i])]
+        branches.append(and_(*prefix, _after(expr, descending, values[i])))
+    return or_(*branches)
+
+
+# --- Counting ---------------------------------------------------------------
+def bounded_count(db: Session, stmt, cap: int) -> tuple[int, bool]:
+    """Count rows of *stmt* but stop after ``cap``: ``(n, exact)``.
+
+    When more than ``cap`` rows match, returns ``(cap, False)``.
+    """
+    n = db.scalar(select(func.count()).select_from(stmt.limit(cap + 1).subquery())) or 0
+    return (cap, False) if n > cap else (n, True)
+
+
+def exact_count(db: Session, stmt) -> int:
+    return db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery())) or 0
+
+
+def estimated_count(db: Session, stmt) -> int | None:
+    """The PostgreSQL planner's row estimate for *stmt* (``None`` elsewhere)."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = stmt.order_by(None).compile(dialect=bind.dialect, compile_kwargs={"render_postcompile": True})
+    try:
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params
+            ).scalar()
+    except Exception:  # an estimate is a nicety; never fail the search for it
+        log.debug("row estimate failed", exc_info=True)
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
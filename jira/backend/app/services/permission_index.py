@@ -0,0 +1,267 @@
+"""Materialized project permissions (``effective_project_permissions``).
+
+Evaluating a project permission from scratch means resolving the project's
+scheme, walking its grants and looking up role actors — several queries per
+project, so filtering a search by "projects I may browse" used to cost
+O(projects x grants) queries. This module keeps the result of that walk in a
+table, one row per (project, permission, principal), where a principal is a
+user, a group, or one of the symbolic holders ``anyone`` / ``reporter`` /
+``assignee``. "Which projects may user U browse" is then one indexed lookup
+joined to U's groups (see ``permissions.visible_projects_subquery``).
+
+Rows are recomputed per project inside the writing transaction whenever an
+input changes (hooked on Session flush):
+
+* project created, or its lead / permission scheme changed  -> that project
+* role actor added / removed / changed                      -> that project
+* scheme grant or scheme (incl. ``is_default``) changed      -> projects on it
+* group or project role created / renamed / deleted          -> projects on
+  schemes with a grant naming it (and, for a group, projects holding rows
+  for it through role actors)
+* a user gains an external id that a user grant refers to    -> projects on
+  schemes with that grant
+
+Only :func:`rebuild_all` (bootstrap / repair, its own transaction) rebuilds
+every project, so a request never holds the exclusive lock below.
+
+Group *membership* is resolved at query time, so it never triggers work.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import and_, delete, event, inspect, insert, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models import (
+    EffectiveProjectPermission,
+    Group,
+    PermissionGrant,
+    PermissionScheme,
+    Project,
+    ProjectRole,
+    ProjectRoleActor,
+    User,
+)
+from app.services import permission_keys as P
+
+log = logging.getLogger("trackly.permissions")
+
+EPP = EffectiveProjectPermission
+
+HOLDER_ANYONE = "anyone"
+HOLDER_REPORTER = "reporter"
+HOLDER_ASSIGNEE = "assignee"
+HOLDER_USER = "user"
+HOLDER_GROUP = "group"
+
+# pg_advisory_xact_lock namespace: (ns, 0) guards full rebuilds (exclusive)
+# against per-project ones (shared), (ns, project_id) serialises one project.
+_LOCK_NS = 7321
+_SHARED_HELD = "permission_index.shared_lock"
+
+
+# --- Rebuild ----------------------------------------------------------------
+def _lock(conn: Connection, project_ids: list[int] | None) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    if project_ids is None:
+        # Upgrading shared -> exclusive inside one transaction deadlocks
+        # against any other transaction doing the same.
+        if conn.info.get(_SHARED_HELD) is conn.get_transaction():
+            raise RuntimeError("full permission rebuild after a per-project one in the same transaction")
+        conn.execute(text("SELECT pg_advisory_xact_lock(:ns, 0)"), {"ns": _LOCK_NS})
+        return
+    conn.execute(text("SELECT pg_advisory_xact_lock_shared(:ns, 0)"), {"ns": _LOCK_NS})
+    conn.info[_SHARED_HELD] = conn.get_transaction()
+    for pid in sorted(project_ids):
+        conn.execute(text("SELECT pg_advisory_xact_lock(:ns, :pid)"), {"ns": _LOCK_NS, "pid": pid})
+
+
+def _user_holder_ids(value: str | None, users_by_external: dict[str, list[int]]) -> list[int]:
+    # Mirrors the old per-request check: holder_value is the user id as a
+    # string, or the user's external id (grants imported from Jira).
+    ids = list(users_by_external.get(value or "", ()))
+    if value and value.isdigit() and str(int(value)) == value:
+        ids.append(int(value))
+    return ids
+
+
+def rebuild(conn: Connection, project_ids: Iterable[int] | None = None) -> int:
+    """Recompute rows for *project_ids* (every project when None). Returns rows written."""
+    pids = None if project_ids is None else sorted(set(project_ids))
+    if pids == []:
+        return 0
+    _lock(conn, pids)
+
+    q = select(Project.id, Project.lead_id, Project.permission_scheme_id)
+    if pids is not None:
+        q = q.where(Project.id.in_(pids))
+    projects = conn.execute(q).all()
+
+    default_scheme = conn.scalar(
+        select(PermissionScheme.id).where(PermissionScheme.is_default.is_(True)).limit(1)
+    )
+    live_schemes = set(conn.scalars(
+        select(PermissionScheme.id).where(
+            PermissionScheme.id.in_({p.permission_scheme_id for p in projects if p.permission_scheme_id})
+        )
+    ))
+    scheme_of = {
+        p.id: p.permission_scheme_id if p.permission_scheme_id in live_schemes else default_scheme
+        for p in projects
+    }
+    grants = defaultdict(list)
+    for g in conn.execute(
+        select(PermissionGrant.scheme_id, PermissionGrant.permission,
+               PermissionGrant.holder_type, PermissionGrant.holder_value)
+        .where(PermissionGrant.scheme_id.in_({s for s in scheme_of.values() if s}))
+    ):
+        grants[g.scheme_id].append(g)
+
+    values = {g.holder_value for gs in grants.values() for g in gs if g.holder_value}
+    groups = dict(conn.execute(select(Group.name, Group.id).where(Group.name.in_(values))).all())
+    roles = dict(conn.execute(select(ProjectRole.name, ProjectRole.id).where(ProjectRole.name.in_(values))).all())
+    users_by_external: dict[str, list[int]] = defaultdict(list)
+    for ext, uid in conn.execute(select(User.external_id, User.id).where(User.external_id.in_(values))):
+        users_by_external[ext].append(uid)
+
+    actors = defaultdict(list)  # (project_id, role_id) -> [(holder_type, id)]
+    aq = select(ProjectRoleActor.project_id, ProjectRoleActor.role_id,
+                ProjectRoleActor.user_id, ProjectRoleActor.group_id)
+    if pids is not None:
+        aq = aq.where(ProjectRoleActor.project_id.in_(pids))
+    for a in conn.execute(aq):
+        if a.user_id is not None:
+            actors[(a.project_id, a.role_id)].append((HOLDER_USER, a.user_id))
+        if a.group_id is not None:
+            actors[(a.project_id, a.role_id)].append((HOLDER_GROUP, a.group_id))
+
+    rows: set[tuple[int, str, str, int]] = set()
+    for p in projects:
+        for g in grants.get(scheme_of[p.id], ()):
+            ht, hv = g.holder_type, g.holder_value
+            holders: list[tuple[str, int]] = []
+            if ht == P.HOLDER_SPECIAL:
+                if hv in (P.SPECIAL_ANYONE, P.SPECIAL_CURRENT_USER):
+                    holders.append((HOLDER_ANYONE, 0))
+                elif hv == P.SPECIAL_PROJECT_LEAD and p.lead_id:
+                    holders.append((HOLDER_USER, p.lead_id))
+                elif hv == P.SPECIAL_REPORTER:
+                    holders.append((HOLDER_REPORTER, 0))
+                elif hv == P.SPECIAL_ASSIGNEE:
+                    holders.append((HOLDER_ASSIGNEE, 0))
+            elif ht == P.HOLDER_GROUP:
+                if hv in groups:
+                    holders.append((HOLDER_GROUP, groups[hv]))
+            elif ht == P.HOLDER_USER:
+                holders.extend((HOLDER_USER, uid) for uid in _user_holder_ids(hv, users_by_external))
+            elif ht == P.HOLDER_PROJECT_ROLE and hv:
+                role_id = int(hv) if hv.isdigit() else roles.get(hv)
+                holders.extend(actors.get((p.id, role_id), ()))
+            for holder_type, holder_id in holders:
+                rows.add((p.id, g.permission, holder_type, holder_id))
+
+    d = delete(EPP)
+    if pids is not None:
+        d = d.where(EPP.project_id.in_(pids))
+    conn.execute(d)
+    if rows:
+        conn.execute(insert(EPP), [
+            {"project_id": pid, "permission": perm, "holder_type": ht, "holder_id": hid}
+            for pid, perm, ht, hid in rows
+        ])
+    return len(rows)
+
+
+def rebuild_all(engine) -> int:
+    """Full rebuild in its own transaction (bootstrap / repair)."""
+    with engine.begin() as conn:
+        n = rebuild(conn)
+    log.info("Permission index rebuilt: %d row(s)", n)
+    return n
+
+
+# --- Change tracking --------------------------------------------------------
+def _changed(obj, *cols: str) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[c].history.has_changes() for c in cols)
+
+
+def _old_value(obj, col: str):
+    hist = inspect(obj).attrs[col].history
+    return hist.deleted[0] if hist.deleted else None
+
+
+def _names(obj) -> set[str]:
+    """Current and pre-rename name of a Group / ProjectRole."""
+    return {n for n in (obj.name, _old_value(obj, "name")) if n}
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session: Session, flush_context) -> None:
+    projects: set[int] = set()
+    schemes: set[int] = set()
+    group_names: set[str] = set()
+    role_refs: set[str] = set()
+    user_refs: set[str] = set()
+    group_ids: set[int] = set()
+
+    touched = [(obj, "new") for obj in session.new]
+    touched += [(obj, "deleted") for obj in session.deleted]
+    touched += [(obj, "dirty") for obj in session.dirty]
+    for obj, state in touched:
+        if isinstance(obj, Project):
+            if state == "new" or (state == "dirty" and _changed(obj, "lead_id", "permission_scheme_id")):
+                projects.add(obj.id)
+        elif isinstance(obj, ProjectRoleActor):
+            if state != "dirty" or _changed(obj, "project_id", "role_id", "user_id", "group_id"):
+                projects.add(obj.project_id)
+                if state == "dirty" and _old_value(obj, "project_id"):
+                    projects.add(_old_value(obj, "project_id"))
+        elif isinstance(obj, PermissionGrant):
+            if state != "dirty" or _changed(obj, "scheme_id", "permission", "holder_type", "holder_value"):
+                schemes.add(obj.scheme_id)
+                if state == "dirty" and _old_value(obj, "scheme_id"):
+                    schemes.add(_old_value(obj, "scheme_id"))
+        elif isinstance(obj, PermissionScheme):
+            if state != "dirty" or _changed(obj, "is_default"):
+                schemes.add(obj.id)
+        elif isinstance(obj, Group):
+            if state != "dirty" or _changed(obj, "name"):
+                group_names |= _names(obj)
+                group_ids.add(obj.id)
+        elif isinstance(obj, ProjectRole):
+            if state != "dirty" or _changed(obj, "name"):
+                role_refs |= _names(obj) | {str(obj.id)}
+        elif isinstance(obj, User) and state != "deleted" and obj.external_id:
+            if state == "new" or _changed(obj, "external_id"):
+                user_refs.add(obj.external_id)
+
+    if not (projects or schemes or group_names or role_refs or user_refs):
+        return
+    conn = session.connection()
+    refs = [
+        and_(PermissionGrant.holder_type == ht, PermissionGrant.holder_value.in_(values))
+        for ht, values in (
+            (P.HOLDER_GROUP, group_names), (P.HOLDER_PROJECT_ROLE, role_refs), (P.HOLDER_USER, user_refs),
+        )
+        if values
+    ]
+    if refs:
+        schemes.update(conn.scalars(select(PermissionGrant.scheme_id).where(or_(*refs)).distinct()))
+    if group_ids:
+        # Rows a group holds through role actors (removed with it by cascade).
+        projects.update(conn.scalars(select(EPP.project_id).where(
+            EPP.holder_type == HOLDER_GROUP, EPP.holder_id.in_(group_ids),
+        ).distinct()))
+    if schemes:
+        # Projects on those schemes, plus scheme-less ones (which follow the
+        # default — possibly just changed, or just orphaned by a delete).
+        projects.update(conn.scalars(select(Project.id).where(or_(
+            Project.permission_scheme_id.in_(schemes), Project.permission_scheme_id.is_(None),
+        ))))
+    rebuild(conn, projects)
@@ -4,16 +4,21 @@ Evaluates global and project permissions against a user's groups, project roles
 and the special dynamic holders (reporter/assignee/project lead/anyone). Site
 administrators (``User.is_admin``) bypass every check. This module is the single
 source of truth for "can user X do Y" decisions across the API.
+
+Project permissions are answered from ``effective_project_permissions``, the
+per-project flattening of schemes and role actors kept current by
+``services.permission_index``.
 """
 from __future__ import annotations
 
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import or_, select
+from sqlalchemy import and_, exists, or_, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.models import (
+    EffectiveProjectPermission,
     GlobalPermissionGrant,
     Group,
     PermissionScheme,
@@ -24,8 +29,11 @@ from app.models import (
     user_groups,
 )
 from app.models.issue import Issue
+from app.services import permission_index
 from app.services import permission_keys as P
 
+EPP = EffectiveProjectPermission
+
 
 # --- Group / role resolution ----------------------------------------------
 def user_group_ids(db: Session, user: User) -> set[int]:
@@ -86,39 +94,21 @@ def get_effective_scheme(db: Session, project: Project) -> PermissionScheme | No
     ).first()
 
 
-def _grant_matches(
-    db: Session,
-    grant,
-    user: User,
-    project: Project,
-    issue: Issue | None,
-    role_ids: set[int],
-    gnames: set[str],
-) -> bool:
-    ht, hv = grant.holder_type, grant.holder_value
-    if ht == P.HOLDER_SPECIAL:
-        if hv == P.SPECIAL_ANYONE:
-            return True
-        if hv == P.SPECIAL_CURRENT_USER:
-            return True  # any authenticated user
-        if hv == P.SPECIAL_PROJECT_LEAD:
-            return project.lead_id == user.id
-        if hv == P.SPECIAL_REPORTER:
-            return issue is not None and issue.reporter_id == user.id
-        if hv == P.SPECIAL_ASSIGNEE:
-            return issue is not None and issue.assignee_id == user.id
-        return False
-    if ht == P.HOLDER_GROUP:
-        return hv in gnames
-    if ht == P.HOLDER_USER:
-        return hv == str(user.id) or (user.external_id and hv == user.external_id)
-    if ht == P.HOLDER_PROJECT_ROLE:
-        # holder_value may be a role id or a role name.
-        if hv and hv.isdigit():
-            return int(hv) in role_ids
-        role = db.scalars(select(ProjectRole).where(ProjectRole.name == hv)).first()
-        return bool(role and role.id in role_ids)
-    return False
+def _holder_clause(user: User, issue: Issue | None = None):
+    """Rows of effective_project_permissions that *user* holds."""
+    conds = [
+        EPP.holder_type == permission_index.HOLDER_ANYONE,
+        and_(EPP.holder_type == permission_index.HOLDER_USER, EPP.holder_id == user.id),
+        and_(
+            EPP.holder_type == permission_index.HOLDER_GROUP,
+            EPP.holder_id.in_(select(user_groups.c.group_id).where(user_groups.c.user_id == user.id)),
+        ),
+    ]
+    if issue is not None and issue.reporter_id == user.id:
+        conds.append(EPP.holder_type == permission_index.HOLDER_REPORTER)
+    if issue is not None and issue.assignee_id == user.id:
+        conds.append(EPP.holder_type == permission_index.HOLDER_ASSIGNEE)
+    return or_(*conds)
 
 
 def has_project_permission(
@@ -126,17 +116,33 @@ def has_project_permission(
 ) -> bool:
     if is_site_admin(db, user):
         return True
-    scheme = get_effective_scheme(db, project)
-    if scheme is None:
-        return False
-    role_ids = user_project_role_ids(db, user, project)
-    gnames = user_group_names(db, user)
-    for grant in scheme.grants:
-        if grant.permission != permission:
-            continue
-        if _grant_matches(db, grant, user, project, issue, role_ids, gnames):
-            return True
-    return False
+    # Scheme, grants and role actors are pre-resolved per project by
+    # services.permission_index, so this is one indexed EXISTS.
+    return bool(db.scalar(select(exists().where(
+        EPP.project_id == project.id,
+        EPP.permission == permission,
+        _holder_clause(user, issue),
+    ))))
+
+
+def visible_projects_subquery(user: User, permission: str = P.BROWSE_PROJECTS):
+    """``SELECT project_id`` of projects where *user* holds *permission*.
+
+    Compose as ``column.in_(...)`` to filter by visibility inside the main
+    query instead of materialising an id list first. Does not apply the site
+    admin bypass — see :func:`visible_project_filter`.
+    """
+    return select(EPP.project_id).where(
+        EPP.permission == permission, _holder_clause(user)
+    )
+
+
+def visible_project_filter(db: Session, user: User, column):
+    """WHERE clause limiting *column* (a project id) to browsable projects,
+    or None for site admins (no filtering)."""
+    if is_site_admin(db, user):
+        return None
+    return column.in_(visible_projects_subquery(user))
 
 
 def visible_project_ids(db: Session, user: User) -> set[int] | None:
@@ -145,11 +151,7 @@ def visible_project_ids(db: Session, user: User) -> set[int] | None:
     """
     if is_site_admin(db, user):
         return None
-    ids: set[int] = set()
-    for project in db.scalars(select(Project)):
-        if has_project_permission(db, user, project, P.BROWSE_PROJECTS):
-            ids.add(project.id)
-    return ids
+    return set(db.scalars(visible_projects_subquery(user).distinct()))
 
 
 # --- Project default wiring (used on project creation / sync) --------------
@@ -0,0 +1,171 @@
+"""Rank upkeep: bulk moves, length-pressure detection and online rebalancing.
+
+Board order is the lexicographic ``Issue.rank`` (see :mod:`app.utils.ranking`).
+Splitting the same gap over and over makes ranks longer, which bloats the rank
+index and eventually hits the ``String(64)`` column limit. This module:
+
+* writes multi-card moves with a single ``UPDATE … FROM (VALUES …)``
+  (:func:`write_ranks`), using evenly spaced ranks so a drop of N cards
+  lengthens ranks by ~log62(N) characters instead of one per few cards;
+* reports per-project rank-length pressure (:func:`rank_pressure`);
+* rebalances a project online (:func:`rebalance_project`): ranks are rewritten
+  into a new bucket prefix that sorts below (or above) every existing rank, in
+  short batches that each lock only the rows they rewrite. Because rewritten
+  and untouched ranks never interleave, boards stay correctly ordered while a
+  rebalance is running and keep accepting moves. The API only queues it
+  (:func:`enqueue_rebalance`); the job worker runs it.
+
+Rank writes are Core statements, so callers invalidate
+:mod:`app.services.analytics` themselves where it matters (ranks are not part
+of any cached aggregate, so rebalancing does not).
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy import Integer, String, column, func, select, text, update, values
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models import Issue
+from app.services import jobs
+from app.utils.ranking import bucket_prefix, spread_ranks
+
+log = logging.getLogger("trackly.services.rank_maintenance")
+
+# pg_advisory_lock namespace: (ns, project_id) serialises rebalances per project.
+_LOCK_NS = 7301
+
+
+def needs_rebalance(rank: str | None) -> bool:
+    return bool(rank) and len(rank) >= settings.rank_rebalance_length
+
+
+def write_ranks(db: Session, ranks: Iterable[tuple[int, str]], **extra) -> None:
+    """Set ``rank`` (plus any *extra* column values) for many issues in one statement."""
+    rows = list(ranks)
+    if not rows:
+        return
+    v = values(column("id", Integer), column("rank", String), name="v").data(rows)
+    db.execute(
+        update(Issue)
+        .where(Issue.id == v.c.id)
+        .values(rank=v.c.rank, **extra)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rank_pressure(db: Session, project_ids: Iterable[int] | None = None) -> list[dict]:
+    """Rank-length statistics per project, longest first.
+
+    ``long_ranks`` counts ranks at or over ``settings.rank_rebalance_length``;
+    any project with one is due a rebalance.
+    """
+    length = func.length(Issue.rank)
+    stmt = (
+        select(
+            Issue.project_id,
+            func.count(),
+            func.max(length),
+            func.avg(length),
+            func.count().filter(length >= settings.rank_rebalance_length),
+        )
+        .group_by(Issue.project_id)
+        .order_by(func.max(length).desc())
+    )
+    if project_ids is not None:
+        stmt = stmt.where(Issue.project_id.in_(list(project_ids)))
+    return [
+        {
+            "project_id": pid,
+            "issues": count,
+            "max_length": longest,
+            "avg_length": round(float(avg), 1),
+            "long_ranks": long_ranks,
+            "needs_rebalance": long_ranks > 0,
+        }
+        for pid, count, longest, avg, long_ranks in db.execute(stmt)
+    ]
+
+
+def rebalance_project(db: Session, project_id: int, batch_size: int | None = None) -> int:
+    """Rewrite *project_id*'s ranks evenly into a fresh bucket; returns issues rewritten.
+
+    Runs in batches of ``batch_size`` (default ``settings.rank_rebalance_batch``),
+    committing after each. Returns 0 without doing anything when another
+    rebalance of the same project holds the lock.
+    """
+    batch_size = batch_size or settings.rank_rebalance_batch
+    with engine.connect() as lock_conn:
+        got = lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:ns, :pid)"), {"ns": _LOCK_NS, "pid": project_id}
+        ).scalar()
+        lock_conn.commit()
+        if not got:
+            log.info("Rank rebalance for project %s already running", project_id)
+            return 0
+        try:
+            return _rebalance(db, project_id, batch_size)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:ns, :pid)"), {"ns": _LOCK_NS, "pid": project_id})
+            lock_conn.commit()
+
+
+def _rebalance(db: Session, project_id: int, batch_size: int) -> int:
+    total, lowest, highest = db.execute(
+        select(func.count(), func.min(Issue.rank), func.max(Issue.rank)).where(Issue.project_id == project_id)
+    ).one()
+    db.commit()
+    if not total:
+        return 0
+    bucket = bucket_prefix(lowest, highest)
+    new_ranks = spread_ranks(total, bucket[0]) if bucket else []
+    if not new_ranks or len(new_ranks[-1]) > Issue.rank.type.length:
+        log.warning("No room to rebalance ranks of project %s", project_id)
+        return 0
+    prefix, ascending = bucket
+    if not ascending:
+        new_ranks.reverse()
+
+    # Issues not rewritten yet are exactly those still inside the old range;
+    # anything created or moved meanwhile already sorts correctly around them.
+    stmt = select(Issue.id).where(Issue.project_id == project_id)
+    if ascending:
+        stmt = stmt.where(Issue.rank >= lowest).order_by(Issue.rank.asc(), Issue.id.asc())
+    else:
+        stmt = stmt.where(Issue.rank <= highest).order_by(Issue.rank.desc(), Issue.id.desc())
+
+    done = 0
+    while done < total:
+        ids = db.scalars(stmt.limit(min(batch_size, total - done)).with_for_update()).all()
+        if not ids:
+            break
+        write_ranks(db, zip(ids, new_ranks[done:done + len(ids)]))
+        db.commit()
+        done += len(ids)
+    log.info("Rebalanced %s rank(s) of project %s under prefix %r", done, project_id, prefix)
+    return done
+
+
+# --------------------------------------------------------------------------- #
+# Job queue integration
+# --------------------------------------------------------------------------- #
+REBALANCE_JOB = "rank_rebalance"
+
+
+def enqueue_rebalance(db: Session, project_id: int) -> int | None:
+    """Queue a rebalance of *project_id* for the job worker, in *db*'s transaction.
+
+    A rebalance already queued or running for the project is reused.
+    """
+    return jobs.enqueue(
+        db, REBALANCE_JOB, {"project_id": project_id}, dedupe_key=f"{REBALANCE_JOB}:{project_id}",
+    )
+
+
+@jobs.handler(REBALANCE_JOB)
+def run_rebalance_job(db: Session, payload: dict) -> None:
+    """Job handler: rebalance one project's ranks in the worker process."""
+    rebalance_project(db, payload["project_id"])
@@ -0,0 +1,194 @@
+"""In-process cache of reference data used to resolve symbolic names to ids.
+
+TQL (and anything else that turns "project = ENG AND status = Done" into
+foreign keys) needs the id behind a handful of small, rarely-changing tables:
+projects, statuses, issue types, priorities, users and sprints. Looking each
+name up with its own ``ILIKE`` query costs one round trip per name per search;
+this module instead keeps one snapshot per table in memory and answers every
+lookup for a query with a single :func:`resolve` call.
+
+Matching mirrors the SQL it replaces — case-insensitive ``ILIKE`` semantics,
+including ``%`` / ``_`` wildcards and backslash escapes — so results are
+identical to the per-name queries.
+
+Freshness:
+
+* Any flush that inserts, deletes or renames one of the cached entities drops
+  that table's snapshot (again on commit, so a concurrent reload that read the
+  pre-commit rows cannot stick).
+* Snapshots also expire after ``settings.refcache_ttl_seconds`` as a safety net
+  for changes made by other worker processes.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from itertools import chain
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import IssueType, Priority, Project, Sprint, Status, User
+
+# kind -> (model, columns matched by name lookups, extra columns kept on rows)
+_KINDS: dict[str, tuple[type, tuple[str, ...], tuple[str, ...]]] = {
+    "project": (Project, ("key", "name"), ()),
+    "status": (Status, ("name",), ("category",)),
+    "type": (IssueType, ("name",), ()),
+    "priority": (Priority, ("name",), ()),
+    "user": (User, ("username", "email", "display_name"), ()),
+    "sprint": (Sprint, ("name",), ("state",)),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _, _) in _KINDS.items()}
+
+_LIKE_META = re.compile(r"[%_\\]")
+
+
+class _Snapshot:
+    """One table's rows plus a lowercase exact-match index."""
+
+    __slots__ = ("rows", "exact", "loaded_at")
+
+    def __init__(self, rows: list[tuple]):
+        # rows: (id, (match values...), (extra values...))
+        self.rows = rows
+        self.exact: dict[str, list[int]] = {}
+        for row_id, names, _ in rows:
+            seen = set()
+            for name in names:
+                key = (name or "").lower()
+                if key and key not in seen:
+                    seen.add(key)
+                    self.exact.setdefault(key, []).append(row_id)
+        self.loaded_at = time.monotonic()
+
+
+_lock = threading.Lock()
+_snapshots: dict[str, _Snapshot] = {}
+# Bumped on every invalidation so a load that raced a write is not stored.
+_generations: dict[str, int] = {kind: 0 for kind in _KINDS}
+
+
+# --- Invalidation -----------------------------------------------------------
+def invalidate(*kinds: str) -> None:
+    """Drop the cached snapshot for *kinds* (all kinds when none are given)."""
+    with _lock:
+        for kind in kinds or tuple(_KINDS):
+            _snapshots.pop(kind, None)
+            _generations[kind] += 1
+
+
+def _changed_kinds(session: Session) -> set[str]:
+    kinds: set[str] = set()
+    for obj in chain(session.new, session.deleted):
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind:
+            kinds.add(kind)
+    for obj in session.dirty:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if not kind or kind in kinds:
+            continue
+        _, match_cols, extra_cols = _KINDS[kind]
+        attrs = inspect(obj).attrs
+        # Only name-bearing columns matter; e.g. a user's last_login does not.
+        if any(attrs[c].history.has_changes() for c in match_cols + extra_cols):
+            kinds.add(kind)
+    return kinds
+
+
+@event.listens_for(Session, "after_flush")
+def _on_flush(session: Session, flush_context) -> None:
+    kinds = _changed_kinds(session)
+    if kinds:
+        session.info.setdefault("refcache_dirty", set()).update(kinds)
+        invalidate(*kinds)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session: Session) -> None:
+    kinds = session.info.pop("refcache_dirty", None)
+    if kinds:
+        invalidate(*kinds)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    session.info.pop("refcache_dirty", None)
+
+
+# --- Loading ----------------------------------------------------------------
+def _load(db: Session, kind: str) -> _Snapshot:
+    model, match_cols, extra_cols = _KINDS[kind]
+    with _lock:
+        snap = _snapshots.get(kind)
+        generation = _generations[kind]
+    if snap is not None and time.monotonic() - snap.loaded_at < settings.refcache_ttl_seconds:
+        return snap
+    cols = [model.id] + [getattr(model, c) for c in match_cols + extra_cols]
+    n = len(match_cols)
+    rows = [(r[0], tuple(r[1:n + 1]), tuple(r[n + 1:])) for r in db.execute(select(*cols))]
+    snap = _Snapshot(rows)
+    with _lock:
+        if _generations[kind] == generation:
+            _snapshots[kind] = snap
+    return snap
+
+
+def _like_regex(pattern: str) -> re.Pattern:
+    """Translate a LIKE pattern (``\\`` escape) into an anchored regex."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        elif ch == "%":
+            out.append(".*")
+        elif ch == "_":
+            out.append(".")
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return re.compile("".join(out), re.IGNORECASE | re.DOTALL)
+
+
+def _match(snap: _Snapshot, value: str) -> list[int]:
+    if not _LIKE_META.search(value):
+        return list(snap.exact.get(value.lower(), ()))
+    rx = _like_regex(value)
+    return [
+        row_id for row_id, names, _ in snap.rows
+        if any(name is not None and rx.fullmatch(name) for name in names)
+    ]
+
+
+# --- Public API -------------------------------------------------------------
+def resolve(db: Session, wanted: dict[str, set[str]]) -> dict[str, dict[str, list[int]]]:
+    """Resolve names to ids for several kinds at once.
+
+    *wanted* maps a kind ("project", "status", "type", "priority", "user",
+    "sprint") to the names to look up; the result maps each kind and name to
+    the matching ids. Only kinds whose snapshot is cold cost a query. For
+    sprints the name "active" selects every sprint whose state is active.
+    """
+    out: dict[str, dict[str, list[int]]] = {}
+    for kind, values in wanted.items():
+        if not values:
+            continue
+        snap = _load(db, kind)
+        found = out.setdefault(kind, {})
+        for value in values:
+            if kind == "sprint" and value.lower() == "active":
+                found[value] = [row_id for row_id, _, (state,) in snap.rows if state == "active"]
+            else:
+                found[value] = _match(snap, value)
+    return out
+
+
+def status_ids_for_categories(db: Session, categories: list[str]) -> list[int]:
+    """Ids of statuses whose category is exactly one of *categories*."""
+    wanted = set(categories)
+    return [row_id for row_id, _, (category,) in _load(db, "status").rows if category in wanted]
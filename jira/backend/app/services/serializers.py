@@ -3,10 +3,21 @@
 Centralised so every router (issues, agile, search) emits identical issue
 payloads. The only field that needs massaging is ``labels`` (Label objects ->
 list of names); everything else is handled by Pydantic's from_attributes.
+
+Paged ``select(Issue)`` listings (search, the issue list) load rows with
+:data:`LIST_ITEM_OPTIONS` so :func:`to_list_item` never lazy-loads per row.
+Views that render many cards at once (boards, backlogs) use
+:func:`list_items` instead, which builds the same ``IssueListItem`` payloads
+from a column projection: one query for the issues and their type / status /
+priority / people, one for their labels, however many cards there are.
 """
 from __future__ import annotations
 
-from app.models import Issue
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased, lazyload, selectinload
+
+from app.models import Issue, IssueType, Label, Priority, Status, User
+from app.models.issue import issue_labels
 from app.schemas.issue import (
     AttachmentOut,
     CommentOut,
@@ -16,6 +27,8 @@ from app.schemas.issue import (
     IssueRef,
     WorklogOut,
 )
+from app.schemas.meta import IssueTypeOut, PriorityOut, StatusOut
+from app.schemas.user import UserBrief
 
 # Inverse link labels so an inward link reads naturally from the other side.
 _INVERSE = {
@@ -33,12 +46,94 @@ def issue_ref(issue: Issue) -> IssueRef:
     return IssueRef.model_validate(issue)
 
 
+# Loader options for Issue rows rendered with to_list_item: each reference
+# arrives in one IN query over the page, labels in one more, and the other
+# collections are not loaded at all. Not joined into the row query: a join
+# makes Postgres hash-join and sort every matching issue before the LIMIT,
+# which costs more than the extra statements on large, loosely filtered
+# searches.
+LIST_ITEM_OPTIONS = (
+    selectinload(Issue.type),
+    selectinload(Issue.status),
+    selectinload(Issue.priority),
+    selectinload(Issue.assignee),
+    selectinload(Issue.reporter),
+    lazyload(Issue.components),
+    lazyload(Issue.fix_versions),
+)
+
+
 def to_list_item(issue: Issue) -> IssueListItem:
     item = IssueListItem.model_validate(issue)
     item.labels = [l.name for l in issue.labels]
     return item
 
 
+_LIST_COLUMNS = (
+    "id", "key", "summary", "story_points", "parent_id", "epic_id",
+    "sprint_id", "rank", "due_date", "updated_at",
+)
+_Assignee = aliased(User)
+_Reporter = aliased(User)
+# IssueListItem field -> (schema, entity, foreign key on Issue)
+_LIST_REFS = (
+    ("type", IssueTypeOut, IssueType, Issue.type_id),
+    ("status", StatusOut, Status, Issue.status_id),
+    ("priority", PriorityOut, Priority, Issue.priority_id),
+    ("assignee", UserBrief, _Assignee, Issue.assignee_id),
+    ("reporter", UserBrief, _Reporter, Issue.reporter_id),
+)
+
+
+def list_items(db: Session, *where, order_by=(Issue.rank.asc(),)) -> list[IssueListItem]:
+    """``IssueListItem`` for every issue matching *where*, without loading entities.
+
+    *where* may reference ``Status`` columns (it is joined). Issues come back
+    in *order_by* order.
+    """
+    cols = [getattr(Issue, c) for c in _LIST_COLUMNS]
+    ref_cols: list[list] = []
+    for _, schema, entity, _ in _LIST_REFS:
+        fields = [getattr(entity, f) for f in schema.model_fields]
+        ref_cols.append(fields)
+        cols.extend(fields)
+    stmt = select(*cols)
+    for _, _, entity, fk in _LIST_REFS:
+        stmt = stmt.outerjoin(entity, entity.id == fk)
+    rows = db.execute(stmt.where(*where).order_by(*order_by)).all()
+    if not rows:
+        return []
+
+    labels: dict[int, list[str]] = {}
+    for issue_id, name in db.execute(
+        select(issue_labels.c.issue_id, Label.name)
+        .join(Label, Label.id == issue_labels.c.label_id)
+        .where(issue_labels.c.issue_id.in_([r[0] for r in rows]))
+    ):
+        labels.setdefault(issue_id, []).append(name)
+
+    # Reference rows repeat across cards; build each schema object once.
+    refs: dict[tuple[str, int], object] = {}
+    n = len(_LIST_COLUMNS)
+    items: list[IssueListItem] = []
+    for row in rows:
+        data = dict(zip(_LIST_COLUMNS, row[:n]))
+        offset = n
+        for (name, schema, _, _), fields in zip(_LIST_REFS, ref_cols):
+            values = row[offset:offset + len(fields)]
+            offset += len(fields)
+            if values[0] is None:
+                data[name] = None
+                continue
+            key = (schema.__name__, values[0])
+            if key not in refs:
+                refs[key] = schema.model_validate(dict(zip(schema.model_fields, values)))
+            data[name] = refs[key]
+        data["labels"] = labels.get(data["id"], [])
+        items.append(IssueListItem.model_validate(data))
+    return items
+
+
 def to_detail(issue: Issue) -> IssueDetail:
     detail = IssueDetail.model_validate(issue)
     detail.labels = [l.name for l in issue.labels]
@@ -0,0 +1,169 @@
+"""Pluggable blob storage for attachment files.
+
+Attachments are stored by key through a :class:`BlobStorage` backend chosen by
+``settings.attachments_backend``:
+
+* ``local`` — files under ``settings.attachments_dir`` (the default, and where
+  attachments uploaded before content addressing already live); and
+* ``s3`` — any S3-compatible object store (AWS, MinIO, Ceph RGW, ...) through
+  ``boto3``, which is only imported when this backend is selected. Credentials
+  come from the usual AWS environment / instance-profile chain.
+
+Uploads are staged to a temporary file first (see
+:mod:`app.services.attachments`) and handed over with :meth:`BlobStorage.put_file`,
+so no backend ever needs the whole file in memory. Reads are ranged iterators of
+``CHUNK_SIZE`` pieces.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from app.core.config import settings
+
+CHUNK_SIZE = 256 * 1024
+
+# (backend, location...) -> instance, so settings changes (tests) take effect.
+_instances: dict[tuple, "BlobStorage"] = {}
+
+
+class BlobStorage(ABC):
+    """Where attachment bytes live, addressed by an opaque key."""
+
+    #: Directory for staged uploads; on the same filesystem as the store when
+    #: that lets :meth:`put_file` be a rename. None means the system default.
+    staging_dir: str | None = None
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def size(self, key: str) -> int | None:
+        """Stored size in bytes, or None when *key* is missing."""
+
+    @abstractmethod
+    def put_file(self, key: str, path: str) -> None:
+        """Store the file at *path* under *key*; *path* may be consumed."""
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        """Yield bytes ``[start, stop)`` of *key* in chunks."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove *key*; a missing key is not an error."""
+
+
+class LocalStorage(BlobStorage):
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+        self.staging_dir = os.path.join(self.root, ".incoming")
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid storage key {key!r}")
+        return path
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def size(self, key: str) -> int | None:
+        try:
+            return os.path.getsize(self._path(key))
+        except OSError:
+            return None
+
+    def put_file(self, key: str, path: str) -> None:
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Staged in the same tree, so this is an atomic rename: readers never
+        # see a half-written blob.
+        shutil.move(path, target)
+
+    def iter_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as fh:
+            fh.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                chunk = fh.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3Storage(BlobStorage):
+    def __init__(
+        self, bucket: str, prefix: str = "", endpoint_url: str | None = None, region: str | None = None,
+    ) -> None:
+        try:
+            import boto3
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("ATTACHMENTS_BACKEND=s3 needs the boto3 package installed") from exc
+        if not bucket:
+            raise RuntimeError("ATTACHMENTS_S3_BUCKET is not configured")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def size(self, key: str) -> int | None:
+        from botocore.exceptions import ClientError
+
+        try:
+            return int(self.client.head_object(Bucket=self.bucket, Key=self._key(key))["ContentLength"])
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self.size(key) is not None
+
+    def put_file(self, key: str, path: str) -> None:
+        # upload_file switches to a multipart upload for large files.
+        self.client.upload_file(path, self.bucket, self._key(key))
+
+    def iter_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        if stop <= start:
+            return
+        body = self.client.get_object(
+            Bucket=self.bucket, Key=self._key(key), Range=f"bytes={start}-{stop - 1}",
+        )["Body"]
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+def get_storage() -> BlobStorage:
+    """The configured attachment store."""
+    backend = settings.attachments_backend.lower()
+    if backend == "s3":
+        ident: tuple = (
+            "s3", settings.attachments_s3_bucket, settings.attachments_s3_prefix,
+            settings.attachments_s3_endpoint_url, settings.attachments_s3_region,
+        )
+    elif backend == "local":
+        ident = ("local", settings.attachments_dir)
+    else:
+        raise RuntimeError(f"Unknown ATTACHMENTS_BACKEND {settings.attachments_backend!r}")
+    store = _instances.get(ident)
+    if store is None:
+        store = S3Storage(*ident[1:]) if backend == "s3" else LocalStorage(*ident[1:])
+        _instances[ident] = store
+    return store
@@ -0,0 +1,206 @@
+"""Full-text and trigram search backend for the TQL text operators.
+
+``summary ~ x`` and ``text ~ x`` used to compile to a bare ``ILIKE '%x%'``,
+which is a sequential scan of ``issues``. On PostgreSQL this module maintains:
+
+* ``issues.search_vector`` — a weighted ``tsvector`` (summary ``A`` >
+  description ``B`` > comment bodies ``C``) kept current by triggers on
+  ``issues`` and ``comments``, with a GIN index; and
+* ``pg_trgm`` GIN indexes on ``issues.summary`` / ``issues.description`` so the
+  substring ``ILIKE`` arm stays index-backed too (when the extension can be
+  installed).
+
+Text conditions then match ``search_vector @@ phraseto_tsquery(...)`` (stemmed
+phrase match, comments included) *or* the original substring ``ILIKE``, so no
+result the old behaviour returned is lost, and queries without an explicit
+``ORDER BY`` rank by ``ts_rank_cd``. On any other dialect (SQLite test
+databases) or before the index exists, the plain ``ILIKE`` is used unchanged.
+
+The column lives outside the ORM model on purpose: ``create_all`` stays
+portable, and the triggers own every write to it.
+"""
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import func, literal_column, or_, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.models import Issue
+
+log = logging.getLogger("trackly.search")
+
+# Text search configuration for both the stored vectors and the queries.
+# Changing it requires rebuilding search_vector (set it to NULL and restart).
+TS_CONFIG = "english"
+
+_BACKFILL_BATCH = 5000
+
+# engine url -> (fts available, trigram indexes available)
+_capabilities: dict[str, tuple[bool, bool]] = {}
+
+_SEARCH_VECTOR = literal_column(f"{Issue.__tablename__}.search_vector", TSVECTOR)
+_TS_REGCONFIG = literal_column(f"'{TS_CONFIG}'::regconfig")
+# ts_rank weight arrays are ordered {D, C, B, A}.
+_RANK_ALL = literal_column("'{0.1, 0.2, 0.4, 1.0}'::float4[]")
+_RANK_SUMMARY = literal_column("'{0, 0, 0, 1.0}'::float4[]")
+
+_DDL = f"""
+ALTER TABLE issues ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION trackly_issue_search_vector(p_id integer, p_summary text, p_description text)
+RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT setweight(to_tsvector('{TS_CONFIG}', coalesce(p_summary, '')), 'A')
+        || setweight(to_tsvector('{TS_CONFIG}', coalesce(p_description, '')), 'B')
+        || setweight(to_tsvector('{TS_CONFIG}', coalesce(
+               (SELECT string_agg(body, ' ') FROM comments WHERE issue_id = p_id), '')), 'C')
+$$;
+
+CREATE OR REPLACE FUNCTION trackly_issues_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := trackly_issue_search_vector(NEW.id, NEW.summary, NEW.description);
+    RETURN NEW;
+END $$;
+
+-- Statement-level, so a multi-row comment write (the importer inserts a page
+-- at a time) recomputes each affected issue once rather than once per row.
+CREATE OR REPLACE FUNCTION trackly_comments_search_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE issues SET search_vector = trackly_issue_search_vector(id, summary, description)
+        WHERE id IN (SELECT issue_id FROM new_comments);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE issues SET search_vector = trackly_issue_search_vector(id, summary, description)
+        WHERE id IN (SELECT issue_id FROM old_comments);
+    ELSE
+        UPDATE issues SET search_vector = trackly_issue_search_vector(id, summary, description)
+        WHERE id IN (
+            SELECT unnest(ARRAY[o.issue_id, n.issue_id])
+            FROM old_comments o JOIN new_comments n ON n.id = o.id
+            WHERE n.body IS DISTINCT FROM o.body OR n.issue_id <> o.issue_id
+        );
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trackly_issues_search ON issues;
+CREATE TRIGGER trackly_issues_search BEFORE INSERT OR UPDATE OF summary, description ON issues
+    FOR EACH ROW EXECUTE FUNCTION trackly_issues_search_trigger();
+
+-- Transition tables allow one event per trigger and no column list.
+DROP TRIGGER IF EXISTS trackly_comments_search ON comments;
+DROP TRIGGER IF EXISTS trackly_comments_search_ins ON comments;
+DROP TRIGGER IF EXISTS trackly_comments_search_upd ON comments;
+DROP TRIGGER IF EXISTS trackly_comments_search_del ON comments;
+CREATE TRIGGER trackly_comments_search_ins AFTER INSERT ON comments
+    REFERENCING NEW TABLE AS new_comments
+    FOR EACH STATEMENT EXECUTE FUNCTION trackly_comments_search_trigger();
+CREATE TRIGGER trackly_comments_search_upd AFTER UPDATE ON comments
+    REFERENCING OLD TABLE AS old_comments NEW TABLE AS new_comments
+    FOR EACH STATEMENT EXECUTE FUNCTION trackly_comments_search_trigger();
+CREATE TRIGGER trackly_comments_search_del AFTER DELETE ON comments
+    REFERENCING OLD TABLE AS old_comments
+    FOR EACH STATEMENT EXECUTE FUNCTION trackly_comments_search_trigger();
+
+CREATE INDEX IF NOT EXISTS ix_issues_search_vector ON issues USING gin (search_vector);
+"""
+
+_TRGM_DDL = """
+CREATE INDEX IF NOT EXISTS ix_issues_summary_trgm ON issues USING gin (summary gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_issues_description_trgm ON issues USING gin (description gin_trgm_ops);
+"""
+
+
+# --- Schema -----------------------------------------------------------------
+def ensure_search_index(engine: Engine) -> tuple[bool, bool]:
+    """Install the search column, triggers and indexes; backfill missing vectors.
+
+    Idempotent and safe to run from several workers at once (serialised by an
+    advisory lock). Returns ``(fts, trigram)`` availability. A no-op returning
+    ``(False, False)`` on non-PostgreSQL engines.
+    """
+    if engine.dialect.name != "postgresql":
+        _capabilities[str(engine.url)] = (False, False)
+        return False, False
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('trackly.search_index'))"))
+        conn.exec_driver_sql(_DDL)
+
+    trgm = True
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.exec_driver_sql(_TRGM_DDL)
+    except DBAPIError as exc:
+        # Needs the contrib package and CREATE privilege; substring search
+        # still works without it, just without index support.
+        trgm = False
+        log.warning("pg_trgm unavailable, substring search is unindexed: %s", exc.orig)
+
+    filled = 0
+    while True:
+        with engine.begin() as conn:
+            n = conn.execute(
+                text(
+                    "UPDATE issues SET search_vector = trackly_issue_search_vector(id, summary, description) "
+                    "WHERE id IN (SELECT id FROM issues WHERE search_vector IS NULL ORDER BY id LIMIT :n)"
+                ),
+                {"n": _BACKFILL_BATCH},
+            ).rowcount
+        filled += n
+        if n < _BACKFILL_BATCH:
+            break
+    if filled:
+        log.info("Search index: backfilled %d issue(s)", filled)
+
+    _capabilities[str(engine.url)] = (True, trgm)
+    return True, trgm
+
+
+def capabilities(bind) -> tuple[bool, bool]:
+    """``(fts, trigram)`` availability for *bind*, probed once per engine."""
+    if bind is None or bind.dialect.name != "postgresql":
+        return False, False
+    engine = getattr(bind, "engine", bind)
+    key = str(engine.url)
+    if key not in _capabilities:
+        with engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+                    "               WHERE table_name = 'issues' AND column_name = 'search_vector'), "
+                    "       EXISTS (SELECT 1 FROM pg_indexes WHERE indexname = 'ix_issues_summary_trgm')"
+                )
+            ).one()
+        _capabilities[key] = (bool(row[0]), bool(row[1]))
+    return _capabilities[key]
+
+
+# --- Query compilation ------------------------------------------------------
+def text_condition(db, field: str, value: str):
+    """Compile ``<field> ~ value`` for summary / text / description.
+
+    Returns ``(where_clause, rank_expression | None)``; the rank is only
+    available when the full-text index is.
+    """
+    like = f"%{value}%"
+    if field == "summary":
+        substring = Issue.summary.ilike(like)
+    else:
+        substring = or_(Issue.summary.ilike(like), Issue.description.ilike(like))
+
+    fts, _ = capabilities(db.get_bind() if db is not None else None)
+    if not fts:
+        return substring, None
+
+    tsquery = func.phraseto_tsquery(_TS_REGCONFIG, value)
+    if field == "summary":
+        # The weighted vector cannot be restricted to summary in an index
+        # lookup, so matching stays on the (trigram-indexed) substring test;
+        # ranking still prefers summaries that contain the phrase as words.
+        return substring, func.ts_rank_cd(_RANK_SUMMARY, _SEARCH_VECTOR, tsquery)
+    clause = or_(_SEARCH_VECTOR.bool_op("@@")(tsquery), substring)
+    return clause, func.ts_rank_cd(_RANK_ALL, _SEARCH_VECTOR, tsquery)
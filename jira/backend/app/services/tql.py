@@ -21,6 +21,8 @@ updated, due, key.
 from __future__ import annotations
 
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from sqlalchemy import String, and_, asc, cast, desc, func, or_, select
@@ -29,15 +31,10 @@ from sqlalchemy.orm import Session, aliased
 from app.models import (
     Component,
     Issue,
-    IssueType,
     Label,
-    Priority,
-    Project,
-    Sprint,
-    Status,
-    User,
     issue_labels,
 )
+from app.services import refcache, text_search
 
 
 class TQLError(ValueError):
@@ -256,33 +253,41 @@ class TQLCompiler:
 
     def __init__(self, db: Session):
         self.db = db
+        self._resolved: dict[str, dict[str, list[int]]] = {}
+        # Relevance expressions from text conditions (see services.text_search).
+        self.rank_terms: list = []
 
     # -- value resolution helpers (names -> ids) --
+    def prefetch(self, names: dict[str, frozenset[str]]) -> None:
+        """Resolve every symbolic name in a plan with one reference-cache lookup."""
+        for kind, found in refcache.resolve(self.db, names).items():
+            self._resolved.setdefault(kind, {}).update(found)
+
+    def _ids(self, kind: str, value: str) -> list[int]:
+        found = self._resolved.setdefault(kind, {})
+        if value not in found:
+            found.update(refcache.resolve(self.db, {kind: {value}})[kind])
+        return found[value]
+
     def _project_ids(self, value: str) -> list[int]:
-        q = select(Project.id).where(or_(Project.key.ilike(value), Project.name.ilike(value)))
-        return list(self.db.scalars(q))
+        return self._ids("project", value)
 
     def _status_ids(self, value: str) -> list[int]:
-        return list(self.db.scalars(select(Status.id).where(Status.name.ilike(value))))
+        return self._ids("status", value)
 
     def _type_ids(self, value: str) -> list[int]:
-        return list(self.db.scalars(select(IssueType.id).where(IssueType.name.ilike(value))))
+        return self._ids("type", value)
 
     def _priority_ids(self, value: str) -> list[int]:
-        return list(self.db.scalars(select(Priority.id).where(Priority.name.ilike(value))))
+        return self._ids("priority", value)
 
     def _user_ids(self, value: str) -> list[int]:
         if value.lower() in _CURRENT_USER:
             return []  # resolved by caller via bound param; treated as empty here
-        q = select(User.id).where(
-            or_(User.username.ilike(value), User.email.ilike(value), User.display_name.ilike(value))
-        )
-        return list(self.db.scalars(q))
+        return self._ids("user", value)
 
     def _sprint_ids(self, value: str) -> list[int]:
-        if value.lower() == "active":
-            return list(self.db.scalars(select(Sprint.id).where(Sprint.state == "active")))
-        return list(self.db.scalars(select(Sprint.id).where(Sprint.name.ilike(value))))
+        return self._ids("sprint", value)
 
     def compile_condition(self, c: Condition, current_user_id: int | None):
         field = c.field.lower()
@@ -301,9 +306,7 @@ class TQLCompiler:
             ids = [i for v in _as_list(val) for i in self._status_ids(v)]
             return in_clause(Issue.status_id, ids)
         if field in ("statuscategory", "category"):
-            cats = _as_list(val)
-            sub = select(Status.id).where(Status.category.in_(cats))
-            ids = list(self.db.scalars(sub))
+            ids = refcache.status_ids_for_categories(self.db, _as_list(val))
             return in_clause(Issue.status_id, ids)
         if field in ("type", "issuetype"):
             ids = [i for v in _as_list(val) for i in self._type_ids(v)]
@@ -336,10 +339,10 @@ class TQLCompiler:
             clause = Issue.id.in_(sub)
             return clause if op in ("=", "IN", "~") else ~clause
         if field in ("summary", "text", "description"):
-            like = f"%{val}%"
-            if field == "summary":
-                return Issue.summary.ilike(like)
-            return or_(Issue.summary.ilike(like), Issue.description.ilike(like))
+            clause, rank = text_search.text_condition(self.db, field, str(val))
+            if rank is not None:
+                self.rank_terms.append(rank)
+            return clause
         if field == "key":
             return Issue.key.ilike(val) if op in ("=", "~") else Issue.key.notilike(val)
         if field == "resolution":
@@ -406,26 +409,144 @@ def _num_clause(col, op: str, val: str):
     return ops[op]
 
 
-def build_query(db: Session, tql: str, current_user_id: int | None = None):
-    """Parse *tql* and return (where_clause | None, order_by list).
+# --- Plan cache -------------------------------------------------------------
+# Field -> reference-data kind for conditions whose values are symbolic names.
+_NAME_KINDS = {
+    "project": "project",
+    "status": "status",
+    "type": "type",
+    "issuetype": "type",
+    "priority": "priority",
+    "assignee": "user",
+    "reporter": "user",
+    "sprint": "sprint",
+}
+
+_PLAN_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class Plan:
+    """The parse of one query text: AST, ORDER BY, and the names it references.
 
-    The caller composes these onto a base ``select(Issue)``.
+    Plans hold no ids — those come from the reference cache at compile time —
+    so a plan stays valid when projects, statuses, etc. change.
     """
-    tql = (tql or "").strip()
-    if not tql:
-        return None, [desc(Issue.updated_at)]
-    node, sorts = Parser(tokenize(tql)).parse()
-    compiler = TQLCompiler(db)
-    where = compiler.compile_node(node, current_user_id)
-    order_by = []
+
+    node: object
+    sort_keys: tuple  # (column, descending) pairs; empty without ORDER BY
+    names: dict[str, frozenset[str]]
+
+
+_plans: OrderedDict[str, Plan] = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def _plan_key(tql: str) -> str:
+    # Collapsing whitespace is only safe when no quoted literal could contain it.
+    if '"' in tql or "'" in tql:
+        return tql
+    return " ".join(tql.split())
+
+
+def _collect_names(node, out: dict[str, set[str]]) -> None:
+    if node is None:
+        return
+    if isinstance(node, BoolNode):
+        _collect_names(node.left, out)
+        _collect_names(node.right, out)
+        return
+    kind = _NAME_KINDS.get(node.field.lower())
+    if kind is None:
+        return
+    values = _as_list(node.value)
+    if kind == "user":
+        if len(values) == 1 and values[0].lower() in _EMPTY:
+            return
+        values = [v for v in values if v.lower() not in _CURRENT_USER]
+    out.setdefault(kind, set()).update(values)
+
+
+def compile_plan(tql: str) -> Plan:
+    """Parse *tql* into a :class:`Plan`, reusing a cached plan for the same text."""
+    key = _plan_key(tql.strip())
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _plans.move_to_end(key)
+            return plan
+    node, sorts = Parser(tokenize(key)).parse()
+    sort_keys = []
     for s in sorts:
         col = _SORT_COLUMNS.get(s.field.lower())
         if col is None:
             raise TQLError(f"Cannot sort by unknown field: {s.field}")
-        order_by.append(desc(col) if s.direction == "desc" else asc(col))
-    if not order_by:
-        order_by = [desc(Issue.updated_at)]
-    return where, order_by
+        sort_keys.append((col, s.direction == "desc"))
+    names: dict[str, set[str]] = {}
+    _collect_names(node, names)
+    plan = Plan(node, tuple(sort_keys), {k: frozenset(v) for k, v in names.items()})
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > _PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+@dataclass
+class CompiledQuery:
+    """WHERE clause plus a total sort order for ``select(Issue)``.
+
+    ``sort_keys`` always ends with ``Issue.id`` so every row has a unique
+    position — the property keyset pagination relies on.
+    """
+
+    where: object | None
+    sort_keys: list[tuple[object, bool]]  # (expression, descending)
+
+    @property
+    def order_by(self) -> list:
+        # NULL placement spelled out (PostgreSQL's default) so keyset
+        # comparisons agree with the ORDER BY on every dialect.
+        return [desc(e).nulls_first() if d else asc(e).nulls_last() for e, d in self.sort_keys]
+
+
+def compile_query(db: Session, tql: str, current_user_id: int | None = None) -> CompiledQuery:
+    """Parse and compile *tql* into a :class:`CompiledQuery`.
+
+    Parsing is cached per query text and every name in the query is resolved
+    in one batched reference-cache lookup, so a repeated search issues no
+    lookup queries. Without an ORDER BY, text searches sort by relevance, then
+    recency; everything else by recency.
+    """
+    tql = (tql or "").strip()
+    if not tql:
+        return CompiledQuery(None, [(Issue.updated_at, True), (Issue.id, False)])
+    plan = compile_plan(tql)
+    compiler = TQLCompiler(db)
+    if plan.names:
+        compiler.prefetch(plan.names)
+    where = compiler.compile_node(plan.node, current_user_id)
+    sort_keys = list(plan.sort_keys)
+    if not sort_keys:
+        if compiler.rank_terms:
+            rank = compiler.rank_terms[0]
+            for term in compiler.rank_terms[1:]:
+                rank = rank + term
+            sort_keys.append((rank, True))
+        sort_keys.append((Issue.updated_at, True))
+    sort_keys.append((Issue.id, False))
+    return CompiledQuery(where, sort_keys)
+
+
+def build_query(db: Session, tql: str, current_user_id: int | None = None):
+    """Parse *tql* and return (where_clause | None, order_by list).
+
+    The caller composes these onto a base ``select(Issue)``. See
+    :func:`compile_query` for the cursor-friendly form.
+    """
+    compiled = compile_query(db, tql, current_user_id)
+    order_by = [desc(e) if d else asc(e) for e, d in compiled.sort_keys[:-1]]
+    return compiled.where, order_by
 
 
 # --- Schema/help catalog (drives UI autocomplete + examples) ---------------
@@ -4,6 +4,12 @@ We use a base-62 "LexoRank"-style midpoint algorithm: every item carries a
 short string rank, and to move an item between two neighbours we compute a
 string that sorts strictly between them. This avoids renumbering siblings on
 every reorder.
+
+Repeatedly splitting the same gap makes ranks longer, so
+:mod:`app.services.rank_maintenance` periodically rewrites a project's ranks
+into a fresh *bucket* — a prefix sorting entirely below (or above) every
+existing rank, followed by evenly spaced fixed-width bodies — using
+:func:`bucket_prefix` and :func:`spread_ranks`.
 """
 from __future__ import annotations
 
@@ -54,3 +60,112 @@ def rank_between(low: str | None, high: str | None) -> str:
 
 def initial_rank() -> str:
     return ALPHABET[BASE // 2]
+
+
+def _value(rank: str, width: int) -> int:
+    """*rank* right-padded to *width* digits, read as a base-62 integer."""
+    value = 0
+    for ch in rank[:width].ljust(width, _MIN):
+        value = value * BASE + ALPHABET.index(ch)
+    return value
+
+
+def _spaced(low: int, high: int, count: int) -> list[int]:
+    """*count* evenly spaced integers strictly between *low* and *high*.
+
+    Values whose last digit would be the minimum character are nudged up by
+    one: a rank ending in ``0`` has no room directly below its own prefix.
+    Requires ``high - low >= 2 * (count + 1)``.
+    """
+    step = (high - low) / (count + 1)
+    out = []
+    for i in range(1, count + 1):
+        v = low + int(step * i)
+        if v % BASE == 0:
+            v += 1
+        out.append(v)
+    return out
+
+
+def _encode(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, d = divmod(value, BASE)
+        digits.append(ALPHABET[d])
+    return "".join(reversed(digits))
+
+
+def ranks_after(low: str | None, count: int, width: int = 6) -> list[str]:
+    """*count* increasing ranks sorting after *low*, for appending in bulk.
+
+    Chaining ``rank_between(prev, None)`` grows the string by a character every
+    few calls; instead this reads *low* as a fixed-width base-62 number and
+    hands out consecutive values after it, so the length stays at
+    ``max(len(low), width)``.
+    """
+    if count <= 0:
+        return []
+    low = low or ""
+    width = max(len(low), width)
+    start = _value(low, width)
+    if start + count >= BASE ** width:
+        # No room at this width: fall back to the open-ended midpoint chain.
+        out, prev = [], low or None
+        for _ in range(count):
+            prev = rank_between(prev, None)
+            out.append(prev)
+        return out
+    return [_encode(start + i, width) for i in range(1, count + 1)]
+
+
+def ranks_between(low: str | None, high: str | None, count: int) -> list[str]:
+    """*count* increasing ranks strictly between *low* and *high*, evenly spaced.
+
+    Used for multi-card moves: the ranks grow by only about ``log62(count)``
+    characters however many cards are dropped into one gap, where chaining
+    :func:`rank_between` would add a character every few cards.
+    """
+    if count <= 0:
+        return []
+    low = low or ""
+    high = high or ""
+    width = max(len(low), len(high), 1)
+    lo = _value(low, width)
+    hi = _value(high, width) if high else BASE ** width
+    while hi - lo < 2 * (count + 1):
+        width += 1
+        lo *= BASE
+        hi *= BASE
+    return [_encode(v, width) for v in _spaced(lo, hi, count)]
+
+
+def bucket_prefix(lowest: str, highest: str) -> tuple[str, bool] | None:
+    """A prefix for rewriting ranks that currently span *lowest*..*highest*.
+
+    Returns ``(prefix, ascending)``: every ``prefix + body`` sorts below
+    *lowest* (``ascending=True`` — rewrite from the first item up) or above
+    *highest* (``ascending=False`` — rewrite from the last item down), so old
+    and rewritten ranks never interleave mid-rebalance. The shorter candidate
+    wins; None when neither end has room.
+    """
+    below = rank_between(None, lowest)
+    above = rank_between(highest, None)
+    candidates = []
+    # below + anything < lowest, unless below is itself a prefix of lowest.
+    if below < lowest and not lowest.startswith(below):
+        candidates.append((below, True))
+    if above > highest:
+        candidates.append((above, False))
+    return min(candidates, key=lambda c: len(c[0])) if candidates else None
+
+
+def spread_ranks(count: int, prefix: str = "") -> list[str]:
+    """*count* increasing ranks under *prefix*, evenly spread over the body space.
+
+    Bodies are fixed-width with at least two spare base-62 digits per item,
+    so every gap can absorb thousands of single-card moves before growing.
+    """
+    width = 3
+    while BASE ** width < (count + 1) * BASE ** 2:
+        width += 1
+    return [prefix + _encode(v, width) for v in _spaced(0, BASE ** width, count)]
@@ -0,0 +1,60 @@
+"""Trackly background job worker entrypoint.
+
+Runs the jobs queued by the API (Jira syncs, rank rebalances) in a process of its
+own, so long-running work never competes with request handling::
+
+    python -m app.worker                  # job_worker_concurrency slots
+    python -m app.worker --concurrency 2 --kinds jira_sync
+
+Any number of workers may run side by side; see :mod:`app.services.jobs`.
+SIGTERM / SIGINT stop claiming new jobs and wait for the ones in hand.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import threading
+
+from app.core.config import settings
+
+logging.basicConfig(
+    level=logging.INFO if not settings.debug else logging.DEBUG,
+    format="%(asctime)s %(levelname)-7s %(name)s: %(message)s",
+)
+log = logging.getLogger("trackly.worker")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="app.worker", description="Run queued Trackly background jobs.")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Jobs run at once (default: JOB_WORKER_CONCURRENCY).")
+    parser.add_argument("--kinds", default=None, help="Comma-separated job kinds to run (default: all).")
+    args = parser.parse_args(argv)
+
+    from app.core.bootstrap import run_bootstrap
+    from app.services import jira_sync  # noqa: F401 - registers the jira_sync handler
+    from app.services import rank_maintenance  # noqa: F401 - registers the rank_rebalance handler
+    from app.services.jobs import Worker
+
+    run_bootstrap()
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()] if args.kinds else None
+    worker = Worker(concurrency=args.concurrency, kinds=kinds)
+
+    stopping = threading.Event()
+
+    def _shutdown(signum, _frame) -> None:
+        log.info("Received signal %s; finishing running jobs", signum)
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    worker.start()
+    stopping.wait()
+    worker.stop()
+    log.info("Worker %s stopped", worker.name)
+
+
+if __name__ == "__main__":
+    main()
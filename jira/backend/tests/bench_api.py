@@ -0,0 +1,229 @@
+"""API latency benchmark over the synthetic dataset (``tests/datagen.py``).
+
+Not collected by pytest. Needs the same database as the test suite::
+
+    python -m tests.bench_api                                   # report only
+    python -m tests.bench_api --check tests/bench_api_baseline.json
+    python -m tests.bench_api --write-baseline tests/bench_api_baseline.json
+    python -m tests.bench_api --concurrency 4 --background 4       # under load
+
+Drives the hot read endpoints — TQL search (``_run_search``), the issue
+list, board and backlog views, the insights overview (``overview_stats``) and
+the project list — through ``TestClient`` as a site admin and as a plain
+member (``visible_project_ids``). Reports p50/p95 latency and the number of
+SQL statements per request. The insights cache is disabled so every call
+does the work.
+
+``--concurrency N`` sends each endpoint's timed requests from N client
+threads at once. ``--background N`` keeps N more clients busy on a sync
+route (a project's insights) for the whole run, occupying threadpool slots
+and sync-pool connections the way a busy instance does; search, the issue
+list, board and backlog are ``async`` routes on their own engine, so they
+should not queue behind that load.
+
+With ``--check``, exits non-zero when an endpoint's p95 exceeds the baseline
+by more than ``--latency-margin`` (plus ``--latency-floor-ms``, so sub-
+millisecond noise never fails a run) or its statement count exceeds the
+baseline by more than ``--query-margin``. Statement counts are deterministic
+for a given dataset, so the default query margin is zero.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.models import User
+from tests.datagen import Dataset, Spec, ensure_dataset
+
+
+@dataclass
+class Result:
+    p50_ms: float
+    p95_ms: float
+    queries: int
+
+
+def _endpoints(ds: Dataset) -> list[tuple[str, str, str]]:
+    """(name, principal, url) for every benchmarked request."""
+    key, board = ds.project_keys[0], ds.board_ids[0]
+    return [
+        ("search_all", "admin", "/api/search/search?tql="),
+        ("search_project_open", "admin",
+         f"/api/search/search?tql=project = {key} AND statusCategory != done ORDER BY updated DESC"),
+        ("search_text", "admin", '/api/search/search?tql=text ~ "payment"'),
+        ("search_member", "member", "/api/search/search?tql=assignee = EMPTY ORDER BY created DESC"),
+        ("search_member_page5", "member", "/api/search/search?tql=&page=5"),
+        ("issue_list", "admin", f"/api/issues?project={key}&page_size=50"),
+        ("board", "admin", f"/api/agile/boards/{board}/board"),
+        ("backlog", "admin", f"/api/agile/boards/{board}/backlog"),
+        ("board_member", "member", f"/api/agile/boards/{board}/board"),
+        ("overview", "admin", "/api/analytics/overview"),
+        ("overview_member", "member", "/api/analytics/my"),
+        ("projects_member", "member", "/api/projects"),
+    ]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _background_url(ds: Dataset) -> str:
+    return f"/api/analytics/projects/{ds.project_keys[-1]}"
+
+
+def run(
+    ds: Dataset,
+    repeat: int,
+    warmup: int,
+    only: set[str] | None = None,
+    concurrency: int = 1,
+    background: int = 0,
+) -> dict[str, Result]:
+    from app.main import app
+
+    with SessionLocal() as db:
+        admin_id = db.query(User.id).filter(User.is_admin.is_(True)).order_by(User.id).first()[0]
+    headers = {
+        "admin": {"Authorization": f"Bearer {create_access_token(admin_id)}"},
+        "member": {"Authorization": f"Bearer {create_access_token(ds.member_id)}"},
+    }
+    results: dict[str, Result] = {}
+    cache_ttl, timing = settings.analytics_cache_ttl_seconds, settings.request_timing_headers
+    settings.analytics_cache_ttl_seconds = 0
+    settings.request_timing_headers = True
+    stop = threading.Event()
+    try:
+        with TestClient(app) as client:
+
+            def load() -> None:
+                while not stop.is_set():
+                    client.get(_background_url(ds), headers=headers["admin"])
+
+            loaders = [threading.Thread(target=load, daemon=True) for _ in range(background)]
+            for thread in loaders:
+                thread.start()
+
+            def timed(url: str, principal: str) -> tuple[float, int, int]:
+                started = time.perf_counter()
+                resp = client.get(url, headers=headers[principal])
+                elapsed = (time.perf_counter() - started) * 1000
+                # Counted per request by app.core.request_metrics.
+                return elapsed, resp.status_code, int(resp.headers.get("x-db-statements", 0))
+
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                for name, principal, url in _endpoints(ds):
+                    if only and name not in only:
+                        continue
+                    for _ in range(warmup):
+                        resp = client.get(url, headers=headers[principal])
+                        assert resp.status_code == 200, f"{name}: {resp.status_code} {resp.text[:200]}"
+                    gc.collect()
+                    samples = list(pool.map(lambda _: timed(url, principal), range(repeat)))
+                    assert all(code == 200 for _, code, _ in samples), f"{name}: non-200 response"
+                    timings = [ms for ms, _, _ in samples]
+                    results[name] = Result(
+                        p50_ms=round(statistics.median(timings), 2),
+                        p95_ms=round(_percentile(timings, 95), 2),
+                        queries=max(n for _, _, n in samples),
+                    )
+            stop.set()
+            for thread in loaders:
+                thread.join()
+    finally:
+        stop.set()
+        settings.analytics_cache_ttl_seconds = cache_ttl
+        settings.request_timing_headers = timing
+    return results
+
+
+def compare(
+    results: dict[str, Result], baseline: dict, latency_margin: float, floor_ms: float, query_margin: float,
+) -> list[str]:
+    """Human-readable regressions of *results* against *baseline*."""
+    failures = []
+    for name, base in baseline.get("endpoints", {}).items():
+        got = results.get(name)
+        if got is None:
+            continue
+        limit_ms = base["p95_ms"] * (1 + latency_margin) + floor_ms
+        if got.p95_ms > limit_ms:
+            failures.append(f"{name}: p95 {got.p95_ms:.1f} ms > {limit_ms:.1f} ms (baseline {base['p95_ms']:.1f})")
+        limit_q = int(base["queries"] * (1 + query_margin))
+        if got.queries > limit_q:
+            failures.append(f"{name}: {got.queries} statements > {limit_q} (baseline {base['queries']})")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=Spec.seed)
+    parser.add_argument("--projects", type=int, default=Spec.projects)
+    parser.add_argument("--issues", type=int, default=Spec.issues, help="total across all projects")
+    parser.add_argument("--users", type=int, default=Spec.users)
+    parser.add_argument("--repeat", type=int, default=30, help="timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed requests per endpoint")
+    parser.add_argument("--only", default=None, help="comma-separated endpoint names")
+    parser.add_argument("--concurrency", type=int, default=1, help="client threads per endpoint")
+    parser.add_argument("--background", type=int, default=0, help="clients loading a sync route meanwhile")
+    parser.add_argument("--check", metavar="BASELINE", help="fail on regressions against this baseline")
+    parser.add_argument("--write-baseline", metavar="PATH", help="save these results as the baseline")
+    parser.add_argument("--latency-margin", type=float, default=0.5, help="allowed p95 growth (0.5 = +50%%)")
+    parser.add_argument("--latency-floor-ms", type=float, default=5.0, help="absolute p95 slack")
+    parser.add_argument("--query-margin", type=float, default=0.0, help="allowed statement-count growth")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    spec = Spec(seed=args.seed, projects=args.projects, issues=args.issues, users=args.users)
+    started = time.perf_counter()
+    dataset = ensure_dataset(spec)
+    print(f"dataset {spec} ready in {time.perf_counter() - started:.1f}s")
+    only = {n.strip() for n in args.only.split(",")} if args.only else None
+    results = run(dataset, args.repeat, args.warmup, only, args.concurrency, args.background)
+    load = {"concurrency": args.concurrency, "background": args.background}
+    print(f"load: {load}")
+
+    print(f"{'endpoint':<22} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8}")
+    for name, r in results.items():
+        print(f"{name:<22} {r.p50_ms:>9.1f} {r.p95_ms:>9.1f} {r.queries:>8}")
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as fh:
+            json.dump(
+                {"dataset": asdict(spec), "load": load, "endpoints": {n: asdict(r) for n, r in results.items()}},
+                fh, indent=2, sort_keys=True,
+            )
+            fh.write("\n")
+        print(f"baseline written to {args.write_baseline}")
+
+    if args.check:
+        with open(args.check) as fh:
+            baseline = json.load(fh)
+        if baseline.get("dataset") != asdict(spec):
+            print(f"warning: baseline was recorded for {baseline.get('dataset')}, not {asdict(spec)}")
+        if baseline.get("load", {"concurrency": 1, "background": 0}) != load:
+            print(f"warning: baseline was recorded under load {baseline.get('load')}, not {load}")
+        failures = compare(results, baseline, args.latency_margin, args.latency_floor_ms, args.query_margin)
+        for line in failures:
+            print(f"REGRESSION {line}")
+        if failures:
+            sys.exit(1)
+        print("no regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Throughput benchmark for the one-shot Jira importer against the local stub.
+
+Not collected by pytest. Needs the same database as the test suite::
+
+    python -m tests.bench_importer --issues 2000 --latency 0.02 --workers 1,4
+
+Each configuration imports a fresh project from a stub Jira whose every
+request takes ``--latency`` seconds, then re-imports it (every issue now an
+update), and reports wall time and issues per second for both passes.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import func, select
+
+from app.core.bootstrap import run_bootstrap
+from app.core.database import SessionLocal
+from app.migration.importer import ImportOptions, Importer
+from app.migration.jira_client import JiraClient
+from app.models import Issue, Project
+from tests.jira_stub import StubJira
+
+
+def _import(stub: StubJira, key: str, workers: int, prefetch: int) -> tuple[float, Importer]:
+    with SessionLocal() as db, JiraClient(base_url=stub.url, api_token="bench", server_token=True) as client:
+        importer = Importer(db, client, ImportOptions(workers=workers, prefetch=prefetch))
+        started = time.perf_counter()
+        importer.discover_fields()
+        importer.ensure_statuses()
+        importer.ensure_issue_types()
+        importer.ensure_priorities()
+        project = importer.import_project({"id": f"bench-{key}", "key": key, "name": f"Bench {key}"})
+        importer.import_issues(project, importer._build_jql(key, ""))
+        return time.perf_counter() - started, importer
+
+
+def bench(issues: int, latency: float, workers: int, prefetch: int) -> tuple[float, float]:
+    key = ("BI" + uuid.uuid4().hex[:5]).upper()
+    stub = StubJira(key, issues, latency=latency, page_size=100)
+    with stub:
+        first, importer = _import(stub, key, workers, prefetch)
+        assert importer.stats.issues == issues
+        second, importer = _import(stub, key, workers, prefetch)
+        assert importer.stats.issues == 0
+    with SessionLocal() as db:
+        project = db.scalars(select(Project).where(Project.key == key)).one()
+        assert db.scalar(select(func.count(Issue.id)).where(Issue.project_id == project.id)) == issues
+        db.delete(project)
+        db.commit()
+    return first, second
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per stub request")
+    parser.add_argument("--workers", default="1,4", help="comma-separated worker counts")
+    parser.add_argument("--prefetch", type=int, default=None, help="pages in flight (default: workers)")
+    args = parser.parse_args()
+
+    run_bootstrap()
+    print(f"{args.issues} issues, {args.latency * 1000:.0f} ms/request")
+    print(f"{'workers':>8} {'prefetch':>9} {'import s':>9} {'issues/s':>9} {'reimport s':>11} {'issues/s':>9}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        prefetch = args.prefetch or workers
+        first, second = bench(args.issues, args.latency, workers, prefetch)
+        print(f"{workers:>8} {prefetch:>9} {first:>9.2f} {args.issues / first:>9.0f}"
+              f" {second:>11.2f} {args.issues / second:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Throughput benchmark for the Jira sync engine against the local stub.
+
+Not collected by pytest. Needs the same database as the test suite::
+
+    python -m tests.bench_jira_sync --issues 2000 --latency 0.05 --workers 1,4,8
+
+Each configuration syncs a fresh project from a stub Jira whose every request
+takes ``--latency`` seconds, and reports wall time and issues per second.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+
+from app.core.bootstrap import run_bootstrap
+from app.core.crypto import encrypt
+from app.core.database import SessionLocal
+from app.models import Project, ProjectSyncLink
+from app.models.identity import JiraConnection
+from app.services.jira_sync import JiraSyncEngine
+from tests.jira_stub import StubJira
+
+
+def _project(db, base_url: str) -> ProjectSyncLink:
+    key = ("BJ" + uuid.uuid4().hex[:5]).upper()
+    project = Project(key=key, name=f"Bench {key}")
+    conn = JiraConnection(name=f"Bench {key}", base_url=base_url, auth_mode="server",
+                          api_token_enc=encrypt("bench"), verify_ssl=False)
+    db.add_all([project, conn])
+    db.flush()
+    link = ProjectSyncLink(project_id=project.id, connection_id=conn.id,
+                           jira_project_key=key, sync_permissions=False)
+    db.add(link)
+    db.commit()
+    return link
+
+
+def bench(issues: int, latency: float, workers: int, prefetch: int, token_only: bool) -> float:
+    stub = StubJira("", issues, latency=latency, page_size=100, token_only=token_only)
+    with SessionLocal() as db:
+        link = _project(db, stub.url)
+        stub.project_key = link.jira_project_key
+        with stub:
+            started = time.perf_counter()
+            run = JiraSyncEngine(db, link, workers=workers, prefetch=prefetch).run()
+            elapsed = time.perf_counter() - started
+        assert run.status == "completed", run.message
+        assert run.created == issues
+        db.delete(db.get(Project, link.project_id))
+        db.delete(db.get(JiraConnection, link.connection_id))
+        db.commit()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stub request")
+    parser.add_argument("--workers", default="1,4,8", help="comma-separated worker counts")
+    parser.add_argument("--prefetch", type=int, default=None, help="pages in flight (default: workers)")
+    parser.add_argument("--token-only", action="store_true", help="serve only /search/jql")
+    args = parser.parse_args()
+
+    run_bootstrap()
+    print(f"{args.issues} issues, {args.latency * 1000:.0f} ms/request"
+          f"{', token pagination' if args.token_only else ''}")
+    print(f"{'workers':>8} {'prefetch':>9} {'seconds':>9} {'issues/s':>9}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        prefetch = args.prefetch or workers
+        elapsed = bench(args.issues, args.latency, workers, prefetch, args.token_only)
+        print(f"{workers:>8} {prefetch:>9} {elapsed:>9.2f} {args.issues / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Fixtures shared across the test modules.
+
+Module-specific fixtures (API client, logins, seeded projects) stay in their
+modules; only helpers several modules need live here.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+
+
+class Statements(list):
+    """SQL text of every statement run while capturing, in order.
+
+    ``by_engine`` counts them per engine: ``"sync"`` for ``engine`` and
+    ``"async"`` for ``async_engine`` (the hot read routes).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.by_engine: Counter[str] = Counter()
+
+
+@pytest.fixture
+def capture_sql():
+    """Context manager recording the statements issued on both engines::
+
+        with capture_sql() as statements:
+            client.get(url, headers=headers)
+        assert len(statements) <= 3
+    """
+    from sqlalchemy import event
+
+    from app.core.database import async_engine, engine
+
+    @contextmanager
+    def _capture():
+        statements = Statements()
+        listeners = []
+        for name, eng in (("sync", engine), ("async", async_engine.sync_engine)):
+            def _before(conn, cursor, statement, *args, _name=name):
+                statements.append(statement)
+                statements.by_engine[_name] += 1
+
+            event.listen(eng, "before_cursor_execute", _before)
+            listeners.append((eng, _before))
+        try:
+            yield statements
+        finally:
+            for eng, fn in listeners:
+                event.remove(eng, "before_cursor_execute", fn)
+
+    return _capture
@@ -0,0 +1,408 @@
+"""Deterministic, large-scale synthetic Trackly dataset for benchmarks.
+
+Not collected by pytest. :func:`ensure_dataset` builds (or finds, when the same
+spec was generated before) ``projects`` projects holding ``issues`` issues in
+total, with the shapes real instances have:
+
+* people — ``users`` accounts, a team group, and per project an admin,
+  Developers (users and the group), Viewers, and on every fourth project a
+  stricter permission scheme that leaves Viewers out;
+* agile — one scrum board per project with closed sprints, an active and a
+  future sprint, issues spread over them and the backlog;
+* issues — skewed type, priority and status mixes, epics with children,
+  Zipf-distributed labels, geometric comment counts, worklogs on started
+  work and a status-transition history for every issue.
+
+The same seed and sizes always produce the same rows (timestamps are offsets
+from the day it runs), and every write is a multi-row ``INSERT`` so a
+100k-issue dataset takes about a minute. Rows are tagged by project key
+(``SY<seed><n>``) and the spec is recorded in each project's description, so
+a re-run with the same spec reuses the data and a different spec for the same
+seed is refused.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.bootstrap import run_bootstrap
+from app.core.database import SessionLocal
+from app.core.security import hash_password
+from app.models import (
+    Board,
+    Comment,
+    Group,
+    Issue,
+    IssueHistory,
+    IssueType,
+    Label,
+    PermissionGrant,
+    PermissionScheme,
+    Priority,
+    Project,
+    ProjectMember,
+    ProjectRole,
+    ProjectRoleActor,
+    Sprint,
+    Status,
+    User,
+    Worklog,
+)
+from app.models.issue import issue_labels
+from app.models.rbac import user_groups
+from app.services import permission_index
+from app.utils.ranking import spread_ranks
+
+PASSWORD = "synthetic"
+
+_WORDS = (
+    "account api audit backlog billing cache checkout client config dashboard deploy "
+    "email export feed filter gateway import index invoice job login metrics mobile "
+    "notification onboarding order payment pipeline profile queue report search "
+    "session settings signup storage sync upload webhook widget worker"
+).split()
+_VERBS = "Add Fix Improve Refactor Remove Support Speed up Validate Migrate Document".split()
+_LABELS = [f"syn-{w}" for w in _WORDS]
+# Issue type, priority and sprint-bucket mixes (name, weight).
+_TYPE_MIX = [("Story", 50), ("Task", 25), ("Bug", 21), ("Epic", 4)]
+_PRIORITY_MIX = [("Highest", 3), ("High", 15), ("Medium", 55), ("Low", 20), ("Lowest", 7)]
+_CLOSED_SPRINTS = 4
+_SPRINT_DAYS = 14
+
+
+@dataclass(frozen=True)
+class Spec:
+    seed: int = 1
+    projects: int = 8
+    issues: int = 8000
+    users: int = 60
+
+
+@dataclass
+class Dataset:
+    spec: Spec
+    project_ids: list[int] = field(default_factory=list)
+    project_keys: list[str] = field(default_factory=list)
+    board_ids: list[int] = field(default_factory=list)
+    #: A non-admin Developer on the even projects and Viewer on some others.
+    member_id: int = 0
+
+
+def _alpha(n: int, width: int) -> str:
+    out = ""
+    for _ in range(width):
+        n, r = divmod(n, 26)
+        out = chr(ord("A") + r) + out
+    return out
+
+
+def project_key(seed: int, index: int) -> str:
+    return f"SY{_alpha(seed, 3)}{_alpha(index, 3)}"
+
+
+def _marker(spec: Spec) -> str:
+    return "synthetic:" + json.dumps(asdict(spec), sort_keys=True)
+
+
+def _pick(rng: random.Random, mix: list[tuple[str, int]]) -> str:
+    return rng.choices([m[0] for m in mix], weights=[m[1] for m in mix])[0]
+
+
+def _geometric(rng: random.Random, p: float, cap: int) -> int:
+    n = 0
+    while n < cap and rng.random() < p:
+        n += 1
+    return n
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _insert(db: Session, model, rows: list[dict], chunk: int = 5000) -> list[int]:
+    ids: list[int] = []
+    for i in range(0, len(rows), chunk):
+        ids.extend(db.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows[i:i + chunk]
+        ).all())
+    return ids
+
+
+def _insert_plain(db: Session, table, rows: list[dict], chunk: int = 10000) -> None:
+    for i in range(0, len(rows), chunk):
+        db.execute(insert(table), rows[i:i + chunk])
+
+
+# --- Lookup ------------------------------------------------------------------
+def find_dataset(db: Session, spec: Spec) -> Dataset | None:
+    """The dataset previously generated for *spec*, or None."""
+    keys = [project_key(spec.seed, i) for i in range(spec.projects)]
+    projects = db.execute(
+        select(Project.id, Project.key, Project.description).where(Project.key.in_(keys))
+    ).all()
+    if not projects:
+        return None
+    if len(projects) != spec.projects or any(p.description != _marker(spec) for p in projects):
+        raise SystemExit(
+            f"Seed {spec.seed} already holds a different synthetic dataset; use another --seed"
+        )
+    by_key = {p.key: p.id for p in projects}
+    pids = [by_key[k] for k in keys]
+    boards = dict(db.execute(select(Board.project_id, Board.id).where(Board.project_id.in_(pids))).all())
+    member = db.scalar(select(User.id).where(User.username == f"syn-{spec.seed}-0"))
+    return Dataset(spec, pids, keys, [boards[p] for p in pids], member)
+
+
+def ensure_dataset(spec: Spec) -> Dataset:
+    run_bootstrap()
+    with SessionLocal() as db:
+        existing = find_dataset(db, spec)
+        if existing is not None:
+            return existing
+        dataset = generate(db, spec)
+        db.commit()
+        return dataset
+
+
+# --- Generation --------------------------------------------------------------
+def generate(db: Session, spec: Spec) -> Dataset:
+    """Write *spec*'s dataset in *db*'s transaction (the caller commits)."""
+    rng = random.Random(spec.seed)
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    admin = db.scalars(select(User).where(User.is_admin.is_(True)).order_by(User.id)).first()
+    statuses = db.scalars(select(Status).where(Status.project_id.is_(None)).order_by(Status.order)).all()
+    types = {t.name: t.id for t in db.scalars(select(IssueType).where(IssueType.project_id.is_(None)))}
+    priorities = {p.name: p.id for p in db.scalars(select(Priority))}
+    roles = {r.name: r.id for r in db.scalars(select(ProjectRole))}
+    default_scheme = db.scalars(select(PermissionScheme).where(PermissionScheme.is_default.is_(True))).one()
+
+    # People.
+    password_hash = hash_password(PASSWORD)
+    user_ids = _insert(db, User, [
+        {
+            "username": f"syn-{spec.seed}-{i}",
+            "email": f"syn-{spec.seed}-{i}@synthetic.trackly.local",
+            "display_name": f"Synthetic {spec.seed}/{i}",
+            "password_hash": password_hash,
+        }
+        for i in range(spec.users)
+    ])
+    member_id = user_ids[0]
+    team = Group(name=f"syn-{spec.seed}-team", description="Synthetic benchmark team")
+    db.add(team)
+    restricted = PermissionScheme(name=f"Synthetic {spec.seed} restricted", description="No viewer access")
+    db.add(restricted)
+    db.flush()
+    _insert_plain(db, user_groups, [
+        {"user_id": uid, "group_id": team.id} for uid in user_ids[1:] if rng.random() < 0.2
+    ])
+    _insert_plain(db, PermissionGrant, [
+        {"scheme_id": restricted.id, "permission": g.permission, "holder_type": g.holder_type,
+         "holder_value": g.holder_value}
+        for g in default_scheme.grants if g.holder_value != "Viewers"
+    ])
+
+    db.execute(pg_insert(Label).values([{"name": n} for n in _LABELS]).on_conflict_do_nothing())
+    label_ids = dict(db.execute(select(Label.name, Label.id).where(Label.name.in_(_LABELS))).all())
+    label_pool = [label_ids[n] for n in _LABELS]
+    label_weights = [1 / (rank + 1) for rank in range(len(label_pool))]
+
+    # Projects, boards, roles.
+    keys = [project_key(spec.seed, i) for i in range(spec.projects)]
+    pids = _insert(db, Project, [
+        {
+            "key": key,
+            "name": f"Synthetic {key}",
+            "description": _marker(spec),
+            "lead_id": admin.id,
+            "permission_scheme_id": restricted.id if i % 4 == 3 else default_scheme.id,
+        }
+        for i, key in enumerate(keys)
+    ])
+    board_ids = _insert(db, Board, [{"project_id": pid, "name": f"Synthetic {key} board"} for pid, key in zip(pids, keys)])
+    _insert_plain(db, ProjectMember, [{"project_id": pid, "user_id": admin.id, "role": "admin"} for pid in pids])
+    actors: list[dict] = []
+    developers: dict[int, list[int]] = {}
+    for i, pid in enumerate(pids):
+        devs = [uid for uid in user_ids[1:] if rng.random() < 0.3]
+        if i % 2 == 0:
+            devs.append(member_id)
+        developers[pid] = devs
+        viewers = rng.sample([u for u in user_ids if u not in devs], k=min(5, spec.users - len(devs)))
+        if i % 2 == 1 and i % 3 == 0 and member_id not in viewers:
+            viewers.append(member_id)
+        actors.append({"project_id": pid, "role_id": roles["Administrators"], "user_id": admin.id, "group_id": None})
+        actors += [{"project_id": pid, "role_id": roles["Developers"], "user_id": u, "group_id": None} for u in devs]
+        actors += [{"project_id": pid, "role_id": roles["Viewers"], "user_id": u, "group_id": None} for u in viewers]
+        if i % 3 == 0:
+            actors.append({"project_id": pid, "role_id": roles["Developers"], "user_id": None, "group_id": team.id})
+    _insert_plain(db, ProjectRoleActor, actors)
+
+    # Sprints: closed history, one active, one future per board.
+    sprint_rows = []
+    for bid in board_ids:
+        for s in range(_CLOSED_SPRINTS + 2):
+            start = today - timedelta(days=_SPRINT_DAYS * (_CLOSED_SPRINTS - s) + 7)
+            state = "closed" if s < _CLOSED_SPRINTS else ("active" if s == _CLOSED_SPRINTS else "future")
+            sprint_rows.append({
+                "board_id": bid,
+                "name": f"Sprint {s + 1}",
+                "state": state,
+                "start_date": start if state != "future" else None,
+                "end_date": start + timedelta(days=_SPRINT_DAYS) if state != "future" else None,
+                "complete_date": start + timedelta(days=_SPRINT_DAYS) if state == "closed" else None,
+            })
+    sprint_ids = _insert(db, Sprint, sprint_rows)
+    per_board = _CLOSED_SPRINTS + 2
+    sprints = {pid: sprint_ids[i * per_board:(i + 1) * per_board] for i, pid in enumerate(pids)}
+
+    # Issues: epics first so children can point at them.
+    done = [s for s in statuses if s.category == "done"]
+    started = [s for s in statuses if s.category == "in_progress"]
+    todo = [s for s in statuses if s.category == "todo"]
+    status_names = {s.id: s.name for s in statuses}
+    base, extra = divmod(spec.issues, spec.projects)
+    issue_meta: list[tuple[int, str, list[int]]] = []  # (project id, type name, status id path)
+    issue_rows: list[dict] = []
+    for i, (pid, key) in enumerate(zip(pids, keys)):
+        count = base + (1 if i < extra else 0)
+        ranks = spread_ranks(count)
+        rng.shuffle(ranks)
+        sprint_of = sprints[pid]
+        for n in range(1, count + 1):
+            type_name = _pick(rng, _TYPE_MIX)
+            bucket = rng.random()
+            if bucket < 0.35:
+                sprint_id = rng.choice(sprint_of[:_CLOSED_SPRINTS])
+                status = rng.choice(done) if rng.random() < 0.9 else rng.choice(started + todo)
+            elif bucket < 0.55:
+                sprint_id = sprint_of[_CLOSED_SPRINTS]
+                status = rng.choice(statuses)
+            elif bucket < 0.65:
+                sprint_id = sprint_of[_CLOSED_SPRINTS + 1]
+                status = rng.choice(todo)
+            else:
+                sprint_id = None
+                status = rng.choice(todo) if rng.random() < 0.8 else rng.choice(statuses)
+            if type_name == "Epic":
+                sprint_id = None
+            created = today - timedelta(days=rng.randint(1, 365), minutes=rng.randint(0, 1439))
+            updated = min(created + timedelta(days=rng.randint(0, 60)), today)
+            is_done = status.category == "done"
+            devs = developers[pid]
+            issue_rows.append({
+                "key": f"{key}-{n}",
+                "number": n,
+                "project_id": pid,
+                "type_id": types[type_name],
+                "status_id": status.id,
+                "priority_id": priorities[_pick(rng, _PRIORITY_MIX)],
+                "summary": f"{rng.choice(_VERBS)} {rng.choice(_WORDS)} {rng.choice(_WORDS)}",
+                "description": " ".join(_sentence(rng, rng.randint(6, 16)) for _ in range(rng.randint(1, 4))),
+                "reporter_id": rng.choice(devs or user_ids),
+                "assignee_id": rng.choice(devs) if devs and rng.random() < 0.8 else None,
+                "story_points": rng.choice([1, 2, 3, 5, 8, 13]) if type_name != "Epic" and rng.random() < 0.7 else None,
+                "original_estimate_seconds": rng.choice([3600, 7200, 14400, 28800]) if rng.random() < 0.4 else None,
+                "resolution": "Done" if is_done else None,
+                "resolved_at": updated if is_done else None,
+                "sprint_id": sprint_id,
+                "rank": ranks[n - 1],
+                "created_at": created,
+                "updated_at": updated,
+            })
+            path = [todo[0].id]
+            if status.category != "todo":
+                path += [s.id for s in started[:rng.randint(1, len(started))]]
+            if status.id != path[-1]:
+                path.append(status.id)
+            issue_meta.append((pid, type_name, path))
+    issue_ids = _insert(db, Issue, issue_rows)
+    counts = Counter(m[0] for m in issue_meta)
+    db.execute(
+        update(Project.__table__).where(Project.id == bindparam("b_id")).values(issue_counter=bindparam("b_n")),
+        [{"b_id": pid, "b_n": counts[pid]} for pid in pids],
+    )
+
+    # Epic links, labels, comments, worklogs, history.
+    epics: dict[int, list[int]] = {}
+    for iid, (pid, type_name, _) in zip(issue_ids, issue_meta):
+        if type_name == "Epic":
+            epics.setdefault(pid, []).append(iid)
+    epic_links = [
+        {"id": iid, "epic_id": rng.choice(epics[pid])}
+        for iid, (pid, type_name, _) in zip(issue_ids, issue_meta)
+        if type_name != "Epic" and epics.get(pid) and rng.random() < 0.4
+    ]
+    if epic_links:
+        db.execute(
+            update(Issue.__table__).where(Issue.id == bindparam("b_id")).values(epic_id=bindparam("b_epic")),
+            [{"b_id": r["id"], "b_epic": r["epic_id"]} for r in epic_links],
+        )
+
+    label_rows, comment_rows, worklog_rows, history_rows = [], [], [], []
+    for iid, row, (pid, _, path) in zip(issue_ids, issue_rows, issue_meta):
+        chosen = {rng.choices(label_pool, weights=label_weights)[0] for _ in range(_geometric(rng, 0.55, 4))}
+        label_rows += [{"issue_id": iid, "label_id": lid} for lid in chosen]
+        people = developers[pid] or user_ids
+        created = row["created_at"]
+        for c in range(_geometric(rng, 0.6, 12)):
+            at = created + timedelta(hours=rng.randint(1, 24 * 30))
+            comment_rows.append({
+                "issue_id": iid, "author_id": rng.choice(people),
+                "body": " ".join(_sentence(rng, rng.randint(5, 20)) for _ in range(rng.randint(1, 3))),
+                "created_at": at, "updated_at": at,
+            })
+        if len(path) > 1 and rng.random() < 0.6:
+            for _ in range(rng.randint(1, 4)):
+                at = created + timedelta(hours=rng.randint(1, 24 * 20))
+                worklog_rows.append({
+                    "issue_id": iid, "author_id": rng.choice(people),
+                    "time_spent_seconds": rng.choice([900, 1800, 3600, 7200, 14400]),
+                    "started_at": at, "created_at": at, "updated_at": at,
+                })
+        history_rows.append({
+            "issue_id": iid, "author_id": row["reporter_id"], "field": "created",
+            "old_value": None, "new_value": row["key"], "created_at": created,
+        })
+        at = created
+        for old, new in zip(path, path[1:]):
+            at = min(at + timedelta(hours=rng.randint(2, 24 * 7)), row["updated_at"])
+            history_rows.append({
+                "issue_id": iid, "author_id": row["assignee_id"] or row["reporter_id"], "field": "status",
+                "old_value": status_names[old], "new_value": status_names[new], "created_at": at,
+            })
+    _insert_plain(db, issue_labels, label_rows)
+    _insert_plain(db, Comment, comment_rows, chunk=2000)
+    _insert_plain(db, Worklog, worklog_rows)
+    _insert_plain(db, IssueHistory, history_rows)
+
+    # Bulk inserts bypass the ORM hooks that keep the permission index current.
+    db.flush()
+    permission_index.rebuild(db.connection(), pids)
+    return Dataset(spec, pids, keys, board_ids, member_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=Spec.seed)
+    parser.add_argument("--projects", type=int, default=Spec.projects)
+    parser.add_argument("--issues", type=int, default=Spec.issues, help="total across all projects")
+    parser.add_argument("--users", type=int, default=Spec.users)
+    args = parser.parse_args()
+    spec = Spec(seed=args.seed, projects=args.projects, issues=args.issues, users=args.users)
+    started = time.perf_counter()
+    dataset = ensure_dataset(spec)
+    print(f"{spec}: projects {', '.join(dataset.project_keys)} ready in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
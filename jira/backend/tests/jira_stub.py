@@ -0,0 +1,216 @@
+"""A local stand-in for the Jira REST API, serving generated fixture pages.
+
+Backs the sync-engine and importer tests and ``tests/bench_jira_sync.py`` /
+``tests/bench_importer.py``. It implements just the endpoints
+:class:`app.services.jira_sync.JiraSyncEngine` and
+:class:`app.migration.importer.Importer` call:
+field / status / priority / issue-type metadata, the classic ``/search`` (or,
+with ``token_only``, only ``/search/jql``) and per-issue comment / worklog
+listings. Issues are deterministic functions of their number:
+
+* every 10th issue is a sub-task whose parent is the issue 5 numbers *later*
+  (so parents often arrive on a later page);
+* issue ``n`` has ``n % 4`` comments and ``n % 3`` worklogs, and search
+  results embed at most ``EMBED`` of each — the rest must be fetched.
+
+Searches honour the engine's ``updated >= "..."`` watermark clause (issue
+``n`` was updated ``n`` minutes after ``BASE_TIME``). ``latency`` adds a
+per-request delay to mimic a remote server, and
+``fail_at_start`` makes the search page starting at that offset return 400 so
+tests can interrupt a sync mid-run.
+"""
+from __future__ import annotations
+
+import calendar
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+EMBED = 2
+BASE_TIME = 1_700_000_000  # epoch seconds; issue n is updated n minutes later
+
+_WATERMARK = re.compile(r'updated >= "(\d{4}/\d\d/\d\d \d\d:\d\d)"')
+
+
+def _ts(seconds: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000+0000", time.gmtime(seconds))
+
+
+class StubJira:
+    def __init__(
+        self,
+        project_key: str,
+        issues: int,
+        *,
+        latency: float = 0.0,
+        page_size: int = 50,
+        token_only: bool = False,
+    ) -> None:
+        self.project_key = project_key
+        self.count = issues
+        self.latency = latency
+        self.page_size = page_size
+        self.token_only = token_only
+        self.fail_at_start: int | None = None
+        self.requests: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    # -- lifecycle ---------------------------------------------------------
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubJira":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # -- fixture data ------------------------------------------------------
+    def _key(self, n: int) -> str:
+        return f"{self.project_key}-{n}"
+
+    def comments(self, n: int) -> list[dict]:
+        return [
+            {
+                "id": f"{self.project_key}-c{n}-{i}",
+                "author": {"accountId": f"acct-{(n + i) % 7}", "displayName": f"Person {(n + i) % 7}"},
+                "body": f"Comment {i} on issue {n}",
+                "created": _ts(BASE_TIME + n * 60 + i),
+                "updated": _ts(BASE_TIME + n * 60 + i),
+            }
+            for i in range(n % 4)
+        ]
+
+    def worklogs(self, n: int) -> list[dict]:
+        return [
+            {
+                "id": f"w{n}-{i}",
+                "author": {"accountId": f"acct-{(n + i) % 7}", "displayName": f"Person {(n + i) % 7}"},
+                "timeSpentSeconds": 900 * (i + 1),
+                "started": _ts(BASE_TIME + n * 60 + i),
+            }
+            for i in range(n % 3)
+        ]
+
+    def issue(self, n: int) -> dict:
+        comments, worklogs = self.comments(n), self.worklogs(n)
+        fields = {
+            "summary": f"Issue number {n}",
+            "description": f"Body of issue {n}",
+            "issuetype": {"id": "10001" if n % 10 == 0 else "10000",
+                          "name": "Sub-task" if n % 10 == 0 else "Task"},
+            "status": {"id": "1", "name": "To Do"},
+            "priority": {"id": "3", "name": "Medium"},
+            "assignee": {"accountId": f"acct-{n % 7}", "displayName": f"Person {n % 7}"},
+            "reporter": {"accountId": "acct-0", "displayName": "Person 0"},
+            "labels": [f"l{n % 5}", "synced"],
+            "created": _ts(BASE_TIME + n * 60),
+            "updated": _ts(BASE_TIME + n * 60),
+            "comment": {"comments": comments[:EMBED], "total": len(comments), "maxResults": EMBED},
+            "worklog": {"worklogs": worklogs[:EMBED], "total": len(worklogs), "maxResults": EMBED},
+        }
+        if n % 10 == 0 and n + 5 <= self.count:
+            fields["parent"] = {"key": self._key(n + 5), "fields": {"issuetype": {"name": "Task"}}}
+        return {"id": str(900_000 + n), "key": self._key(n), "fields": fields}
+
+    # -- HTTP --------------------------------------------------------------
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # keep test output quiet
+                pass
+
+            def _send(self, code: int, body) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _route(self, method: str) -> None:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlparse(self.path)
+                path, query = url.path, parse_qs(url.query)
+                body = {}
+                if method == "POST":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.requests[path.rsplit("/", 1)[-1] if "/issue/" in path else path] += 1
+                code, payload = stub.respond(method, path, query, body)
+                self._send(code, payload)
+
+            def do_GET(self):
+                self._route("GET")
+
+            def do_POST(self):
+                self._route("POST")
+
+        return Handler
+
+    def _number(self, key: str) -> int:
+        return int(key.rsplit("-", 1)[-1])
+
+    def respond(self, method: str, path: str, query: dict, body: dict):
+        parts = path.strip("/").split("/")
+        tail = "/".join(parts[3:]) if parts[:2] == ["rest", "api"] else ""
+        if tail == "field":
+            return 200, [{"id": "customfield_10016", "name": "Story Points"}]
+        if tail == "status":
+            return 200, [{"id": "1", "name": "To Do", "statusCategory": {"key": "new"}}]
+        if tail == "priority":
+            return 200, [{"id": "3", "name": "Medium"}]
+        if tail == "issuetype":
+            return 200, [{"id": "10000", "name": "Task", "subtask": False},
+                         {"id": "10001", "name": "Sub-task", "subtask": True}]
+        if tail == "search" and method == "POST":
+            if self.token_only:
+                return 410, {"errorMessages": ["gone"]}
+            start = int(body.get("startAt") or 0)
+            size = min(int(body.get("maxResults") or 50), self.page_size)
+            return self._page(body.get("jql", ""), start, size)
+        if tail == "search/jql" and method == "POST":
+            start = int(body.get("nextPageToken") or 0)
+            code, page = self._page(body.get("jql", ""), start, self.page_size)
+            if code == 200:
+                nxt = start + len(page["issues"])
+                last = nxt >= page["total"]
+                page = {"issues": page["issues"], "isLast": last}
+                if not last:
+                    page["nextPageToken"] = str(nxt)
+            return code, page
+        if len(parts) == 6 and parts[3] == "issue" and parts[5] in ("comment", "worklog"):
+            n = self._number(parts[4])
+            items = self.comments(n) if parts[5] == "comment" else self.worklogs(n)
+            start = int((query.get("startAt") or ["0"])[0])
+            size = int((query.get("maxResults") or ["50"])[0])
+            return 200, {f"{parts[5]}s": items[start:start + size], "total": len(items)}
+        return 404, {"errorMessages": [f"No stub for {method} {path}"]}
+
+    def _page(self, jql: str, start: int, size: int):
+        if self.fail_at_start is not None and start == self.fail_at_start:
+            return 400, {"errorMessages": ["stub: interrupted"]}
+        first = 1
+        m = _WATERMARK.search(jql)
+        if m:
+            since = calendar.timegm(time.strptime(m.group(1), "%Y/%m/%d %H:%M"))
+            first = max(1, -(-(since - BASE_TIME) // 60))
+        numbers = list(range(first, self.count + 1))
+        return 200, {
+            "startAt": start, "maxResults": size, "total": len(numbers),
+            "issues": [self.issue(n) for n in numbers[start:start + size]],
+        }
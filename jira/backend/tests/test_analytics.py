@@ -336,3 +336,51 @@ def test_clean_project_has_no_attention(client, admin_headers, meta):
     # The done issue is still counted in totals, just not flagged.
     assert stats["total_issues"] == 1
     assert stats["closed_issues"] == 1
+
+
+# ===========================================================================
+# 5. Batched aggregates & the per-project cache
+# ===========================================================================
+def test_overview_query_count_is_constant(client, admin_headers, meta, capture_sql):
+    from app.core.database import SessionLocal
+    from app.services import analytics
+
+    ids = []
+    for n in range(4):
+        project = create_project(client, admin_headers)
+        ids.append(project["id"])
+        create_issue(client, admin_headers, meta, project["id"], f"Batch {n}",
+                     priority_name="High", due_date="2020-03-03")
+
+    def _count(project_ids):
+        analytics.invalidate_projects()
+        with SessionLocal() as db, capture_sql() as statements:
+            stats = analytics.overview_stats(db, project_ids, scope="test")
+        return len(statements), stats
+
+    one, _ = _count(ids[:1])
+    many, stats = _count(ids)
+    assert many == one
+    assert stats.total_projects == 4
+    assert stats.total_overdue == 4
+    assert len(stats.top_attention) == 8  # four overdue, then the same four by priority
+
+
+def test_cached_stats_follow_issue_writes(client, admin_headers, meta):
+    project = create_project(client, admin_headers)
+    pid, key = project["id"], project["key"]
+
+    create_issue(client, admin_headers, meta, pid, "First overdue", due_date="2020-04-04")
+    first = client.get(f"/api/analytics/projects/{key}", headers=admin_headers).json()
+    assert _attn(first["attention"])["overdue"]["count"] == 1
+
+    late = create_issue(client, admin_headers, meta, pid, "Second overdue", due_date="2020-04-05")
+    second = client.get(f"/api/analytics/projects/{key}", headers=admin_headers).json()
+    assert _attn(second["attention"])["overdue"]["count"] == 2
+    assert second["total_issues"] == 2
+
+    done = next(s for s in meta["statuses"] if s["category"] == "done")
+    client.patch(f"/api/issues/{late['key']}", headers=admin_headers, json={"status_id": done["id"]})
+    third = client.get(f"/api/analytics/projects/{key}", headers=admin_headers).json()
+    assert _attn(third["attention"])["overdue"]["count"] == 1
+    assert third["closed_issues"] == 1
@@ -0,0 +1,195 @@
+"""DB-backed tests for streaming, content-addressed attachments.
+
+Covers de-duplicated storage with trigger-maintained reference counts, blob
+release on attachment and issue deletion, ranged downloads, the streaming
+size limit and the upload path's bounded memory use, through the real API
+and PostgreSQL. File contents embed a per-run token so blobs never collide
+with earlier runs.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import tracemalloc
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Attachment, AttachmentBlob
+from app.services import attachments
+from app.services.storage import get_storage
+
+
+# ---------------------------------------------------------------------------
+# Fixtures & helpers
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def client():
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def admin_headers(client) -> dict[str, str]:
+    resp = client.post(
+        "/api/auth/login",
+        data={"username": settings.bootstrap_admin_email, "password": settings.bootstrap_admin_password},
+    )
+    assert resp.status_code == 200, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def _issues(client, admin_headers, count: int) -> list[str]:
+    key = ("AT" + uuid.uuid4().hex[:5]).upper()
+    resp = client.post("/api/projects", headers=admin_headers, json={"key": key, "name": f"Attach {key}"})
+    assert resp.status_code == 201, resp.text
+    pid = resp.json()["id"]
+    type_id = client.get("/api/meta/issue-types", headers=admin_headers).json()[0]["id"]
+    keys = []
+    for i in range(count):
+        issue = client.post(
+            "/api/issues", headers=admin_headers,
+            json={"project_id": pid, "type_id": type_id, "summary": f"Files {i}"},
+        )
+        assert issue.status_code == 201, issue.text
+        keys.append(issue.json()["key"])
+    return keys
+
+
+def _upload(client, admin_headers, key: str, content: bytes, name: str = "data.bin"):
+    return client.post(
+        f"/api/issues/{key}/attachments", headers=admin_headers,
+        files={"file": (name, content, "application/octet-stream")},
+    )
+
+
+def _blob(sha256: str) -> AttachmentBlob | None:
+    with SessionLocal() as db:
+        return db.get(AttachmentBlob, sha256)
+
+
+# ===========================================================================
+# Content addressing and reference counts
+# ===========================================================================
+def test_identical_files_share_one_blob_until_the_last_reference_goes(client, admin_headers):
+    first, second = _issues(client, admin_headers, 2)
+    content = f"shared {uuid.uuid4().hex}".encode() * 100
+    a = _upload(client, admin_headers, first, content, "a.txt")
+    b = _upload(client, admin_headers, second, content, "b.txt")
+    assert a.status_code == b.status_code == 201, (a.text, b.text)
+
+    with SessionLocal() as db:
+        rows = db.scalars(select(Attachment).where(Attachment.id.in_([a.json()["id"], b.json()["id"]]))).all()
+    sha = rows[0].sha256
+    assert {r.storage_key for r in rows} == {attachments.blob_key(sha)}
+    assert _blob(sha).ref_count == 2
+    store = get_storage()
+    assert store.size(attachments.blob_key(sha)) == len(content)
+
+    resp = client.delete(f"/api/issues/attachments/{a.json()['id']}", headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+    assert _blob(sha).ref_count == 1
+    download = client.get(f"/api/issues/attachments/{b.json()['id']}/download", headers=admin_headers)
+    assert download.content == content
+
+    # Deleting the issue cascades to its attachment; the trigger releases the
+    # blob and the background sweep removes the file.
+    assert client.delete(f"/api/issues/{second}", headers=admin_headers).status_code == 200
+    assert _blob(sha) is None
+    assert not store.exists(attachments.blob_key(sha))
+
+
+def test_upload_limit_is_enforced_while_streaming(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(settings, "max_attachment_mb", 1)
+    (key,) = _issues(client, admin_headers, 1)
+    staging = get_storage().staging_dir
+    before = set(os.listdir(staging)) if os.path.isdir(staging) else set()
+
+    resp = _upload(client, admin_headers, key, b"x" * (1024 * 1024 + 1))
+    assert resp.status_code == 413, resp.text
+    assert set(os.listdir(staging)) <= before
+    assert _upload(client, admin_headers, key, b"y" * (1024 * 1024)).status_code == 201
+    assert client.post(
+        f"/api/issues/{key}/attachments", headers=admin_headers, files={"other": ("x", b"1")},
+    ).status_code == 400
+
+
+def test_upload_memory_stays_flat():
+    size = 64 * 1024 * 1024
+    boundary = b"trackly-test-boundary"
+    head = (
+        b"--" + boundary + b"\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="big.bin"\r\n'
+        b"Content-Type: application/octet-stream\r\n\r\n"
+    )
+    tail = b"\r\n--" + boundary + b"--\r\n"
+    chunk = os.urandom(64 * 1024)
+
+    def messages():
+        yield head
+        for _ in range(size // len(chunk)):
+            yield chunk
+        yield tail
+
+    body = messages()
+
+    async def receive():
+        data = next(body, None)
+        return {"type": "http.request", "body": data or b"", "more_body": data is not None}
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/", "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=" + boundary)],
+    }
+    tracemalloc.start()
+    try:
+        staged = asyncio.run(attachments.receive_upload(Request(scope, receive), size))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    try:
+        assert staged.size == size == os.path.getsize(staged.path)
+        assert peak < 8 * 1024 * 1024
+    finally:
+        staged.discard()
+
+
+# ===========================================================================
+# Ranged downloads
+# ===========================================================================
+def test_download_serves_byte_ranges(client, admin_headers):
+    (key,) = _issues(client, admin_headers, 1)
+    content = bytes(range(256)) * 4 + uuid.uuid4().bytes
+    up = _upload(client, admin_headers, key, content)
+    url = f"/api/issues/attachments/{up.json()['id']}/download"
+
+    full = client.get(url, headers=admin_headers)
+    assert full.status_code == 200 and full.content == content
+    assert full.headers["accept-ranges"] == "bytes"
+    etag = full.headers["etag"]
+
+    part = client.get(url, headers={**admin_headers, "Range": "bytes=10-19"})
+    assert part.status_code == 206
+    assert part.content == content[10:20]
+    assert part.headers["content-range"] == f"bytes 10-19/{len(content)}"
+
+    tail = client.get(url, headers={**admin_headers, "Range": "bytes=-7"})
+    assert (tail.status_code, tail.content) == (206, content[-7:])
+    rest = client.get(url, headers={**admin_headers, "Range": "bytes=1000-"})
+    assert (rest.status_code, rest.content) == (206, content[1000:])
+
+    beyond = client.get(url, headers={**admin_headers, "Range": f"bytes={len(content)}-"})
+    assert beyond.status_code == 416
+    assert beyond.headers["content-range"] == f"bytes */{len(content)}"
+
+    stale = client.get(url, headers={**admin_headers, "Range": "bytes=0-0", "If-Range": '"other"'})
+    assert (stale.status_code, stale.content) == (200, content)
+    fresh = client.get(url, headers={**admin_headers, "Range": "bytes=0-0", "If-Range": etag})
+    assert (fresh.status_code, fresh.content) == (206, content[:1])
@@ -0,0 +1,64 @@
+"""Tests for the benchmark tooling: the synthetic dataset generator and the
+latency/statement-count regression check in ``tests/bench_api.py``.
+
+The generator runs against the real database with a small spec and a seed
+picked per run; the first generation is rolled back so nothing is left behind.
+"""
+from __future__ import annotations
+
+import random
+
+from sqlalchemy import func, select
+
+from app.core.bootstrap import run_bootstrap
+from app.core.database import SessionLocal
+from app.models import Comment, Issue, Project, Sprint
+from tests.bench_api import Result, compare
+from tests.datagen import Spec, find_dataset, generate
+
+
+def _snapshot(db, project_ids: list[int]) -> list[tuple]:
+    return db.execute(
+        select(Issue.number, Issue.summary, Issue.type_id, Issue.priority_id, Issue.status_id,
+               Issue.rank, Issue.story_points)
+        .join(Project, Project.id == Issue.project_id)
+        .where(Issue.project_id.in_(project_ids))
+        .order_by(Project.key, Issue.number)
+    ).all()
+
+
+def test_generator_is_deterministic_and_sized_by_spec():
+    run_bootstrap()
+    spec = Spec(seed=random.randrange(2000, 17000), projects=3, issues=240, users=12)
+    with SessionLocal() as db:
+        assert find_dataset(db, spec) is None
+        first = generate(db, spec)
+        rows = _snapshot(db, first.project_ids)
+        db.rollback()
+
+        second = generate(db, spec)
+        assert second.project_keys == first.project_keys
+        assert _snapshot(db, second.project_ids) == rows
+        assert len(rows) == spec.issues
+        assert db.scalar(select(func.count(Sprint.id)).where(Sprint.board_id.in_(second.board_ids))) == 3 * 6
+        assert db.scalar(
+            select(func.count(Comment.id)).join(Issue).where(Issue.project_id.in_(second.project_ids))
+        ) > 0
+        db.rollback()
+
+
+def test_compare_flags_latency_and_statement_regressions():
+    baseline = {"endpoints": {
+        "search": {"p50_ms": 10.0, "p95_ms": 20.0, "queries": 8},
+        "board": {"p50_ms": 5.0, "p95_ms": 6.0, "queries": 4},
+        "gone": {"p50_ms": 1.0, "p95_ms": 1.0, "queries": 1},
+    }}
+    steady = {"search": Result(11.0, 34.0, 8), "board": Result(5.0, 6.5, 4)}
+    assert compare(steady, baseline, latency_margin=0.5, floor_ms=5.0, query_margin=0.0) == []
+
+    slower = {"search": Result(30.0, 36.0, 8), "board": Result(5.0, 6.0, 5)}
+    failures = compare(slower, baseline, latency_margin=0.5, floor_ms=5.0, query_margin=0.0)
+    assert len(failures) == 2
+    assert failures[0].startswith("search: p95 36.0 ms")
+    assert failures[1].startswith("board: 5 statements")
+    assert compare(slower, baseline, latency_margin=0.5, floor_ms=5.0, query_margin=0.25) == failures[:1]
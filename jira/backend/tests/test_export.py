@@ -82,6 +82,30 @@ def test_export_issues_json(client, admin, project):
     assert len(data) == 4 and {d["Key"] for d in data} == set(project["issue_keys"])
 
 
+def test_export_issues_ndjson(client, admin, project):
+    r = client.get("/api/search/export", headers=admin, params={"tql": f"project = {project['key']}", "format": "ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.content.decode().splitlines()]
+    assert {d["Key"] for d in lines} == set(project["issue_keys"])
+    assert all(d["Labels"] == "exp" and d["Project"] == project["key"] for d in lines)
+
+
+def test_export_issues_streams_in_chunks_up_to_the_cap(client, admin, project, monkeypatch):
+    monkeypatch.setattr(settings, "export_chunk_rows", 3)
+    params = {"tql": f"project = {project['key']} ORDER BY key ASC", "format": "json"}
+    data = json.loads(client.get("/api/search/export", headers=admin, params=params).content)
+    assert [d["Key"] for d in data] == sorted(project["issue_keys"])
+    assert all(d["Labels"] == "exp" and d["Status"] for d in data)
+
+    monkeypatch.setattr(settings, "export_max_rows", 2)
+    for fmt in ("csv", "json"):
+        r = client.get("/api/search/export", headers=admin, params={**params, "format": fmt})
+        body = r.content.decode("utf-8-sig")
+        rows = list(csv.DictReader(io.StringIO(body))) if fmt == "csv" else json.loads(body)
+        assert [row["Key"] for row in rows] == sorted(project["issue_keys"])[:2]
+
+
 def test_export_issues_xlsx(client, admin, project):
     r = client.get("/api/search/export", headers=admin, params={"tql": f"project = {project['key']}", "format": "xlsx"})
     assert r.status_code == 200
@@ -0,0 +1,76 @@
+"""DB-backed tests for the one-shot Jira importer (app.migration.importer).
+
+Runs the page-at-a-time bulk import against the local stub Jira
+(``tests/jira_stub.py``) and the real PostgreSQL schema: preloaded lookups,
+set-based upserts, the deferred ``UPDATE … FROM`` link pass and idempotent
+re-imports.
+"""
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import func, select
+
+from app.core.bootstrap import run_bootstrap
+from app.core.database import SessionLocal
+from app.migration.importer import ImportOptions, Importer
+from app.migration.jira_client import JiraClient
+from app.models import Comment, Issue, Project, User, Worklog
+from tests.jira_stub import StubJira
+
+
+def _import(stub: StubJira, key: str, **options) -> Importer:
+    with SessionLocal() as db, JiraClient(base_url=stub.url, api_token="stub", server_token=True) as client:
+        importer = Importer(db, client, ImportOptions(**options))
+        importer.discover_fields()
+        importer.ensure_statuses()
+        importer.ensure_issue_types()
+        importer.ensure_priorities()
+        project = importer.import_project({"id": f"imp-{key}", "key": key, "name": f"Import {key}"})
+        importer.import_issues(project, importer._build_jql(key, ""))
+        return importer
+
+
+def _counts(key: str) -> tuple[int, int, int]:
+    with SessionLocal() as db:
+        pid = db.scalar(select(Project.id).where(Project.key == key))
+        issues = db.scalar(select(func.count(Issue.id)).where(Issue.project_id == pid))
+        comments = db.scalar(
+            select(func.count(Comment.id)).join(Issue, Issue.id == Comment.issue_id).where(Issue.project_id == pid)
+        )
+        worklogs = db.scalar(
+            select(func.count(Worklog.id)).join(Issue, Issue.id == Worklog.issue_id).where(Issue.project_id == pid)
+        )
+    return issues, comments, worklogs
+
+
+def test_import_is_set_based_and_idempotent(capture_sql):
+    run_bootstrap()
+    key = ("IM" + uuid.uuid4().hex[:5]).upper()
+    total = 120
+    expected = (total, sum(i % 4 for i in range(1, total + 1)), sum(i % 3 for i in range(1, total + 1)))
+    stub = StubJira(key, total, page_size=50)
+    with stub:
+        with capture_sql() as statements:
+            importer = _import(stub, key, workers=3)
+        assert importer.stats.issues == total
+        assert _counts(key) == expected
+        # A few statements per page, not several per issue.
+        assert len(statements) < 20 * (total // 50 + 1)
+
+        with SessionLocal() as db:
+            child = db.scalars(select(Issue).where(Issue.key == f"{key}-50")).one()
+            assert child.parent_id == db.scalar(select(Issue.id).where(Issue.key == f"{key}-55"))
+            assert sorted(l.name for l in child.labels) == ["l0", "synced"]
+            assert child.assignee.external_id == "acct-1"
+            ranks = db.scalars(
+                select(Issue.rank).where(Issue.project_id == child.project_id).order_by(Issue.number)
+            ).all()
+            assert list(ranks) == sorted(ranks)
+            users = db.scalar(select(func.count(User.id)).where(User.external_id.like("acct-%")))
+
+        again = _import(stub, key)
+        assert (again.stats.issues, again.stats.comments, again.stats.worklogs, again.stats.users) == (0, 0, 0, 0)
+        assert _counts(key) == expected
+        with SessionLocal() as db:
+            assert db.scalar(select(func.count(User.id)).where(User.external_id.like("acct-%"))) == users
@@ -0,0 +1,270 @@
+"""DB-backed tests for the Postgres job queue (app.services.jobs).
+
+Covers enqueue de-duplication, ``SKIP LOCKED`` leasing, per-key concurrency
+limits, lease takeover (and giving up on jobs that keep losing theirs),
+stopping a run whose lease was lost, retries with backoff, and the sync API
+handing its work to the job worker. Every test registers its own per-run job kind and
+claims only that kind, so it is unaffected by other rows in the table.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text, update
+
+from app.core.bootstrap import run_bootstrap
+from app.core.config import settings
+from app.core.crypto import encrypt
+from app.core.database import SessionLocal
+from app.models import Job, ProjectSyncLink, SyncRun
+from app.models.identity import JiraConnection
+from app.services import jobs
+from app.services.jira_sync import SYNC_JOB
+from tests.jira_stub import StubJira
+
+
+# ---------------------------------------------------------------------------
+# Fixtures & helpers
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def client():
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def admin_headers(client) -> dict[str, str]:
+    resp = client.post(
+        "/api/auth/login",
+        data={"username": settings.bootstrap_admin_email, "password": settings.bootstrap_admin_password},
+    )
+    assert resp.status_code == 200, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.fixture
+def kind():
+    run_bootstrap()
+    name = f"test-{uuid.uuid4().hex[:8]}"
+    yield name
+    jobs._handlers.pop(name, None)
+
+
+def _job(job_id: int) -> Job:
+    with SessionLocal() as db:
+        return db.get(Job, job_id)
+
+
+def _enqueue(kind: str, **kwargs) -> int:
+    with SessionLocal() as db:
+        job_id = jobs.enqueue(db, kind, {"n": 1}, **kwargs)
+        db.commit()
+    return job_id
+
+
+# ===========================================================================
+# Enqueue and leasing
+# ===========================================================================
+def test_enqueue_dedupes_live_jobs(kind):
+    key = f"{kind}:one"
+    first = _enqueue(kind, dedupe_key=key)
+    assert _enqueue(kind, dedupe_key=key) == first
+
+    ran: list[dict] = []
+    jobs.handler(kind)(lambda db, payload: ran.append(payload))
+    assert jobs.Worker(kinds=[kind]).run_once()
+    assert ran == [{"n": 1}]
+    assert _job(first).status == "done"
+    # Once the first finished, the key is free again.
+    assert _enqueue(kind, dedupe_key=key) != first
+
+
+def test_claim_skips_locked_rows_and_respects_concurrency(kind):
+    a = _enqueue(kind, concurrency_key=kind, concurrency_limit=2)
+    b = _enqueue(kind, concurrency_key=kind, concurrency_limit=2)
+    c = _enqueue(kind, concurrency_key=kind, concurrency_limit=2)
+
+    with SessionLocal() as holder, SessionLocal() as db:
+        # Another worker is mid-claim on the first row: it is skipped, not waited on.
+        holder.execute(select(Job).where(Job.id == a).with_for_update())
+        claimed = jobs.claim(db, "w1", [kind])
+        assert claimed is not None and claimed.id == b
+        holder.rollback()
+
+        assert jobs.claim(db, "w2", [kind]).id == a
+        # Two of the key's two slots are leased; the third job waits.
+        assert jobs.claim(db, "w3", [kind]) is None
+        assert _job(c).status == "queued"
+
+        assert jobs.heartbeat(db, "w1", [b, a]) == [b]
+
+
+def test_expired_lease_is_taken_over(kind):
+    job_id = _enqueue(kind)
+    with SessionLocal() as db:
+        assert jobs.claim(db, "gone", [kind]).id == job_id
+        assert jobs.claim(db, "other", [kind]) is None
+        db.execute(
+            update(Job).where(Job.id == job_id)
+            .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        db.commit()
+        taken = jobs.claim(db, "other", [kind])
+        assert (taken.id, taken.lease_owner, taken.attempts) == (job_id, "other", 2)
+        # The old owner's late heartbeat and outcome are ignored.
+        assert jobs.heartbeat(db, "gone", [job_id]) == []
+    jobs._finish(job_id, "gone", None)
+    assert _job(job_id).status == "running"
+
+
+def _expire_lease(job_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(Job).where(Job.id == job_id)
+            .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        db.commit()
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_job(kind):
+    job_id = _enqueue(kind, max_attempts=2)
+    with SessionLocal() as db:
+        assert jobs.claim(db, "crashed-1", [kind]).id == job_id
+        _expire_lease(job_id)
+        assert jobs.claim(db, "crashed-2", [kind]).id == job_id
+        _expire_lease(job_id)
+        # Both attempts took their worker down: the job is not leased again.
+        assert jobs.claim(db, "next", [kind]) is None
+
+    job = _job(job_id)
+    assert (job.status, job.attempts, job.lease_owner) == ("failed", 2, None)
+    assert job.finished_at is not None
+    assert "Lease expired (held by crashed-2) after 2 attempt(s)" == job.last_error
+
+
+def test_claim_does_not_wait_on_a_busy_concurrency_key(kind):
+    busy = _enqueue(kind, concurrency_key=f"{kind}:x")
+    free = _enqueue(kind, concurrency_key=f"{kind}:y")
+
+    with SessionLocal() as holder, SessionLocal() as db:
+        # Another claimer is mid-decision on key x; this one moves on to y.
+        holder.execute(
+            text("SELECT pg_advisory_xact_lock(:ns, hashtext(:key))"),
+            {"ns": jobs._LOCK_NS, "key": f"{kind}:x"},
+        )
+        db.execute(text("SET lock_timeout = '5s'"))  # fail, don't hang, if claim waits
+        assert jobs.claim(db, "w1", [kind]).id == free
+        holder.rollback()
+        assert jobs.claim(db, "w2", [kind]).id == busy
+
+
+def test_run_stops_once_its_lease_is_lost(kind, monkeypatch):
+    monkeypatch.setattr(settings, "job_lease_seconds", 1)
+    job_id = _enqueue(kind)
+    seen: list[str] = []
+
+    def handler(db, payload):
+        # Another worker takes the job over while this run is still going.
+        db.execute(update(Job).where(Job.id == job_id).values(lease_owner="thief"))
+        db.commit()
+        db.execute(update(Job).where(Job.id == job_id).values(last_error="written by the old run"))
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                jobs.check_lease()
+            except jobs.LeaseLost:
+                seen.append("lost")
+                raise
+            time.sleep(0.05)
+        db.commit()
+
+    jobs.handler(kind)(handler)
+    worker = jobs.Worker(kinds=[kind])
+    beat = threading.Thread(target=worker._beat, daemon=True)
+    beat.start()
+    try:
+        assert worker.run_once()
+    finally:
+        worker._stop_beat.set()
+        beat.join(5)
+
+    assert seen == ["lost"]
+    job = _job(job_id)
+    # Nothing the old run did after losing the lease was kept, and it
+    # recorded no outcome over the new holder's.
+    assert (job.status, job.lease_owner, job.last_error) == ("running", "thief", None)
+
+
+def test_failures_retry_with_backoff_then_fail(kind):
+    def boom(db, payload):
+        raise RuntimeError("upstream down")
+
+    jobs.handler(kind)(boom)
+    job_id = _enqueue(kind, max_attempts=2)
+    worker = jobs.Worker(kinds=[kind])
+
+    assert worker.run_once()
+    job = _job(job_id)
+    assert (job.status, job.attempts, job.last_error) == ("queued", 1, "upstream down")
+    assert job.run_after > datetime.now(timezone.utc) + timedelta(seconds=settings.job_retry_seconds - 5)
+    assert not worker.run_once()  # not due yet
+
+    with SessionLocal() as db:
+        db.execute(update(Job).where(Job.id == job_id).values(run_after=datetime.now(timezone.utc)))
+        db.commit()
+    assert worker.run_once()
+    assert (_job(job_id).status, _job(job_id).attempts) == ("failed", 2)
+
+
+# ===========================================================================
+# Sync API → job worker
+# ===========================================================================
+def test_sync_start_only_enqueues_and_worker_runs_it(client, admin_headers):
+    total = 40
+    stub = StubJira("", total)
+    key = ("JQ" + uuid.uuid4().hex[:5]).upper()
+    stub.project_key = key
+    resp = client.post("/api/projects", headers=admin_headers, json={"key": key, "name": f"Queue {key}"})
+    assert resp.status_code == 201, resp.text
+    pid = resp.json()["id"]
+    with SessionLocal() as db:
+        conn = JiraConnection(
+            name=f"Stub {key}", base_url=stub.url, auth_mode="server",
+            api_token_enc=encrypt("stub-token"), verify_ssl=False,
+        )
+        db.add(conn)
+        db.flush()
+        db.add(ProjectSyncLink(project_id=pid, connection_id=conn.id, jira_project_key=key, sync_permissions=False))
+        db.commit()
+
+    resp = client.post(f"/api/sync/projects/{pid}/start", headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["link"]["status"] == "running"
+    assert client.post(f"/api/sync/projects/{pid}/start", headers=admin_headers).status_code == 409
+
+    with SessionLocal() as db:
+        job = db.scalars(select(Job).where(Job.dedupe_key == f"{SYNC_JOB}:{pid}")).one()
+        assert job.status == "queued"
+        link = db.scalars(select(ProjectSyncLink).where(ProjectSyncLink.project_id == pid)).one()
+        assert db.scalars(select(SyncRun).where(SyncRun.link_id == link.id)).first() is None
+
+    with stub:
+        worker = jobs.Worker(kinds=[SYNC_JOB])
+        for _ in range(20):
+            worker.run_once()
+            if _job(job.id).status == "done":
+                break
+        assert _job(job.id).status == "done"
+
+    with SessionLocal() as db:
+        link = db.scalars(select(ProjectSyncLink).where(ProjectSyncLink.project_id == pid)).one()
+        run = db.scalars(select(SyncRun).where(SyncRun.link_id == link.id)).one()
+        assert (link.status, run.status, run.created) == ("completed", "completed", total)
+        assert run.actor_id is not None
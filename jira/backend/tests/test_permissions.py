@@ -263,3 +263,124 @@ def test_global_browse_users_permission_via_group(client, admin_headers):
 
     # After revocation the member loses access again.
     assert client.get("/api/groups", headers=member["_headers"]).status_code == 403
+
+
+# ===========================================================================
+# 6. Materialized permissions: scheme grants, late-created groups, rebuild
+# ===========================================================================
+def _search_keys(client, headers, key):
+    resp = client.post("/api/search", headers=headers, json={"tql": f"project = {key}"})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_scheme_group_grant_applies_once_group_exists(client, admin_headers):
+    from app.core.database import SessionLocal
+    from app.models import PermissionGrant, PermissionScheme, Project
+    from app.services import permission_keys as P
+
+    project = create_project(client, admin_headers)
+    member = register_user(client, "scheme_member")
+    group_name = f"perm-grp-late-{RUN}"
+    with SessionLocal() as db:
+        scheme = PermissionScheme(name=f"Scheme {RUN} {project['key']}")
+        scheme.grants = [
+            PermissionGrant(permission=P.BROWSE_PROJECTS, holder_type=P.HOLDER_GROUP, holder_value=group_name)
+        ]
+        db.add(scheme)
+        db.flush()
+        db.get(Project, project["id"]).permission_scheme_id = scheme.id
+        db.commit()
+
+    insights = f"/api/analytics/projects/{project['key']}"
+    assert client.get(insights, headers=member["_headers"]).status_code == 403
+
+    # The grant names a group that does not exist yet; creating it and adding
+    # the member must be enough.
+    resp = client.post("/api/groups", headers=admin_headers, json={"name": group_name})
+    assert resp.status_code == 201, resp.text
+    assert client.post(
+        f"/api/groups/{resp.json()['id']}/members", headers=admin_headers, json={"user_id": member["id"]}
+    ).status_code == 200
+    assert client.get(insights, headers=member["_headers"]).status_code == 200
+    assert _search_keys(client, member["_headers"], project["key"])["total"] == 0
+
+
+def test_visible_project_ids_is_constant_queries(client, admin_headers, capture_sql):
+    from app.core.database import SessionLocal
+    from app.models import User
+    from app.services.permissions import visible_project_ids
+
+    for _ in range(3):
+        create_project(client, admin_headers)
+    member = register_user(client, "counted")
+    with SessionLocal() as db:
+        user = db.get(User, member["id"])
+        with capture_sql() as statements:
+            visible_project_ids(db, user)
+    # Site-admin check (groups + global grants) plus one visibility lookup.
+    assert len(statements) <= 3
+
+
+def test_incremental_index_matches_full_rebuild(client, admin_headers):
+    from sqlalchemy import select
+
+    from app.core.database import engine
+    from app.models import EffectiveProjectPermission as EPP
+    from app.services.permission_index import rebuild
+
+    cols = (EPP.project_id, EPP.permission, EPP.holder_type, EPP.holder_id)
+    with engine.connect() as conn:
+        before = set(conn.execute(select(*cols)).all())
+        rebuild(conn)
+        after = set(conn.execute(select(*cols)).all())
+        conn.rollback()
+    assert before == after
+
+
+def test_group_changes_rebuild_only_the_projects_that_name_it(client, admin_headers, capture_sql):
+    from app.core.database import SessionLocal
+    from app.models import PermissionGrant, PermissionScheme, Project
+    from app.services import permission_keys as P
+
+    project = create_project(client, admin_headers)
+    member = register_user(client, "renamed_member")
+    group_name = f"perm-grp-ren-{RUN}"
+    with SessionLocal() as db:
+        scheme = PermissionScheme(name=f"Scheme ren {RUN} {project['key']}")
+        scheme.grants = [
+            PermissionGrant(permission=P.BROWSE_PROJECTS, holder_type=P.HOLDER_GROUP, holder_value=group_name)
+        ]
+        db.add(scheme)
+        db.flush()
+        db.get(Project, project["id"]).permission_scheme_id = scheme.id
+        db.commit()
+    gid = client.post("/api/groups", headers=admin_headers, json={"name": group_name}).json()["id"]
+    client.post(f"/api/groups/{gid}/members", headers=admin_headers, json={"user_id": member["id"]})
+    insights = f"/api/analytics/projects/{project['key']}"
+    assert client.get(insights, headers=member["_headers"]).status_code == 200
+
+    with capture_sql() as statements:
+        resp = client.patch(f"/api/groups/{gid}", headers=admin_headers, json={"name": f"{group_name}-x"})
+        assert resp.status_code == 200, resp.text
+        client.post("/api/groups", headers=admin_headers, json={"name": f"perm-grp-unused-{RUN}"})
+    # Per-project rebuilds only: never the exclusive full-rebuild lock.
+    assert not [s for s in statements if "pg_advisory_xact_lock(" in s and ", 0)" in s]
+    assert client.get(insights, headers=member["_headers"]).status_code == 403
+
+    client.patch(f"/api/groups/{gid}", headers=admin_headers, json={"name": group_name})
+    assert client.get(insights, headers=member["_headers"]).status_code == 200
+
+
+def test_full_rebuild_never_upgrades_a_shared_lock(client, admin_headers):
+    from app.core.database import engine
+    from app.services.permission_index import rebuild
+
+    project = create_project(client, admin_headers)
+    with engine.connect() as conn:
+        rebuild(conn, [project["id"]])
+        with pytest.raises(RuntimeError):
+            rebuild(conn)
+        conn.rollback()
+        rebuild(conn)  # a fresh transaction may take the exclusive lock
+        conn.rollback()
@@ -0,0 +1,183 @@
+"""DB-backed tests for the async read path and per-request statement budget.
+
+Covers the hot read endpoints running on the async engine without the
+threadpool, search and issue-list statement counts staying flat as results
+grow, and the request-metrics middleware's headers (off unless enabled),
+budget warnings and admin report, through the real API and PostgreSQL.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import uuid
+
+import anyio.to_thread
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.database import async_engine
+
+RUN = uuid.uuid4().hex[:5].upper()
+
+
+# ---------------------------------------------------------------------------
+# Fixtures & helpers
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def client():
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def admin_headers(client) -> dict[str, str]:
+    resp = client.post(
+        "/api/auth/login",
+        data={"username": settings.bootstrap_admin_email, "password": settings.bootstrap_admin_password},
+    )
+    assert resp.status_code == 200, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.fixture
+def timing_headers(monkeypatch):
+    monkeypatch.setattr(settings, "request_timing_headers", True)
+
+
+@pytest.fixture(scope="module")
+def project(client, admin_headers) -> dict:
+    key = f"RM{RUN}"
+    resp = client.post("/api/projects", headers=admin_headers, json={"key": key, "name": f"Metrics {key}"})
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def _add_issues(client, admin_headers, project: dict, count: int, offset: int) -> None:
+    types = client.get("/api/meta/issue-types", headers=admin_headers).json()
+    priorities = client.get("/api/meta/priorities", headers=admin_headers).json()
+    for i in range(offset, offset + count):
+        name = f"rm{RUN.lower()}{i}"
+        user = client.post(
+            "/api/users", headers=admin_headers,
+            json={"username": name, "email": f"{name}@example.com", "display_name": name, "password": "pw-123456"},
+        )
+        assert user.status_code == 201, user.text
+        resp = client.post("/api/issues", headers=admin_headers, json={
+            "project_id": project["id"],
+            "type_id": types[i % len(types)]["id"],
+            "priority_id": priorities[i % len(priorities)]["id"],
+            "assignee_id": user.json()["id"],
+            "summary": f"Metrics {i}",
+            "label_names": [f"rm{i}"],
+        })
+        assert resp.status_code == 201, resp.text
+
+
+# ===========================================================================
+# Async read path
+# ===========================================================================
+def test_hot_reads_run_on_the_async_engine(client, admin_headers, project, capture_sql):
+    board = client.get("/api/agile/boards", headers=admin_headers, params={"project_id": project["id"]}).json()[0]
+    urls = [
+        f"/api/search/search?tql=project = {project['key']}",
+        f"/api/issues?project={project['key']}",
+        f"/api/agile/boards/{board['id']}/board",
+        f"/api/agile/boards/{board['id']}/backlog",
+    ]
+    for url in urls:
+        with capture_sql() as statements:
+            client.get(url, headers=admin_headers).raise_for_status()
+        assert statements.by_engine["sync"] == 0 and statements.by_engine["async"] > 0, (url, statements.by_engine)
+
+    # The overviews are CPU-bound aggregation and stay in the threadpool.
+    for url in ("/api/analytics/overview", "/api/analytics/my"):
+        with capture_sql() as statements:
+            client.get(url, headers=admin_headers).raise_for_status()
+        assert statements.by_engine["async"] == 0 and statements.by_engine["sync"] > 0, (url, statements.by_engine)
+
+
+def test_search_is_served_while_the_threadpool_is_exhausted(client, admin_headers, project):
+    from app.main import app
+
+    url = f"/api/search/search?tql=project = {project['key']}"
+
+    async def scenario():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        tokens = limiter.total_tokens
+        limiter.total_tokens = 1
+        release = threading.Event()
+        blocker = asyncio.create_task(anyio.to_thread.run_sync(release.wait))
+        await asyncio.sleep(0.05)
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+                responses = await asyncio.wait_for(
+                    asyncio.gather(*(c.get(url, headers=admin_headers) for _ in range(8))), timeout=30,
+                )
+        finally:
+            release.set()
+            await blocker
+            limiter.total_tokens = tokens
+            # Pooled async connections are bound to this loop.
+            await async_engine.dispose()
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200] * 8
+
+
+def test_list_statement_counts_do_not_grow_with_results(client, admin_headers, project, timing_headers):
+    urls = [f"/api/search/search?tql=project = {project['key']}", f"/api/issues?project={project['key']}"]
+
+    def statements():
+        return [int(client.get(u, headers=admin_headers).headers["x-db-statements"]) for u in urls]
+
+    _add_issues(client, admin_headers, project, 2, 0)
+    few = statements()
+    _add_issues(client, admin_headers, project, 6, 2)
+    many = statements()
+    assert client.get(urls[0], headers=admin_headers).json()["total"] == 8
+    assert many == few
+
+
+# ===========================================================================
+# Request metrics
+# ===========================================================================
+def test_timing_headers_are_off_by_default(client, admin_headers, project):
+    resp = client.get(f"/api/issues?project={project['key']}", headers=admin_headers)
+    assert resp.status_code == 200
+    assert "x-db-statements" not in resp.headers and "server-timing" not in resp.headers
+
+
+def test_request_over_budget_is_logged_and_reported(client, admin_headers, project, monkeypatch, timing_headers):
+    assert client.delete("/api/admin/request-metrics", headers=admin_headers).status_code == 200
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("trackly.requests")
+    logger.addHandler(handler)
+    try:
+        monkeypatch.setattr(settings, "request_statement_budget", 1000)
+        ok = client.get(f"/api/issues?project={project['key']}", headers=admin_headers)
+        monkeypatch.setattr(settings, "request_statement_budget", 1)
+        over = client.get(f"/api/issues?project={project['key']}", headers=admin_headers)
+    finally:
+        logger.removeHandler(handler)
+
+    for resp in (ok, over):
+        assert resp.status_code == 200
+        assert int(resp.headers["x-db-statements"]) > 1
+        assert "db;dur=" in resp.headers["server-timing"]
+    assert [r.getMessage().split()[0:2] for r in records] == [["GET", "/api/issues"]]
+
+    monkeypatch.setattr(settings, "request_statement_budget", 1000)
+    report = client.get("/api/admin/request-metrics", headers=admin_headers).json()
+    route = report["routes"]["GET /api/issues"]
+    assert (route["requests"], route["over_budget"]) == (2, 1)
+    assert route["max_statements"] == int(over.headers["x-db-statements"])
+    assert set(report["pools"]) == {"sync", "async"}
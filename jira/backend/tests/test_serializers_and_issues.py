@@ -218,3 +218,43 @@ def test_allocate_key_is_sequential_and_unique(client, admin_headers):
     # A freshly created project starts numbering at 1 and increments by 1.
     assert keys == [f"{pkey}-1", f"{pkey}-2", f"{pkey}-3", f"{pkey}-4"]
     assert len(set(keys)) == len(keys)  # unique
+
+
+# ===========================================================================
+# Board / backlog: list items are batch-loaded, query count is flat
+# ===========================================================================
+def test_board_and_backlog_queries_do_not_grow_with_cards(client, admin_headers, capture_sql):
+    project = _create_project(client, admin_headers)
+    pid = project["id"]
+    board_id = client.get(
+        "/api/agile/boards", headers=admin_headers, params={"project_id": pid}
+    ).json()[0]["id"]
+    sprint = client.post(
+        f"/api/agile/boards/{board_id}/sprints", headers=admin_headers, json={"name": f"Cards {RUN}"}
+    ).json()
+    in_sprint = _create_issue(client, admin_headers, pid, "In sprint", label_names=["gamma"])
+    client.put(f"/api/issues/{in_sprint['key']}/rank", headers=admin_headers, json={"sprint_id": sprint["id"]})
+    _create_issue(client, admin_headers, pid, "Backlog 0", label_names=["alpha", "beta"])
+
+    def views():
+        board = client.get(f"/api/agile/boards/{board_id}/board", headers=admin_headers)
+        backlog = client.get(f"/api/agile/boards/{board_id}/backlog", headers=admin_headers)
+        assert board.status_code == 200 and backlog.status_code == 200
+        return backlog.json()
+
+    # Board and backlog run on the async engine; capture_sql counts both.
+    with capture_sql() as statements:
+        backlog = views()
+    few = len(statements)
+    assert [i["key"] for i in backlog["sprint_issues"][str(sprint["id"])]] == [in_sprint["key"]]
+    assert backlog["sprint_issues"][str(sprint["id"])][0]["labels"] == ["gamma"]
+    assert sorted(backlog["backlog"][0]["labels"]) == ["alpha", "beta"]
+    assert backlog["backlog"][0]["type"]["name"] == "Story"
+
+    for i in range(1, 8):
+        _create_issue(client, admin_headers, pid, f"Backlog {i}", label_names=[f"l{i}"])
+    with capture_sql() as statements:
+        backlog = views()
+    many = len(statements)
+    assert len(backlog["backlog"]) == 8
+    assert many == few
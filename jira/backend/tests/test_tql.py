@@ -15,6 +15,7 @@ from app.services.tql import (
     Sort,
     TQLError,
     build_query,
+    compile_plan,
     tokenize,
     Parser,
 )
@@ -227,3 +228,56 @@ def test_build_query_unknown_sort_field_raises():
     # the database; the unknown-sort-field check then fires with db=None.
     with pytest.raises(TQLError):
         build_query(None, "ORDER BY bogusfield")
+
+
+# ===========================================================================
+# Plan cache
+# ===========================================================================
+def test_compile_plan_reuses_plan_across_whitespace():
+    a = compile_plan("project = ENG   AND status = Done")
+    b = compile_plan("  project = ENG AND status = Done ")
+    assert a is b
+
+
+def test_compile_plan_keeps_whitespace_inside_quotes():
+    a = compile_plan('summary ~ "two  spaces"')
+    b = compile_plan('summary ~ "two spaces"')
+    assert a is not b
+    assert a.node.value == "two  spaces"
+
+
+def test_compile_plan_collects_names_per_kind():
+    plan = compile_plan(
+        "project IN (ENG, OPS) AND assignee IN (alice, currentUser()) "
+        "AND reporter = bob AND issuetype = Bug AND summary ~ login"
+    )
+    assert plan.names == {
+        "project": frozenset({"ENG", "OPS"}),
+        "user": frozenset({"alice", "bob"}),
+        "type": frozenset({"Bug"}),
+    }
+
+
+def test_compile_plan_skips_empty_user_values():
+    assert compile_plan("assignee = empty").names == {}
+
+
+# ===========================================================================
+# Search cursors
+# ===========================================================================
+def test_cursor_round_trips_typed_sort_values():
+    from datetime import date, datetime, timezone
+
+    from app.services.pagination import decode_cursor, encode_cursor
+
+    values = [datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), date(2024, 6, 1), None, 2.5, "ENG-7", 42]
+    token = encode_cursor(values, "sig")
+    assert decode_cursor(token, "sig", len(values)) == values
+
+
+def test_cursor_rejects_other_query_signature():
+    from app.services.pagination import CursorError, encode_cursor, decode_cursor
+
+    token = encode_cursor([1], "one")
+    with pytest.raises(CursorError):
+        decode_cursor(token, "two", 1)
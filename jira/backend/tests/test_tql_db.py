@@ -202,6 +202,214 @@ def test_validate_rejects_invalid_query(client, admin_headers):
     assert resp.json()["error"]
 
 
+# ===========================================================================
+# Plan + reference-data caching
+# ===========================================================================
+@pytest.fixture
+def db_session():
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_repeat_search_compiles_without_queries(db_session, seeded, admin_me, capture_sql):
+    from app.services.tql import build_query
+
+    tql = (
+        f'project = {seeded["key"]} AND status IN ("In Progress", Done) AND type = Bug '
+        f"AND priority = High AND assignee = {admin_me['username']} AND sprint != active "
+        "AND statusCategory != done"
+    )
+    build_query(db_session, tql, admin_me["id"])
+    with capture_sql() as statements:
+        build_query(db_session, tql, admin_me["id"])
+    assert statements == []
+
+
+def test_reference_cache_sees_new_project(client, admin_headers, db_session, seeded):
+    from app.services.tql import build_query
+
+    build_query(db_session, f"project = {seeded['key']}")  # warm the project cache
+    key = ("R" + uuid.uuid4().hex[:4]).upper()
+    resp = client.post(
+        "/api/projects", headers=admin_headers, json={"key": key, "name": f"Ref {key}"}
+    )
+    assert resp.status_code in (200, 201), resp.text
+    res = _search(client, admin_headers, f"project = {key}")
+    assert res["total"] == 0
+    where, _ = build_query(db_session, f"project = {key}")
+    assert resp.json()["id"] in where.right.value
+
+
+# ===========================================================================
+# Full-text search (PostgreSQL search_vector; ILIKE elsewhere)
+# ===========================================================================
+WORD = f"zephyr{RUN}"
+
+
+@pytest.fixture(scope="module")
+def text_seeded(client, admin_headers):
+    from app.core.database import engine
+    from app.services.text_search import capabilities
+
+    if not capabilities(engine)[0]:
+        pytest.skip("full-text search index not available on this database")
+    key = ("X" + uuid.uuid4().hex[:4]).upper()
+    pid = client.post(
+        "/api/projects", headers=admin_headers, json={"key": key, "name": f"FTS {key}"}
+    ).json()["id"]
+    types, statuses, priorities = _meta(client, admin_headers)
+
+    def mk(summary, description=None):
+        body = {"project_id": pid, "type_id": types["Task"], "summary": summary}
+        if description:
+            body["description"] = description
+        resp = client.post("/api/issues", headers=admin_headers, json=body)
+        assert resp.status_code == 201, resp.text
+        return resp.json()["key"]
+
+    in_summary = mk(f"Rebuild the {WORD} cache")
+    in_description = mk("Unrelated title", f"The body mentions {WORD} once.")
+    in_comment = mk("Plain title")
+    resp = client.post(
+        f"/api/issues/{in_comment}/comments", headers=admin_headers,
+        json={"body": f"Saw {WORD} in the logs"},
+    )
+    assert resp.status_code == 201, resp.text
+    return {
+        "key": key, "summary": in_summary, "description": in_description,
+        "comment": in_comment, "comment_id": resp.json()["id"],
+    }
+
+
+def test_text_search_ranks_summary_over_description_over_comment(client, admin_headers, text_seeded):
+    res = _search(client, admin_headers, f"project = {text_seeded['key']} AND text ~ {WORD}")
+    assert [i["key"] for i in res["items"]] == [
+        text_seeded["summary"], text_seeded["description"], text_seeded["comment"],
+    ]
+
+
+def test_text_search_phrase_is_stemmed_and_ordered(client, admin_headers, text_seeded):
+    hit = _search(client, admin_headers, f'project = {text_seeded["key"]} AND text ~ "{WORD} caches"')
+    assert _keys(hit) == {text_seeded["summary"]}
+    miss = _search(client, admin_headers, f'project = {text_seeded["key"]} AND text ~ "caches {WORD}"')
+    assert miss["total"] == 0
+
+
+def test_summary_search_ignores_description_and_comments(client, admin_headers, text_seeded):
+    res = _search(client, admin_headers, f"project = {text_seeded['key']} AND summary ~ {WORD}")
+    assert _keys(res) == {text_seeded["summary"]}
+
+
+def test_text_search_tracks_comment_deletes(client, admin_headers, text_seeded):
+    resp = client.delete(
+        f"/api/issues/{text_seeded['comment']}/comments/{text_seeded['comment_id']}",
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200, resp.text
+    res = _search(client, admin_headers, f"project = {text_seeded['key']} AND text ~ {WORD}")
+    assert _keys(res) == {text_seeded["summary"], text_seeded["description"]}
+
+
+def test_text_search_tracks_multi_row_comment_writes(client, admin_headers, text_seeded):
+    from sqlalchemy import text
+
+    from app.core.database import engine
+
+    word = f"quokka{RUN}"
+    keys = [text_seeded["summary"], text_seeded["description"]]
+    tql = f"project = {text_seeded['key']} AND text ~ {word}"
+    with engine.begin() as conn:
+        ids = dict(conn.execute(text("SELECT key, id FROM issues WHERE key = ANY(:k)"), {"k": keys}).all())
+        # Statement-level: one recompute per affected issue, not per row.
+        assert conn.execute(text(
+            "SELECT bool_and(tgtype & 1 = 0) FROM pg_trigger "
+            "WHERE tgrelid = 'comments'::regclass AND tgname LIKE 'trackly_comments_search%'"
+        )).scalar() is True
+        cids = conn.execute(text(
+            "INSERT INTO comments (issue_id, body, created_at, updated_at) VALUES "
+            "(:a, :w, now(), now()), (:a, 'filler', now(), now()), (:b, :w, now(), now()) RETURNING id"
+        ), {"a": ids[keys[0]], "b": ids[keys[1]], "w": f"a {word} sighting"}).scalars().all()
+    assert _keys(_search(client, admin_headers, tql)) == set(keys)
+
+    with engine.begin() as conn:  # edit one away, move the other across
+        conn.execute(text("UPDATE comments SET body = 'nothing here' WHERE id = :c"), {"c": cids[0]})
+        conn.execute(text("UPDATE comments SET issue_id = :a WHERE id = :c"), {"a": ids[keys[0]], "c": cids[2]})
+    assert _keys(_search(client, admin_headers, tql)) == {keys[0]}
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM comments WHERE id = ANY(:c)"), {"c": cids})
+    assert _search(client, admin_headers, tql)["total"] == 0
+
+
+# ===========================================================================
+# Keyset pagination + bounded counts
+# ===========================================================================
+def _page(client, headers, tql, page_size, cursor=None):
+    resp = client.post(
+        "/api/search", headers=headers,
+        json={"tql": tql, "page": 1, "page_size": page_size, "cursor": cursor},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+@pytest.mark.parametrize("order", ["", " ORDER BY due ASC", " ORDER BY due DESC, key ASC", " ORDER BY priority DESC"])
+def test_cursor_pages_match_offset_order(client, admin_headers, seeded, order):
+    tql = f"project = {seeded['key']}{order}"
+    expected = [i["key"] for i in _search(client, admin_headers, tql)["items"]]
+    seen, cursor = [], None
+    for _ in range(5):
+        res = _page(client, admin_headers, tql, 1, cursor)
+        seen += [i["key"] for i in res["items"]]
+        cursor = res["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+    assert len(seen) == 3
+
+
+def test_cursor_from_another_query_is_400(client, admin_headers, seeded):
+    cursor = _page(client, admin_headers, f"project = {seeded['key']}", 1)["next_cursor"]
+    resp = client.post(
+        "/api/search", headers=admin_headers,
+        json={"tql": f"project = {seeded['key']} AND type = Bug", "cursor": cursor},
+    )
+    assert resp.status_code == 400
+    resp = client.post("/api/search", headers=admin_headers, json={"tql": "", "cursor": "garbage!"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("values", [["soon", 1], [{"d": "2024-01-01"}, 1], [None, "1"], [None, [1]], [None, True]])
+def test_cursor_with_wrongly_typed_values_is_400(client, admin_headers, seeded, values):
+    from app.services.pagination import encode_cursor, query_signature
+
+    tql = f"project = {seeded['key']}"
+    # Without ORDER BY the keys are (updated_at, id).
+    cursor = encode_cursor(values, query_signature(tql))
+    resp = client.post("/api/search", headers=admin_headers, json={"tql": tql, "cursor": cursor})
+    assert resp.status_code == 400, resp.text
+
+
+def test_total_is_capped_and_exact_count_on_request(client, admin_headers, seeded, monkeypatch):
+    from app.api.routes import search
+
+    monkeypatch.setattr(search, "_COUNT_CAP", 2)
+    res = _search(client, admin_headers, f"project = {seeded['key']}")
+    assert res["total"] == 2
+    assert res["total_exact"] is False
+    assert len(res["items"]) == 3
+    resp = client.get(
+        "/api/search/count", headers=admin_headers, params={"tql": f"project = {seeded['key']}"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 3
+
+
 def test_search_unknown_field_is_400(client, admin_headers):
     resp = client.post(
         "/api/search", headers=admin_headers,
@@ -1,9 +1,19 @@
 """Pure unit tests (no database required)."""
 from __future__ import annotations
 
+import pytest
+
 from app.core.crypto import decrypt, encrypt, is_encrypted
 from app.services import permission_keys as P
-from app.utils.ranking import initial_rank, rank_between
+from app.services.attachments import RangeNotSatisfiable, content_disposition, parse_range
+from app.utils.ranking import (
+    bucket_prefix,
+    initial_rank,
+    rank_between,
+    ranks_after,
+    ranks_between,
+    spread_ranks,
+)
 from app.utils.timetracking import format_duration, parse_duration
 
 
@@ -27,6 +37,38 @@ def test_rank_between_many_inserts_stay_ordered():
         prev = mid
 
 
+def test_ranks_after_appends_without_growing():
+    prev = initial_rank()
+    for _ in range(50):
+        batch = ranks_after(prev, 100)
+        assert [prev, *batch] == sorted({prev, *batch})
+        prev = batch[-1]
+    assert len(prev) == 6
+
+
+def test_ranks_between_spreads_a_multi_card_drop():
+    for low, high in [("V", "W"), ("V", "V1"), (None, "0001"), ("zzz", None), ("Vx", "Vx01")]:
+        batch = ranks_between(low, high, 200)
+        assert batch == sorted(set(batch))
+        assert (low or "") < batch[0] and (high is None or batch[-1] < high)
+        # 200 cards cost two extra characters, not one per few cards.
+        assert max(map(len, batch)) <= max(len(low or ""), len(high or "")) + 3
+        # Every gap (and both ends) can still take a single-card move.
+        for a, b in zip([low, *batch], [*batch, high]):
+            assert (a or "") < rank_between(a, b) and (b is None or rank_between(a, b) < b)
+
+
+def test_bucket_prefix_sorts_outside_existing_ranks():
+    for lowest, highest in [("V", "x"), ("0V", "z"), ("0", "zzzzU")]:
+        prefix, ascending = bucket_prefix(lowest, highest)
+        fresh = spread_ranks(1000, prefix)
+        assert fresh == sorted(set(fresh))
+        if ascending:
+            assert fresh[-1] < lowest
+        else:
+            assert fresh[0] > highest
+
+
 def test_parse_duration():
     assert parse_duration("2h 30m") == 2 * 3600 + 30 * 60
     assert parse_duration("1d") == 8 * 3600
@@ -62,3 +104,23 @@ def test_permission_keys_are_consistent():
     # Jira holder mapping translates onto known holder types.
     holder_type, _ = P.JIRA_HOLDER_MAP["projectRole"]
     assert holder_type == P.HOLDER_PROJECT_ROLE
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 10)
+    assert parse_range("bytes=90-200", 100) == (90, 100)
+    assert parse_range("bytes=95-", 100) == (95, 100)
+    assert parse_range("bytes=-10", 100) == (90, 100)
+    assert parse_range("bytes=-500", 100) == (0, 100)
+    # Malformed, other units and multi-range requests get the whole file.
+    for header in ("bytes=9-1", "bytes=a-b", "items=0-1", "bytes=0-1,5-6", "bytes=-"):
+        assert parse_range(header, 100) is None
+    for header, size in (("bytes=100-", 100), ("bytes=-0", 100), ("bytes=0-", 0)):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, size)
+
+
+def test_content_disposition_encodes_non_ascii_names():
+    assert content_disposition("report.pdf") == 'attachment; filename="report.pdf"'
+    assert content_disposition("résumé.pdf") == "attachment; filename*=utf-8''r%C3%A9sum%C3%A9.pdf"
@@ -18,6 +18,7 @@
 {{- end -}}
 
 {{- define "trackly.backend.fullname" -}}{{ include "trackly.fullname" . }}-backend{{- end -}}
+{{- define "trackly.worker.fullname" -}}{{ include "trackly.fullname" . }}-worker{{- end -}}
 {{- define "trackly.frontend.fullname" -}}{{ include "trackly.fullname" . }}-frontend{{- end -}}
 {{- define "trackly.postgres.fullname" -}}{{ include "trackly.fullname" . }}-postgres{{- end -}}
 
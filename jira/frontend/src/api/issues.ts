@@ -51,6 +51,10 @@ export async function rankIssue(key: string, payload: RankPayload): Promise<void
   await api.put(`/issues/${key}/rank`, payload);
 }
 
+export async function rankIssues(issueIds: string[], payload: RankPayload): Promise<void> {
+  await api.put(`/issues/rank`, { ...payload, issue_ids: issueIds });
+}
+
 // Comments
 export async function listComments(key: string): Promise<Comment[]> {
   const res = await api.get<Comment[]>(`/issues/${key}/comments`);
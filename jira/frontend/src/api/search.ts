@@ -1,11 +1,21 @@
 import { api } from './client';
-import { Page, IssueListItem, SavedFilter, TqlSchema, TqlValue } from '../types';
-
-export async function runSearch(tql: string, page = 1, page_size = 50): Promise<Page<IssueListItem>> {
-  const res = await api.post<Page<IssueListItem>>('/search', { tql, page, page_size });
+import { CursorPage, IssueListItem, SavedFilter, TqlSchema, TqlValue } from '../types';
+
+export async function runSearch(
+  tql: string,
+  page = 1,
+  page_size = 50,
+  cursor: string | null = null,
+): Promise<CursorPage<IssueListItem>> {
+  const res = await api.post<CursorPage<IssueListItem>>('/search', { tql, page, page_size, cursor });
   return res.data;
 }
 
+export async function countSearch(tql: string): Promise<number> {
+  const res = await api.get<{ total: number }>('/search/count', { params: { tql } });
+  return res.data.total;
+}
+
 // --- TQL autocomplete / help ------------------------------------------------
 
 export async function getTqlSchema(): Promise<TqlSchema> {
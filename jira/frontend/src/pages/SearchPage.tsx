@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react';
 import { useSearchParams } from 'react-router-dom';
-import { IssueListItem, Page, SavedFilter, TqlSchema } from '../types';
-import { runSearch, listFilters, createFilter, deleteFilter, getTqlSchema } from '../api/search';
+import { CursorPage, IssueListItem, SavedFilter, TqlSchema } from '../types';
+import { runSearch, countSearch, listFilters, createFilter, deleteFilter, getTqlSchema } from '../api/search';
 import { IssueTypeIcon } from '../components/IssueTypeIcon';
 import { PriorityIcon } from '../components/PriorityIcon';
 import { StatusBadge } from '../components/StatusBadge';
@@ -20,13 +20,16 @@ export function SearchPage() {
   const [searchParams] = useSearchParams();
   const initial = searchParams.get('tql') || searchParams.get('q') || '';
   const [tql, setTql] = useState(initial);
-  const [results, setResults] = useState<Page<IssueListItem> | null>(null);
+  const [results, setResults] = useState<CursorPage<IssueListItem> | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [schema, setSchema] = useState<TqlSchema | null>(null);
   const [filters, setFilters] = useState<SavedFilter[]>([]);
   const [openKey, setOpenKey] = useState<string | null>(null);
   const [page, setPage] = useState(1);
+  // cursors[p - 1] fetches page p (keyset paging; page 1 needs none).
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [exactTotal, setExactTotal] = useState<number | null>(null);
   const [exporting, setExporting] = useState(false);
 
   function loadFilters() {
@@ -43,9 +46,11 @@ export function SearchPage() {
     setLoading(true);
     setError('');
     setPage(p);
+    if (p === 1) setExactTotal(null);
     try {
-      const res = await runSearch(tql, p, 50);
+      const res = await runSearch(tql, p, 50, p === 1 ? null : cursors[p - 1] ?? null);
       setResults(res);
+      setCursors((prev) => [...(p === 1 ? [null] : prev.slice(0, p)), res.next_cursor]);
     } catch (e) {
       setError(apiErrorMessage(e, 'Search failed'));
       setResults(null);
@@ -84,7 +89,17 @@ export function SearchPage() {
     }
   }
 
-  const totalPages = results ? Math.max(1, Math.ceil(results.total / results.page_size)) : 1;
+  async function countExact() {
+    try {
+      setExactTotal(await countSearch(tql));
+    } catch (e) {
+      setError(apiErrorMessage(e, 'Count failed'));
+    }
+  }
+
+  const total = exactTotal ?? results?.total ?? 0;
+  const totalKnown = exactTotal !== null || !!results?.total_exact;
+  const totalPages = results ? Math.max(1, Math.ceil(total / results.page_size)) : 1;
 
   return (
     <div className="page" style={{ maxWidth: '100%' }}>
@@ -123,6 +138,7 @@ export function SearchPage() {
               options={[
                 { label: 'CSV', format: 'csv' },
                 { label: 'JSON', format: 'json' },
+                { label: 'NDJSON', format: 'ndjson' },
                 { label: 'Excel', format: 'xlsx' },
               ]}
               onSelect={exportIssues}
@@ -200,15 +216,26 @@ export function SearchPage() {
               </tbody>
             </table>
             <div className="row-between" style={{ padding: '10px 14px' }}>
-              <span className="muted text-sm">{results.total} results</span>
+              <span className="muted text-sm">
+                {totalKnown ? (
+                  `${total.toLocaleString()} results`
+                ) : (
+                  <>
+                    {total.toLocaleString()}+ results{' '}
+                    <button className="btn btn-sm" onClick={countExact}>
+                      Count all
+                    </button>
+                  </>
+                )}
+              </span>
               <div className="row gap-8">
                 <button className="btn btn-sm" disabled={page <= 1} onClick={() => run(page - 1)}>
                   Prev
                 </button>
                 <span className="text-sm">
-                  {page} / {totalPages}
+                  {totalKnown ? `${page} / ${totalPages}` : page}
                 </span>
-                <button className="btn btn-sm" disabled={page >= totalPages} onClick={() => run(page + 1)}>
+                <button className="btn btn-sm" disabled={!results.next_cursor} onClick={() => run(page + 1)}>
                   Next
                 </button>
               </div>
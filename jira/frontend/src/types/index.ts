@@ -194,6 +194,14 @@ export interface Page<T> {
   page_size: number;
 }
 
+// Search results: continue with next_cursor; when total_exact is false,
+// total is a lower bound ("10,000+").
+export interface CursorPage<T> extends Page<T> {
+  next_cursor: string | null;
+  total_exact: boolean;
+  total_estimate: number | null;
+}
+
 export interface Board {
   id: string;
   project_id: string;
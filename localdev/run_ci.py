@@ -348,6 +348,16 @@ def main() -> int:
         _run("Smoke test (all tabs render)",
              [PY, "-m", "pytest", "localdev/test_smoke.py", "-q",
               f"--junitxml={os.path.join(OUT, 'junit.xml')}"], True),
+        _run("Unit tests (Prisma report cache)",
+             [PY, "-m", "pytest", "localdev/test_prisma_cache.py", "-q"], True),
+        _run("Unit tests (Jenkins status snapshot)",
+             [PY, "-m", "pytest", "localdev/test_jenkins_status.py", "-q"], True),
+        _run("Unit tests (People daily rollup)",
+             [PY, "-m", "pytest", "localdev/test_users_rollup.py", "-q"], True),
+        _run("Unit tests (inventory Merkle digests)",
+             [PY, "-m", "pytest", "localdev/test_merkle.py", "-q"], True),
+        _run("Unit tests (team scope index)",
+             [PY, "-m", "pytest", "localdev/test_team_scope.py", "-q"], True),
         _run("Performance (render timings)", [PY, "localdev/perf.py"], False),
     ]
     if not args.no_screens:
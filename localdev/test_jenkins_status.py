@@ -0,0 +1,178 @@
+"""Jenkins panel status: folder-scoped tree call and the shared snapshot.
+
+Imports the dashboard module against the local fake seam (same setup as
+``test_smoke.py``) and points it at a tiny in-process Jenkins stub that
+serves the ``CICD`` folder configured in ``JENKINS_PIPELINES``.
+
+Run:  pytest localdev/test_jenkins_status.py -q
+"""
+
+import collections
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+for _p in (_HERE, _ROOT):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+os.environ.setdefault("LOCALDEV_SECRETS", os.path.join(_HERE, "secrets.local.json"))
+os.environ.setdefault("CICD_REPO_BASE", os.path.join(_HERE, "clones"))
+os.environ.setdefault("DOCCHAT_OLLAMA_URL", "http://localhost:0")
+
+import cicd_dashboard as dash  # noqa: E402
+
+
+class _StubJenkins:
+    """Answers the panel's GETs; ``calls`` counts requests per path."""
+
+    def __init__(self) -> None:
+        self.calls: collections.Counter = collections.Counter()
+        self.latency = 0.0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # keep pytest output quiet
+                pass
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                stub.calls[path] += 1
+                time.sleep(stub.latency)
+                body = stub.answer(path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                raw = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("X-Jenkins", "2.440.1")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def answer(self, path: str):
+        if path == "/job/CICD/api/json":
+            return {"name": "CICD", "jobs": [
+                {"name": cfg["path"].split("/")[-1], "buildable": True, "color": "blue",
+                 "builds": [], "lastCompletedBuild": {"number": 7, "result": "SUCCESS"}}
+                for cfg in dash.JENKINS_PIPELINES.values()
+            ]}
+        if path == "/queue/api/json":
+            return {"items": [{"id": 1}]}
+        if path == "/updateCenter/site/default/api/json":
+            return {"data": {"core": {"version": "2.440.1"}}}
+        return None
+
+
+@pytest.fixture
+def jenkins(monkeypatch):
+    stub = _StubJenkins()
+    creds = {"host": stub.url, "public_name": "stub", "username": "", "token": ""}
+    monkeypatch.setattr(dash, "_jenkins_creds", lambda: dict(creds))
+    dash._jenkins_poller_state.clear()
+    yield stub
+    dash._jenkins_poller_state.clear()
+    stub.server.shutdown()
+
+
+def test_status_scope_is_the_common_folder():
+    assert dash._jenkins_status_scope(["CICD/Build", "CICD/Request_deploy"]) == (
+        "CICD", ["Build", "Request_deploy"])
+    assert dash._jenkins_status_scope(["A/B/x", "A/B/C/y"]) == ("A/B", ["x", "C/y"])
+    assert dash._jenkins_status_scope(["A/x", "B/y"]) == ("", ["A/x", "B/y"])
+    assert dash._jenkins_status_scope(["CICD/Build", "Other"]) == ("", ["CICD/Build", "Other"])
+
+
+def test_status_is_read_from_the_pipeline_folder(jenkins):
+    snap = dash._fetch_jenkins_status_raw(dash._jenkins_creds(), {})
+
+    assert snap["ok"], snap["status_msg"]
+    assert snap["status_msg"] == "connected · queue 1"
+    assert snap["version"]["running"] == "2.440.1"
+    assert all(p["exists"] and p["last_build"]["number"] == 7 for p in snap["pipelines"].values())
+    assert jenkins.calls["/job/CICD/api/json"] == 1
+    assert jenkins.calls["/api/json"] == 0
+
+
+def test_cold_start_fetches_once_for_concurrent_readers(jenkins):
+    jenkins.latency = 0.3
+    snaps: list[dict] = []
+    readers = [threading.Thread(target=lambda: snaps.append(dash._jenkins_status_shared()))
+               for _ in range(8)]
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+
+    assert len(snaps) == 8 and all(s is snaps[0] for s in snaps)
+    assert jenkins.calls["/job/CICD/api/json"] == 1
+
+
+def test_failed_fetch_keeps_the_snapshot_shape(jenkins, monkeypatch):
+    live = dash._fetch_jenkins_status_raw(dash._jenkins_creds(), {})
+
+    def boom(*_args):
+        raise ValueError("bad payload")
+
+    monkeypatch.setattr(dash, "_fetch_jenkins_status_raw", boom)
+    snap = dash._jenkins_status_shared(force=True)
+
+    assert not snap["ok"] and snap["status_msg"] == "ValueError: bad payload"
+    assert snap.keys() == live.keys()
+    assert snap["version"].keys() == live["version"].keys()
+    assert snap["version"]["compare"] == "unknown"
+
+
+def test_concurrent_readers_start_one_poller(jenkins, monkeypatch):
+    dash._jenkins_status_shared()  # warm snapshot; starts the real poller
+    state = dash._jenkins_poller_state()
+    state["thread"] = None
+    started: list[str] = []
+    release = threading.Event()
+
+    def loop(_state):
+        started.append(threading.current_thread().name)
+        release.wait(5)
+
+    monkeypatch.setattr(dash, "_jenkins_poller_loop", loop)
+    gate = threading.Barrier(8)
+
+    def read():
+        gate.wait()
+        dash._jenkins_status_shared()
+
+    readers = [threading.Thread(target=read) for _ in range(8)]
+    for t in readers:
+        t.start()
+    for t in readers:
+        t.join()
+    release.set()
+
+    assert started == ["jenkins-poller"]
+
+
+def test_idle_poller_parks_and_the_next_read_restarts_it(jenkins, monkeypatch):
+    monkeypatch.setattr(dash, "JENKINS_TTL", 0.05)
+    monkeypatch.setattr(dash, "JENKINS_POLL_IDLE", 0)
+    dash._jenkins_status_shared()
+    state = dash._jenkins_poller_state()
+    first = state["thread"]
+    first.join(5)
+
+    assert not first.is_alive() and state["thread"] is None
+    dash._jenkins_status_shared()
+    assert state["thread"] is not None and state["thread"] is not first
@@ -0,0 +1,97 @@
+"""Prisma scan-report disk cache: store / lookup / LRU eviction.
+
+Imports the dashboard module against the local fake seam (same setup as
+``test_smoke.py``) and drives the cache helpers directly with an in-memory
+``get_object``-shaped body, pointing ``PRISMA_SCAN_CACHE_DIR`` at a temp dir.
+
+Run:  pytest localdev/test_prisma_cache.py -q
+"""
+
+import gzip
+import io
+import os
+import sys
+import threading
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+for _p in (_HERE, _ROOT):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+os.environ.setdefault("LOCALDEV_SECRETS", os.path.join(_HERE, "secrets.local.json"))
+os.environ.setdefault("CICD_REPO_BASE", os.path.join(_HERE, "clones"))
+os.environ.setdefault("DOCCHAT_OLLAMA_URL", "http://localhost:0")
+
+import cicd_dashboard as dash  # noqa: E402
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dash, "PRISMA_SCAN_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _obj(data: bytes, etag: str = "e1") -> dict:
+    return {"Body": io.BytesIO(data), "ETag": f'"{etag}"'}
+
+
+def _read(path: str) -> bytes:
+    with gzip.open(path, "rb") as fh:
+        return fh.read()
+
+
+def test_store_then_lookup_round_trips(cache_dir):
+    entry = dash._prisma_cache_store("b", "app/1.0.json", _obj(b'{"ok": 1}'))
+    assert _read(entry["path"]) == b'{"ok": 1}'
+    assert entry["size"] == 9 and entry["etag"] == "e1"
+
+    hit = dash._prisma_cache_lookup("b", "app/1.0.json")
+    assert hit["path"] == entry["path"] and hit["sha256"] == entry["sha256"]
+    assert dash._prisma_cache_lookup("b", "app/2.0.json") is None
+
+
+def test_report_larger_than_the_limit_is_kept(cache_dir, monkeypatch):
+    old = dash._prisma_cache_store("b", "old.json", _obj(b"old report"))
+    monkeypatch.setattr(dash, "PRISMA_SCAN_CACHE_MAX_MB", 0)
+
+    entry = dash._prisma_cache_store("b", "big.json", _obj(b"big report"))
+
+    assert _read(entry["path"]) == b"big report"
+    assert not os.path.exists(old["path"])  # older blobs still make room
+    assert dash._prisma_cache_lookup("b", "big.json")["path"] == entry["path"]
+
+
+def test_eviction_skips_in_flight_downloads(cache_dir, monkeypatch):
+    blobs = cache_dir / "blobs"
+    blobs.mkdir()
+    part = blobs / "tmpwriter.part"
+    part.write_bytes(b"x" * 4096)
+    monkeypatch.setattr(dash, "PRISMA_SCAN_CACHE_MAX_MB", 0)
+
+    dash._prisma_cache_store("b", "k.json", _obj(b"report"))
+
+    assert part.exists()
+
+
+def test_concurrent_stores_of_one_key(cache_dir):
+    errors: list[BaseException] = []
+
+    def store(i: int) -> None:
+        try:
+            dash._prisma_cache_store("b", "same.json", _obj(f"report {i}".encode(), etag=str(i)))
+        except BaseException as exc:  # noqa: BLE001 - surfaced by the assert below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=store, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    hit = dash._prisma_cache_lookup("b", "same.json")
+    assert _read(hit["path"]) == f"report {hit['etag']}".encode()
+    assert not [n for n in os.listdir(cache_dir / "index") if n.endswith(".part")]
@@ -0,0 +1,182 @@
+"""Team → scope inverted index: build, lookup, and the empty-git memo.
+
+Imports the dashboard module against the local fake seam (same setup as
+``test_smoke.py``). ``_team_scope_index`` is driven with its inventory
+loaders monkeypatched, so no git clone or ES is needed.
+
+Run:  pytest localdev/test_team_scope.py -q
+"""
+
+import os
+import sys
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+for _p in (_HERE, _ROOT):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+os.environ.setdefault("LOCALDEV_SECRETS", os.path.join(_HERE, "secrets.local.json"))
+os.environ.setdefault("CICD_REPO_BASE", os.path.join(_HERE, "clones"))
+os.environ.setdefault("DOCCHAT_OLLAMA_URL", "http://localhost:0")
+
+import cicd_dashboard as dash  # noqa: E402
+
+_ROWS = [
+    {"application": "pay", "project": "p1", "company": "acme",
+     "teams": {"dev_team": "My Team", "qa_team": ["QA", "ops"]}},
+    {"application": "web", "project": "p1", "company": "acme",
+     "teams": {"dev_team": "my-team", "release_team": "Rel"}},
+    {"application": "core", "project": "p2", "company": "globex",
+     "teams": {"qa_team": "my_team", "owner": "my team"}},
+    {"application": "", "project": "p3", "company": "",
+     "teams": {"dev_team": ["", None], 7: "my team"}},
+]
+
+
+@pytest.fixture
+def index():
+    return dash._team_scope_index_build(_ROWS, "git")
+
+
+# ── Build ────────────────────────────────────────────────────────────────
+
+def test_build_inverts_rows_by_normalised_team_and_field(index):
+    assert index["source"] == "git"
+    assert index["rows"][0] == ("pay", "p1", "acme")
+    mine = index["by_team"]["my_team"]
+    assert set(mine) == {"dev_team", "qa_team", "owner"}
+    assert mine["dev_team"]["rows"] == (0, 1)
+    assert mine["dev_team"]["apps"] == {"pay", "web"}
+    assert mine["qa_team"]["companies"] == {"globex"}
+    assert index["by_team"]["ops"]["qa_team"]["rows"] == (0,)
+
+
+def test_build_skips_blank_teams_and_non_string_fields(index):
+    # Row 3 has only blank values and a non-string key: no fields at all.
+    assert index["row_teams"][3] == ()
+    assert "" not in index["by_team"]
+    assert index["row_teams"][0] == (
+        ("dev_team", frozenset({"my_team"})),
+        ("qa_team", frozenset({"qa", "ops"})),
+    )
+
+
+# ── Lookup ───────────────────────────────────────────────────────────────
+
+def test_lookup_any_team_field_by_default(index):
+    got = dash._team_scope_lookup(index, ["MY TEAM"])
+    # ``owner`` is not a *_team field, so only dev_team / qa_team rows match.
+    assert got == {"rows": [0, 1, 2], "apps": ["core", "pay", "web"],
+                   "projects": ["p1", "p2"], "companies": ["acme", "globex"]}
+    assert dash._team_scope_lookup(index, ["my team"], ["*"]) == got
+
+
+def test_lookup_restricted_to_fields_accepts_keyword_names(index):
+    got = dash._team_scope_lookup(index, ["my-team"], ["dev_team.keyword"])
+    assert got["apps"] == ["pay", "web"] and got["rows"] == [0, 1]
+    got = dash._team_scope_lookup(index, ["my_team"], ["owner"])
+    assert got["apps"] == ["core"]
+
+
+def test_lookup_unions_several_teams(index):
+    got = dash._team_scope_lookup(index, ["rel", "Ops"])
+    assert got["apps"] == ["pay", "web"] and got["companies"] == ["acme"]
+
+
+def test_lookup_unknown_or_blank_team_is_empty(index):
+    empty = {"rows": [], "apps": [], "projects": [], "companies": []}
+    assert dash._team_scope_lookup(index, ["nobody"]) == empty
+    assert dash._team_scope_lookup(index, ["", None]) == empty
+    assert dash._team_scope_lookup(index, ["my team"], ["release_team"]) == empty
+
+
+def test_lookup_matches_the_row_scan(index):
+    for teams, fields in ((["My Team"], []), (["qa", "rel"], ["qa_team", "release_team"]),
+                          (["my_team"], ["owner.keyword"])):
+        bare = [f.replace(".keyword", "") for f in fields]
+        assert (dash._team_scope_lookup(index, teams, fields)["apps"]
+                == dash._resolve_inventory_by_teams_git(bare, teams, "application", _ROWS))
+
+
+# ── Snapshot refresh and the empty-git memo ─────────────────────────────
+
+class _Inventory:
+    def __init__(self):
+        self.head = "abc"
+        self.git_rows: list[dict] = []
+        self.git_calls = 0
+        self.es_calls = 0
+
+    def git(self, head, fp):
+        self.git_calls += 1
+        return list(self.git_rows), []
+
+    def es(self, scope_json, direct_es=False):
+        self.es_calls += 1
+        return [_ROWS[2]]
+
+
+@pytest.fixture
+def inventory(monkeypatch):
+    inv = _Inventory()
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(dash, "_inventory_git_head", lambda w: (inv.head, "ok"))
+    monkeypatch.setattr(dash, "_vault_pw_fingerprint", lambda: "fp")
+    monkeypatch.setattr(dash, "_load_inventory_from_git", inv.git)
+    monkeypatch.setattr(dash, "_fetch_full_inventory", inv.es)
+    monkeypatch.setattr(dash, "_YAML_AVAILABLE", True)
+    monkeypatch.setattr(dash.time, "monotonic", lambda: clock["now"])
+    dash._team_scope_store.clear()
+    inv.clock = clock
+    yield inv
+    dash._team_scope_store.clear()
+
+
+def test_index_is_reused_until_the_snapshot_moves(inventory):
+    inventory.git_rows = _ROWS[:2]
+    first = dash._team_scope_index()
+    assert first["source"] == "git" and inventory.git_calls == 1
+    assert dash._team_scope_index() is first and inventory.git_calls == 1
+
+    inventory.head = "def"
+    assert dash._team_scope_index() is not first
+    assert inventory.git_calls == 2
+
+
+def test_empty_git_snapshot_falls_back_to_es_and_is_not_reparsed(inventory):
+    got = dash._team_scope_index()
+    assert got["source"] == "es" and (inventory.git_calls, inventory.es_calls) == (1, 1)
+    assert dash._team_scope_index() is got
+    assert inventory.git_calls == 1
+
+
+def test_empty_git_memo_expires(inventory):
+    assert dash._team_scope_index()["source"] == "es"
+    # Same HEAD now parses (clone / vault recovered) — picked up after the TTL.
+    inventory.git_rows = _ROWS[:1]
+    inventory.clock["now"] += dash.CACHE_TTL - 1
+    dash._team_scope_index()
+    assert inventory.git_calls == 1
+
+    inventory.clock["now"] += 1
+    assert dash._team_scope_index()["source"] == "git"
+    assert inventory.git_calls == 2
+    assert "git:abc:fp" not in dash._team_scope_store()["empty_git"]
+
+
+def test_empty_git_memo_is_bounded(inventory, monkeypatch):
+    monkeypatch.setattr(dash, "_TEAM_SCOPE_EMPTY_GIT_MAX", 3)
+    for i in range(5):
+        inventory.head = f"h{i}"
+        inventory.clock["now"] += 1
+        dash._team_scope_index()
+    assert list(dash._team_scope_store()["empty_git"]) == ["git:h2:fp", "git:h3:fp", "git:h4:fp"]
+
+    # Expired keys are dropped on the next insert, whatever the cap.
+    inventory.clock["now"] += dash.CACHE_TTL
+    inventory.head = "h5"
+    dash._team_scope_index()
+    assert list(dash._team_scope_store()["empty_git"]) == ["git:h5:fp"]
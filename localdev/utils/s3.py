@@ -1,32 +1,64 @@
 """Fake S3Client for local/CI testing.
 
-The dashboard uses S3 only for the Prisma scan-report viewer. The fake reports
-"object not found" for every key, so the viewer shows its graceful empty state
-instead of crashing. Drop real text under localdev/fixtures/s3/<key> to serve
-canned reports if you want to exercise the viewer.
+The dashboard uses S3 only for the Prisma scan-report viewer, which calls the
+boto3-shaped ``get_object(Bucket=, Key=)`` / ``head_object(Bucket=, Key=)``
+pair and streams ``Body`` to its on-disk cache. This fake answers both
+MinIO-style from local files: drop text under localdev/fixtures/s3/<key> to
+serve canned reports; every other key raises a ``NoSuchKey``-shaped error so
+the viewer shows its graceful empty state instead of crashing.
+
+``calls`` counts GET/HEAD requests per key so a harness can check that repeat
+views are served from the dashboard's cache rather than the bucket.
 """
 
 from __future__ import annotations
 
+import collections
+import hashlib
 import os
 
 _S3_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                        "fixtures", "s3")
 
 
+class _NoSuchKey(Exception):
+    def __init__(self, bucket: str, key: str):
+        super().__init__(f"localdev fake S3: no object {bucket}/{key}")
+        self.response = {"Error": {"Code": "NoSuchKey",
+                                   "Message": f"no object {bucket}/{key}"}}
+
+
 class S3Client:
+    calls: collections.Counter = collections.Counter()
+
     def __init__(self, *args, **kwargs):
-        pass
+        self.endpoint_url = "http://localdev-s3"
 
-    def get_object(self, bucket: str = "", key: str = "", **kwargs):
+    def _path(self, bucket: str, key: str) -> str:
         path = os.path.join(_S3_DIR, key.lstrip("/"))
-        if os.path.isfile(path):
-            with open(path, "rb") as fh:
-                return fh.read()
-        raise FileNotFoundError(f"localdev fake S3: no object {bucket}/{key}")
+        if not os.path.isfile(path):
+            raise _NoSuchKey(bucket, key)
+        return path
+
+    @staticmethod
+    def _etag(path: str) -> str:
+        st = os.stat(path)
+        return '"' + hashlib.md5(f"{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest() + '"'
+
+    def head_object(self, Bucket: str = "", Key: str = "", **kwargs) -> dict:
+        S3Client.calls[("HEAD", Key)] += 1
+        path = self._path(Bucket, Key)
+        return {"ContentLength": os.path.getsize(path), "ETag": self._etag(path)}
+
+    def get_object(self, Bucket: str = "", Key: str = "", **kwargs) -> dict:
+        S3Client.calls[("GET", Key)] += 1
+        path = self._path(Bucket, Key)
+        return {"Body": open(path, "rb"), "ContentLength": os.path.getsize(path),
+                "ETag": self._etag(path)}
 
     def get_object_text(self, bucket: str = "", key: str = "", **kwargs) -> str:
-        return self.get_object(bucket, key).decode("utf-8", "replace")
+        with self.get_object(Bucket=bucket, Key=key)["Body"] as fh:
+            return fh.read().decode("utf-8", "replace")
 
     def list_objects(self, *args, **kwargs):
         return []
@@ -0,0 +1,55 @@
+"""Roster + Jira reconciliation, off the request path.
+
+One daemon thread per process runs both every BACKGROUND_SYNC_SECONDS. The
+roster sync keeps its own TTL; the Jira reconciler is incremental from a
+persisted watermark and only runs on the replica that holds its advisory
+lock (see ticket_sync), so a tick on any other replica is nearly free.
+"""
+
+import threading
+
+from .auth import sync_group_members
+from .config import settings
+from .db import SessionLocal, resign_leadership
+from .ticket_sync import reconcile_closed_tickets
+
+_STOP = threading.Event()
+_THREAD: dict = {"t": None}
+
+
+def sync_once() -> None:
+    for job in (sync_group_members,         # everyone in the LDAP group appears
+                reconcile_closed_tickets):  # Jira-side closures count too
+        db = SessionLocal()
+        try:
+            job(db)
+        except Exception:  # noqa: BLE001 — the next tick retries
+            db.rollback()
+        finally:
+            db.close()
+
+
+def _loop(interval: float) -> None:
+    while not _STOP.is_set():
+        sync_once()
+        _STOP.wait(interval)
+
+
+def start() -> None:
+    """Idempotent; BACKGROUND_SYNC_SECONDS=0 disables the loop."""
+    if settings.background_sync_seconds <= 0 or _THREAD["t"] is not None:
+        return
+    _STOP.clear()
+    t = threading.Thread(target=_loop, args=(settings.background_sync_seconds,),
+                         name="questops-sync", daemon=True)
+    _THREAD["t"] = t
+    t.start()
+
+
+def stop(timeout: float = 5.0) -> None:
+    t = _THREAD["t"]
+    _STOP.set()
+    if t is not None:
+        t.join(timeout)
+    _THREAD["t"] = None
+    resign_leadership()  # hand the reconciler to another replica right away
@@ -12,6 +12,19 @@ class Settings(BaseSettings):
     token_ttl_hours: int = 12
     database_url: str = "sqlite:///./questops.db"
     demo_password: str = "demo"
+    # seconds between background roster (LDAP) + Jira-closure syncs; 0 = off.
+    # The roster keeps a 10 min TTL; the Jira reconciler is incremental (a
+    # persisted watermark) and runs on one replica (Postgres advisory lock).
+    background_sync_seconds: int = 60
+
+    # --- Overview page: per-section caches (seconds) ---
+    # /overview waits at most this long for upstream sections being refreshed;
+    # late or failing ones are served from their last good value, marked stale
+    overview_section_deadline: float = 2.0
+    overview_jira_ttl: int = 60
+    overview_ci_ttl: int = 15        # the Jenkins snapshot has its own TTL too
+    overview_kpi_ttl: int = 120
+    overview_db_ttl: int = 60        # DB sections also re-read on any XP/action change
 
     # --- AI / Ollama ---
     ollama_url: str = "http://localhost:11434"
@@ -43,6 +56,10 @@ class Settings(BaseSettings):
     jenkins_long_running_minutes: int = 45
     jenkins_failure_window_days: int = 14  # failures older than this are not shown
     jenkins_ignore: str = "DevOps_Test"    # comma list; skip pipeline paths containing these
+    # one shared snapshot per process: served fresh for this many seconds, then
+    # served stale while a single background refresh polls only changed jobs
+    jenkins_snapshot_ttl: int = 30
+    jenkins_full_refresh_minutes: int = 30  # full tree (all build history) reload
 
     # --- Elasticsearch (Jenkins KPI + error analysis indices) ---
     es_url: str = ""                 # e.g. https://es.mycorp.local:9200
@@ -1,7 +1,9 @@
 import datetime as dt
+import hashlib
 
-from sqlalchemy import JSON, DateTime, Integer, String, Text, create_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy import (JSON, Date, DateTime, Index, Integer, String, Text,
+                        create_engine, event, func, literal, select, text)
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
 
 from .config import settings
 
@@ -37,10 +39,53 @@ class XPEvent(Base):
     kind: Mapped[str] = mapped_column(String(40), index=True)
     points: Mapped[int] = mapped_column(Integer, default=0)
     message: Mapped[str] = mapped_column(String(400), default="")
-    ref: Mapped[str] = mapped_column(String(200), default="")
+    ref: Mapped[str] = mapped_column(String(200), default="", index=True)
     created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=utcnow, index=True)
 
 
+class XPDaily(Base):
+    """Per-(user, UTC day, kind) rollup of xp_events — points and event counts.
+    Kept in step by the flush hook below, so windowed leaderboards read a few
+    rows per member from the covering index instead of scanning the ledger."""
+
+    __tablename__ = "xp_daily"
+    __table_args__ = (Index("ix_xp_daily_window", "day", "username", "kind", "points", "events"),)
+
+    username: Mapped[str] = mapped_column(String(120), primary_key=True)
+    day: Mapped[dt.date] = mapped_column(Date, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(40), primary_key=True)
+    points: Mapped[int] = mapped_column(Integer, default=0)
+    events: Mapped[int] = mapped_column(Integer, default=0)
+
+
+ALL_TIME = "all"
+
+
+class XPCounter(Base):
+    """Materialized lifetime counters per (user, kind) that the badge rules
+    read; period is always 'all' (today's counts are xp_daily rows). Updated
+    by the same flush hook as xp_daily, so one award costs a fixed handful of
+    primary-key lookups no matter how long the history is."""
+
+    __tablename__ = "xp_counters"
+
+    username: Mapped[str] = mapped_column(String(120), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(40), primary_key=True)
+    period: Mapped[str] = mapped_column(String(10), primary_key=True)
+    points: Mapped[int] = mapped_column(Integer, default=0)
+    events: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class SyncState(Base):
+    """Persisted watermarks of background reconcilers, shared by all replicas."""
+
+    __tablename__ = "sync_state"
+
+    name: Mapped[str] = mapped_column(String(60), primary_key=True)
+    watermark: Mapped[dt.datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime, default=utcnow, onupdate=utcnow)
+
+
 class BadgeAward(Base):
     __tablename__ = "badge_awards"
 
@@ -178,11 +223,128 @@ def init_db(retries: int = 30, delay: float = 1.0) -> None:
     for attempt in range(retries):
         try:
             Base.metadata.create_all(engine)
-            return
+            break
         except OperationalError:
             if attempt == retries - 1:
                 raise
             time.sleep(delay)
+    for table in Base.metadata.sorted_tables:  # indexes added to existing tables
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with SessionLocal() as db:  # first start on an existing ledger: backfill
+        if db.query(XPEvent).first() is not None and (
+                db.query(XPDaily).first() is None or db.query(XPCounter).first() is None):
+            rebuild_xp_rollups(db)
+        # Earlier versions also kept per-day counters here; xp_daily has them.
+        if db.query(XPCounter).filter(XPCounter.period != ALL_TIME).delete(synchronize_session=False):
+            db.commit()
+
+
+# ---------------------------------------------------------------- XP rollups
+def _upsert(db: Session, model, keys: tuple[str, ...], rows: list[dict]) -> None:
+    """Add points/events to existing rollup rows, inserting missing ones.
+    Runs on the flush's connection, so it commits or rolls back with the events."""
+    conn, table = db.connection(), model.__table__
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:  # no native upsert: update-then-insert
+        for r in rows:
+            hit = conn.execute(table.update().where(
+                *[table.c[k] == r[k] for k in keys]).values(
+                points=table.c.points + r["points"], events=table.c.events + r["events"]))
+            if not hit.rowcount:
+                conn.execute(table.insert().values(**r))
+        return
+    stmt = insert(table).values(rows)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={"points": table.c.points + stmt.excluded.points,
+              "events": table.c.events + stmt.excluded.events}))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _roll_up_xp(db: Session, _flush_context) -> None:
+    """Every XPEvent insert lands in xp_daily and xp_counters in the same
+    transaction. Bulk query().delete()s bypass this — call
+    rebuild_xp_rollups() after those."""
+    daily: dict[tuple, list[int]] = {}
+    counters: dict[tuple, list[int]] = {}
+    for obj in db.new:
+        if isinstance(obj, XPEvent):
+            day = (obj.created_at or utcnow()).date()
+            for acc in (daily.setdefault((obj.username, day, obj.kind), [0, 0]),
+                        counters.setdefault((obj.username, obj.kind, ALL_TIME), [0, 0])):
+                acc[0] += obj.points or 0
+                acc[1] += 1
+    if daily:
+        _upsert(db, XPDaily, ("username", "day", "kind"),
+                [{"username": u, "day": d, "kind": k, "points": p, "events": n}
+                 for (u, d, k), (p, n) in sorted(daily.items())])
+        _upsert(db, XPCounter, ("username", "kind", "period"),
+                [{"username": u, "kind": k, "period": per, "points": p, "events": n}
+                 for (u, k, per), (p, n) in sorted(counters.items())])
+
+
+def rebuild_xp_rollups(db: Session) -> None:
+    """Recompute xp_daily + xp_counters from xp_events (backfill / after bulk deletes)."""
+    day = func.date(XPEvent.created_at)
+    points, events = func.coalesce(func.sum(XPEvent.points), 0), func.count(XPEvent.id)
+    cols = ["username", "kind", "period", "points", "events"]
+    db.query(XPDaily).delete(synchronize_session=False)
+    db.query(XPCounter).delete(synchronize_session=False)
+    db.execute(XPDaily.__table__.insert().from_select(
+        ["username", "day", "kind", "points", "events"],
+        select(XPEvent.username, day, XPEvent.kind, points, events)
+        .group_by(XPEvent.username, day, XPEvent.kind)))
+    db.execute(XPCounter.__table__.insert().from_select(cols, select(
+        XPEvent.username, XPEvent.kind, literal(ALL_TIME, String), points, events)
+        .group_by(XPEvent.username, XPEvent.kind)))
+    db.commit()
+
+
+# ---------------------------------------------------------------- leader election
+_LEADERS: dict = {}  # lock name -> the connection holding it
+
+
+def is_leader(name: str) -> bool:
+    """True while this process holds the cluster-wide Postgres advisory lock
+    `name`. The lock lives on a dedicated autocommit connection, so a replica
+    that dies (or loses its connection) hands leadership to the next one to
+    ask. Other databases mean a single process: always the leader."""
+    if engine.dialect.name != "postgresql":
+        return True
+    conn = _LEADERS.get(name)
+    if conn is not None:
+        try:
+            conn.exec_driver_sql("SELECT 1")
+            return True
+        except Exception:  # noqa: BLE001 — connection lost, so is the lock
+            _LEADERS.pop(name, None)
+            conn.invalidate()
+    key = int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], "big", signed=True)
+    conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        if conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": key}).scalar():
+            _LEADERS[name] = conn
+            return True
+    except Exception:  # noqa: BLE001 — database hiccup: not the leader this time
+        pass
+    conn.close()
+    return False
+
+
+def resign_leadership() -> None:
+    """Release every held lock. Unlocked explicitly: a pooled connection that
+    is merely closed goes back to the pool still holding it."""
+    while _LEADERS:
+        _, conn = _LEADERS.popitem()
+        try:
+            conn.exec_driver_sql("SELECT pg_advisory_unlock_all()")
+            conn.close()
+        except Exception:  # noqa: BLE001 — drop the connection, and the lock with it
+            conn.invalidate()
 
 
 def get_db():
@@ -1,15 +1,18 @@
 """XP, levels, streaks, badges and daily quests.
 
 Every awarded action is an XPEvent row — that table doubles as the
-activity history, so 'present and past' views share one truth.
+activity history, so 'present and past' views share one truth. Rules are
+evaluated against the xp_counters (lifetime) and xp_daily (today) rows the
+XPEvent insert maintains, never by counting the ledger, so an award costs the
+same on day 1 and day 1000.
 """
 
 import datetime as dt
 
-from sqlalchemy import func
+from sqlalchemy import and_, func, literal, select, union_all
 from sqlalchemy.orm import Session
 
-from .db import BadgeAward, User, XPEvent, utcnow
+from .db import ALL_TIME, BadgeAward, User, XPCounter, XPDaily, XPEvent, utcnow
 
 XP_RULES = {
     "ticket_created": 8,  # added work to the pool with priority/urgency set
@@ -121,12 +124,18 @@ def _today() -> dt.date:
     return utcnow().date()
 
 
-def _count_kind(db: Session, username: str, kind: str, since: dt.datetime | None = None) -> int:
-    q = db.query(func.count(XPEvent.id)).filter(
-        XPEvent.username == username, XPEvent.kind == kind)
-    if since is not None:
-        q = q.filter(XPEvent.created_at >= since)
-    return q.scalar() or 0
+def _user_counts(db: Session, username: str) -> tuple[dict[str, int], dict[str, int]]:
+    """(lifetime, today) event counts per kind for one member — one read."""
+    lifetime: dict[str, int] = {}
+    day: dict[str, int] = {}
+    rows = union_all(
+        select(XPCounter.kind, literal(True).label("all_time"), XPCounter.events).where(
+            XPCounter.username == username, XPCounter.period == ALL_TIME),
+        select(XPDaily.kind, literal(False), XPDaily.events).where(
+            XPDaily.username == username, XPDaily.day == _today()))
+    for kind, all_time, n in db.execute(rows):
+        (lifetime if all_time else day)[kind] = n
+    return lifetime, day
 
 
 def _update_streak(user: User) -> None:
@@ -138,15 +147,18 @@ def _update_streak(user: User) -> None:
     user.last_active = today
 
 
-def _check_badges(db: Session, user: User) -> list[dict]:
-    owned = {b.key for b in db.query(BadgeAward).filter(BadgeAward.username == user.username)}
+def _check_badges(db: Session, user: User, lifetime: dict[str, int] | None = None) -> list[dict]:
+    if lifetime is None:
+        lifetime = _user_counts(db, user.username)[0]
+    owned = {key for (key,) in db.query(BadgeAward.key).filter(
+        BadgeAward.username == user.username)}
     new = []
     for badge in BADGES:
         if badge["key"] in owned:
             continue
         earned = False
         if "kind" in badge:
-            earned = _count_kind(db, user.username, badge["kind"]) >= badge["count"]
+            earned = lifetime.get(badge["kind"], 0) >= badge["count"]
         elif "streak" in badge:
             earned = user.streak >= badge["streak"]
         if earned:
@@ -156,39 +168,50 @@ def _check_badges(db: Session, user: User) -> list[dict]:
     return new
 
 
-def quest_progress(db: Session, username: str) -> list[dict]:
-    day_start = dt.datetime.combine(_today(), dt.time.min)
+def quest_progress(db: Session, username: str, today: dict[str, int] | None = None) -> list[dict]:
+    if today is None:
+        today = _user_counts(db, username)[1]
     out = []
     for q in DAILY_QUESTS:
-        done = _count_kind(db, username, q["kind"], since=day_start)
+        done = today.get(q["kind"], 0)
         out.append({**q, "progress": min(done, q["target"]),
                     "complete": done >= q["target"]})
     return out
 
 
 def team_quest_progress(db: Session) -> list[dict]:
-    day_start = dt.datetime.combine(_today(), dt.time.min)
+    done_by_kind = dict(
+        db.query(XPDaily.kind, func.sum(XPDaily.events))
+        .filter(XPDaily.day == _today(), XPDaily.kind.in_({q["kind"] for q in TEAM_QUESTS}))
+        .group_by(XPDaily.kind).all())
     out = []
     for q in TEAM_QUESTS:
-        done = (db.query(func.count(XPEvent.id))
-                .filter(XPEvent.kind == q["kind"], XPEvent.created_at >= day_start)
-                .scalar() or 0)
+        done = int(done_by_kind.get(q["kind"]) or 0)
         out.append({**q, "progress": min(done, q["target"]),
                     "complete": done >= q["target"], "team": True})
     return out
 
 
+def _paid_refs(db: Session, refs: list[str], username: str | None = None) -> set[str]:
+    q = db.query(XPEvent.ref).filter(XPEvent.ref.in_(refs))
+    if username is not None:
+        q = q.filter(XPEvent.username == username)
+    return {ref for (ref,) in q.distinct()}
+
+
 def _check_team_quests(db: Session) -> list[dict]:
     """Completing a team quest pays the bonus to EVERY member, once per day."""
     day = _today().isoformat()
-    users = db.query(User).all()
+    due = {f"teamquest:{q['key']}:{day}": q for q in team_quest_progress(db) if q["complete"]}
+    if not due:
+        return []
+    paid = _paid_refs(db, list(due))
+    due = {ref: q for ref, q in due.items() if ref not in paid}
+    if not due:
+        return []
+    users = db.query(User).all()  # once per quest per day, not per award
     completed = []
-    for q in team_quest_progress(db):
-        if not q["complete"]:
-            continue
-        ref = f"teamquest:{q['key']}:{day}"
-        if db.query(XPEvent).filter(XPEvent.ref == ref).first():
-            continue
+    for ref, q in due.items():
         for u in users:
             db.add(XPEvent(username=u.username, kind="quest_bonus", points=q["bonus"],
                            message=f"Team quest complete: {q['name']}", ref=ref))
@@ -198,48 +221,51 @@ def _check_team_quests(db: Session) -> list[dict]:
 
 
 def _check_team_badges(db: Session) -> list[dict]:
-    """Team badges land on every member's wall the moment the team earns them."""
-    users = db.query(User).all()
-    if not users:
+    """Team badges land on every member's wall the moment the team earns them.
+    One grouped read: every member with today's event count and XP."""
+    day = (db.query(User.username, func.coalesce(func.sum(XPDaily.events), 0),
+                    func.coalesce(func.sum(XPDaily.points), 0))
+           .outerjoin(XPDaily, and_(XPDaily.username == User.username, XPDaily.day == _today()))
+           .group_by(User.username).all())
+    if not day:
         return []
-    day_start = dt.datetime.combine(_today(), dt.time.min)
-    rows = (db.query(XPEvent.username, func.coalesce(func.sum(XPEvent.points), 0))
-            .filter(XPEvent.created_at >= day_start)
-            .group_by(XPEvent.username).all())
-    active = {r[0] for r in rows}
-    day_xp = sum(r[1] for r in rows)
+    day_xp = sum(int(points) for _, _, points in day)
 
     earned = []
-    if all(u.username in active for u in users):
+    if all(events for _, events, _ in day):
         earned.append(TEAM_BADGES[0])
     if day_xp >= 500:
         earned.append(TEAM_BADGES[1])
+    if not earned:
+        return []
 
+    holders: dict[str, set[str]] = {}
+    for key, username in db.query(BadgeAward.key, BadgeAward.username).filter(
+            BadgeAward.key.in_([b["key"] for b in earned])):
+        holders.setdefault(key, set()).add(username)
     new = []
     for badge in earned:
-        holders = {b.username for b in
-                   db.query(BadgeAward).filter(BadgeAward.key == badge["key"])}
-        missing = [u for u in users if u.username not in holders]
+        missing = [u for u, _, _ in day if u not in holders.get(badge["key"], set())]
         if not missing:
             continue
-        for u in missing:
-            db.add(BadgeAward(username=u.username, key=badge["key"],
+        for username in missing:
+            db.add(BadgeAward(username=username, key=badge["key"],
                               name=badge["name"], icon=badge["icon"]))
         new.append({"key": badge["key"], "name": badge["name"], "icon": badge["icon"]})
     return new
 
 
-def _check_quests(db: Session, user: User) -> list[dict]:
+def _check_quests(db: Session, user: User, today: dict[str, int] | None = None) -> list[dict]:
     """Grant the daily bonus once per quest per day."""
     day = _today().isoformat()
+    due = {f"quest:{q['key']}:{day}": q
+           for q in quest_progress(db, user.username, today) if q["complete"]}
+    if not due:
+        return []
+    paid = _paid_refs(db, list(due), user.username)
     completed = []
-    for q in quest_progress(db, user.username):
-        if not q["complete"]:
-            continue
-        ref = f"quest:{q['key']}:{day}"
-        already = db.query(XPEvent).filter(
-            XPEvent.username == user.username, XPEvent.ref == ref).first()
-        if already:
+    for ref, q in due.items():
+        if ref in paid:
             continue
         db.add(XPEvent(username=user.username, kind="quest_bonus", points=q["bonus"],
                        message=f"Daily quest complete: {q['name']}", ref=ref))
@@ -260,9 +286,11 @@ def award(db: Session, user: User, kind: str, message: str = "", ref: str = "")
                    message=message, ref=ref))
     user.xp += points
     _update_streak(user)
-    quests = _check_quests(db, user)
+    db.flush()  # the flush hook folds the event into xp_daily / xp_counters
+    lifetime, today = _user_counts(db, user.username)
+    quests = _check_quests(db, user, today)
     team_quests = _check_team_quests(db)
-    badges = _check_badges(db, user)
+    badges = _check_badges(db, user, lifetime)
     team_badges = _check_team_badges(db)
     db.commit()
 
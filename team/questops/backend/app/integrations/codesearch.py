@@ -0,0 +1,392 @@
+"""Persistent trigram index over each repo's server copy, for repo search.
+
+One index per repo (REPOS_WORKDIR/.codesearch/{id}-{name}.idx) maps every
+case-folded trigram of every tracked text file at HEAD to the files holding
+it. A query is planned into the trigrams any matching line must contain, the
+posting lists are intersected, and only those candidate files are read and
+checked against the real pattern — a cross-repo search opens a handful of
+files instead of grepping every checkout. Regex candidates are checked by
+`git grep -E` itself, so a regex means POSIX ERE whichever engine serves a
+repo.
+
+The index follows HEAD: clone builds it, pull (or any other HEAD move,
+noticed at search time) updates it from `git diff old new`, so only changed
+paths are re-read. A changed file gets a fresh id and its old one is
+tombstoned; once tombstones outnumber live files the index is rebuilt. While
+a repo's index is missing or behind, that repo is searched with `git grep`
+and the (re)build runs in the background."""
+
+import os
+import pickle
+import re
+import subprocess
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from pathlib import Path
+from re import _parser as sre_parse  # the stdlib's own regex parser
+
+from .repos import _GIT_ENV, _SEARCH_LINE, _git, _grep_args, _workdir
+
+INDEX_VERSION = 1
+INDEX_MAX_FILE_BYTES = 8 * 1024 * 1024  # bigger text files skip the postings and
+                                        # are always verified instead
+BINARY_PROBE = 8000                     # same NUL probe git grep -I uses
+GREP_PATHS_PER_CALL = 1000              # candidate paths per verifying git grep
+
+_INDEXES: dict[str, "_Index"] = {}  # server-copy dir name -> loaded index
+_PENDING: set[str] = set()          # loads/builds queued or running
+_LOCK = threading.Lock()
+_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="codesearch")
+
+
+def _trigrams(text: str) -> set[str]:
+    """Distinct trigrams of already case-folded text; none span a newline
+    since every match is confined to one line."""
+    return {a + b + c for a, b, c in set(zip(text, text[1:], text[2:]))
+            if "\n" not in (a, b, c)}
+
+
+class _Index:
+    def __init__(self, head: str):
+        self.head = head
+        self.paths: list[str | None] = []      # file id -> path (None = tombstone)
+        self.ids: dict[str, int] = {}          # live path -> file id
+        self.wide: set[int] = set()            # over INDEX_MAX_FILE_BYTES
+        self.postings: dict[str, array] = {}   # trigram -> ascending file ids
+        self.dead = 0
+
+    def add(self, base: Path, path: str) -> None:
+        try:
+            data = (base / path).read_bytes()
+        except OSError:
+            return
+        if b"\x00" in data[:BINARY_PROBE]:
+            return                             # binary: git grep -I skips it too
+        fid = len(self.paths)
+        self.paths.append(path)
+        self.ids[path] = fid
+        if len(data) > INDEX_MAX_FILE_BYTES:
+            self.wide.add(fid)
+            return
+        for gram in _trigrams(data.decode("utf-8", "replace").lower()):
+            self.postings.setdefault(gram, array("I")).append(fid)
+
+    def remove(self, path: str) -> None:
+        fid = self.ids.pop(path, None)
+        if fid is not None:
+            self.paths[fid] = None
+            self.wide.discard(fid)
+            self.dead += 1
+
+    def update(self, base: Path, head: str) -> bool:
+        """Re-read only the paths that changed between our HEAD and `head`;
+        False when the old commit is unknown (force-push, re-clone)."""
+        if not _commit_exists(base, self.head):
+            return False
+        out = _git(base, "diff", "--name-only", "--no-renames", "-z",
+                   self.head, head)
+        for path in filter(None, out.split("\x00")):
+            self.remove(path)
+            full = base / path
+            if full.is_file() and not full.is_symlink():
+                self.add(base, path)
+        self.head = head
+        return True
+
+    def candidates(self, grams: list[str]) -> set[int]:
+        lists = sorted((self.postings.get(g, ()) for g in grams), key=len)
+        found = set(lists[0])
+        for ids in lists[1:]:
+            if not found:
+                break
+            found.intersection_update(ids)
+        return found | self.wide
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        del state["ids"]                       # rebuilt from paths on load
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.ids = {p: i for i, p in enumerate(self.paths) if p is not None}
+
+
+def _commit_exists(base: Path, sha: str) -> bool:
+    try:
+        _git(base, "cat-file", "-e", f"{sha}^{{commit}}")
+        return True
+    except Exception:  # noqa: BLE001 — unknown object / broken clone alike
+        return False
+
+
+def _head(base: Path) -> str:
+    """HEAD's sha straight from .git (no subprocess per repo per search);
+    `git rev-parse` covers anything unusual."""
+    git = base / ".git"
+    try:
+        ref = (git / "HEAD").read_text().strip()
+        if not ref.startswith("ref: "):
+            return ref
+        name = ref[5:]
+        loose = git / name
+        if loose.is_file():
+            return loose.read_text().strip()
+        for line in (git / "packed-refs").read_text().splitlines():
+            if line.endswith(" " + name):
+                return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return _git(base, "rev-parse", "HEAD", ok_fail=True).strip()
+
+
+def _index_path(name: str) -> Path:
+    return _workdir() / ".codesearch" / f"{name}.idx"
+
+
+def _load(name: str) -> "_Index | None":
+    try:
+        with _index_path(name).open("rb") as fh:
+            version, idx = pickle.load(fh)
+    except Exception:  # noqa: BLE001 — missing / torn / older format: rebuild
+        return None
+    return idx if version == INDEX_VERSION else None
+
+
+def _save(name: str, idx: _Index) -> None:
+    path = _index_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+    with tmp.open("wb") as fh:
+        pickle.dump((INDEX_VERSION, idx), fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)                      # readers never see half a file
+
+
+def _build(base: Path, head: str) -> _Index:
+    idx = _Index(head)
+    for entry in _git(base, "ls-files", "-s", "-z").split("\x00"):
+        meta, _, path = entry.partition("\t")
+        if path and meta.startswith("100"):    # regular files; not links/submodules
+            idx.add(base, path)
+    return idx
+
+
+def _refresh(base: Path) -> None:
+    name = base.name
+    try:
+        with _LOCK:
+            idx = _INDEXES.pop(name, None)
+        if idx is None:
+            idx = _load(name)
+        head = _head(base)
+        if idx is None or idx.head != head:
+            if idx is None or not idx.update(base, head) or idx.dead > len(idx.ids):
+                idx = _build(base, head)
+            _save(name, idx)
+        with _LOCK:
+            _INDEXES[name] = idx
+    except Exception:  # noqa: BLE001 — searches stay on git grep; the next one retries
+        pass
+    finally:
+        with _LOCK:
+            _PENDING.discard(name)
+
+
+def refresh(base: Path) -> None:
+    """Bring the index of one server copy up to its HEAD, in the background."""
+    with _LOCK:
+        if base.name in _PENDING:
+            return
+        _PENDING.add(base.name)
+    _POOL.submit(_refresh, base)
+
+
+def drop(name: str) -> None:
+    """Forget a removed repo's index."""
+    with _LOCK:
+        _INDEXES.pop(name, None)
+    _index_path(name).unlink(missing_ok=True)
+
+
+# --- Query planning -----------------------------------------------------------
+
+class Plan:
+    """A compiled query: the trigrams and the longest case-folded literal
+    (anchor) a matching line must contain, the optional pathspec, and how
+    candidates are verified — the per-line `pattern` for literals, or the
+    `grep` argv when git grep must decide (regexes, non-ASCII case folding)."""
+
+    def __init__(self, pattern: re.Pattern | None, grams: list[str], anchor: str,
+                 pathspec: str, grep: list[str] | None = None):
+        self.pattern = pattern
+        self.grams = grams
+        self.anchor = anchor
+        self.pathspec = pathspec
+        self.grep = grep
+
+    def wants(self, path: str) -> bool:
+        spec = self.pathspec
+        if not spec:
+            return True
+        if not any(c in spec for c in "*?["):  # plain pathspec = file or directory
+            spec = spec.rstrip("/")
+            return path == spec or path.startswith(spec + "/")
+        return fnmatchcase(path, spec)         # like git, `*` also crosses `/`
+
+
+def _required_runs(items) -> list[str]:
+    """Literal runs every match of a parsed regex must contain. Anything that
+    is optional or alternates only ends the current run — it never adds one."""
+    runs, run = [], []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        runs.append("".join(run))
+        run = []
+        if op is sre_parse.SUBPATTERN:
+            runs += _required_runs(av[-1])
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT,
+                    sre_parse.POSSESSIVE_REPEAT) and av[0] >= 1:
+            runs += _required_runs(av[2])
+        elif op is sre_parse.ATOMIC_GROUP:
+            runs += _required_runs(av)
+    runs.append("".join(run))
+    return runs
+
+
+# escapes that mean the same literal in Python's re and in POSIX ERE
+_ERE_META = set(".[]()*+?{}|^$\\")
+_LAZY = re.compile(r"[*+?}]\?")          # Python: lazy; ERE: optional
+
+
+def _ere_plannable(query: str) -> bool:
+    """True when every literal Python's parse of `query` requires is also
+    required by its POSIX ERE reading. Other escapes (`\\d` is a digit to
+    Python, a `d` to ERE), `(?...)` groups, lazy quantifiers, POSIX classes
+    and backslashes inside brackets are left to git grep."""
+    if "(?" in query or "[:" in query or _LAZY.search(query):
+        return False
+    if "[" in query and "\\" in query:
+        return False
+    return all(m.group(1) in _ERE_META for m in re.finditer(r"\\(.)", query, re.S))
+
+
+def plan(query: str, regex: bool, case_sensitive: bool, whole_word: bool,
+         path_glob: str = "") -> Plan | None:
+    """None when the index can't narrow this query (no trigram to require,
+    a regex whose Python parse may disagree with ERE, a magic pathspec) —
+    git grep handles those."""
+    if path_glob.startswith(":"):
+        return None                            # magic pathspec
+    grep = None
+    if regex:
+        if not _ere_plannable(query):
+            return None
+        try:
+            runs = _required_runs(sre_parse.parse(query))
+        except (re.error, OverflowError, RecursionError):
+            return None
+        grep = _grep_args(query, True, case_sensitive, whole_word)
+    else:
+        runs = [query]
+        if not case_sensitive and not query.isascii():
+            grep = _grep_args(query, False, case_sensitive, whole_word)
+    runs = [r.lower() for r in runs]
+    grams = sorted({g for r in runs for g in _trigrams(r)})
+    if not grams:
+        return None
+    anchor = max(runs, key=len)
+    if grep:
+        return Plan(None, grams, anchor, path_glob, grep)
+    # A fixed string like git grep -F: ASCII-only case folding, and -w's
+    # word characters are [A-Za-z0-9_].
+    source = re.escape(query)
+    if whole_word:
+        source = rf"(?<!\w)(?:{source})(?!\w)"
+    flags = re.ASCII | (0 if case_sensitive else re.IGNORECASE)
+    return Plan(re.compile(source, flags), grams, anchor, path_glob)
+
+
+# --- Search -------------------------------------------------------------------
+
+def hits(base: Path, query: Plan):
+    """(path, line, text) for every matching line of one server copy, in git
+    grep's order — or None when its index isn't at HEAD yet (a refresh is
+    queued; search this repo with git grep meanwhile)."""
+    if not base.exists():
+        return None
+    head = _head(base)
+    with _LOCK:
+        idx = _INDEXES.get(base.name)
+    if idx is None or idx.head != head:
+        refresh(base)
+        return None
+    paths = sorted(p for p in map(idx.paths.__getitem__, idx.candidates(query.grams))
+                   if p is not None and query.wants(p))
+    if query.grep:
+        return _grep(base, query.grep, paths)
+    return _verify(base, paths, query)
+
+
+def _grep(base: Path, argv: list[str], paths: list[str]):
+    """Let git grep itself check the candidates; None on a git error (an
+    invalid ERE, say) so the repo's full git grep reports it."""
+    found = []
+    # No candidates still runs once, on a path git never tracks, so an
+    # invalid pattern fails here exactly as the full git grep would.
+    for i in range(0, max(len(paths), 1), GREP_PATHS_PER_CALL):
+        chunk = paths[i:i + GREP_PATHS_PER_CALL] or [".git"]
+        p = subprocess.run(["git", "--literal-pathspecs", *argv, "--", *chunk],
+                           cwd=base, env=_GIT_ENV, capture_output=True, text=True,
+                           timeout=45)
+        if p.returncode >= 2:                  # 1 == no matches
+            return None
+        found += [(m.group(1), int(m.group(2)), m.group(3))
+                  for m in map(_SEARCH_LINE.match, p.stdout.splitlines()) if m]
+    return found
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", "replace")
+
+
+def _verify(base: Path, paths: list[str], query: Plan):
+    pattern, anchor = query.pattern, query.anchor
+    needle = anchor.encode() if anchor.isascii() else None
+    for path in paths:
+        try:
+            data = (base / path).read_bytes()
+        except OSError:
+            continue
+        if needle is not None:                 # fold the bytes; decode hit lines only
+            low = data.lower()
+            yield from _lines(path, data, b"\n", lambda pos: low.find(needle, pos),
+                              pattern, _decode)
+            continue
+        text = _decode(data)
+        folded = text.lower()
+        if len(folded) == len(text):           # folding kept every offset
+            find = (lambda pos: folded.find(anchor, pos))
+        else:
+            find = (lambda pos: -1 if (m := pattern.search(text, pos)) is None
+                    else m.start())
+        yield from _lines(path, text, "\n", find, pattern, str)
+
+
+def _lines(path: str, src, nl, find, pattern: re.Pattern, decode):
+    """Walk from one anchor hit to the next — far cheaper than running the
+    regex over every line — and keep the lines the pattern really matches."""
+    lineno, seen, pos = 1, 0, 0
+    while (at := find(pos)) >= 0:
+        start = src.rfind(nl, 0, at) + 1
+        end = src.find(nl, at)
+        end = len(src) if end < 0 else end
+        lineno += src.count(nl, seen, start)
+        seen = start
+        line = decode(src[start:end])
+        if pattern.search(line):
+            yield path, lineno, line
+        pos = end + 1
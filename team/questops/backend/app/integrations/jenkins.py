@@ -5,6 +5,8 @@ job table so 'claim' / 'fixed' flows are exercisable offline."""
 
 import datetime as dt
 import re
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 
 import requests
@@ -91,18 +93,19 @@ def _demo_overview() -> dict:
 # builds{0,20} = recent history: average runtime AND the failure scan — a red
 # pipeline is any job with a failed run in the window, not just a red LAST run
 # (the same pipeline serves multiple projects, so later runs can mask failures).
-_LEAF = ("_class,fullName,name,url,"
-         "lastBuild[number,building,timestamp,duration,result,url],"
-         "lastCompletedBuild[number,timestamp,duration,result,url],"
-         "builds[number,timestamp,duration,result,building,url]{0,20}")
+_LIGHT_LEAF = ("_class,fullName,name,url,"
+               "lastBuild[number,building,timestamp,duration,result,url],"
+               "lastCompletedBuild[number,timestamp,duration,result,url]")
+_BUILDS = "builds[number,timestamp,duration,result,building,url]{0,20}"
+_LEAF = f"{_LIGHT_LEAF},{_BUILDS}"
 
 
-def _tree_query(depth: int = 8) -> str:
+def _tree_query(depth: int = 8, leaf: str = _LEAF) -> str:
     """Nested tree so jobs inside folders / multibranch pipelines are included.
     Depth must exceed the deepest folder nesting or those jobs are dropped."""
-    tree = _LEAF
+    tree = leaf
     for _ in range(depth):
-        tree = f"{_LEAF},jobs[{tree}]"
+        tree = f"{leaf},jobs[{tree}]"
     return f"jobs[{tree}]"
 
 
@@ -156,14 +159,12 @@ def _is_long_running(running_min: float, avg_min: float) -> bool:
     return running_min >= settings.jenkins_long_running_minutes  # no history fallback
 
 
-def _live_overview() -> dict:
-    auth = (settings.jenkins_user, settings.jenkins_token) if settings.jenkins_user else None
-    r = requests.get(f"{settings.jenkins_url}/api/json",
-                     params={"tree": _tree_query()}, auth=auth, timeout=30)
-    r.raise_for_status()
+def _summarize(raw_jobs: list[dict]) -> dict:
+    """Failure / long-running / activity feed from leaf jobs (with builds).
+    Pure — recomputed per call so ages and claims are always current."""
     now = _now_ms()
     failures, long_running, jobs = [], [], []
-    for j in _flatten(r.json().get("jobs", []), []):
+    for j in raw_jobs:
         name = j.get("fullName") or j.get("name") or ""
         if any(tok in name.lower() for tok in settings.jenkins_ignore_tokens):
             continue
@@ -211,6 +212,114 @@ def _live_overview() -> dict:
             "jobs": jobs, "source": "live"}
 
 
+# ---------------------------------------------------------------- shared snapshot
+# Every /overview, CI panel, focus feed and AI briefing reads ONE per-process
+# snapshot of the leaf jobs instead of pulling the full tree (builds included)
+# from the controller per request. Stale-while-revalidate: a snapshot older
+# than JENKINS_SNAPSHOT_TTL is still served while a single background refresh
+# runs. Refreshes are incremental — the tree is polled WITHOUT build history,
+# and only jobs whose lastBuild changed (new number, or it finished) or whose
+# lastCompletedBuild changed (an older concurrent build finished behind a newer
+# running one) get their builds re-fetched; a full tree load runs every
+# JENKINS_FULL_REFRESH_MINUTES.
+_SNAPSHOT: dict = {"jobs": None, "sigs": {}, "at": 0.0, "full_at": 0.0, "error": ""}
+_SNAPSHOT_LOCK = threading.Lock()  # single flight: at most one refresh running
+_BUILD_FETCH_POOL = 8
+
+
+def _job_key(j: dict) -> str:
+    return j.get("fullName") or j.get("name") or ""
+
+
+def _signature(j: dict) -> tuple:
+    last, completed = j.get("lastBuild") or {}, j.get("lastCompletedBuild") or {}
+    return (last.get("number"), last.get("building"), last.get("result"),
+            completed.get("number"), completed.get("result"))
+
+
+def _fetch_tree(leaf: str) -> list[dict]:
+    r = requests.get(f"{settings.jenkins_url}/api/json",
+                     params={"tree": _tree_query(leaf=leaf)}, auth=_auth(), timeout=30)
+    r.raise_for_status()
+    return _flatten(r.json().get("jobs", []), [])
+
+
+def _fetch_builds(j: dict) -> list | None:
+    """One job's recent builds; None on failure (retried next poll)."""
+    try:
+        r = requests.get(f"{(j.get('url') or '').rstrip('/')}/api/json",
+                         params={"tree": _BUILDS}, auth=_auth(), timeout=30)
+        r.raise_for_status()
+        return r.json().get("builds") or []
+    except Exception:  # noqa: BLE001 — keep the previous builds for now
+        return None
+
+
+def _refresh() -> None:
+    """Caller holds _SNAPSHOT_LOCK."""
+    started = time.time()
+    old = _SNAPSHOT["jobs"]
+    if old is None or started - _SNAPSHOT["full_at"] >= settings.jenkins_full_refresh_minutes * 60:
+        leaves = _fetch_tree(_LEAF)
+        jobs = {_job_key(j): j for j in leaves}
+        _SNAPSHOT.update(jobs=jobs, sigs={k: _signature(j) for k, j in jobs.items()},
+                         at=started, full_at=started, error="")
+        return
+    sigs, jobs, changed = {}, {}, []
+    for j in _fetch_tree(_LIGHT_LEAF):
+        key = _job_key(j)
+        prev = old.get(key) or {}
+        jobs[key] = {**j, "builds": prev.get("builds") or []}
+        if _SNAPSHOT["sigs"].get(key) == _signature(j):
+            sigs[key] = _signature(j)
+        else:
+            changed.append(key)
+    if changed:
+        with ThreadPoolExecutor(max_workers=_BUILD_FETCH_POOL) as pool:
+            fetched = pool.map(_fetch_builds, [jobs[k] for k in changed])
+            for key, builds in zip(changed, fetched):
+                if builds is not None:
+                    jobs[key]["builds"] = builds
+                    sigs[key] = _signature(jobs[key])
+    _SNAPSHOT.update(jobs=jobs, sigs=sigs, at=started, error="")
+
+
+def _refresh_in_background() -> None:
+    try:
+        _refresh()
+    except Exception as exc:  # noqa: BLE001 — keep serving the last good snapshot
+        _SNAPSHOT["error"] = str(exc)[:200]
+    finally:
+        _SNAPSHOT_LOCK.release()
+
+
+def refresh_snapshot() -> None:
+    """Blocking refresh that joins one already in flight instead of stacking."""
+    asked = time.time()
+    with _SNAPSHOT_LOCK:
+        if _SNAPSHOT["jobs"] is None or _SNAPSHOT["at"] < asked:
+            _refresh()
+
+
+def _snapshot() -> tuple[list[dict], float]:
+    """(leaf jobs, snapshot time). Only the very first load blocks a request."""
+    if _SNAPSHOT["jobs"] is None:
+        with _SNAPSHOT_LOCK:
+            if _SNAPSHOT["jobs"] is None:
+                _refresh()
+    elif (time.time() - _SNAPSHOT["at"] >= settings.jenkins_snapshot_ttl
+          and _SNAPSHOT_LOCK.acquire(blocking=False)):
+        threading.Thread(target=_refresh_in_background, name="jenkins-snapshot",
+                         daemon=True).start()
+    return list(_SNAPSHOT["jobs"].values()), _SNAPSHOT["at"]
+
+
+def _live_overview() -> dict:
+    jobs, at = _snapshot()
+    return {**_summarize(jobs), "snapshot_age_s": int(time.time() - at),
+            "snapshot_error": _SNAPSHOT["error"]}
+
+
 def overview() -> dict:
     if is_live():
         return _live_overview()
@@ -472,6 +581,7 @@ def verify_fixed(job: str) -> bool:
                 j["recent_failures"] = []
                 return True
         return False
+    refresh_snapshot()  # incremental poll — a claim must not pay out on stale data
     data = _live_overview()
     entry = next((x for x in data["jobs"] if x["name"] == job), None)
     return bool(entry and entry.get("result") == "SUCCESS")
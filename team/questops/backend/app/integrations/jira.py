@@ -4,6 +4,7 @@ Live mode uses basic auth (JIRA_USER / JIRA_PASSWORD). Demo mode keeps a
 mutable in-memory board so the whole flow works without a Jira."""
 
 import datetime as dt
+import math
 
 import requests
 
@@ -336,18 +337,23 @@ def issue_brief(key: str) -> dict | None:
         return None
 
 
-def closed_recently() -> list[dict]:
-    """Tickets that reached a done status within the closed window —
-    INCLUDING ones closed directly in Jira, never touched via QuestOps."""
+def closed_since(since: dt.datetime | None) -> list[dict]:
+    """Done-status tickets UPDATED since `since` (naive UTC; None = the whole
+    closed window) — INCLUDING ones closed directly in Jira, never touched via
+    QuestOps. The JQL bound is relative ('updated >= -17m'), so the Jira
+    user's timezone never shifts the window."""
     if is_live():
-        days = settings.jira_closed_window_days
+        if since is None:
+            window = f"-{settings.jira_closed_window_days}d"
+        else:
+            window = f"-{max(1, math.ceil((_now() - since).total_seconds() / 60))}m"
         done = ", ".join(f'"{s}"' for s in settings._csv(settings.jira_done_statuses))
-        changed = " OR ".join(f'status CHANGED TO "{s}" AFTER -{days}d'
-                              for s in settings._csv(settings.jira_done_statuses))
         issues = _live_search(f'project = "{settings.jira_project_key}" '
-                              f'AND status in ({done}) AND ({changed})')
+                              f'AND status in ({done}) AND updated >= {window} '
+                              f'ORDER BY updated ASC')
     elif settings.demo_mode:
-        issues = [dict(i) for i in _DEMO_ISSUES if not _is_open(i)]
+        issues = [dict(i) for i in _DEMO_ISSUES if not _is_open(i)
+                  and (since is None or dt.datetime.fromisoformat(i["updated"]) >= since)]
     else:
         return []
     return [{"key": i["key"], "assignee": i["assignee"], "summary": i["summary"],
@@ -380,6 +380,8 @@ def remove_repo(db: Session, slot: int) -> None:
     db.commit()
     shutil.rmtree(worktrees, ignore_errors=True)  # members' workspaces too
     shutil.rmtree(base, ignore_errors=True)
+    from .codesearch import drop
+    drop(base.name)                               # and its search index
 
 
 def discover(collection: str = "") -> dict:
@@ -653,6 +655,7 @@ def clone(slot: int, branch: str = "") -> None:
         _seed_demo_repo(repo, repo_dir)
         if branch:  # demo parity: show the requested branch in the UI
             _git(repo_dir, "checkout", "-b", branch, ok_fail=True)
+        _reindex(repo)
         return
     branch_args = ["--branch", branch] if branch else []
     attempts = []
@@ -662,6 +665,7 @@ def clone(slot: int, branch: str = "") -> None:
         if p.returncode == 0:
             _WORKING["label"] = label
             _git(repo_dir, "remote", "set-url", "origin", repo["url"])  # keep creds out
+            _reindex(repo)
             return
         shutil.rmtree(repo_dir, ignore_errors=True)  # clean slate per attempt
         msg = _scrub((p.stderr or p.stdout).strip())
@@ -713,6 +717,7 @@ def pull(slot: int, username: str | None = None) -> str:
         branch_arg = [current] if current and current != "HEAD" else []
         out = _scrub(_git_authed(base, repo, "pull", "--ff-only", "{URL}",
                                  *branch_arg)).strip()
+        _reindex(repo)  # incremental: only the paths the pull changed
     if username:
         wt = _ensure_worktree(repo, username)
         base_head = _git(base, "rev-parse", "HEAD").strip()
@@ -1067,12 +1072,55 @@ SEARCH_LINE_CHARS = 400         # trim very long matched lines
 _SEARCH_LINE = re.compile(r"^(.*?)\x00(\d+)\x00(.*)$")
 
 
+def _grep_args(query: str, regex: bool, case_sensitive: bool,
+               whole_word: bool) -> list[str]:
+    """`git grep` argv (no pathspec) for one search — the semantics every
+    engine must reproduce: POSIX ERE for regexes, a fixed string otherwise."""
+    flags = ["grep", "-I", "--no-color", "-n", "-z", "--full-name"]
+    if not case_sensitive:
+        flags.append("-i")
+    if whole_word:
+        flags.append("-w")
+    flags.append("-E" if regex else "-F")        # extended regex / literal string
+    return [*flags, "-e", query]
+
+
+def _search_row(repo: dict) -> dict:
+    return {"slot": repo["slot"], "name": repo["name"], "url": repo["url"],
+            "cloned": False, "files": [], "match_count": 0, "file_count": 0,
+            "truncated": False, "error": None}
+
+
+def _group_hits(row: dict, hits) -> dict:
+    """Shape (path, line, text) hits into the row, grouped by file, under the
+    same caps whichever engine produced them. Stops consuming at the cap."""
+    by_file: dict[str, list] = {}
+    count = 0
+    for path, lineno, text in hits:
+        count += 1
+        if count > SEARCH_HITS_PER_REPO:
+            row["truncated"] = True
+            break
+        fl = by_file.setdefault(path, [])
+        if len(fl) < SEARCH_HITS_PER_FILE:
+            fl.append({"line": lineno, "text": text[:SEARCH_LINE_CHARS]})
+        row["match_count"] += 1
+
+    row["file_count"] = len(by_file)
+    files = [{"path": path, "hits": h, "hit_count": len(h)}
+             for path, h in by_file.items()]
+    files.sort(key=lambda f: (-f["hit_count"], f["path"].lower()))
+    if len(files) > SEARCH_FILES_PER_REPO:
+        row["truncated"] = True
+        files = files[:SEARCH_FILES_PER_REPO]
+    row["files"] = files
+    return row
+
+
 def _search_one(repo: dict, argv: list[str]) -> dict:
     """Run one `git grep` in a repo's server copy and shape its hits, grouped
     by file. Distinguishes 'no matches' (exit 1) from a real error (exit ≥2)."""
-    row = {"slot": repo["slot"], "name": repo["name"], "url": repo["url"],
-           "cloned": False, "files": [], "match_count": 0, "file_count": 0,
-           "truncated": False, "error": None}
+    row = _search_row(repo)
     base = _dir_for(repo)
     if not base.exists():
         return row
@@ -1087,64 +1135,66 @@ def _search_one(repo: dict, argv: list[str]) -> dict:
         err = _scrub((p.stderr or p.stdout).strip())
         row["error"] = (err.splitlines()[-1] if err else "search failed")[:160]
         return row
+    matches = map(_SEARCH_LINE.match, p.stdout.splitlines())
+    return _group_hits(row, ((m.group(1), int(m.group(2)), m.group(3))
+                             for m in matches if m))
+
+
+def _search_indexed(repo: dict, query) -> dict | None:
+    """The same row from the repo's trigram index; None while that index is
+    missing or behind HEAD (it refreshes in the background)."""
+    from .codesearch import hits
+    found = hits(_dir_for(repo), query)
+    if found is None:
+        return None
+    row = _search_row(repo)
+    row["cloned"] = True
+    return _group_hits(row, found)
 
-    by_file: dict[str, list] = {}
-    hits = 0
-    for line in p.stdout.splitlines():
-        m = _SEARCH_LINE.match(line)
-        if not m:
-            continue
-        path, lineno, text = m.group(1), int(m.group(2)), m.group(3)
-        hits += 1
-        if hits > SEARCH_HITS_PER_REPO:
-            row["truncated"] = True
-            break
-        fl = by_file.setdefault(path, [])
-        if len(fl) < SEARCH_HITS_PER_FILE:
-            fl.append({"line": lineno, "text": text[:SEARCH_LINE_CHARS]})
-        row["match_count"] += 1
 
-    row["file_count"] = len(by_file)
-    files = [{"path": path, "hits": h, "hit_count": len(h)}
-             for path, h in by_file.items()]
-    files.sort(key=lambda f: (-f["hit_count"], f["path"].lower()))
-    if len(files) > SEARCH_FILES_PER_REPO:
-        row["truncated"] = True
-        files = files[:SEARCH_FILES_PER_REPO]
-    row["files"] = files
-    return row
+def _reindex(repo: dict) -> None:
+    from .codesearch import refresh
+    refresh(_dir_for(repo))
+
+
+def warm_search_index() -> None:
+    """Load (or build) every cloned repo's search index in the background."""
+    for repo in configured():
+        if _dir_for(repo).exists():
+            _reindex(repo)
 
 
 def search(query: str, regex: bool = False, case_sensitive: bool = False,
            whole_word: bool = False, slot: int | None = None,
            path_glob: str = "", collection: str = "", project: str = "") -> dict:
-    """Search a string/regex across every cloned repo's server copy via
-    `git grep` (tracked files, binaries skipped). Read-only; no worktree
-    needed since the server copy is always clean. The target set can be
-    narrowed by collection, project and/or a single repo (slot)."""
+    """Search a string/regex across every cloned repo's server copy (tracked
+    files, binaries skipped). Read-only; no worktree needed since the server
+    copy is always clean. Served from each repo's trigram index (see
+    codesearch); `git grep` covers repos whose index is still building and
+    queries the index can't narrow, and verifies the index's regex candidates,
+    so a regex means POSIX ERE in every repo. The target set can be narrowed by
+    collection, project and/or a single repo (slot)."""
+    from .codesearch import plan
     q = (query or "").strip()
     if len(q) < SEARCH_MIN_LEN:
         raise RepoError(f"enter at least {SEARCH_MIN_LEN} characters to search")
 
     targets = _match_repos(slot=slot, collection=collection, project=project)
 
-    flags = ["grep", "-I", "--no-color", "-n", "-z", "--full-name"]
-    if not case_sensitive:
-        flags.append("-i")
-    if whole_word:
-        flags.append("-w")
-    if not regex:
-        flags.append("-F")                       # literal string
-    else:
-        flags.append("-E")                       # extended regex
-    argv = [*flags, "-e", q]
+    argv = _grep_args(q, regex, case_sensitive, whole_word)
     if path_glob.strip():
         # limit to a pathspec (e.g. "*.py"); git treats it as a glob
         argv += ["--", path_glob.strip()]
 
+    query = plan(q, regex, case_sensitive, whole_word, path_glob.strip())
+
+    def one(repo: dict) -> dict:
+        row = _search_indexed(repo, query) if query else None
+        return row or _search_one(repo, argv)
+
     started = time.time()
     with ThreadPoolExecutor(max_workers=6) as pool:
-        rows = list(pool.map(lambda r: _search_one(r, argv), targets))
+        rows = list(pool.map(one, targets))
 
     cloned = [r for r in rows if r["cloned"]]
     return {
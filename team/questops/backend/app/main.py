@@ -3,8 +3,10 @@ from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 
+from . import background
 from .config import settings
 from .db import SessionLocal, init_db
+from .integrations import repos
 from .routers import (access_routes, actions, ai, auth_routes, deps, dive,
                       game, insights, logging_routes, overview, prompts,
                       repos_routes, upgrades_routes, work)
@@ -49,6 +51,13 @@ def startup() -> None:
             cleanup_demo_data(db)  # purge leftovers from any earlier demo run
     finally:
         db.close()
+    background.start()  # LDAP roster + Jira closures, never on a request thread
+    repos.warm_search_index()  # load/build the repo search indexes off-request
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    background.stop()
 
 
 def _frontend_dir() -> Path:
@@ -3,70 +3,68 @@
 import datetime as dt
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
-from ..auth import current_user, sync_group_members
-from ..db import BadgeAward, User, XPEvent, get_db, utcnow
+from ..auth import current_user
+from ..db import BadgeAward, User, XPDaily, XPEvent, get_db, utcnow
 from ..gamification import BADGES, TEAM_BADGES, level_info
-from ..ticket_sync import sync_closed_tickets
 
 router = APIRouter(prefix="/api", tags=["game"])
 
 
-def _since_for(window: str) -> dt.datetime | None:
-    """window: number of days ('7', '30', …), 'week' (legacy) or 'all'."""
+# leaderboard stat -> XPEvent kind whose count it shows
+STAT_KINDS = {"tickets_done": "ticket_done", "resolved": "ticket_resolved",
+              "builds_fixed": "build_fixed", "reviews": "approval_review",
+              "actions": "repo_action_executed"}
+
+
+def _since_day(window: str) -> dt.date | None:
+    """window: number of days ('7', '30', …), 'week' (legacy) or 'all'.
+    Whole UTC days, today included — the granularity of the xp_daily rollup."""
     if window == "all":
         return None
     if window == "week":
         window = "7"
-    days = int("".join(ch for ch in window if ch.isdigit()) or 7)
-    return utcnow() - dt.timedelta(days=days)
+    days = max(1, int("".join(ch for ch in window if ch.isdigit()) or 7))
+    return utcnow().date() - dt.timedelta(days=days - 1)
 
 
 @router.get("/leaderboard")
 def leaderboard(window: str = "7", user: User = Depends(current_user),
                 db: Session = Depends(get_db)):
-    sync_group_members(db)  # everyone in the LDAP group appears, XP or not
-    sync_closed_tickets(db)  # Jira-side closures count too
-    users = db.query(User).all()
-    since = _since_for(window)
-
-    # per-member activity counts for the window, one grouped query
-    kq = db.query(XPEvent.username, XPEvent.kind, func.count(XPEvent.id))
+    """One grouped query over the xp_daily rollup + badge counts — the cost is
+    per member, not per XP event, and no longer N queries per member. The
+    roster and Jira closures are reconciled in the background (app.background)."""
+    since = _since_day(window)
+    roll = select(XPDaily.username, func.sum(XPDaily.points).label("xp"),
+                  *[func.sum(case((XPDaily.kind == kind, XPDaily.events), else_=0)).label(stat)
+                    for stat, kind in STAT_KINDS.items()])
     if since is not None:
-        kq = kq.filter(XPEvent.created_at >= since)
-    counts: dict[str, dict[str, int]] = {}
-    for uname, kind, n in kq.group_by(XPEvent.username, XPEvent.kind):
-        counts.setdefault(uname, {})[kind] = n
+        roll = roll.where(XPDaily.day >= since)
+    roll = roll.group_by(XPDaily.username).subquery()
+    badges = (select(BadgeAward.username, func.count(BadgeAward.id).label("n"))
+              .group_by(BadgeAward.username).subquery())
+    xp = func.coalesce(roll.c.xp, 0) if since is not None else User.xp
+    q = (select(User, xp, func.coalesce(badges.c.n, 0),
+                *[func.coalesce(roll.c[stat], 0) for stat in STAT_KINDS])
+         .outerjoin(roll, roll.c.username == User.username)
+         .outerjoin(badges, badges.c.username == User.username)
+         .order_by(xp.desc(), User.username))
 
     rows = []
-    for u in users:
-        q = db.query(func.coalesce(func.sum(XPEvent.points), 0)).filter(
-            XPEvent.username == u.username)
-        if since is not None:
-            q = q.filter(XPEvent.created_at >= since)
-        window_xp = q.scalar() or 0
-        badge_count = db.query(func.count(BadgeAward.id)).filter(
-            BadgeAward.username == u.username).scalar() or 0
-        c = counts.get(u.username, {})
+    for u, window_xp, badge_count, *stats in db.execute(q):
         rows.append({"username": u.username, "display_name": u.display_name,
-                     "role": u.role, "xp": window_xp if since else u.xp,
-                     "total_xp": u.xp, "streak": u.streak,
-                     "level": level_info(u.xp), "badges": badge_count,
-                     "stats": {"tickets_done": c.get("ticket_done", 0),
-                               "resolved": c.get("ticket_resolved", 0),
-                               "builds_fixed": c.get("build_fixed", 0),
-                               "reviews": c.get("approval_review", 0),
-                               "actions": c.get("repo_action_executed", 0)}})
-    rows.sort(key=lambda r: -r["xp"])
+                     "role": u.role, "xp": int(window_xp), "total_xp": u.xp,
+                     "streak": u.streak, "level": level_info(u.xp),
+                     "badges": int(badge_count),
+                     "stats": {stat: int(n) for stat, n in zip(STAT_KINDS, stats)}})
     return {"window": window, "rows": rows}
 
 
 @router.get("/members")
 def members(user: User = Depends(current_user), db: Session = Depends(get_db)):
     """Lightweight roster for pickers (e.g. quick-add assignee)."""
-    sync_group_members(db)
     rows = db.query(User).order_by(User.username).all()
     return {"members": [{"username": u.username, "display_name": u.display_name}
                         for u in rows]}
@@ -109,7 +107,6 @@ def activity(days: int = 7, limit: int = 200, user: User = Depends(current_user)
 
 @router.get("/recap")
 def recap(days: int = 7, user: User = Depends(current_user), db: Session = Depends(get_db)):
-    sync_closed_tickets(db)
     now = utcnow()
     this_start = now - dt.timedelta(days=days)
     last_start = now - dt.timedelta(days=days * 2)
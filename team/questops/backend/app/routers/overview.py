@@ -1,7 +1,13 @@
 """The whole picture on one screen — every section is failure-isolated so a
-broken integration dims its panel instead of blanking the page."""
+broken integration dims its panel instead of blanking the page, and the
+upstream sections are fetched concurrently so a slow one never delays it."""
 
 import datetime as dt
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import func
@@ -12,7 +18,6 @@ from ..config import settings
 from ..db import RepoAction, User, XPEvent, get_db, utcnow
 from ..gamification import team_quest_progress
 from ..integrations import elastic, jenkins, jira
-from ..ticket_sync import sync_closed_tickets
 
 router = APIRouter(prefix="/api", tags=["overview"])
 
@@ -58,73 +63,210 @@ def _jira_section() -> dict:
     }
 
 
-def _kpi_section(ci_failures: list[dict]) -> dict:
+def _ci_section() -> dict:
+    ci = jenkins.overview()
+    return {"source": ci["source"],
+            "failure_window_days": ci["failure_window_days"],
+            "failures": len(ci["failures"]),
+            "long_running": len(ci["long_running"]),
+            "top_failures": ci["failures"][:3],
+            "stuck": ci["long_running"][:3],
+            # failure ages feed the KPI panel's at-risk count (stripped on output)
+            "_ages": [f["ago_min"] for f in ci["failures"]]}
+
+
+def _kpi_section() -> dict:
     last_sync, next_sync = elastic.sync_times()
-    now = elastic._now()
     docs = elastic.kpi_recent(hours=24)["docs"]
     ok = sum(1 for d in docs if str(d.get("status", "")).upper() == "SUCCESS")
-    since_last_min = (now - last_sync).total_seconds() / 60
     return {
         "source": ("live" if elastic.is_live()
                    else ("demo" if settings.demo_mode else "not configured")),
         "total": len(docs), "success": ok,
         "overall_pct": round(ok / len(docs) * 100, 1) if docs else 0.0,
-        "seconds_remaining": max(0, int((next_sync - now).total_seconds())),
-        "next_sync": next_sync.isoformat(),
-        "at_risk": sum(1 for f in ci_failures if f["ago_min"] <= since_last_min),
+        "last_sync": last_sync.isoformat(), "next_sync": next_sync.isoformat(),
     }
 
 
-@router.get("/overview/cursor")
-def overview_cursor(user: User = Depends(current_user), db: Session = Depends(get_db)):
-    """Cheap change beacon the Overview polls: bumps whenever any member's
-    action lands an XPEvent or a repo action changes state. External
-    Jira/Jenkins/ES drift is covered by the frontend's slow full refresh."""
+def _kpi_view(kpi: dict, ci: dict, ci_at: float) -> dict:
+    """Clock-dependent KPI fields, derived on every response from the cached
+    section (and the CI section's failure ages)."""
+    out = {k: v for k, v in kpi.items() if k != "last_sync"}
+    if not kpi.get("next_sync"):
+        return out
+    now = elastic._now()
+    since_last_min = (now - dt.datetime.fromisoformat(kpi["last_sync"])).total_seconds() / 60
+    aged = (time.time() - ci_at) / 60 if ci_at else 0.0
+    out["seconds_remaining"] = max(0, int((dt.datetime.fromisoformat(kpi["next_sync"]) - now)
+                                          .total_seconds()))
+    out["at_risk"] = sum(1 for a in ci.get("_ages") or [] if a + aged <= since_last_min)
+    return out
+
+
+# ---------------------------------------------------------------- section cache
+# Upstream sections (Jira board, Jenkins, ES KPI) each have their own TTL cache
+# and refresh on a small pool, one refresh in flight per section, all at once.
+# /overview waits at most OVERVIEW_SECTION_DEADLINE for the ones refreshing; a
+# section that misses it or whose upstream fails is served from its last good
+# value marked stale (dimmed if it never loaded) and lands for the next poll.
+# DB sections are cached per change cursor. Every section carries a version
+# (content hash) so the cursor beacon tells the frontend what to re-pull.
+UPSTREAM = {"jira": _jira_section, "ci": _ci_section, "kpi": _kpi_section}
+DB_SECTIONS = ("approvals", "team", "activity")
+
+_FALLBACK = {
+    "jira": {"columns": [], "objectives": [], "open_total": 0, "unassigned": 0,
+             "reopened": 0, "missing_objective": 0, "due_soon": 0, "overdue": 0},
+    "ci": {"failures": 0, "long_running": 0, "top_failures": [], "stuck": []},
+    "kpi": {"total": 0, "success": 0, "overall_pct": 0.0, "at_risk": 0,
+            "seconds_remaining": 0, "next_sync": None, "last_sync": None},
+}
+
+_POOL = ThreadPoolExecutor(max_workers=len(UPSTREAM), thread_name_prefix="overview")
+_LOCK = threading.Lock()
+_CACHE: dict[str, dict] = {}  # name -> {data, at, version, error, checked, cursor}
+_INFLIGHT: dict[str, Future] = {}
+
+
+def _ttl(name: str) -> int:
+    return {"jira": settings.overview_jira_ttl, "ci": settings.overview_ci_ttl,
+            "kpi": settings.overview_kpi_ttl}.get(name, settings.overview_db_ttl)
+
+
+def _version(data) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def _store(name: str, data, **extra) -> None:
+    now = time.time()
+    with _LOCK:
+        _CACHE[name] = {"data": data, "at": now, "checked": now, "error": "",
+                        "version": _version(data), **extra}
+
+
+def _run(name: str) -> None:
+    try:
+        data = UPSTREAM[name]()
+    except Exception as exc:  # noqa: BLE001 — keep the last good value, dimmed
+        with _LOCK:
+            entry = _CACHE.setdefault(name, {"data": None, "at": 0.0, "version": ""})
+            entry.update(error=str(exc)[:200], checked=time.time())
+    else:
+        _store(name, data)
+    finally:
+        with _LOCK:
+            _INFLIGHT.pop(name, None)
+
+
+def _refresh(name: str) -> Future | None:
+    """Start a refresh if the section expired and none is running; returns
+    the in-flight refresh (None when the cache is fresh). Never blocks."""
+    with _LOCK:
+        entry = _CACHE.get(name)
+        if entry and time.time() - entry["checked"] < _ttl(name):
+            return None  # fresh — or failed recently: don't hammer a dead upstream
+        fut = _INFLIGHT.get(name)
+        if fut is None:
+            fut = _INFLIGHT[name] = _POOL.submit(_run, name)
+        return fut
+
+
+def _upstream(name: str) -> tuple[dict, float]:
+    """(section for the response, time its data was fetched)."""
+    with _LOCK:
+        entry = dict(_CACHE.get(name) or {})
+    if entry.get("data") is None:
+        return {**_FALLBACK[name], "source": "error" if entry.get("error") else "pending",
+                "error": entry.get("error") or "still loading", "stale": True}, 0.0
+    out = dict(entry["data"])
+    out["stale"] = bool(entry["error"]) or time.time() - entry["at"] >= _ttl(name)
+    if entry["error"]:
+        out["error"] = entry["error"]
+    return out, entry["at"]
+
+
+def _db_section(name: str, cursor: str, build):
+    with _LOCK:
+        entry = _CACHE.get(name)
+    if (entry is None or entry.get("cursor") != cursor
+            or time.time() - entry["at"] >= _ttl(name)):
+        _store(name, build(), cursor=cursor)
+        with _LOCK:
+            entry = _CACHE[name]
+    return entry["data"]
+
+
+def _db_cursor(db: Session) -> str:
     last_event = db.query(func.max(XPEvent.id)).scalar() or 0
     actions = db.query(func.count(RepoAction.id)).scalar() or 0
     pending = db.query(func.count(RepoAction.id)).filter(
         RepoAction.status == "pending_approval").scalar() or 0
-    return {"cursor": f"{last_event}:{actions}:{pending}"}
+    return f"{last_event}:{actions}:{pending}"
+
+
+def _freshness() -> dict:
+    now = time.time()
+    with _LOCK:
+        return {name: {"version": e["version"],
+                       "age_s": int(now - e["at"]) if e["at"] else None,
+                       "stale": bool(e["error"]) or now - e["at"] >= _ttl(name),
+                       "refreshing": name in _INFLIGHT}
+                for name, e in _CACHE.items()}
+
+
+@router.get("/overview/cursor")
+def overview_cursor(user: User = Depends(current_user), db: Session = Depends(get_db)):
+    """Cheap change beacon the Overview polls. `cursor` bumps whenever any
+    member's action lands an XPEvent or a repo action changes state;
+    `sections` carries each section's version + freshness, so the frontend
+    re-pulls only sections whose version moved. Polling it also starts
+    background refreshes of expired upstream sections (never waits on them)."""
+    for name in UPSTREAM:
+        _refresh(name)
+    return {"cursor": _db_cursor(db), "sections": _freshness()}
 
 
 @router.get("/overview")
-def overview(user: User = Depends(current_user), db: Session = Depends(get_db)):
-    sync_closed_tickets(db)  # Jira-side closures count toward team pulse
-    out: dict = {"generated_at": utcnow().isoformat()}
+def overview(sections: str = "", user: User = Depends(current_user),
+             db: Session = Depends(get_db)):
+    """All sections, or only the comma-separated `sections` asked for."""
+    started = time.monotonic()
+    wanted = {s.strip() for s in sections.split(",") if s.strip()} or (
+        set(UPSTREAM) | set(DB_SECTIONS))
+    if "kpi" in wanted:
+        wanted.add("ci")  # at-risk needs the CI failure ages
+    pending = [f for f in (_refresh(n) for n in UPSTREAM if n in wanted) if f]
 
-    try:
-        out["jira"] = _jira_section()
-    except Exception as exc:  # noqa: BLE001 — dim the panel, keep the page
-        out["jira"] = {"source": "error", "error": str(exc)[:200],
-                       "columns": [], "objectives": [], "open_total": 0,
-                       "unassigned": 0, "reopened": 0, "missing_objective": 0,
-                       "due_soon": 0, "overdue": 0}
-
-    ci_failures: list[dict] = []
-    try:
-        ci = jenkins.overview()
-        ci_failures = ci["failures"]
-        out["ci"] = {"source": ci["source"],
-                     "failure_window_days": ci["failure_window_days"],
-                     "failures": len(ci["failures"]),
-                     "long_running": len(ci["long_running"]),
-                     "top_failures": ci["failures"][:3],
-                     "stuck": ci["long_running"][:3]}
-    except Exception as exc:  # noqa: BLE001
-        out["ci"] = {"source": "error", "error": str(exc)[:200], "failures": 0,
-                     "long_running": 0, "top_failures": [], "stuck": [],
-                     "failure_window_days": settings.jenkins_failure_window_days}
+    out: dict = {"generated_at": utcnow().isoformat()}
+    cursor = _db_cursor(db)  # DB sections build while upstreams are in flight
+    if "approvals" in wanted:
+        out["approvals"] = _db_section("approvals", cursor, lambda: {
+            "pending": db.query(func.count(RepoAction.id)).filter(
+                RepoAction.status == "pending_approval").scalar() or 0})
+    if "team" in wanted:
+        out["team"] = _db_section("team", cursor, lambda: _team_section(db))
+    if "activity" in wanted:
+        out["activity"] = _db_section("activity", cursor, lambda: [
+            {"username": e.username, "kind": e.kind, "points": e.points,
+             "message": e.message, "at": e.created_at.isoformat()}
+            for e in db.query(XPEvent).order_by(XPEvent.created_at.desc()).limit(8)])
 
-    try:
-        out["kpi"] = _kpi_section(ci_failures)
-    except Exception as exc:  # noqa: BLE001
-        out["kpi"] = {"source": "error", "error": str(exc)[:200], "total": 0,
-                      "success": 0, "overall_pct": 0.0, "at_risk": 0,
-                      "seconds_remaining": 0, "next_sync": None}
+    if pending:
+        wait(pending, timeout=max(0.0, settings.overview_section_deadline
+                                  - (time.monotonic() - started)))
+    ci, ci_at = _upstream("ci")
+    for name in UPSTREAM:
+        if name not in wanted:
+            continue
+        section = ci if name == "ci" else _upstream(name)[0]
+        if name == "kpi":
+            section = _kpi_view(section, ci, ci_at)
+        out[name] = {k: v for k, v in section.items() if not k.startswith("_")}
+    out["sections"] = {k: v for k, v in _freshness().items() if k in wanted}
+    return out
 
-    out["approvals"] = {"pending": db.query(func.count(RepoAction.id)).filter(
-        RepoAction.status == "pending_approval").scalar() or 0}
 
+def _team_section(db: Session) -> dict:
     now = utcnow()
     week, prev = now - dt.timedelta(days=7), now - dt.timedelta(days=14)
 
@@ -142,14 +284,8 @@ def overview(user: User = Depends(current_user), db: Session = Depends(get_db)):
             .filter(XPEvent.created_at >= week).group_by(XPEvent.username)
             .order_by(func.sum(XPEvent.points).desc()).limit(3).all())
     names = {u.username: u.display_name for u in db.query(User).all()}
-    out["team"] = {"this_week": _window(week, now), "last_week": _window(prev, week),
-                   "top3": [{"username": r[0],
-                             "display_name": names.get(r[0], r[0]),
-                             "xp": int(r[1])} for r in top3],
-                   "quests": team_quest_progress(db)}
-
-    events = (db.query(XPEvent).order_by(XPEvent.created_at.desc()).limit(8).all())
-    out["activity"] = [{"username": e.username, "kind": e.kind, "points": e.points,
-                        "message": e.message, "at": e.created_at.isoformat()}
-                       for e in events]
-    return out
+    return {"this_week": _window(week, now), "last_week": _window(prev, week),
+            "top3": [{"username": r[0],
+                      "display_name": names.get(r[0], r[0]),
+                      "xp": int(r[1])} for r in top3],
+            "quests": team_quest_progress(db)}
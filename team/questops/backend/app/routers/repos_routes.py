@@ -101,8 +101,9 @@ def search(q: str, regex: bool = False, case_sensitive: bool = False,
            whole_word: bool = False, slot: int | None = None,
            path_glob: str = "", collection: str = "", project: str = "",
            user: User = Depends(current_user)):
-    """Search a string/regex across cloned repos (git grep, read-only),
-    optionally narrowed by collection / project / repository."""
+    """Search a string/regex across cloned repos (per-repo trigram index,
+    git grep fallback; read-only), optionally narrowed by collection /
+    project / repository."""
     return _wrap(repos.search, q, regex, case_sensitive, whole_word, slot,
                  path_glob, collection, project)
 
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 
 from .auth import DEMO_USERS
 from .db import (AgentCommand, BadgeAward, PromptTemplate, RepoAction,
-                 Repository, User, XPEvent, utcnow)
+                 Repository, User, XPEvent, rebuild_xp_rollups, utcnow)
 from .gamification import BADGES, _check_badges, level_for_xp
 
 SEED_KINDS = [
@@ -43,22 +43,25 @@ def cleanup_demo_data(db: Session) -> None:
     event messages, git.example.local repo URLs."""
     demo_users = [u.username for u in
                   db.query(User).filter(User.email.like("%@demo.local"))]
+    purged = 0
     if demo_users:
         db.query(AgentCommand).filter(AgentCommand.username.in_(demo_users)).delete(
             synchronize_session=False)
-        db.query(XPEvent).filter(XPEvent.username.in_(demo_users)).delete(
+        purged += db.query(XPEvent).filter(XPEvent.username.in_(demo_users)).delete(
             synchronize_session=False)
         db.query(BadgeAward).filter(BadgeAward.username.in_(demo_users)).delete(
             synchronize_session=False)
         db.query(User).filter(User.username.in_(demo_users)).delete(
             synchronize_session=False)
-    db.query(XPEvent).filter(XPEvent.message.like("(seeded)%")).delete(
+    purged += db.query(XPEvent).filter(XPEvent.message.like("(seeded)%")).delete(
         synchronize_session=False)
     db.query(RepoAction).filter(RepoAction.repo_url.like("%git.example.local%")).delete(
         synchronize_session=False)
     db.query(Repository).filter(Repository.url.like("%git.example.local%")).delete(
         synchronize_session=False)
     db.commit()
+    if purged:  # bulk deletes skip the rollup hook
+        rebuild_xp_rollups(db)
 
 
 def seed_demo(db: Session) -> None:
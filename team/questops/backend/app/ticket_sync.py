@@ -5,21 +5,28 @@ still count toward completed-ticket stats, quests and badges. This sync
 backfills a ticket_done XPEvent for any done-status ticket in the closed
 window that has no event yet — deduped by issue key, credited to the
 assignee, timestamped at the Jira resolution date so windowed views count
-it in the right range."""
+it in the right range.
+
+It runs only in the background loop (app.background), never on a request
+thread, and only on the replica holding the 'jira-reconciler' advisory lock.
+Each cycle asks Jira for done tickets UPDATED since a watermark persisted in
+sync_state (minus an overlap for clock skew), so a closure lands within one
+cycle and every replica sees the same progress."""
 
 import datetime as dt
 import re
-import time
 
 from sqlalchemy.orm import Session
 
-from .db import User, XPEvent, utcnow
+from .config import settings
+from .db import SyncState, User, XPEvent, is_leader, utcnow
 from .gamification import (XP_RULES, _check_badges, _check_team_badges,
                            _check_team_quests, _update_streak)
 from .integrations import jira
 
-_LAST = {"at": 0.0}
-SYNC_TTL = 600  # seconds between real Jira reconciliations
+LEADER_LOCK = "jira-reconciler"
+WATERMARK = "jira_closed_tickets"
+OVERLAP = dt.timedelta(minutes=5)  # re-read this much before the watermark
 
 
 def _parse_when(raw: str | None) -> dt.datetime | None:
@@ -36,18 +43,28 @@ def _parse_when(raw: str | None) -> dt.datetime | None:
         return None
 
 
-def sync_closed_tickets(db: Session, force: bool = False) -> int:
-    """Returns how many Jira-side closures were backfilled. TTL-cached and
-    outage-safe — a Jira hiccup never breaks the calling page."""
-    if not force and time.time() - _LAST["at"] < SYNC_TTL:
-        return 0
-    _LAST["at"] = time.time()
-    try:
-        closed = jira.closed_recently()
-    except Exception:  # noqa: BLE001 — reconcile later
-        return 0
+def reconcile_closed_tickets(db: Session) -> int | None:
+    """One reconciliation cycle. Returns how many Jira-side closures were
+    backfilled, or None when another replica is the leader. A Jira outage
+    raises and leaves the watermark alone, so the next cycle re-reads."""
+    if not is_leader(LEADER_LOCK):
+        return None
+    state = db.get(SyncState, WATERMARK)
+    started = utcnow()
+    since = state.watermark - OVERLAP if state and state.watermark else None
+    added = _credit_closures(db, jira.closed_since(since))
+    if state is None:
+        state = SyncState(name=WATERMARK)
+        db.add(state)
+    state.watermark = started
+    db.commit()
+    return added
+
+
+def _credit_closures(db: Session, closed: list[dict]) -> int:
     if not closed:
         return 0
+    oldest = utcnow() - dt.timedelta(days=settings.jira_closed_window_days)
 
     users = {u.username.lower(): u for u in db.query(User).all()}
     already = {ref for (ref,) in db.query(XPEvent.ref).filter(
@@ -62,6 +79,8 @@ def sync_closed_tickets(db: Session, force: bool = False) -> int:
         if user is None:
             continue  # assignee is not a team member
         when = _parse_when(c.get("resolved")) or _parse_when(c.get("updated")) or utcnow()
+        if when < oldest:
+            continue  # closed long ago, merely touched since
         points = XP_RULES["ticket_done"]
         db.add(XPEvent(username=user.username, kind="ticket_done", points=points,
                        message=f"(jira) {c['key']} closed in Jira — "
@@ -0,0 +1,26 @@
+"""Shared setup: a throwaway SQLite database and live (non-demo) settings.
+
+``app.config`` and ``app.db`` read the environment and build the engine at
+import time, so it is pointed at a temp database before anything from ``app``
+is imported. The integrations are then aimed at local stub servers per test.
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="questops-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/questops.db"
+os.environ["DEMO_MODE"] = "false"
+os.environ["BACKGROUND_SYNC_SECONDS"] = "0"
+
+import pytest  # noqa: E402
+
+from app.db import Base, SessionLocal, engine  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        yield session
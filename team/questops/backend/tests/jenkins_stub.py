@@ -0,0 +1,110 @@
+"""A local stand-in for the Jenkins JSON API behind app.integrations.jenkins.
+
+Serves one folder (``team``) of pipeline jobs. The root ``/api/json`` answers
+the snapshot's tree query — with or without ``builds`` depending on what the
+tree asks for — and ``/job/team/job/<name>/api/json`` answers the per-job
+build-history fetch of an incremental poll. Tests mutate ``jobs`` between
+calls and read ``requests`` to see what the client asked for.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+FOLDER = "team"
+
+
+def build(number: int, result: str | None = "SUCCESS", *, building: bool = False,
+          minutes_ago: int = 10, duration_min: int = 5) -> dict:
+    return {"number": number, "result": None if building else result, "building": building,
+            "timestamp": int((time.time() - minutes_ago * 60) * 1000),
+            "duration": 0 if building else duration_min * 60_000}
+
+
+class StubJenkins:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        # job name -> newest-first list of builds
+        self.jobs: dict[str, list[dict]] = {}
+        self.requests: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    # -- lifecycle ---------------------------------------------------------
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubJenkins":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # -- fixture data ------------------------------------------------------
+    def job_url(self, name: str) -> str:
+        return f"{self.url}/job/{FOLDER}/job/{name}/"
+
+    def _builds(self, name: str) -> list[dict]:
+        return [{**b, "url": f"{self.job_url(name)}{b['number']}/"} for b in self.jobs[name]]
+
+    def _leaf(self, name: str, with_builds: bool) -> dict:
+        builds = self._builds(name)
+        completed = next((b for b in builds if not b["building"]), None)
+        leaf = {"_class": "org.jenkinsci.plugins.workflow.job.WorkflowJob",
+                "fullName": f"{FOLDER}/{name}", "name": name, "url": self.job_url(name),
+                "lastBuild": builds[0] if builds else None,
+                "lastCompletedBuild": completed}
+        if with_builds:
+            leaf["builds"] = builds
+        return leaf
+
+    # -- HTTP --------------------------------------------------------------
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # keep test output quiet
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                tree = parse_qs(parsed.query).get("tree", [""])[0]
+                if stub.latency:
+                    time.sleep(stub.latency)
+                code, body = stub.respond(unquote(parsed.path), tree)
+                payload = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def respond(self, path: str, tree: str):
+        with self._lock:
+            if path == "/api/json":
+                with_builds = "builds[" in tree
+                self.requests["tree" if with_builds else "light_tree"] += 1
+                return 200, {"jobs": [{
+                    "_class": "com.cloudbees.hudson.plugins.folder.Folder",
+                    "fullName": FOLDER, "name": FOLDER, "url": f"{self.url}/job/{FOLDER}/",
+                    "jobs": [self._leaf(n, with_builds) for n in sorted(self.jobs)],
+                }]}
+            prefix = f"/job/{FOLDER}/job/"
+            if path.startswith(prefix) and path.endswith("/api/json"):
+                name = path[len(prefix):-len("/api/json")]
+                if name in self.jobs:
+                    self.requests[f"builds:{name}"] += 1
+                    return 200, {"builds": self._builds(name)}
+            return 404, {"error": "not found"}
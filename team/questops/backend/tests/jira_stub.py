@@ -0,0 +1,85 @@
+"""A local stand-in for the Jira Data Center search API behind app.integrations.jira.
+
+Answers ``POST /rest/api/2/search`` with the issues in ``issues`` (paged by
+``startAt`` / ``maxResults``) and records every JQL it was sent, so tests can
+check the window the reconciler asked for. ``fail`` makes searches return 500.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def jira_time(when: dt.datetime) -> str:
+    """Naive UTC -> Jira's '2026-07-12T10:11:12.000+0000'."""
+    return when.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def issue(key: str, assignee: str | None, *, resolved: dt.datetime, updated: dt.datetime | None = None,
+          status: str = "Closed", summary: str = "") -> dict:
+    return {"key": key, "fields": {
+        "summary": summary or f"Ticket {key}", "status": {"name": status},
+        "priority": {"name": "Medium"}, "issuetype": {"name": "Task"},
+        "assignee": {"name": assignee} if assignee else None,
+        "created": jira_time(resolved - dt.timedelta(days=1)),
+        "updated": jira_time(updated or resolved), "resolutiondate": jira_time(resolved),
+    }}
+
+
+class StubJira:
+    def __init__(self) -> None:
+        self.issues: list[dict] = []
+        self.jqls: list[str] = []
+        self.fail = False
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    # -- lifecycle ---------------------------------------------------------
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubJira":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # -- HTTP --------------------------------------------------------------
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # keep test output quiet
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                code, payload = stub.respond(self.path, body)
+                raw = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        return Handler
+
+    def respond(self, path: str, body: dict):
+        with self._lock:
+            if path != "/rest/api/2/search":
+                return 404, {"errorMessages": ["not found"]}
+            self.jqls.append(body.get("jql", ""))
+            if self.fail:
+                return 500, {"errorMessages": ["stub outage"]}
+            start, size = int(body.get("startAt", 0)), int(body.get("maxResults", 50))
+            return 200, {"startAt": start, "maxResults": size, "total": len(self.issues),
+                         "issues": self.issues[start:start + size]}
@@ -0,0 +1,148 @@
+"""XP rollups (app.db): the XPEvent flush hook that keeps xp_daily and
+xp_counters current, award()'s fixed statement cost (app.gamification), and
+the windowed leaderboard read from xp_daily (app.routers.game)."""
+import datetime as dt
+
+import pytest
+from sqlalchemy import event
+
+from app.db import Base, User, XPCounter, XPDaily, XPEvent, engine, rebuild_xp_rollups, utcnow
+from app.gamification import XP_RULES, award
+from app.routers.game import STAT_KINDS, leaderboard
+from app.seed import cleanup_demo_data
+
+
+def _rollups(db) -> tuple[set, set]:
+    db.expire_all()
+    return ({(r.username, r.day, r.kind, r.points, r.events) for r in db.query(XPDaily)},
+            {(r.username, r.kind, r.period, r.points, r.events) for r in db.query(XPCounter)})
+
+
+def _history(db, username: str, n: int) -> None:
+    """n past events straight into the ledger, rolled up in bulk."""
+    now = utcnow()
+    db.execute(XPEvent.__table__.insert(), [
+        {"username": username, "kind": "ticket_comment", "points": 5, "message": "", "ref": "",
+         "created_at": now - dt.timedelta(days=1 + i % 60)}
+        for i in range(n)])
+    db.commit()
+    rebuild_xp_rollups(db)
+
+
+@pytest.fixture
+def team(db):
+    db.add_all([User(username="alice"), User(username="bob")])
+    db.commit()
+    return db
+
+
+def _statements(fn) -> int:
+    count = 0
+
+    def _before(*_args):
+        nonlocal count
+        count += 1
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+    return count
+
+
+def test_award_cost_does_not_grow_with_history(db):
+    counts = {}
+    for history in (100, 20_000):
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        db.expunge_all()
+        db.add_all([User(username="alice"), User(username="bob")])
+        db.commit()
+        alice = db.get(User, "alice")
+        _history(db, "alice", history)
+        award(db, alice, "ticket_comment", ref="warm-up")  # first award of the day
+        counts[history] = _statements(lambda: award(db, alice, "ticket_comment", ref="counted"))
+
+    assert counts[100] == counts[20_000] <= 11
+
+
+def test_flush_hook_matches_a_full_rebuild(team):
+    alice, bob = team.get(User, "alice"), team.get(User, "bob")
+    for kind in ("ticket_done", "ticket_comment", "ticket_comment", "build_fixed"):
+        award(team, alice, kind)
+    award(team, bob, "ticket_comment")
+    # Events on earlier days, added through the ORM so the hook sees them.
+    for days_ago, kind in ((1, "ticket_done"), (1, "ticket_done"), (9, "approval_review")):
+        team.add(XPEvent(username="bob", kind=kind, points=XP_RULES[kind],
+                         created_at=utcnow() - dt.timedelta(days=days_ago)))
+    team.commit()
+
+    daily, counters = _rollups(team)
+    assert {period for _, _, period, _, _ in counters} == {"all"}
+    rebuild_xp_rollups(team)
+    assert _rollups(team) == (daily, counters)
+
+
+def _expected(db, days: int | None) -> dict[str, tuple[int, dict[str, int]]]:
+    """Window XP and stat counts per member, aggregated straight from the ledger."""
+    since = None if days is None else utcnow().date() - dt.timedelta(days=days - 1)
+    out = {u.username: [0, dict.fromkeys(STAT_KINDS, 0)] for u in db.query(User)}
+    kinds = {kind: stat for stat, kind in STAT_KINDS.items()}
+    for e in db.query(XPEvent):
+        if e.username not in out or (since and e.created_at.date() < since):
+            continue
+        out[e.username][0] += e.points
+        if e.kind in kinds:
+            out[e.username][1][kinds[e.kind]] += 1
+    return {u: (xp, stats) for u, (xp, stats) in out.items()}
+
+
+def _board(db, window: str) -> dict[str, tuple[int, dict[str, int]]]:
+    db.expire_all()
+    rows = leaderboard(window=window, user=None, db=db)["rows"]
+    return {r["username"]: (r["xp"], r["stats"]) for r in rows}
+
+
+def _earn(db, username: str, kind: str, days_ago: int, message: str = "") -> None:
+    user = db.get(User, username)
+    db.add(XPEvent(username=username, kind=kind, points=XP_RULES[kind], message=message,
+                   created_at=utcnow() - dt.timedelta(days=days_ago)))
+    user.xp += XP_RULES[kind]
+    db.commit()
+
+
+def test_leaderboard_windows_match_the_ledger(team):
+    alice, bob = team.get(User, "alice"), team.get(User, "bob")
+    award(team, alice, "ticket_done")
+    award(team, bob, "build_fixed")
+    for username, kind, days_ago in (("alice", "ticket_done", 3), ("alice", "approval_review", 6),
+                                     ("bob", "ticket_resolved", 7), ("bob", "ticket_done", 20),
+                                     ("alice", "repo_action_executed", 29), ("bob", "build_fixed", 30),
+                                     ("alice", "ticket_done", 90)):
+        _earn(team, username, kind, days_ago)
+
+    for window, days in (("7", 7), ("week", 7), ("30", 30), ("all", None)):
+        assert _board(team, window) == _expected(team, days), window
+    # Whole UTC days, today included: 6 days ago is in the 7-day window, 7 is not.
+    assert _board(team, "7")["bob"][1]["resolved"] == 0
+    assert _board(team, "all")["alice"][0] == team.get(User, "alice").xp
+
+
+def test_rollups_after_demo_cleanup(team):
+    team.add(User(username="demo", email="demo@demo.local"))
+    team.commit()
+    _earn(team, "demo", "ticket_done", 2)
+    _earn(team, "alice", "ticket_done", 1)
+    _earn(team, "alice", "build_fixed", 4, message="(seeded) fixed the build")
+    award(team, team.get(User, "bob"), "approval_review")
+
+    cleanup_demo_data(team)  # bulk deletes, then rebuild_xp_rollups
+
+    daily, counters = _rollups(team)
+    assert {u for u, *_ in daily} == {u for u, *_ in counters} == {"alice", "bob"}
+    for window, days in (("7", 7), ("30", 30)):
+        assert _board(team, window) == _expected(team, days), window
+    assert _board(team, "all")["alice"][1] == _expected(team, None)["alice"][1]
+    rebuild_xp_rollups(team)
+    assert _rollups(team) == (daily, counters)
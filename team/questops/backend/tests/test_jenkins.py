@@ -0,0 +1,69 @@
+"""Shared Jenkins snapshot (app.integrations.jenkins) against a stub controller.
+
+Covers single-flight cold reads, the incremental poll (tree without build
+history) and re-fetching build history only for jobs whose signature changed
+— including an older concurrent build finishing behind a newer running one.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.integrations import jenkins
+from tests.jenkins_stub import StubJenkins, build
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with StubJenkins() as server:
+        server.jobs = {
+            "api": [build(12), build(11)],
+            "web": [build(7), build(6)],
+            "etl": [build(3, building=True, minutes_ago=2), build(2)],
+        }
+        monkeypatch.setattr(settings, "jenkins_url", server.url)
+        monkeypatch.setattr(settings, "jenkins_user", "")
+        monkeypatch.setattr(settings, "demo_mode", False)
+        monkeypatch.setattr(jenkins, "_SNAPSHOT",
+                            {"jobs": None, "sigs": {}, "at": 0.0, "full_at": 0.0, "error": ""})
+        yield server
+
+
+def _failures(data: dict) -> set[tuple[str, int]]:
+    return {(f["job"], f["number"]) for f in data["failures"]}
+
+
+def test_concurrent_cold_reads_share_one_tree_fetch(stub):
+    stub.latency = 0.2
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: jenkins.overview(), range(8)))
+    assert stub.requests["tree"] == 1
+    assert all(r["source"] == "live" and len(r["jobs"]) == 3 for r in results)
+
+
+def test_incremental_poll_skips_build_history_when_nothing_changed(stub):
+    jenkins.overview()
+    jenkins.refresh_snapshot()
+    assert (stub.requests["tree"], stub.requests["light_tree"]) == (1, 1)
+    assert not [k for k in stub.requests if k.startswith("builds:")]
+
+
+def test_only_changed_jobs_have_their_builds_refetched(stub):
+    jenkins.overview()
+    stub.jobs["api"].insert(0, build(13, "FAILURE", minutes_ago=1))
+    jenkins.refresh_snapshot()
+    fetched = {k.split(":", 1)[1] for k in stub.requests if k.startswith("builds:")}
+    assert fetched == {"api"}
+    assert ("team/api", 13) in _failures(jenkins.overview())
+
+
+def test_older_build_finishing_behind_a_running_one_is_picked_up(stub):
+    # Concurrent builds: #2 and #3 both running, #1 the last completed.
+    stub.jobs["etl"] = [build(3, building=True, minutes_ago=2),
+                        build(2, building=True, minutes_ago=4), build(1)]
+    jenkins.overview()
+    # #2 fails while #3 keeps running: lastBuild is unchanged.
+    stub.jobs["etl"][1] = build(2, "FAILURE", minutes_ago=4)
+    jenkins.refresh_snapshot()
+    assert stub.requests["builds:etl"] == 1
+    assert ("team/etl", 2) in _failures(jenkins.overview())
@@ -0,0 +1,128 @@
+"""/api/overview section cache (app.routers.overview): the response deadline,
+stale / pending fallbacks for slow and failing upstreams, retry only after
+the section TTL, and ``?sections=`` filtering. Upstreams are in-process stubs."""
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.routers import overview as ov
+
+
+class _Upstream:
+    """Counts calls; ``fail`` raises, ``gate`` holds the call until set."""
+
+    def __init__(self, data: dict):
+        self.data, self.calls, self.fail, self.gate = data, 0, None, None
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(10)
+        if self.fail:
+            raise RuntimeError(self.fail)
+        return dict(self.data)
+
+
+@pytest.fixture
+def upstreams(db, monkeypatch):
+    stubs = {
+        "jira": _Upstream({"source": "live", "project": "OPS", "columns": [], "objectives": [],
+                           "open_total": 4, "unassigned": 1, "reopened": 0,
+                           "missing_objective": 0, "due_soon": 0, "overdue": 0}),
+        "ci": _Upstream({"source": "live", "failure_window_days": 1, "failures": 2,
+                         "long_running": 0, "top_failures": [], "stuck": [], "_ages": []}),
+        "kpi": _Upstream({"source": "live", "total": 3, "success": 3, "overall_pct": 100.0,
+                          "last_sync": None, "next_sync": None}),
+    }
+    for name, stub in stubs.items():
+        monkeypatch.setitem(ov.UPSTREAM, name, stub)
+    monkeypatch.setattr(settings, "overview_section_deadline", 0.3)
+    ov._CACHE.clear()
+    yield stubs
+    for stub in stubs.values():
+        if stub.gate is not None:
+            stub.gate.set()
+    _settle()
+    ov._CACHE.clear()
+
+
+def _settle() -> None:
+    """Wait for background refreshes still in flight."""
+    with ov._LOCK:
+        inflight = list(ov._INFLIGHT.values())
+    for fut in inflight:
+        fut.result(10)
+
+
+def _get(db, sections: str = "") -> dict:
+    return ov.overview(sections=sections, user=None, db=db)
+
+
+def test_all_sections_are_served_fresh(db, upstreams):
+    out = _get(db)
+
+    assert out["jira"]["open_total"] == 4 and out["jira"]["stale"] is False
+    assert out["ci"]["failures"] == 2 and "_ages" not in out["ci"]
+    assert out["kpi"]["overall_pct"] == 100.0
+    assert {"approvals", "team", "activity"} <= out.keys()
+    assert set(out["sections"]) == {"jira", "ci", "kpi", "approvals", "team", "activity"}
+
+
+def test_slow_section_is_pending_within_the_deadline(db, upstreams):
+    upstreams["jira"].gate = threading.Event()
+
+    started = time.monotonic()
+    out = _get(db)
+
+    assert time.monotonic() - started < settings.overview_section_deadline + 0.5
+    assert out["jira"]["source"] == "pending" and out["jira"]["stale"] is True
+    assert out["sections"]["ci"]["stale"] is False
+    assert "jira" not in out["sections"]  # never loaded yet
+
+    upstreams["jira"].gate.set()
+    _settle()
+    assert _get(db)["jira"]["open_total"] == 4  # lands for the next poll
+    assert upstreams["jira"].calls == 1
+
+
+def test_failed_section_is_not_retried_until_its_ttl(db, upstreams):
+    upstreams["ci"].fail = "jenkins down"
+    out = _get(db)
+    assert out["ci"]["source"] == "error" and out["ci"]["error"] == "jenkins down"
+    assert out["ci"]["stale"] is True
+
+    _get(db)
+    assert upstreams["ci"].calls == 1  # failed recently: don't hammer it
+
+    with ov._LOCK:
+        ov._CACHE["ci"]["checked"] -= settings.overview_ci_ttl
+    upstreams["ci"].fail = None
+    assert _get(db)["ci"]["failures"] == 2
+    assert upstreams["ci"].calls == 2
+
+
+def test_failure_after_a_good_fetch_serves_the_last_value_stale(db, upstreams):
+    _get(db)
+    upstreams["jira"].fail = "jira down"
+    with ov._LOCK:
+        ov._CACHE["jira"]["checked"] -= settings.overview_jira_ttl
+        ov._CACHE["jira"]["at"] -= settings.overview_jira_ttl
+
+    out = _get(db)
+
+    assert out["jira"]["open_total"] == 4
+    assert out["jira"]["stale"] is True and out["jira"]["error"] == "jira down"
+    assert out["sections"]["jira"]["stale"] is True
+
+
+def test_sections_filter(db, upstreams):
+    out = _get(db, "approvals, team")
+    assert out.keys() == {"generated_at", "approvals", "team", "sections"}
+    assert set(out["sections"]) == {"approvals", "team"}
+    assert all(stub.calls == 0 for stub in upstreams.values())
+
+    out = _get(db, "kpi")  # at-risk needs the CI failure ages
+    assert {"kpi", "ci"} <= out.keys() and "jira" not in out
+    assert (upstreams["ci"].calls, upstreams["kpi"].calls, upstreams["jira"].calls) == (1, 1, 0)
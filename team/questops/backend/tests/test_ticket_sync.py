@@ -0,0 +1,124 @@
+"""Jira closure reconciliation (app.ticket_sync) against a stub Jira, plus the
+advisory-lock leader election it runs under (app.db.is_leader).
+
+The Postgres leader test needs a scratch database in QUESTOPS_TEST_POSTGRES_URL
+(e.g. ``postgresql+psycopg://user:pw@localhost/questops_test``); it is skipped
+otherwise.
+"""
+import datetime as dt
+import hashlib
+import os
+import re
+
+import pytest
+import requests
+from sqlalchemy import create_engine, text
+
+from app import db as db_module
+from app.config import settings
+from app.db import SyncState, User, XPEvent, is_leader, resign_leadership, utcnow
+from app.ticket_sync import WATERMARK, reconcile_closed_tickets
+from tests.jira_stub import StubJira, issue
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    with StubJira() as server:
+        monkeypatch.setattr(settings, "jira_base_url", server.url)
+        monkeypatch.setattr(settings, "jira_user", "svc")
+        monkeypatch.setattr(settings, "jira_password", "secret")
+        monkeypatch.setattr(settings, "demo_mode", False)
+        yield server
+
+
+@pytest.fixture
+def team(db):
+    db.add_all([User(username="alice"), User(username="bob")])
+    db.commit()
+    return db
+
+
+def _watermark(db) -> dt.datetime | None:
+    db.expire_all()
+    state = db.get(SyncState, WATERMARK)
+    return state.watermark if state else None
+
+
+def _credited(db) -> set[str]:
+    return {ref for (ref,) in db.query(XPEvent.ref).filter(XPEvent.kind == "ticket_done")}
+
+
+def test_first_run_reads_the_whole_closed_window(jira, team):
+    jira.issues = [issue("DEVOPS-1", "alice", resolved=utcnow() - dt.timedelta(days=2))]
+    before = utcnow()
+    assert reconcile_closed_tickets(team) == 1
+    assert f"updated >= -{settings.jira_closed_window_days}d" in jira.jqls[0]
+    assert _credited(team) == {"DEVOPS-1"}
+    assert _watermark(team) >= before
+
+
+def test_next_run_reads_from_the_watermark_and_advances_it(jira, team):
+    team.add(SyncState(name=WATERMARK, watermark=utcnow() - dt.timedelta(minutes=10)))
+    team.commit()
+    jira.issues = [issue("DEVOPS-2", "bob", resolved=utcnow() - dt.timedelta(minutes=3))]
+    before = utcnow()
+    assert reconcile_closed_tickets(team) == 1
+    # 10 minutes since the watermark plus the 5 minute overlap.
+    minutes = int(re.search(r"updated >= -(\d+)m", jira.jqls[0]).group(1))
+    assert 15 <= minutes <= 16
+    assert _watermark(team) >= before
+    # Re-reading the same closure never credits it twice.
+    assert reconcile_closed_tickets(team) == 0
+    assert _credited(team) == {"DEVOPS-2"}
+
+
+def test_jira_error_leaves_the_watermark_alone(jira, team):
+    mark = utcnow() - dt.timedelta(minutes=10)
+    team.add(SyncState(name=WATERMARK, watermark=mark))
+    team.commit()
+    jira.fail = True
+    with pytest.raises(requests.HTTPError):
+        reconcile_closed_tickets(team)
+    team.rollback()
+    assert _watermark(team) == mark
+
+
+def test_closures_older_than_the_window_are_skipped(jira, team):
+    now = utcnow()
+    jira.issues = [
+        # closed long ago, merely touched (commented) since
+        issue("DEVOPS-3", "alice", resolved=now - dt.timedelta(days=settings.jira_closed_window_days + 5),
+              updated=now - dt.timedelta(hours=1)),
+        issue("DEVOPS-4", "alice", resolved=now - dt.timedelta(hours=2)),
+        issue("DEVOPS-5", "mallory", resolved=now - dt.timedelta(hours=2)),  # not on the team
+    ]
+    assert reconcile_closed_tickets(team) == 1
+    assert _credited(team) == {"DEVOPS-4"}
+    alice = team.get(User, "alice")
+    team.refresh(alice)
+    assert alice.xp > 0
+
+
+def test_sqlite_process_is_always_the_leader():
+    assert is_leader("jira-reconciler")
+    assert is_leader("jira-reconciler")
+
+
+@pytest.mark.skipif(not os.environ.get("QUESTOPS_TEST_POSTGRES_URL"),
+                    reason="QUESTOPS_TEST_POSTGRES_URL not set")
+def test_postgres_advisory_lock_elects_one_leader(monkeypatch):
+    engine = create_engine(os.environ["QUESTOPS_TEST_POSTGRES_URL"])
+    monkeypatch.setattr(db_module, "engine", engine)
+    name = "questops-test-leader"
+    key = int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], "big", signed=True)
+    try:
+        assert is_leader(name)
+        assert is_leader(name)  # still held on the same connection
+        with engine.connect() as other:  # another replica asking
+            assert not other.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": key}).scalar()
+            resign_leadership()
+            assert other.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": key}).scalar()
+            other.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": key})
+    finally:
+        resign_leadership()
+        engine.dispose()
@@ -231,36 +231,53 @@ function route() {
 window.addEventListener("hashchange", route);
 
 /* ================= OVERVIEW ================= */
-// live refresh: poll a cheap cursor every 5s (any member's action bumps it)
-// and do a full re-pull every 60s for changes made outside QuestOps
-let OV_CURSOR = null, OV_RENDERED = 0, OV_BUSY = false;
+// live refresh: poll a cheap cursor every 5s. Any member's action bumps
+// `cursor` (re-pull the DB sections); an upstream section whose version moved
+// is re-pulled on its own. A full re-pull every 60s is the safety net.
+let OV_CURSOR = null, OV_RENDERED = 0, OV_BUSY = false, OV_DATA = null;
 const OV_POLL_MS = 5000, OV_STALE_MS = 60000;
+const OV_DB_SECTIONS = ["approvals", "team", "activity"];
+
+function ovChanged(cursor, sections) {
+  const seen = (OV_DATA && OV_DATA.sections) || {};
+  const changed = Object.keys(sections || {}).filter((n) =>
+    !OV_DB_SECTIONS.includes(n) && (!seen[n] || seen[n].version !== sections[n].version));
+  if (cursor !== OV_CURSOR) changed.push(...OV_DB_SECTIONS);
+  return changed;
+}
 
 setInterval(async () => {
   if (state.view !== "overview" || document.hidden || OV_BUSY || !state.me) return;
   try {
-    const { cursor } = await api("/api/overview/cursor");
+    const { cursor, sections } = await api("/api/overview/cursor");
     // re-check AFTER the await — the user may have navigated away meanwhile
     if (state.view !== "overview" || document.hidden) return;
-    if (cursor !== OV_CURSOR || Date.now() - OV_RENDERED > OV_STALE_MS)
-      await renderOverview();
+    if (!OV_DATA || Date.now() - OV_RENDERED > OV_STALE_MS) return await renderOverview();
+    const changed = ovChanged(cursor, sections);
+    if (changed.length) await renderOverview(changed);
   } catch { /* transient — next tick retries */ }
 }, OV_POLL_MS);
 
-async function renderOverview() {
+async function renderOverview(only = null) {
   OV_BUSY = true;
   try {
-    await renderOverviewInner();
+    await renderOverviewInner(only);
   } finally { OV_BUSY = false; }
 }
 
-async function renderOverviewInner() {
+async function renderOverviewInner(only = null) {
   const tok = navToken();
-  const [data, cur] = await Promise.all([
-    api("/api/overview"), api("/api/overview/cursor").catch(() => null)]);
+  const partial = only && OV_DATA;
+  const [fetched, cur] = await Promise.all([
+    api(partial ? `/api/overview?sections=${only.join(",")}` : "/api/overview"),
+    api("/api/overview/cursor").catch(() => null)]);
   if (navStale(tok)) return;  // navigated away during the fetch — don't paint
+  const data = partial
+    ? { ...OV_DATA, ...fetched, sections: { ...OV_DATA.sections, ...fetched.sections } }
+    : fetched;
+  OV_DATA = data;
   OV_CURSOR = cur ? cur.cursor : OV_CURSOR;
-  OV_RENDERED = Date.now();
+  if (!partial) OV_RENDERED = Date.now();
   const j = data.jira, ci = data.ci, kpi = data.kpi, team = data.team;
   const pctCls = (p) => p >= 90 ? "pct-good" : p >= 70 ? "pct-warn" : "pct-bad";
 
@@ -349,8 +366,8 @@ async function renderOverviewInner() {
     </div>`).join("") || `<div class="empty">no activity yet</div>`;
 
   const srcNote = [["Jira", j], ["Jenkins", ci], ["Elasticsearch", kpi]]
-    .filter(([, s]) => s.source === "error")
-    .map(([n, s]) => `⚠ ${n}: ${esc(s.error || "unavailable")}`).join(" · ");
+    .filter(([, s]) => s.source === "error" || s.stale)
+    .map(([n, s]) => `⚠ ${n}: ${esc(s.error || "showing cached data — refreshing")}`).join(" · ");
 
   const scroll = view().scrollTop;  // live re-renders must not yank the page
   view().innerHTML = `